@@ -17,13 +17,20 @@ _EXPORT_MAP = {
     "FeedbackDashboardProvider": ("feedback", "FeedbackDashboardProvider"),
     "GenericAuditWriter": ("audit", "GenericAuditWriter"),
     "InteractionHub": ("interaction", "InteractionHub"),
+    "LatencyHistogram": ("latency", "LatencyHistogram"),
     "ObservableStateManager": ("observable", "ObservableStateManager"),
+    "ReadinessMetrics": ("readiness", "ReadinessMetrics"),
+    "ReadinessTracker": ("readiness", "ReadinessTracker"),
     "SafeExpressionEvaluator": ("feedback", "SafeExpressionEvaluator"),
+    "StageProfiler": ("latency", "StageProfiler"),
+    "TraceDecoder": ("trace_store", "TraceDecoder"),
+    "TraceEncoder": ("trace_store", "TraceEncoder"),
     "create_drift_observables": ("observable", "create_drift_observables"),
     "create_rate_metric": ("observable", "create_rate_metric"),
     # Framework invariant enforcement — see broker/INVARIANTS.md Invariant 2.
     "detect_audit_sentinels": ("audit", "detect_audit_sentinels"),
     "detect_audit_sentinels_in_csv": ("audit", "detect_audit_sentinels_in_csv"),
+    "iter_jsonl_traces": ("trace_store", "iter_jsonl_traces"),
 }
 
 __all__ = list(_EXPORT_MAP)
@@ -7,6 +7,7 @@ import threading
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Iterable, Tuple
 from broker.utils.logging import setup_logger
+from broker.components.analytics.trace_store import TRACE_STORAGE_MODES, TraceEncoder, iter_jsonl_traces
 
 logger = setup_logger(__name__)
 
@@ -155,6 +156,7 @@ class AuditConfig:
     experiment_name: str = "simulation"
     log_level: str = "full"  # full, summary, errors_only
     clear_existing_traces: bool = True
+    trace_storage: str = "full"  # full, compact (see trace_store)
 
 
 _CONSTRUCT_SUFFIXES = ("_LABEL", "_UTIL", "_GAP", "_IMPACT", "_APPETITE")
@@ -196,6 +198,19 @@ def trace_to_csv_row(t: Dict[str, Any]) -> Dict[str, Any]:
     row["response_tokens"] = llm_stats.get("response_tokens", 0)
     row["num_ctx"] = llm_stats.get("num_ctx", 0)
     row["context_utilization"] = llm_stats.get("context_utilization", 0.0)
+    prompt_budget = t.get("prompt_budget") or {}
+    row["prompt_token_count"] = prompt_budget.get("prompt_tokens", 0)
+    row["prompt_tiers_trimmed"] = sum((prompt_budget.get("trimmed") or {}).values())
+    if t.get("preflight_pruned"):
+        row["preflight_pruned"] = "|".join(sorted(t["preflight_pruned"]))
+    speculative = llm_stats.get("speculative") or {}
+    # Draft (or template prefix) used: accepted + completed
+    row["draft_accepted"] = speculative.get("accepted", 0) + speculative.get("completed", 0)
+    row["draft_rejected"] = speculative.get("rejected", 0)
+    row["draft_ignored"] = speculative.get("ignored", 0)
+    row["draft_fallback"] = speculative.get("fallback", 0)
+    row["draft_ms"] = speculative.get("draft_ms", 0.0)
+    row["draft_tokens"] = speculative.get("draft_prompt_tokens", 0) + speculative.get("draft_response_tokens", 0)
 
     # 1.6. Structural fault tracking (format/parsing issues fixed by retry)
     row["format_retries"] = t.get("format_retries", 0)
@@ -413,6 +428,10 @@ class GenericAuditWriter:
     """
     
     def __init__(self, config: AuditConfig):
+        if config.trace_storage not in TRACE_STORAGE_MODES:
+            raise ValueError(
+                f"trace_storage must be one of {TRACE_STORAGE_MODES}, got {config.trace_storage!r}"
+            )
         self.config = config
         self.output_dir = Path(config.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -460,6 +479,8 @@ class GenericAuditWriter:
         self._jsonl_buffer: Dict[str, List[str]] = {}
         self._jsonl_buffer_size = 1  # Flush every trace for real-time observability
         self._write_lock = threading.Lock()  # Thread safety for workers > 1
+        # Compact storage: one encoder per trace file (blobs + memory deltas)
+        self._trace_encoders: Dict[str, TraceEncoder] = {}
 
         # Track which aggregate dict keys have been observed across all traces
         # so we can emit a one-time WARNING at first-trace time if any are
@@ -474,6 +495,10 @@ class GenericAuditWriter:
         }
         self._startup_warned: bool = False
 
+        # Optional live readiness metrics (ReadinessTracker); fed every
+        # trace as it is written. Attached by the experiment builder.
+        self.readiness_tracker = None
+
     def _get_file_path(self, agent_type: str) -> Path:
         """Get or create file path for agent type (JSONL traces in raw/ subdir)."""
         if agent_type not in self._files:
@@ -630,7 +655,9 @@ class GenericAuditWriter:
         raw = trace.get('raw_output')
         if isinstance(raw, str) and len(raw) > 500:
             jsonl_trace = {**trace, 'raw_output': raw[:500] + '...[truncated]'}
-        json_line = json.dumps(jsonl_trace, ensure_ascii=False, default=str) + '\n'
+        compact = self.config.trace_storage == "compact"
+        if not compact:
+            json_line = json.dumps(jsonl_trace, ensure_ascii=False, default=str) + '\n'
         
         with self._write_lock:
             if agent_type not in self._jsonl_buffer:
@@ -639,10 +666,23 @@ class GenericAuditWriter:
                     "_metadata": dict(self._run_metadata),
                     "agent_type": agent_type,
                 }
+                if compact:
+                    metadata_record["trace_storage"] = "compact"
                 metadata_line = json.dumps(
                     metadata_record, ensure_ascii=False, default=str
                 ) + '\n'
                 self._jsonl_buffer[agent_type].append(metadata_line)
+            if compact:
+                # Encoded under the lock: blob/delta state must follow file order
+                encoder = self._trace_encoders.get(agent_type)
+                if encoder is None:
+                    encoder = self._trace_encoders[agent_type] = TraceEncoder()
+                jsonl_trace, blobs = encoder.encode(jsonl_trace)
+                for blob in blobs:
+                    self._jsonl_buffer[agent_type].append(
+                        json.dumps(blob, ensure_ascii=False, default=str) + '\n'
+                    )
+                json_line = json.dumps(jsonl_trace, ensure_ascii=False, default=str) + '\n'
             self._jsonl_buffer[agent_type].append(json_line)
 
             # Flush buffer when threshold reached
@@ -653,7 +693,30 @@ class GenericAuditWriter:
             if agent_type not in self._trace_buffer:
                 self._trace_buffer[agent_type] = []
             self._trace_buffer[agent_type].append(trace)
+
+            tracker = getattr(self, "readiness_tracker", None)
+            if tracker is not None:
+                tracker.observe_trace(
+                    trace, self.summary["validator_health"]
+                )
     
+    def reload_trace_buffer(self) -> None:
+        """Rebuild the CSV trace buffer from the raw JSONL files.
+
+        Checkpoints leave the buffer out; a resumed run refills it from the
+        traces already on disk. Those carry ``raw_output`` truncated to 500
+        characters, as in the JSONL.
+        """
+        buffer: Dict[str, List[Dict[str, Any]]] = {}
+        raw_dir = self.output_dir / "raw"
+        for path in sorted(raw_dir.glob("*_traces.jsonl")) if raw_dir.exists() else []:
+            agent_type = path.name[:-len("_traces.jsonl")]
+            traces = [t for t in iter_jsonl_traces(path) if "_metadata" not in t]
+            if traces:
+                buffer[agent_type] = traces
+        with self._write_lock:
+            self._trace_buffer = buffer
+
     def finalize(self) -> Dict[str, Any]:
         """Write summary and export CSVs."""
         self.summary["finalized_at"] = datetime.now().isoformat()
@@ -664,6 +727,12 @@ class GenericAuditWriter:
                 file_path = self._get_file_path(agent_type)
                 self._flush_jsonl_buffer(agent_type, file_path)
         
+        tracker = getattr(self, "readiness_tracker", None)
+        if tracker is not None:
+            if tracker.should_stop:
+                self.summary["readiness_early_stop"] = tracker.stop_reason
+            tracker.write_snapshot()
+
         # Export summary JSON
         summary_path = self.output_dir / "audit_summary.json"
         with open(summary_path, 'w', encoding='utf-8') as f:
@@ -778,7 +847,10 @@ class GenericAuditWriter:
                     # like real activity). Pick loss — same v0.88.15
                     # lesson family as F1 / F3 in this patch:
                     # detectable data loss > undetectable corruption.
-                    lost = len(self._jsonl_buffer[agent_type])
+                    lost = sum(
+                        1 for line in self._jsonl_buffer[agent_type]
+                        if not line.startswith('{"_blob"')
+                    )
                     logger.error(
                         f" [AuditWriter:Error] Final failure flushing "
                         f"{lost} events to {file_path}: {e}. Discarding "
@@ -788,6 +860,10 @@ class GenericAuditWriter:
                         exc_info=True,
                     )
                     self._jsonl_buffer[agent_type] = []
+                    # Dropped blobs/keyframes: start the compact file over
+                    encoder = getattr(self, "_trace_encoders", {}).get(agent_type)
+                    if encoder is not None:
+                        encoder.reset()
                     self.summary["jsonl_events_lost"] = (
                         self.summary.get("jsonl_events_lost", 0) + lost
                     )
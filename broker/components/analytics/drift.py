@@ -16,8 +16,9 @@ Literature: AgentSociety (Piao et al., 2025) — population behavior monitoring
 from __future__ import annotations
 
 import math
+from collections import Counter, deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Deque, Dict, List, Optional, Set
 
 
 @dataclass
@@ -99,10 +100,19 @@ class DriftDetector:
         self.history_window = history_window
         self.jaccard_stagnation_threshold = jaccard_stagnation_threshold
 
-        # State: agent_id -> list of recent decisions
-        self._agent_history: Dict[str, List[str]] = {}
+        # State: agent_id -> ring buffer of recent decisions
+        self._agent_history: Dict[str, Deque[str]] = {}
         # Previous window set per agent (for Jaccard)
         self._agent_prev_set: Dict[str, Set[str]] = {}
+        # Running population counters, updated on every record
+        self._latest: Dict[str, str] = {}
+        self._decision_counts: Counter = Counter()
+        # Cached per-agent Jaccard results and the set of stagnant agents
+        self._agent_jaccard: Dict[str, float] = {}
+        self._stagnant: Set[str] = set()
+        # Agents whose Jaccard must be recomputed at the next snapshot:
+        # new decisions since the last one, or a prior set that changed.
+        self._dirty: Set[str] = set()
         self._reports: List[DriftReport] = []
 
     # ------------------------------------------------------------------
@@ -111,11 +121,20 @@ class DriftDetector:
 
     def record_decision(self, agent_id: str, decision: str) -> None:
         """Record a single agent's decision for the current step."""
-        history = self._agent_history.setdefault(agent_id, [])
+        history = self._agent_history.get(agent_id)
+        if history is None:
+            history = deque(maxlen=self.history_window * 2 or None)
+            self._agent_history[agent_id] = history
         history.append(decision)
-        # Trim to window size
-        if len(history) > self.history_window * 2:
-            self._agent_history[agent_id] = history[-self.history_window * 2:]
+
+        previous = self._latest.get(agent_id)
+        if previous is not None:
+            self._decision_counts[previous] -= 1
+            if not self._decision_counts[previous]:
+                del self._decision_counts[previous]
+        self._latest[agent_id] = decision
+        self._decision_counts[decision] += 1
+        self._dirty.add(agent_id)
 
     def record_decisions(self, decisions: Dict[str, str]) -> None:
         """Record decisions for multiple agents at once.
@@ -133,22 +152,17 @@ class DriftDetector:
     def compute_snapshot(self, step: int, include_agents: bool = False) -> DriftReport:
         """Compute population-level drift metrics for the current step.
 
+        Entropy and the dominant action come from the running decision
+        counts, and Jaccard similarity is only recomputed for agents
+        whose history or prior window changed since the last snapshot,
+        so the cost scales with the number of changed agents.
+
         Args:
             step: Current simulation step
             include_agents: Whether to include per-agent reports
         """
-        # Collect latest decision per agent
-        latest: Dict[str, str] = {}
-        for agent_id, history in self._agent_history.items():
-            if history:
-                latest[agent_id] = history[-1]
-
-        # Decision distribution
-        counts: Dict[str, int] = {}
-        for decision in latest.values():
-            counts[decision] = counts.get(decision, 0) + 1
-
-        total = len(latest)
+        counts = self._decision_counts
+        total = len(self._latest)
         if total == 0:
             report = DriftReport(
                 step=step, decision_entropy=0.0,
@@ -166,46 +180,28 @@ class DriftDetector:
                 entropy -= p * math.log2(p)
 
         # Dominant action
-        dominant_action = max(counts, key=counts.get)  # type: ignore[arg-type]
+        dominant_action = self._dominant_action()
         dominant_pct = counts[dominant_action] / total
 
-        # Per-agent stagnation (Jaccard similarity)
+        # Per-agent stagnation (Jaccard similarity), changed agents only
+        pending, self._dirty = self._dirty, set()
+        for agent_id in pending:
+            self._update_agent_jaccard(agent_id)
+
+        stagnation_rate = len(self._stagnant) / total
+
         agent_reports: List[AgentDriftReport] = []
-        stagnant_count = 0
-        for agent_id, history in self._agent_history.items():
-            if len(history) < 2:
-                continue
-
-            # Split into recent half and prior half
-            mid = len(history) // 2
-            recent_set = set(history[mid:])
-            prior_set = self._agent_prev_set.get(agent_id, set(history[:mid]))
-
-            # Jaccard similarity
-            if recent_set or prior_set:
-                intersection = len(recent_set & prior_set)
-                union = len(recent_set | prior_set)
-                jaccard = intersection / union if union > 0 else 0.0
-            else:
-                jaccard = 1.0
-
-            is_stagnant = jaccard >= self.jaccard_stagnation_threshold
-            if is_stagnant:
-                stagnant_count += 1
-
-            # Update prior set for next comparison
-            self._agent_prev_set[agent_id] = recent_set
-
-            if include_agents:
+        if include_agents:
+            for agent_id, history in self._agent_history.items():
+                if agent_id not in self._agent_jaccard:
+                    continue
                 agent_reports.append(AgentDriftReport(
                     agent_id=agent_id,
-                    jaccard_similarity=jaccard,
-                    decision_history=list(history[-self.history_window:]),
-                    is_stagnant=is_stagnant,
+                    jaccard_similarity=self._agent_jaccard[agent_id],
+                    decision_history=list(history)[-self.history_window:],
+                    is_stagnant=agent_id in self._stagnant,
                 ))
 
-        stagnation_rate = stagnant_count / total if total > 0 else 0.0
-
         report = DriftReport(
             step=step,
             decision_entropy=entropy,
@@ -217,6 +213,54 @@ class DriftDetector:
         self._reports.append(report)
         return report
 
+    def _update_agent_jaccard(self, agent_id: str) -> None:
+        """Recompute one agent's Jaccard similarity and stagnation flag."""
+        history = self._agent_history[agent_id]
+        if len(history) < 2:
+            return
+
+        # Split into recent half and prior half
+        mid = len(history) // 2
+        window = list(history)
+        recent_set = set(window[mid:])
+        prior_set = self._agent_prev_set.get(agent_id, set(window[:mid]))
+
+        # Jaccard similarity
+        if recent_set or prior_set:
+            intersection = len(recent_set & prior_set)
+            union = len(recent_set | prior_set)
+            jaccard = intersection / union if union > 0 else 0.0
+        else:
+            jaccard = 1.0
+
+        self._agent_jaccard[agent_id] = jaccard
+        if jaccard >= self.jaccard_stagnation_threshold:
+            self._stagnant.add(agent_id)
+        else:
+            self._stagnant.discard(agent_id)
+
+        # Update prior set for next comparison; if it moved, the next
+        # snapshot compares against it even without new decisions.
+        if prior_set != recent_set:
+            self._dirty.add(agent_id)
+        self._agent_prev_set[agent_id] = recent_set
+
+    def _dominant_action(self) -> str:
+        """Most common latest decision.
+
+        Ties go to the action whose holder was recorded first, matching a
+        count table built in agent order; only a tie needs that scan.
+        """
+        counts = self._decision_counts
+        top = max(counts.values())
+        tied = {action for action, count in counts.items() if count == top}
+        if len(tied) == 1:
+            return next(iter(tied))
+        for decision in self._latest.values():
+            if decision in tied:
+                return decision
+        return next(iter(tied))  # pragma: no cover - counts mirror _latest
+
     def check_alerts(self, report: DriftReport) -> List[DriftAlert]:
         """Check a DriftReport against thresholds and return any alerts."""
         alerts: List[DriftAlert] = []
@@ -263,4 +307,9 @@ class DriftDetector:
         """Clear all recorded history and reports."""
         self._agent_history.clear()
         self._agent_prev_set.clear()
+        self._latest.clear()
+        self._decision_counts.clear()
+        self._agent_jaccard.clear()
+        self._stagnant.clear()
+        self._dirty.clear()
         self._reports.clear()
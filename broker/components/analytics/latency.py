@@ -0,0 +1,214 @@
+"""Per-stage latency instrumentation for the skill broker.
+
+`StageProfiler` times the stages of `SkillBrokerEngine.process_step`
+(context build, skill retrieval, prompt formatting, LLM calls, parsing,
+each validator, the governance retry loop, execution, audit write)
+with `time.perf_counter()` and aggregates them per agent type into
+log-bucketed histograms, so memory stays constant however long the run
+and percentiles are accurate to about 2%.
+
+Stages nest: ``governance_retry`` includes the ``llm``, ``parse`` and
+``validation`` time of its retries, and ``validation`` includes every
+``validator:<name>``. A stage entered several times in one step (e.g.
+``llm`` across format and governance retries) counts once with the
+summed duration. ``framework`` is step ``total`` minus ``llm``.
+
+Timing is per thread, so broker workers running agents concurrently do
+not mix their stages.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+PERFORMANCE_SUMMARY_FILE = "performance_summary.json"
+
+# Bucket i covers [MIN_S * GROWTH**i, MIN_S * GROWTH**(i+1)).
+_MIN_S = 1e-6
+_GROWTH = 1.04
+_LOG_GROWTH = math.log(_GROWTH)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (seconds)."""
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        idx = int(math.log(seconds / _MIN_S) / _LOG_GROWTH) if seconds > _MIN_S else 0
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for idx, n in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Approximate ``q``-th percentile (0-100), clamped to [min, max]."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100.0 * self.count))
+        if rank >= self.count:
+            return self.max
+        seen = 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= rank:
+                # Geometric midpoint of the bucket
+                value = _MIN_S * _GROWTH ** (idx + 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        ms = 1000.0
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 6),
+            "mean_ms": round(self.total / self.count * ms, 4) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * ms, 4),
+            "p95_ms": round(self.percentile(95) * ms, 4),
+            "p99_ms": round(self.percentile(99) * ms, 4),
+            "min_ms": round(self.min * ms, 4) if self.count else 0.0,
+            "max_ms": round(self.max * ms, 4),
+        }
+
+
+class StepTiming:
+    """Stage durations (seconds) of one ``process_step`` call."""
+
+    __slots__ = ("agent_type", "stages", "start")
+
+    def __init__(self, agent_type: str):
+        self.agent_type = agent_type
+        self.stages: Dict[str, float] = {}
+        self.start = time.perf_counter()
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def to_ms(self) -> Dict[str, float]:
+        return {name: round(s * 1000.0, 3) for name, s in self.stages.items()}
+
+
+class StageProfiler:
+    """Always-on stage timers aggregated per agent type.
+
+    Args:
+        enabled: When False every call is a no-op.
+        include_in_trace: Ask the audit writer to add the step's stage
+            timings (ms) to each trace as ``stage_timings_ms``.
+    """
+
+    def __init__(self, enabled: bool = True, include_in_trace: bool = False):
+        self.enabled = enabled
+        self.include_in_trace = include_in_trace
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hist: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    # ---------- step lifecycle ----------
+
+    def begin_step(self, agent_type: str) -> Optional[StepTiming]:
+        if not self.enabled:
+            return None
+        timing = StepTiming(agent_type)
+        self._local.timing = timing
+        return timing
+
+    def end_step(self) -> Optional[StepTiming]:
+        """Close the current thread's step and fold it into the histograms."""
+        timing: Optional[StepTiming] = getattr(self._local, "timing", None)
+        if timing is None:
+            return None
+        self._local.timing = None
+        total = time.perf_counter() - timing.start
+        llm = timing.stages.get("llm", 0.0)
+        with self._lock:
+            per_type = self._hist.setdefault(timing.agent_type, {})
+            for name, seconds in timing.stages.items():
+                self._hist_for(per_type, name).record(seconds)
+            self._hist_for(per_type, "total").record(total)
+            self._hist_for(per_type, "framework").record(max(0.0, total - llm))
+        return timing
+
+    @staticmethod
+    def _hist_for(per_type: Dict[str, LatencyHistogram], name: str) -> LatencyHistogram:
+        hist = per_type.get(name)
+        if hist is None:
+            hist = per_type[name] = LatencyHistogram()
+        return hist
+
+    def current(self) -> Optional[StepTiming]:
+        return getattr(self._local, "timing", None)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block as ``name`` within the current step (no-op outside one)."""
+        timing = getattr(self._local, "timing", None)
+        if timing is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timing.add(name, time.perf_counter() - start)
+
+    # ---------- reporting ----------
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-agent-type and overall stage statistics (ms) plus LLM share."""
+        with self._lock:
+            overall: Dict[str, LatencyHistogram] = {}
+            by_type: Dict[str, Dict[str, Any]] = {}
+            for agent_type, stages in sorted(self._hist.items()):
+                by_type[agent_type] = {n: h.to_dict() for n, h in sorted(stages.items())}
+                for name, hist in stages.items():
+                    self._hist_for(overall, name).merge(hist)
+
+        total_s = overall["total"].total if "total" in overall else 0.0
+        llm_s = overall["llm"].total if "llm" in overall else 0.0
+        return {
+            "n_steps": overall["total"].count if "total" in overall else 0,
+            "llm_time_s": round(llm_s, 6),
+            "framework_time_s": round(max(0.0, total_s - llm_s), 6),
+            "llm_share": round(llm_s / total_s, 4) if total_s else 0.0,
+            "stages": {n: h.to_dict() for n, h in sorted(overall.items())},
+            "by_agent_type": by_type,
+        }
+
+    def write_summary(self, output_dir: Union[str, Path]) -> Path:
+        """Atomically write ``performance_summary.json`` into ``output_dir``."""
+        path = Path(output_dir) / PERFORMANCE_SUMMARY_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hist.clear()
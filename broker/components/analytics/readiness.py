@@ -0,0 +1,486 @@
+"""Readiness metrics — shared accumulator for live and post-hoc audits.
+
+`ReadinessTracker` folds audit rows into the readiness metrics one row
+at a time (approval rate, retry distribution, action coverage,
+terminal-taxonomy counts) and reads validator firing / dead rules from
+the audit writer's `validator_health` summary. The same accumulator
+backs two consumers:
+
+- `broker.tools.readiness_report` streams a finished run's audit CSV
+  through it (post-hoc report).
+- `GenericAuditWriter` feeds it every trace as it is written when a
+  tracker is attached, so a long run can be watched via a small
+  ``readiness_live.json`` snapshot rewritten every N decisions and,
+  optionally, stopped at the next year boundary once a profile
+  threshold is clearly breached.
+
+"Clearly breached" is deliberately conservative: only the proportion
+metrics (approval rate, terminal rate) are checked, only after
+``min_decisions`` decisions, and only when the Wilson score interval
+for the observed proportion lies entirely on the failing side of the
+threshold. Coverage / diversity / dead-validator thresholds can still
+recover late in a run and never trigger an early stop.
+
+Domain-agnostic: reads only generic audit columns.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from broker.components.analytics.terminal_taxonomy import (
+    TERMINAL_CATEGORIES,
+    classify_terminal,
+)
+from broker.components.validation.readiness_profile import ReadinessProfile
+from broker.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+#: Default snapshot file name (written next to the audit data).
+LIVE_SNAPSHOT_FILE = "readiness_live.json"
+
+
+# ---------------------------------------------------------------------------
+# Result dataclasses
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ReadinessMetrics:
+    """Numeric metrics extracted from a results directory.
+
+    Every metric is optional — when an input file is missing the
+    relevant field stays `None` and the threshold check on it is
+    skipped (caller treats as "not enforced").
+    """
+
+    total_traces: Optional[int] = None
+    approved_count: Optional[int] = None
+    # 6O-C-1 round-1 rename: was `parse_success_rate`, but the computation
+    # was always `approved / total`. The actual parse-quality signal lives
+    # in the `parser_failure` terminal-taxonomy bucket. Use that for a
+    # separate `parse_success_rate` metric in 6O-C-2.
+    approval_rate: Optional[float] = None
+    format_retry_rate: Optional[float] = None
+    terminal_rate: Optional[float] = None
+    terminal_taxonomy: Dict[str, int] = field(default_factory=dict)
+    action_coverage: Optional[int] = None
+    distinct_actions: List[str] = field(default_factory=list)
+    validator_firing_diversity: Optional[int] = None
+    dead_validators: List[str] = field(default_factory=list)
+    #: Governance retry_count -> number of decisions (keys are strings so
+    #: the dict round-trips through JSON unchanged).
+    retry_distribution: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class ThresholdCheck:
+    """One pass/fail check derived from comparing metric to threshold."""
+
+    metric_name: str
+    threshold: Any  # numeric bound or bool flag
+    observed: Any
+    passed: bool
+    detail: str
+
+
+# ---------------------------------------------------------------------------
+# Validator health helpers
+# ---------------------------------------------------------------------------
+
+
+def _firing(stat: Any) -> bool:
+    """Validator-health entry counts as "firing" if it logged at least one
+    hit (errors > 0 or warnings > 0). `fire_count` is the key written by
+    `GenericAuditWriter`; the others are accepted for older summaries.
+    """
+    if not isinstance(stat, dict):
+        return False
+    return any(
+        int(stat.get(key, 0) or 0) > 0
+        for key in ("fire_count", "error_count", "warn_count", "hit_count")
+    )
+
+
+def _is_dead(stat: Any) -> bool:
+    """Validator-health entry counts as "dead" if it has zero fires AND
+    is explicitly listed as registered (registered_count > 0 or just
+    present in validator_health).
+    """
+    return not _firing(stat)
+
+
+# ---------------------------------------------------------------------------
+# Threshold evaluation
+# ---------------------------------------------------------------------------
+
+
+def evaluate_profile(
+    metrics: ReadinessMetrics,
+    profile: ReadinessProfile,
+) -> List[ThresholdCheck]:
+    """Compare metrics to each profile threshold, return per-metric checks."""
+    checks: List[ThresholdCheck] = []
+    thr = profile.thresholds
+
+    if thr.min_approval_rate is not None:
+        observed = metrics.approval_rate
+        passed = observed is not None and observed >= thr.min_approval_rate
+        checks.append(
+            ThresholdCheck(
+                metric_name="approval_rate",
+                threshold=thr.min_approval_rate,
+                observed=observed,
+                passed=passed,
+                detail=_explain("approval_rate", observed, thr.min_approval_rate, "min"),
+            )
+        )
+
+    if thr.max_format_retry_rate is not None:
+        observed = metrics.format_retry_rate
+        passed = observed is None or observed <= thr.max_format_retry_rate
+        checks.append(
+            ThresholdCheck(
+                metric_name="format_retry_rate",
+                threshold=thr.max_format_retry_rate,
+                observed=observed,
+                passed=passed,
+                detail=_explain("format_retry_rate", observed, thr.max_format_retry_rate, "max"),
+            )
+        )
+
+    if thr.max_terminal_rate is not None:
+        observed = metrics.terminal_rate
+        passed = observed is None or observed <= thr.max_terminal_rate
+        checks.append(
+            ThresholdCheck(
+                metric_name="terminal_rate",
+                threshold=thr.max_terminal_rate,
+                observed=observed,
+                passed=passed,
+                detail=_explain("terminal_rate", observed, thr.max_terminal_rate, "max"),
+            )
+        )
+
+    if thr.min_action_coverage is not None:
+        observed = metrics.action_coverage
+        passed = observed is not None and observed >= thr.min_action_coverage
+        checks.append(
+            ThresholdCheck(
+                metric_name="action_coverage",
+                threshold=thr.min_action_coverage,
+                observed=observed,
+                passed=passed,
+                detail=_explain("action_coverage", observed, thr.min_action_coverage, "min"),
+            )
+        )
+
+    if thr.min_validator_firing_diversity is not None:
+        observed = metrics.validator_firing_diversity
+        passed = observed is not None and observed >= thr.min_validator_firing_diversity
+        checks.append(
+            ThresholdCheck(
+                metric_name="validator_firing_diversity",
+                threshold=thr.min_validator_firing_diversity,
+                observed=observed,
+                passed=passed,
+                detail=_explain(
+                    "validator_firing_diversity",
+                    observed,
+                    thr.min_validator_firing_diversity,
+                    "min",
+                ),
+            )
+        )
+
+    # W4 fix (6O-C-1 round-1): required_metrics declared in the profile
+    # MUST be present in the report; FAIL if any is None / missing.
+    for metric_name in profile.required_metrics:
+        observed: Any = getattr(metrics, metric_name, None)
+        is_dict = isinstance(observed, dict)
+        present = bool(observed) if not is_dict else any(v for v in observed.values())
+        checks.append(
+            ThresholdCheck(
+                metric_name=f"required:{metric_name}",
+                threshold="present",
+                observed=observed,
+                passed=present,
+                detail=(
+                    f"required metric {metric_name!r} present"
+                    if present
+                    else f"required metric {metric_name!r} missing or empty"
+                ),
+            )
+        )
+
+    if thr.max_dead_validators is not None:
+        dead_count = len(metrics.dead_validators)
+        passed = dead_count <= thr.max_dead_validators
+        checks.append(
+            ThresholdCheck(
+                metric_name="dead_validators",
+                threshold=thr.max_dead_validators,
+                observed=dead_count,
+                passed=passed,
+                detail=(
+                    f"dead validators: {dead_count} <= {thr.max_dead_validators}"
+                    if passed
+                    else f"{dead_count} dead validator(s) > {thr.max_dead_validators} allowed: {', '.join(metrics.dead_validators[:5])}"
+                ),
+            )
+        )
+
+    return checks
+
+
+def _explain(name: str, observed: Any, threshold: Any, direction: str) -> str:
+    if observed is None:
+        return f"{name}: no data (degraded)"
+    op = ">=" if direction == "min" else "<="
+    return f"{name}: observed={observed} {op} threshold={threshold}"
+
+
+def _wilson_interval(successes: int, n: int, z: float) -> tuple:
+    """Wilson score interval for a binomial proportion."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+# ---------------------------------------------------------------------------
+# Incremental accumulator
+# ---------------------------------------------------------------------------
+
+
+class ReadinessTracker:
+    """Incremental readiness metrics over a stream of audit rows.
+
+    Args:
+        profile: Readiness profile used for snapshot checks and early
+            stopping. ``None`` tracks metrics only.
+        snapshot_path: File rewritten (atomically) every
+            ``snapshot_every`` decisions. ``None`` disables snapshots.
+        snapshot_every: Decisions between snapshot writes.
+        early_stop: Flag the run for stopping once a proportion
+            threshold is clearly breached (see module docstring).
+        min_decisions: Decisions required before early stopping is
+            considered.
+        confidence_z: z-score of the Wilson interval used for the
+            "clearly breached" test (default: 99% two-sided).
+
+    Usage:
+        tracker = ReadinessTracker(profile, snapshot_path=out / LIVE_SNAPSHOT_FILE)
+        audit_writer.readiness_tracker = tracker
+        ...
+        if tracker.should_stop:
+            ...
+    """
+
+    def __init__(
+        self,
+        profile: Optional[ReadinessProfile] = None,
+        snapshot_path: Optional[str | Path] = None,
+        snapshot_every: int = 50,
+        early_stop: bool = False,
+        min_decisions: int = 100,
+        confidence_z: float = 2.576,
+    ):
+        if snapshot_every < 1:
+            raise ValueError(f"snapshot_every must be >= 1, got {snapshot_every}")
+        self.profile = profile
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_every = snapshot_every
+        self.early_stop = early_stop
+        self.min_decisions = min_decisions
+        self.confidence_z = confidence_z
+
+        self.n_decisions = 0
+        self.approved = 0
+        self.format_retries = 0
+        self.retry_counts: Counter = Counter()
+        self.taxonomy: Counter = Counter()
+        self.actions: set = set()
+        self.validator_health: Optional[Dict[str, Any]] = None
+        self.stop_reason: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Feeding
+    # ------------------------------------------------------------------
+
+    def observe(
+        self,
+        row: Dict[str, Any],
+        validator_health: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Fold one audit row (CSV row shape) into the metrics.
+
+        ``validator_health`` is the audit writer's running summary; it
+        is kept by reference, so passing it once is enough.
+        """
+        self.n_decisions += 1
+        if str(row.get("status") or "").upper() == "APPROVED":
+            self.approved += 1
+        skill = row.get("final_skill")
+        if skill:
+            self.actions.add(str(skill))
+        self.retry_counts[str(_as_count(row.get("retry_count")))] += 1
+        self.format_retries += _as_count(row.get("format_retries"))
+        self.taxonomy[classify_terminal(row)] += 1
+        if validator_health is not None:
+            self.validator_health = validator_health
+
+        if self.n_decisions % self.snapshot_every == 0:
+            if self.early_stop and self.stop_reason is None:
+                self._check_early_stop()
+            if self.snapshot_path is not None:
+                self.write_snapshot()
+
+    def observe_trace(
+        self,
+        trace: Dict[str, Any],
+        validator_health: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Fold one live audit trace (JSONL shape) into the metrics."""
+        approved_skill = trace.get("approved_skill") or {}
+        self.observe(
+            {
+                "status": approved_skill.get("status", "UNKNOWN"),
+                "final_skill": approved_skill.get("skill_name"),
+                "retry_count": trace.get("retry_count", 0),
+                "format_retries": trace.get("format_retries", 0),
+                "execution_error": trace.get("execution_error"),
+                "validation_issues": trace.get("validation_issues"),
+            },
+            validator_health,
+        )
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def metrics(
+        self,
+        total_traces: Optional[int] = None,
+        total_format_retries: Optional[int] = None,
+    ) -> ReadinessMetrics:
+        """Current metrics.
+
+        ``total_traces`` / ``total_format_retries`` override the counted
+        values (the post-hoc report takes them from audit_summary.json).
+        """
+        m = ReadinessMetrics()
+        total = total_traces if total_traces else self.n_decisions
+        if self.n_decisions:
+            m.total_traces = total
+            m.approved_count = self.approved
+            m.approval_rate = round(self.approved / total, 4)
+            m.distinct_actions = sorted(self.actions)
+            m.action_coverage = len(m.distinct_actions)
+            m.retry_distribution = {
+                k: self.retry_counts[k] for k in sorted(self.retry_counts, key=int)
+            }
+        elif total_traces:
+            m.total_traces = total_traces
+
+        if m.total_traces:
+            fr = self.format_retries if total_format_retries is None else total_format_retries
+            m.format_retry_rate = round(max(0.0, float(fr)) / m.total_traces, 4)
+
+        if isinstance(self.validator_health, dict):
+            health = self.validator_health
+            m.validator_firing_diversity = sum(1 for s in health.values() if _firing(s))
+            m.dead_validators = sorted(rid for rid, s in health.items() if _is_dead(s))
+
+        m.terminal_taxonomy = dict.fromkeys(TERMINAL_CATEGORIES, 0)
+        m.terminal_taxonomy.update(self.taxonomy)
+        classified = sum(self.taxonomy.values())
+        if classified:
+            m.terminal_rate = round(
+                (classified - self._non_terminal()) / classified, 4
+            )
+        return m
+
+    def _non_terminal(self) -> int:
+        return self.taxonomy.get("approved", 0) + self.taxonomy.get("retry_recovered", 0)
+
+    @property
+    def should_stop(self) -> bool:
+        """True once early stopping flagged a clear threshold breach."""
+        return self.stop_reason is not None
+
+    def _check_early_stop(self) -> None:
+        if self.profile is None or self.n_decisions < self.min_decisions:
+            return
+        thr = self.profile.thresholds
+        n, z = self.n_decisions, self.confidence_z
+        if thr.min_approval_rate is not None:
+            _, upper = _wilson_interval(self.approved, n, z)
+            if upper < thr.min_approval_rate:
+                self.stop_reason = (
+                    f"approval_rate {self.approved / n:.3f} over {n} decisions "
+                    f"(upper bound {upper:.3f}) < min {thr.min_approval_rate}"
+                )
+        if self.stop_reason is None and thr.max_terminal_rate is not None:
+            classified = sum(self.taxonomy.values())
+            terminal = classified - self._non_terminal()
+            lower, _ = _wilson_interval(terminal, classified, z)
+            if classified and lower > thr.max_terminal_rate:
+                self.stop_reason = (
+                    f"terminal_rate {terminal / classified:.3f} over {classified} "
+                    f"decisions (lower bound {lower:.3f}) > max {thr.max_terminal_rate}"
+                )
+        if self.stop_reason is not None:
+            logger.warning(
+                f"[Readiness] Profile '{self.profile.name}' clearly breached: "
+                f"{self.stop_reason}; requesting early stop"
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable view of the current metrics and checks."""
+        metrics = self.metrics()
+        data: Dict[str, Any] = {
+            "updated_at": datetime.now().isoformat(),
+            "n_decisions": self.n_decisions,
+            "metrics": asdict(metrics),
+            "early_stop": self.early_stop,
+            "stop_reason": self.stop_reason,
+        }
+        if self.profile is not None:
+            checks = evaluate_profile(metrics, self.profile)
+            data["profile_name"] = self.profile.name
+            data["checks"] = [asdict(c) for c in checks]
+            data["passing"] = all(c.passed for c in checks) if checks else True
+        return data
+
+    def write_snapshot(self) -> None:
+        """Atomically rewrite the snapshot file (temp file + rename)."""
+        if self.snapshot_path is None:
+            return
+        path = self.snapshot_path
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, indent=2, default=str)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"[Readiness] Could not write snapshot {path}: {e}")
+
+
+def _as_count(value: Any) -> int:
+    """Tolerant non-negative int coerce — CSV reads return strings."""
+    try:
+        return max(0, int(float(value)))
+    except (TypeError, ValueError):
+        return 0
@@ -0,0 +1,272 @@
+"""Content-addressed, delta-encoded storage for raw audit traces.
+
+In ``compact`` trace storage (``AuditConfig(trace_storage="compact")``)
+each ``raw/<agent_type>_traces.jsonl`` holds two kinds of records after
+the metadata header:
+
+* blob records ``{"_blob": <hash>, "v": <value>}``, written once per
+  distinct prompt section, memory item or state dict, always before the
+  first trace that references them;
+* trace records flagged ``"_compact": 1`` whose bulky fields are
+  replaced by references:
+
+  - ``input``: ``{"$sections": [hash, ...]}`` — the prompt split on
+    blank lines, so shared instruction and persona blocks are stored once;
+  - ``memory_pre`` and ``memory_audit.memories``: ``{"$list": [hash, ...]}``;
+  - ``memory_post``: ``{"$delta": ops, "base": digest}`` against the same
+    agent's previous ``memory_post``, where each op is either a
+    ``[start, length]`` run copied from that list or the hash of a new
+    item. Every ``KEYFRAME_INTERVAL``-th snapshot per agent is written
+    whole as ``{"$list": ...}``;
+  - ``state_before`` / ``environment_context``: ``{"$blob": hash}``;
+  - ``state_after``: ``{"$patch": {"set": {...}, "unset": [...]}}``
+    against ``state_before``.
+
+Every other field is written unchanged. `TraceDecoder` reverses the
+encoding record by record and `iter_jsonl_traces` reads a whole file,
+so readers see full traces whichever storage mode wrote it.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+TRACE_STORAGE_MODES = ("full", "compact")
+KEYFRAME_INTERVAL = 20
+SECTION_SEPARATOR = "\n\n"
+
+_BLOB_KEY = "_blob"
+_COMPACT_FLAG = "_compact"
+_HASH_BYTES = 10
+
+
+class TraceDecodeError(ValueError):
+    """A compact trace references a blob or delta base that is not available."""
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(
+        value, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":")
+    )
+
+
+def content_hash(value: Any) -> str:
+    """Stable hash of a JSON-serialisable value (key order does not matter)."""
+    return hashlib.blake2b(
+        _canonical(value).encode("utf-8"), digest_size=_HASH_BYTES
+    ).hexdigest()
+
+
+def _digest(refs: List[str]) -> str:
+    return hashlib.blake2b("".join(refs).encode("ascii"), digest_size=6).hexdigest()
+
+
+def is_blob_record(record: Any) -> bool:
+    return isinstance(record, dict) and _BLOB_KEY in record and "v" in record
+
+
+def _same(a: Any, b: Any) -> bool:
+    # 1 == 1.0 == True, but they serialise differently
+    return a is b or (a == b and _canonical(a) == _canonical(b))
+
+
+def _diff(base: List[str], refs: List[str]) -> List[Any]:
+    if base == refs:
+        return [[0, len(base)]] if base else []
+    ops: List[Any] = []
+    matcher = SequenceMatcher(None, base, refs, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2 - i1])
+        elif tag in ("replace", "insert"):
+            ops.extend(refs[j1:j2])
+    return ops
+
+
+class TraceEncoder:
+    """Encodes one trace file's traces; keep one instance per file.
+
+    The encoder remembers which blobs it has emitted and each agent's
+    last ``memory_post``, so its output must reach the file in the order
+    it was produced. Call `reset` if emitted lines were lost.
+    """
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.reset()
+
+    def reset(self) -> None:
+        self._known: set = set()
+        self._last_post: Dict[str, List[str]] = {}
+        self._since_keyframe: Dict[str, int] = {}
+
+    def encode(self, trace: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Return ``(compact trace, new blob records)`` for ``trace``."""
+        blobs: List[Dict[str, Any]] = []
+        known = self._known
+
+        def ref(value: Any) -> str:
+            h = content_hash(value)
+            if h not in known:
+                known.add(h)
+                blobs.append({_BLOB_KEY: h, "v": value})
+            return h
+
+        out = dict(trace)
+        out[_COMPACT_FLAG] = 1
+
+        prompt = trace.get("input")
+        if isinstance(prompt, str):
+            out["input"] = {"$sections": [ref(s) for s in prompt.split(SECTION_SEPARATOR)]}
+
+        before = trace.get("state_before")
+        for key in ("state_before", "environment_context"):
+            value = trace.get(key)
+            if isinstance(value, dict) and value:
+                out[key] = {"$blob": ref(value)}
+
+        after = trace.get("state_after")
+        if isinstance(after, dict) and isinstance(before, dict):
+            out["state_after"] = {"$patch": {
+                "set": {k: v for k, v in after.items() if k not in before or not _same(before[k], v)},
+                "unset": [k for k in before if k not in after],
+            }}
+
+        pre = trace.get("memory_pre")
+        if isinstance(pre, list):
+            out["memory_pre"] = {"$list": [ref(m) for m in pre]}
+
+        memory_audit = trace.get("memory_audit")
+        if isinstance(memory_audit, dict) and isinstance(memory_audit.get("memories"), list):
+            out["memory_audit"] = {
+                **memory_audit,
+                "memories": {"$list": [ref(m) for m in memory_audit["memories"]]},
+            }
+
+        post = trace.get("memory_post")
+        if isinstance(post, list):
+            agent = str(trace.get("agent_id"))
+            refs = [ref(m) for m in post]
+            base = self._last_post.get(agent)
+            since = self._since_keyframe.get(agent, 0)
+            if base is None or since >= self.keyframe_interval:
+                out["memory_post"] = {"$list": refs}
+                self._since_keyframe[agent] = 1
+            else:
+                out["memory_post"] = {"$delta": _diff(base, refs), "base": _digest(base)}
+                self._since_keyframe[agent] = since + 1
+            self._last_post[agent] = refs
+
+        return out, blobs
+
+
+class TraceDecoder:
+    """Rebuilds full traces from a trace file's records, read in order.
+
+    Decoded values are copies, so callers may mutate them freely.
+    """
+
+    def __init__(self):
+        self._blobs: Dict[str, Any] = {}
+        self._last_post: Dict[str, List[str]] = {}
+
+    def add_blob(self, record: Dict[str, Any]) -> None:
+        self._blobs[record[_BLOB_KEY]] = record["v"]
+
+    def _value(self, h: str) -> Any:
+        try:
+            value = self._blobs[h]
+        except KeyError:
+            raise TraceDecodeError(f"missing blob {h}") from None
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def _list(self, encoded: Any) -> List[Any]:
+        return [self._value(h) for h in encoded["$list"]]
+
+    def decode(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Full trace for ``record``; full-mode traces are returned as-is."""
+        if not record.get(_COMPACT_FLAG):
+            return record
+        trace = dict(record)
+        del trace[_COMPACT_FLAG]
+
+        prompt = trace.get("input")
+        if isinstance(prompt, dict) and "$sections" in prompt:
+            trace["input"] = SECTION_SEPARATOR.join(self._value(h) for h in prompt["$sections"])
+
+        for key in ("state_before", "environment_context"):
+            value = trace.get(key)
+            if isinstance(value, dict) and "$blob" in value:
+                trace[key] = self._value(value["$blob"])
+
+        after = trace.get("state_after")
+        if isinstance(after, dict) and "$patch" in after:
+            state = dict(trace.get("state_before") or {})
+            for key in after["$patch"]["unset"]:
+                state.pop(key, None)
+            state.update(after["$patch"]["set"])
+            trace["state_after"] = state
+
+        pre = trace.get("memory_pre")
+        if isinstance(pre, dict) and "$list" in pre:
+            trace["memory_pre"] = self._list(pre)
+
+        memory_audit = trace.get("memory_audit")
+        memories = memory_audit.get("memories") if isinstance(memory_audit, dict) else None
+        if isinstance(memories, dict) and "$list" in memories:
+            trace["memory_audit"] = {**memory_audit, "memories": self._list(memories)}
+
+        post = trace.get("memory_post")
+        if isinstance(post, dict) and ("$list" in post or "$delta" in post):
+            agent = str(trace.get("agent_id"))
+            if "$list" in post:
+                refs = list(post["$list"])
+            else:
+                base = self._last_post.get(agent)
+                if base is None or _digest(base) != post.get("base"):
+                    raise TraceDecodeError(f"memory_post delta base missing for agent {agent}")
+                refs = []
+                for op in post["$delta"]:
+                    if isinstance(op, list):
+                        refs.extend(base[op[0]:op[0] + op[1]])
+                    else:
+                        refs.append(op)
+            self._last_post[agent] = refs
+            trace["memory_post"] = [self._value(h) for h in refs]
+
+        return trace
+
+
+def iter_jsonl_traces(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield the metadata records and full traces of a raw trace file.
+
+    Works for both storage modes. Blob records, torn or non-object lines
+    and compact traces that cannot be rebuilt (their lines were lost) are
+    skipped.
+    """
+    decoder = TraceDecoder()
+    undecodable = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            if is_blob_record(record):
+                decoder.add_blob(record)
+                continue
+            try:
+                yield decoder.decode(record)
+            except TraceDecodeError:
+                undecodable += 1
+    if undecodable:
+        logger.warning(f"[TraceStore] Skipped {undecodable} undecodable compact traces in {path}")
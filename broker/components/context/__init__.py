@@ -23,8 +23,10 @@ _EXPORT_MAP = {
     "PrioritySchemaProvider": ("providers", "PrioritySchemaProvider"),
     "SocialProvider": ("providers", "SocialProvider"),
     "TieredContextBuilder": ("tiered", "TieredContextBuilder"),
+    "TokenBudget": ("token_budget", "TokenBudget"),
     "create_context_builder": ("tiered", "create_context_builder"),
     "load_prompt_templates": ("tiered", "load_prompt_templates"),
+    "resolve_token_counter": ("token_budget", "resolve_token_counter"),
 }
 
 __all__ = list(_EXPORT_MAP)
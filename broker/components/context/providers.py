@@ -2,6 +2,7 @@
 
 Phase 8: Added SDK observer support for domain-agnostic observation.
 """
+import heapq
 from typing import Dict, List, Any, Optional, Callable, TYPE_CHECKING
 from broker.utils.logging import setup_logger
 
@@ -459,6 +460,16 @@ class SocialMediaProvider(ContextProvider):
     instantiated ONLY when ``UnifiedContextBuilder.enable_social_feeds``
     is True. With the flag OFF (the default for paper-3 flood
     experiments), this class never lands in the provider chain.
+
+    Ranking is materialised per author: each author's unsuppressed
+    posts are weighted and sorted once per year (and again only when
+    that author's feed list changes), and each agent's top-K is a
+    k-way merge over its followed authors' sorted feeds, applying
+    the per-agent ``social_media_post_filter`` lazily as posts are
+    popped. The result (including tie order) is identical to weighting
+    every candidate per agent. This relies on the filter keeping or
+    dropping posts; a pack whose filter returns a transformed post is
+    detected on the first such post and ranked per agent from then on.
     """
 
     def __init__(
@@ -496,13 +507,102 @@ class SocialMediaProvider(ContextProvider):
         self.top_k = top_k
         self.current_year_fn = current_year_fn
         self.half_life_years = half_life_years
+        # author_id -> ((year, id(posts), len(posts)), [(weight, post), ...])
+        self._author_feeds: Dict[str, Any] = {}
+        self._feeds_year: Optional[int] = None
+        self._transforming_filter = False
 
-    def provide(self, agent_id, agents, context, **kwargs):
-        # Lazy import to keep this module importable in environments
-        # without the social subpackage on the path (e.g. minimal
-        # broker installs).
+    def _weight(self, post, year) -> float:
+        # Weighted top-K. Credibility ranges [0, 1] by convention but
+        # we don't enforce — pack-supplied; age_weight is positive;
+        # engagement_score is non-negative. The (1 + engagement)
+        # factor avoids zeroing a post that no one liked yet.
         from broker.components.social.post import age_weight
 
+        cred = self.pack.credibility_weight(getattr(post, "tier_id", ""))
+        age = age_weight(
+            getattr(post, "event_year", year),
+            year,
+            self.half_life_years,
+        )
+        eng = float(getattr(post, "engagement_score", 0.0))
+        return cred * age * (1.0 + eng)
+
+    def _author_feed(self, author_id, posts, year, suppressed):
+        """``author_id``'s unsuppressed posts as ``(weight, post)``, heaviest first."""
+        stamp = (year, id(posts), len(posts))
+        cached = self._author_feeds.get(author_id)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        weighted = [
+            (self._weight(post, year), post)
+            for post in posts
+            if getattr(post, "tier_id", "") not in suppressed
+        ]
+        # Stable, so equal weights keep feed order
+        weighted.sort(key=lambda wp: wp[0], reverse=True)
+        self._author_feeds[author_id] = (stamp, weighted)
+        return weighted
+
+    def _rank_per_agent(self, agent, followed, feeds, suppressed, year):
+        """Filter and weight every candidate post for one agent."""
+        candidates = []
+        for author_id in followed:
+            for post in feeds.get(author_id, []):
+                if getattr(post, "tier_id", "") in suppressed:
+                    continue
+                kept = self.pack.social_media_post_filter(agent, post)
+                if kept is None:
+                    continue
+                candidates.append(kept)
+        return sorted(candidates, key=lambda p: self._weight(p, year), reverse=True)[: self.top_k]
+
+    def _rank_merged(self, agent, followed, feeds, suppressed, year):
+        """Top-K by k-way merge of followed authors' materialised feeds.
+
+        Returns ``None`` when the pack filter transforms a post, so the
+        caller can fall back to per-agent ranking.
+        """
+        if self._feeds_year != year:
+            self._author_feeds.clear()
+            self._feeds_year = year
+
+        author_feeds = []
+        heads = []
+        for author_id in followed:
+            posts = feeds.get(author_id)
+            if not posts:
+                continue
+            weighted = self._author_feed(author_id, posts, year, suppressed)
+            if weighted:
+                # (author rank, index) breaks ties in per-agent candidate order
+                heads.append((-weighted[0][0], len(author_feeds), 0))
+                author_feeds.append(weighted)
+        heapq.heapify(heads)
+
+        ranked = []
+        while heads and len(ranked) < self.top_k:
+            _, rank, idx = heads[0]
+            weighted = author_feeds[rank]
+            post = weighted[idx][1]
+            if idx + 1 < len(weighted):
+                heapq.heapreplace(heads, (-weighted[idx + 1][0], rank, idx + 1))
+            else:
+                heapq.heappop(heads)
+            kept = self.pack.social_media_post_filter(agent, post)
+            if kept is None:
+                continue
+            if kept is not post:
+                logger.info(
+                    "[SocialMedia] Pack post filter transforms posts; "
+                    "ranking feeds per agent"
+                )
+                self._transforming_filter = True
+                return None
+            ranked.append(post)
+        return ranked
+
+    def provide(self, agent_id, agents, context, **kwargs):
         feeds = getattr(self.environment, "social_feeds", None)
         if not feeds:
             context["social_media_feed"] = ""
@@ -530,37 +630,17 @@ class SocialMediaProvider(ContextProvider):
 
         suppressed = self.pack.suppressed_tiers() if hasattr(self.pack, "suppressed_tiers") else set()
 
-        candidates = []
-        for author_id in followed:
-            for post in feeds.get(author_id, []):
-                if getattr(post, "tier_id", "") in suppressed:
-                    continue
-                kept = self.pack.social_media_post_filter(agent, post)
-                if kept is None:
-                    continue
-                candidates.append(kept)
+        ranked = None
+        if not self._transforming_filter:
+            ranked = self._rank_merged(agent, followed, feeds, suppressed, year)
+        if ranked is None:
+            ranked = self._rank_per_agent(agent, followed, feeds, suppressed, year)
 
-        if not candidates:
+        if not ranked:
             context["social_media_feed"] = ""
             context["_social_media_audit"] = []
             return
 
-        # Weighted top-K. Credibility ranges [0, 1] by convention but
-        # we don't enforce — pack-supplied; age_weight is positive;
-        # engagement_score is non-negative. The (1 + engagement)
-        # factor avoids zeroing a post that no one liked yet.
-        def _score(post):
-            cred = self.pack.credibility_weight(getattr(post, "tier_id", ""))
-            age = age_weight(
-                getattr(post, "event_year", year),
-                year,
-                self.half_life_years,
-            )
-            eng = float(getattr(post, "engagement_score", 0.0))
-            return cred * age * (1.0 + eng)
-
-        ranked = sorted(candidates, key=_score, reverse=True)[: self.top_k]
-
         rendered = []
         audit = []
         for post in ranked:
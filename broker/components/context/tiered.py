@@ -8,6 +8,7 @@ from broker.utils.logging import setup_logger
 from broker.utils.agent_config import load_agent_config
 
 from .builder import ContextBuilder, SafeFormatter
+from .token_budget import BudgetReport, TokenBudget, count_prompt_tokens
 from .providers import (
     ContextProvider,
     SystemPromptProvider,
@@ -33,6 +34,55 @@ if TYPE_CHECKING:
 logger = setup_logger(__name__)
 
 
+def _memory_sort_key(item):
+    """Salience-descending sort key for list-form memories.
+
+    Sort by salience DESC, but keep timestamp ASCENDING within ties so
+    equal-importance memories preserve chronological (insertion) order —
+    matches V1 behaviour for Y1 all-routine seed memories. Using bare
+    ``reverse=True`` on the tuple would reverse timestamp too, which
+    scrambles load order.
+    """
+    if not isinstance(item, dict):
+        return (0.0, 0.0, 0)
+    salience = item.get("final_score", item.get("importance", 0.0))
+    importance = item.get("importance", 0.0)
+    timestamp = item.get("timestamp", 0)
+    # Negate salience/importance for descending; keep timestamp
+    # ascending (natural order for equal salience).
+    return (-salience, -importance, timestamp)
+
+
+def _memory_priority(memory_val) -> List[Any]:
+    """Memory item keys, most important first (see ``_fit_token_budget``)."""
+    if isinstance(memory_val, dict) and "episodic" in memory_val:
+        episodic = memory_val.get("episodic", []) or []
+        semantic = memory_val.get("semantic", []) or []
+        return (
+            [("episodic", i) for i in reversed(range(len(episodic)))]
+            + [("semantic", i) for i in range(len(semantic))]
+        )
+    if isinstance(memory_val, list):
+        return sorted(range(len(memory_val)), key=lambda i: _memory_sort_key(memory_val[i]))
+    return []
+
+
+def _select_memory(memory_val, keys: List[Any]):
+    """Subset of ``memory_val`` holding only ``keys``, in original order."""
+    if isinstance(memory_val, dict) and "episodic" in memory_val:
+        keep = set(keys)
+        selected = dict(memory_val)
+        for tier in ("episodic", "semantic"):
+            if tier in memory_val:
+                selected[tier] = [
+                    m for i, m in enumerate(memory_val[tier] or []) if (tier, i) in keep
+                ]
+        return selected
+    if isinstance(memory_val, list):
+        return [memory_val[i] for i in sorted(keys)]
+    return memory_val
+
+
 class BaseAgentContextBuilder(ContextBuilder):
     """Context builder that uses a pipeline of providers for generality."""
 
@@ -47,12 +97,14 @@ class BaseAgentContextBuilder(ContextBuilder):
         semantic_thresholds: tuple = (0.3, 0.7),
         yaml_path: Optional[str] = None,
         max_prompt_tokens: int = 16384,
+        token_budget: Optional[TokenBudget] = None,
     ):
         self.agents = agents
         self.prompt_templates = prompt_templates or {}
         self.semantic_thresholds = semantic_thresholds
         self.yaml_path = yaml_path
         self.max_prompt_tokens = max_prompt_tokens
+        self.token_budget = token_budget
 
         if any(t < 0.0 or t > 1.0 for t in semantic_thresholds):
             logger.warning(
@@ -130,22 +182,7 @@ class BaseAgentContextBuilder(ContextBuilder):
         elif isinstance(memory_val, list):
             if not memory_val:
                 return "No memories yet."
-            # Sort by salience DESC, but keep timestamp ASCENDING within
-            # ties so equal-importance memories preserve chronological
-            # (insertion) order — matches V1 behaviour for Y1 all-routine
-            # seed memories. Using bare `reverse=True` on tuple would
-            # reverse timestamp too, which scrambles load order.
-            def _sort_key(item):
-                if not isinstance(item, dict):
-                    return (0.0, 0.0, 0)
-                salience = item.get("final_score", item.get("importance", 0.0))
-                importance = item.get("importance", 0.0)
-                timestamp = item.get("timestamp", 0)
-                # Negate salience/importance for descending; keep timestamp
-                # ascending (natural order for equal salience).
-                return (-salience, -importance, timestamp)
-
-            ordered = sorted(memory_val, key=_sort_key)
+            ordered = sorted(memory_val, key=_memory_sort_key)
             return "\n".join(format_memory_item(m) for m in ordered)
         elif memory_val:
             return str(memory_val)
@@ -252,16 +289,35 @@ class BaseAgentContextBuilder(ContextBuilder):
             )
 
         formatted = SafeFormatter().format(template, **template_vars)
-        token_estimate = len(formatted) // 4
-        if token_estimate > self.max_prompt_tokens:
+        return self._check_prompt_tokens(context, formatted)
+
+    def _check_prompt_tokens(
+        self,
+        context: Dict[str, Any],
+        formatted: str,
+        report: Optional[BudgetReport] = None,
+    ) -> str:
+        """Enforce ``max_prompt_tokens`` and record the count for the audit trace.
+
+        The count uses ``token_budget``'s tokenizer when configured and the
+        ``len // 4`` estimate otherwise.  The result is stored under
+        ``context["_prompt_budget"]``.
+        """
+        if report is None:
+            limit = self.max_prompt_tokens
+            if self.token_budget is not None:
+                limit = min(limit, self.token_budget.prompt_limit)
+            tokens, counter = count_prompt_tokens(formatted, self.token_budget)
+            report = BudgetReport(prompt_tokens=tokens, limit=limit, counter=counter)
+        context["_prompt_budget"] = report.to_dict()
+        if report.prompt_tokens > report.limit:
             logger.warning(
                 f"[Context:Warning] Prompt exceeds limit for {context.get('agent_id', 'unknown')}: "
-                f"~{token_estimate} tokens (limit {self.max_prompt_tokens})"
+                f"~{report.prompt_tokens} tokens (limit {report.limit})"
             )
             raise RuntimeError(
-                f"Prompt token estimate {token_estimate} exceeds limit {self.max_prompt_tokens}"
+                f"Prompt token estimate {report.prompt_tokens} exceeds limit {report.limit}"
             )
-
         return formatted
 
     def _format_state(self, state: Dict[str, float], compact: bool = True) -> str:
@@ -329,6 +385,7 @@ class TieredContextBuilder(BaseAgentContextBuilder):
         dynamic_whitelist: List[str] = None,
         yaml_path: Optional[str] = None,
         max_prompt_tokens: int = 16384,
+        token_budget: Optional[TokenBudget] = None,
         enable_financial_constraints: bool = False,
         # Phase 8: SDK observer support
         social_observer: Optional["SocialObserver"] = None,
@@ -418,6 +475,7 @@ class TieredContextBuilder(BaseAgentContextBuilder):
             providers=providers,
             yaml_path=yaml_path,
             max_prompt_tokens=max_prompt_tokens,
+            token_budget=token_budget,
         )
 
         self.hub = hub
@@ -679,17 +737,70 @@ class TieredContextBuilder(BaseAgentContextBuilder):
         if "{system_prompt}" not in template:
             template = "{system_prompt}\n\n{priority_section}\n\n" + template
 
-        formatted = SafeFormatter().format(template, **template_vars)
-        token_estimate = len(formatted) // 4
-        if token_estimate > self.max_prompt_tokens:
-            logger.warning(
-                f"[Context:Warning] Prompt exceeds limit for {context.get('agent_id', 'unknown')}: "
-                f"~{token_estimate} tokens (limit {self.max_prompt_tokens})"
-            )
-            raise RuntimeError(
-                f"Prompt token estimate {token_estimate} exceeds limit {self.max_prompt_tokens}"
+        if self.token_budget is None:
+            formatted = SafeFormatter().format(template, **template_vars)
+            return self._check_prompt_tokens(context, formatted)
+
+        formatted, report = self._fit_token_budget(template, template_vars, p, l, g)
+        if report.trimmed:
+            logger.debug(
+                f"[Context:TokenBudget] Trimmed {report.trimmed} for "
+                f"{context.get('agent_id', 'unknown')} ({report.prompt_tokens}/{report.limit} tokens)"
             )
-        return formatted
+        return self._check_prompt_tokens(context, formatted, report)
+
+    def _fit_token_budget(
+        self,
+        template: str,
+        template_vars: Dict[str, Any],
+        p: Dict[str, Any],
+        l: Dict[str, Any],
+        g: List[str],
+    ):
+        """Render the prompt within ``token_budget``, trimming memory/social/events.
+
+        Memories are ranked by salience (recent episodic before semantic
+        for the hierarchical form), gossip and news by their given order;
+        the lowest-ranked items are dropped first.  Kept items render in
+        their original order, so an untrimmed prompt is byte-identical to
+        the unbudgeted one.
+        """
+        memory_val = p.get("memory", [])
+        items = {
+            "memory": _memory_priority(memory_val),
+            "social": list(l.get("social", []) or []),
+            "events": list(g or []),
+        }
+        identity = template_vars.get("system_prompt", "") + "\n\n" + self._format_generic_section(
+            "MY STATUS & HISTORY", {k: v for k, v in p.items() if k != "memory"}
+        )
+        response_format = str(template_vars.get("response_format", ""))
+
+        def render(kept):
+            p_kept, l_kept = dict(p), dict(l)
+            if "memory" in p:
+                p_kept["memory"] = _select_memory(memory_val, kept["memory"])
+            if "social" in l:
+                l_kept["social"] = kept["social"]
+            social, news = kept["social"], kept["events"]
+
+            tier_vars = dict(template_vars)
+            tier_vars["memory"] = self._format_memory(p_kept.get("memory", []))
+            tier_vars["social_gossip"] = "\n".join(f"- {s}" for s in social) if social else ""
+            tier_vars["global_news"] = "\n".join(f"- {n}" for n in news) if news else ""
+            tier_vars["personal_section"] = self._format_generic_section("MY STATUS & HISTORY", p_kept)
+            tier_vars["local_section"] = self._format_generic_section("LOCAL NEIGHBORHOOD", l_kept)
+            tier_vars["global_section"] = self._format_generic_section("WORLD EVENTS", {"news": news})
+            texts = {
+                "identity": identity,
+                "response_format": response_format,
+                "memory": tier_vars["memory"],
+                "social": tier_vars["social_gossip"],
+                "events": tier_vars["global_news"],
+            }
+            return SafeFormatter().format(template, **tier_vars), texts
+
+        return self.token_budget.fit(items, render, limit=self.max_prompt_tokens)
 
     def _format_generic_section(self, title: str, data: Dict[str, Any]) -> str:
         lines = [f"### [{title}]"]
@@ -777,6 +888,7 @@ def create_context_builder(
     semantic_thresholds: tuple = (0.3, 0.7),
     hub: Optional["InteractionHub"] = None,
     max_prompt_tokens: int = 16384,
+    token_budget: Optional[TokenBudget] = None,
 ) -> "BaseAgentContextBuilder":
     templates = {}
 
@@ -794,6 +906,7 @@ def create_context_builder(
             memory_engine=memory_engine,
             yaml_path=yaml_path,
             max_prompt_tokens=max_prompt_tokens,
+            token_budget=token_budget,
         )
 
     return BaseAgentContextBuilder(
@@ -804,6 +917,7 @@ def create_context_builder(
         semantic_thresholds=semantic_thresholds,
         yaml_path=yaml_path,
         max_prompt_tokens=max_prompt_tokens,
+        token_budget=token_budget,
     )
 
 
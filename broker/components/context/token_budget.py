@@ -0,0 +1,332 @@
+"""Token-accurate prompt budgeting for context builders.
+
+Context builders historically sized prompts with ``len(text) // 4``.
+That estimate drifts by 20-40% across model families, so prompts either
+overflow ``num_ctx`` (Ollama silently drops the head of the prompt or
+re-allocates the KV cache) or ``num_ctx`` is padded far above what the
+prompt needs, inflating prefill time for every agent.
+
+This module counts tokens with the model family's own tokenizer, loaded
+from a local ``tokenizer.json`` (HuggingFace ``tokenizers`` format).
+Nothing is ever downloaded: when no tokenizer file is configured, or the
+optional ``tokenizers`` package is missing, counting falls back to the
+legacy character heuristic.
+
+Usage:
+    from broker.components.context.token_budget import TokenBudget
+
+    budget = TokenBudget.for_model(
+        "gemma3:4b", num_ctx=4096, reserve_output=1024,
+        tier_budgets={"memory": 600, "social": 300, "events": 200},
+        tokenizer_dir="models/tokenizers",   # contains gemma/tokenizer.json
+    )
+    builder = TieredContextBuilder(agents, hub=hub, token_budget=budget)
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from broker.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# Prompt tiers, highest priority first.
+TIERS = ("identity", "response_format", "memory", "social", "events")
+
+# Tiers that may be trimmed, lowest priority first. Identity and the
+# response format are never trimmed: a prompt without them is unusable.
+TRIM_ORDER = ("events", "social", "memory")
+
+# Substring → tokenizer family. Checked in order, so more specific
+# patterns come first.
+MODEL_FAMILIES: Tuple[Tuple[str, str], ...] = (
+    ("gpt-oss", "gpt-oss"),
+    ("deepseek", "deepseek"),
+    ("ministral", "mistral"),
+    ("mistral", "mistral"),
+    ("mixtral", "mistral"),
+    ("gemma", "gemma"),
+    ("llama", "llama"),
+    ("qwen", "qwen"),
+    ("phi", "phi"),
+)
+
+TOKENIZER_DIR_ENV = "WAGF_TOKENIZER_DIR"
+
+
+def model_family(model_name: Optional[str]) -> str:
+    """Map a model tag (e.g. ``"gemma3:4b"``) to its tokenizer family."""
+    name = (model_name or "").lower()
+    for pattern, family in MODEL_FAMILIES:
+        if pattern in name:
+            return family
+    return "default"
+
+
+class HeuristicTokenCounter:
+    """Legacy ``len(text) // 4`` estimate, used when no tokenizer is available."""
+
+    name = "heuristic"
+
+    def count(self, text: str) -> int:
+        return len(text) // 4
+
+
+class TokenizerFileCounter:
+    """Exact token counts from a local HuggingFace ``tokenizer.json``.
+
+    Args:
+        path: Path to the tokenizer file. Loaded once, never fetched.
+
+    Raises:
+        FileNotFoundError: If ``path`` does not exist.
+        ImportError: If the optional ``tokenizers`` package is missing.
+    """
+
+    def __init__(self, path: str):
+        path = str(path)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Tokenizer file not found: {path}")
+        try:
+            from tokenizers import Tokenizer
+        except ImportError as exc:
+            raise ImportError(
+                "Token-accurate budgeting requires the 'tokenizers' package "
+                "(pip install tokenizers)"
+            ) from exc
+        self.name = path
+        self._tokenizer = Tokenizer.from_file(path)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+@lru_cache(maxsize=None)
+def _load_counter(path: str) -> TokenizerFileCounter:
+    return TokenizerFileCounter(path)
+
+
+def _find_tokenizer_file(tokenizer_dir: str, family: str) -> Optional[str]:
+    for candidate in (
+        Path(tokenizer_dir) / family / "tokenizer.json",
+        Path(tokenizer_dir) / f"{family}.json",
+    ):
+        if candidate.is_file():
+            return str(candidate)
+    return None
+
+
+def resolve_token_counter(
+    model_name: Optional[str] = None,
+    tokenizer_path: Optional[str] = None,
+    tokenizer_dir: Optional[str] = None,
+):
+    """Return a token counter for ``model_name``.
+
+    An explicit ``tokenizer_path`` must load (errors propagate).  Otherwise
+    ``tokenizer_dir`` (default: ``$WAGF_TOKENIZER_DIR``) is searched for
+    ``<family>/tokenizer.json`` or ``<family>.json``; if nothing is found,
+    or ``tokenizers`` is not installed, the heuristic counter is returned.
+    """
+    if tokenizer_path:
+        return _load_counter(str(tokenizer_path))
+
+    tokenizer_dir = tokenizer_dir or os.environ.get(TOKENIZER_DIR_ENV)
+    family = model_family(model_name)
+    path = _find_tokenizer_file(tokenizer_dir, family) if tokenizer_dir else None
+    if path is None:
+        logger.debug(
+            f"[Context:TokenBudget] No tokenizer file for family '{family}'; "
+            f"using len//4 heuristic"
+        )
+        return HeuristicTokenCounter()
+    try:
+        return _load_counter(path)
+    except ImportError as exc:
+        logger.warning(f"[Context:TokenBudget] {exc}; using len//4 heuristic")
+        return HeuristicTokenCounter()
+
+
+@dataclass
+class BudgetReport:
+    """Outcome of fitting one prompt; written to the audit trace."""
+    prompt_tokens: int
+    limit: int
+    counter: str
+    tier_tokens: Dict[str, int] = field(default_factory=dict)
+    trimmed: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "limit": self.limit,
+            "counter": self.counter,
+            "tier_tokens": dict(self.tier_tokens),
+            "trimmed": dict(self.trimmed),
+        }
+
+
+@dataclass
+class TokenBudget:
+    """Per-tier token budgets for one model's context window.
+
+    Args:
+        num_ctx: Model context window (tokens).
+        reserve_output: Tokens kept free for the response (``num_predict``).
+        tier_budgets: Optional per-tier caps keyed by :data:`TIERS`.
+            Caps on trimmable tiers (:data:`TRIM_ORDER`) are enforced;
+            caps on identity/response_format only log a warning.
+        counter: Token counter; defaults to the heuristic.
+    """
+    num_ctx: int
+    reserve_output: int = 0
+    tier_budgets: Dict[str, int] = field(default_factory=dict)
+    counter: Any = field(default_factory=HeuristicTokenCounter)
+
+    def __post_init__(self):
+        unknown = set(self.tier_budgets) - set(TIERS)
+        if unknown:
+            raise ValueError(
+                f"Unknown prompt tier(s) {sorted(unknown)}; expected {list(TIERS)}"
+            )
+        if self.prompt_limit <= 0:
+            raise ValueError(
+                f"reserve_output ({self.reserve_output}) leaves no room in "
+                f"num_ctx ({self.num_ctx})"
+            )
+
+    @classmethod
+    def for_model(
+        cls,
+        model_name: str,
+        num_ctx: int,
+        reserve_output: int = 0,
+        tier_budgets: Optional[Dict[str, int]] = None,
+        tokenizer_path: Optional[str] = None,
+        tokenizer_dir: Optional[str] = None,
+    ) -> "TokenBudget":
+        """Build a budget whose counter matches ``model_name``'s family."""
+        return cls(
+            num_ctx=num_ctx,
+            reserve_output=reserve_output,
+            tier_budgets=dict(tier_budgets or {}),
+            counter=resolve_token_counter(model_name, tokenizer_path, tokenizer_dir),
+        )
+
+    @property
+    def prompt_limit(self) -> int:
+        return self.num_ctx - self.reserve_output
+
+    def count(self, text: str) -> int:
+        return self.counter.count(text)
+
+    def fit(
+        self,
+        items: Dict[str, Sequence[Any]],
+        render: Callable[[Dict[str, Sequence[Any]]], Tuple[str, Dict[str, str]]],
+        limit: Optional[int] = None,
+    ) -> Tuple[str, BudgetReport]:
+        """Drop lowest-priority items until the prompt fits.
+
+        Args:
+            items: Trimmable tier → items, highest priority first.  Items
+                are removed from the tail only, so the result depends on
+                nothing but the input order.
+            render: ``render(items) -> (prompt, tier_texts)`` where
+                ``tier_texts`` maps tier names to their rendered text.
+            limit: Prompt token limit; defaults to :attr:`prompt_limit`.
+
+        Returns:
+            ``(prompt, report)``.
+
+        Raises:
+            RuntimeError: If the prompt exceeds the limit with every
+                trimmable tier emptied.
+        """
+        limit = self.prompt_limit if limit is None else min(limit, self.prompt_limit)
+        kept = {tier: len(items.get(tier, ())) for tier in TRIM_ORDER}
+
+        def render_kept() -> Tuple[str, Dict[str, str]]:
+            return render({
+                tier: list(items.get(tier, ()))[:kept[tier]] for tier in TRIM_ORDER
+            })
+
+        def largest_fitting(tier: str, fits: Callable[[], bool]) -> None:
+            # Token counts grow monotonically with kept items, so binary
+            # search the largest prefix that satisfies ``fits``.
+            lo, hi = 0, kept[tier]
+            while lo < hi:
+                kept[tier] = (lo + hi + 1) // 2
+                if fits():
+                    lo = kept[tier]
+                else:
+                    hi = kept[tier] - 1
+            kept[tier] = lo
+
+        # 1. Per-tier caps.
+        for tier in TRIM_ORDER:
+            cap = self.tier_budgets.get(tier)
+            if cap is not None and kept[tier]:
+                largest_fitting(tier, lambda: self.count(render_kept()[1].get(tier, "")) <= cap)
+
+        # 2. Whole-prompt limit, trimming lowest-priority tiers first.
+        prompt, texts = render_kept()
+        for tier in TRIM_ORDER:
+            if self.count(prompt) <= limit:
+                break
+            if kept[tier]:
+                largest_fitting(tier, lambda: self.count(render_kept()[0]) <= limit)
+                prompt, texts = render_kept()
+
+        prompt_tokens = self.count(prompt)
+        tier_tokens = {tier: self.count(texts.get(tier, "")) for tier in TIERS}
+        for tier in ("identity", "response_format"):
+            cap = self.tier_budgets.get(tier)
+            if cap is not None and tier_tokens[tier] > cap:
+                logger.warning(
+                    f"[Context:TokenBudget] {tier} tier uses {tier_tokens[tier]} "
+                    f"tokens (budget {cap}); it is never trimmed"
+                )
+
+        report = BudgetReport(
+            prompt_tokens=prompt_tokens,
+            limit=limit,
+            counter=getattr(self.counter, "name", type(self.counter).__name__),
+            tier_tokens=tier_tokens,
+            trimmed={
+                tier: len(items.get(tier, ())) - kept[tier]
+                for tier in TRIM_ORDER
+                if len(items.get(tier, ())) - kept[tier] > 0
+            },
+        )
+        if prompt_tokens > limit:
+            raise RuntimeError(
+                f"Prompt token count {prompt_tokens} exceeds limit {limit} "
+                f"after trimming {report.trimmed}"
+            )
+        return prompt, report
+
+
+def count_prompt_tokens(text: str, token_budget: Optional[TokenBudget]) -> Tuple[int, str]:
+    """Count ``text`` with the budget's counter, or the heuristic if none."""
+    counter = token_budget.counter if token_budget is not None else HeuristicTokenCounter()
+    return counter.count(text), getattr(counter, "name", type(counter).__name__)
+
+
+__all__ = [
+    "TIERS",
+    "TRIM_ORDER",
+    "BudgetReport",
+    "HeuristicTokenCounter",
+    "TokenBudget",
+    "TokenizerFileCounter",
+    "count_prompt_tokens",
+    "model_family",
+    "resolve_token_counter",
+]
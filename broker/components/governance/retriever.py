@@ -4,8 +4,10 @@ Skill Retriever - Implements RAG-based skill selection.
 This component selects the most relevant skills for an agent based on its
 current context (state, memory, perception) to avoid prompt bloat.
 """
+import heapq
 import logging
 import re
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from broker.interfaces.skill_types import SkillDefinition
 
@@ -44,6 +46,8 @@ class SkillRetriever:
             "perception": 1.2, # Immediate external signals
             "memory": 0.8      # Historical context
         }
+        # Inverted indexes keyed by the identities of the skill list
+        self._indexes: Dict[tuple, _SkillIndex] = {}
 
     def retrieve(
         self, 
@@ -71,28 +75,51 @@ class SkillRetriever:
         # 1. Extract searchable terms from context
         keywords = self._extract_keywords(query_context)
         
-        # 2. Score each skill
-        scored_skills = []
-        for skill in available_skills:
-            score = self._calculate_score(skill, keywords)
-            scored_skills.append((score, skill))
-            
-        # 3. Sort by score
-        scored_skills.sort(key=lambda x: x[0], reverse=True)
-        
-        # 4. Filter and truncate
-        top_skills = [s for score, s in scored_skills[:self.top_n] if score >= self.min_score]
+        # 2. Score skills through the inverted index (only matched skills are touched)
+        index = self._get_index(available_skills)
+        scores = index.score(keywords)
+
+        # 3-4. Rank, truncate, filter. Equivalent to a stable descending sort of
+        # every skill followed by [:top_n] and the min_score filter; when
+        # min_score > 0 only matched skills can qualify, so unmatched ones
+        # (score 0) are never ranked.
+        if self.min_score > 0:
+            candidates = [i for i, score in scores.items() if score >= self.min_score]
+        else:
+            candidates = range(len(available_skills))
+        ranked = heapq.nlargest(
+            self.top_n, sorted(candidates), key=lambda i: scores.get(i, 0.0)
+        )
+        top_skills = [
+            available_skills[i] for i in ranked if scores.get(i, 0.0) >= self.min_score
+        ]
         
         # 5. Global Skills Injection (Baseline Disclosure)
         # Always include global skills if the agent is eligible (exists in available_skills)
         # These are added regardless of score to ensure consistent baseline options.
         for gid in self.global_skills:
-            g_skill = next((s for s in available_skills if s.skill_id == gid), None)
+            g_skill = index.by_id.get(gid)
             if g_skill and g_skill not in top_skills:
                 top_skills.append(g_skill)
             
         return top_skills
 
+    def _get_index(self, skills: List[SkillDefinition]) -> "_SkillIndex":
+        """Inverted index for a skill list, built once per distinct list.
+
+        In practice each agent type sees the same eligible list every
+        step, so this is one build per agent type. Keyed by skill object
+        identity: registry definitions are not mutated, and the cached
+        index holds references, so ids cannot be recycled while cached.
+        """
+        key = tuple(map(id, skills))
+        index = self._indexes.get(key)
+        if index is None:
+            if len(self._indexes) >= _MAX_CACHED_INDEXES:
+                self._indexes.clear()
+            index = self._indexes[key] = _SkillIndex(skills)
+        return index
+
     def _extract_keywords(self, context: Dict[str, Any]) -> Dict[str, float]:
         """Convert context into a weighted keyword dictionary."""
         keywords = {}
@@ -131,20 +158,26 @@ class SkillRetriever:
                 for m in memory
             ]
 
-        if mems_to_process:
-            mem_text = " ".join(map(str, mems_to_process)).lower()
-            tokens = re.findall(r'\b\w{3,}\b', mem_text) # Only words > 2 chars
-            for t in tokens:
-                keywords[t] = keywords.get(t, 0) + (0.1 * self.source_weights["memory"])
+        # Memories recur across steps (window / retrieved sets overlap), so
+        # each one is tokenized once and its tokens reused. Per-item tokens in
+        # item order equal the tokens of the space-joined text.
+        mem_weight = 0.1 * self.source_weights["memory"]
+        for mem in mems_to_process:
+            for t in _memory_tokens(str(mem)):
+                keywords[t] = keywords.get(t, 0) + mem_weight
 
         return keywords
 
     def _calculate_score(self, skill: SkillDefinition, keywords: Dict[str, float]) -> float:
-        """Calculate relevance score for a skill against keywords."""
+        """Calculate relevance score for a single skill against keywords.
+
+        Reference (linear) scorer; `retrieve` uses the equivalent
+        inverted index.
+        """
         score = 0.0
         
         # Search targets: skill_id and description
-        search_target = f"{skill.skill_id} {skill.description}".lower().replace('_', ' ')
+        search_target = _search_target(skill)
         
         for k, weight in keywords.items():
             if k in search_target:
@@ -156,3 +189,68 @@ class SkillRetriever:
             score += 2.0
             
         return score
+
+
+_MAX_CACHED_INDEXES = 64
+
+
+def _search_target(skill: SkillDefinition) -> str:
+    return f"{skill.skill_id} {skill.description}".lower().replace('_', ' ')
+
+
+@lru_cache(maxsize=4096)
+def _memory_tokens(text: str) -> tuple:
+    return tuple(re.findall(r'\b\w{3,}\b', text.lower()))  # Only words > 2 chars
+
+
+class _SkillIndex:
+    """Inverted index over one skill list.
+
+    A keyword matches a skill when it is a substring of the skill's search
+    target. Keywords without whitespace can only fall inside a single
+    whitespace-separated target token, so every substring of every target
+    token maps to the skills containing it; lookups are then one dict hit
+    per keyword. Keywords that contain whitespace (multi-word state
+    values) fall back to a substring scan.
+    """
+
+    def __init__(self, skills: List[SkillDefinition]):
+        self.skills = list(skills)
+        self.targets = [_search_target(s) for s in skills]
+        self.by_id: Dict[str, SkillDefinition] = {}
+        self.by_lower_id: Dict[str, List[int]] = {}
+        self.postings: Dict[str, List[int]] = {}
+        for i, (skill, target) in enumerate(zip(skills, self.targets)):
+            self.by_id.setdefault(skill.skill_id, skill)
+            self.by_lower_id.setdefault(skill.skill_id.lower(), []).append(i)
+            subs = set()
+            for token in set(target.split()):
+                n = len(token)
+                subs.update(token[a:b] for a in range(n) for b in range(a + 1, n + 1))
+            for sub in subs:
+                self.postings.setdefault(sub, []).append(i)
+
+    def score(self, keywords: Dict[str, float]) -> Dict[int, float]:
+        """Scores of matched skills (index -> score); unmatched skills score 0.
+
+        Weights are added per skill in keyword order, exactly as the
+        linear scorer does, so scores are bit-identical.
+        """
+        scores: Dict[int, float] = {}
+        for k, weight in keywords.items():
+            if k == "":
+                matched = range(len(self.targets))
+            elif _WHITESPACE.search(k):
+                matched = [i for i, target in enumerate(self.targets) if k in target]
+            else:
+                matched = self.postings.get(k, ())
+            for i in matched:
+                scores[i] = scores.get(i, 0.0) + weight
+        for lower_id, indices in self.by_lower_id.items():
+            if lower_id in keywords:
+                for i in indices:
+                    scores[i] = scores.get(i, 0.0) + 2.0
+        return scores
+
+
+_WHITESPACE = re.compile(r"\s")
@@ -20,6 +20,9 @@ Public API:
     DEFAULT_RULES                            — [M1, M2, M3]
     TemporalRuleEvaluator                    — post-hoc orchestrator
     TrajectoryEvaluation                     — aggregate result
+    StreamingTemporalEvaluator               — bounded-window incremental evaluator
+    iter_audit_rows                          — lazy audit CSV / JSONL reader
+    evaluate_runs                            — multi-run sweep over worker processes
 """
 from .base import (
     AgentTurn,
@@ -29,6 +32,7 @@ from .base import (
     Violation,
 )
 from .evaluator import TemporalRuleEvaluator, TrajectoryEvaluation
+from .streaming import StreamingTemporalEvaluator, evaluate_runs, iter_audit_rows
 from .rules import (
     DEFAULT_RULES,
     AppraisalHistoryCoherence,
@@ -44,8 +48,11 @@ __all__ = [
     "DomainTemporalAdapter",
     "EvidenceGroundedIrreversibility",
     "NullTemporalAdapter",
+    "StreamingTemporalEvaluator",
     "TemporalRule",
     "TemporalRuleEvaluator",
     "TrajectoryEvaluation",
     "Violation",
+    "evaluate_runs",
+    "iter_audit_rows",
 ]
@@ -0,0 +1,203 @@
+"""Streaming temporal-rule evaluation over audit records.
+
+`TemporalRuleEvaluator.evaluate_experiment` groups every row by agent
+before evaluating, and `evaluate_agent` hands each rule the agent's
+whole prior trajectory. `StreamingTemporalEvaluator` instead consumes
+rows one at a time and keeps, per agent, only the turns inside the
+largest rule `window_size`, so memory is bounded by
+agents x window regardless of run length. Violations are emitted as
+soon as the turn that triggers them is read.
+
+Input contract: each agent's rows must arrive in non-decreasing year
+order. Both (agent, year)-sorted files and the year-major order the
+audit writers produce satisfy this. Rules must honour their declared
+`window_size` (all rules in `rules.py` do); under that contract the
+violations equal those of the batch evaluator.
+
+`evaluate_runs` fans many audit files out over worker processes for
+post-hoc sweeps.
+"""
+from __future__ import annotations
+
+import csv
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple,
+)
+
+from .base import AgentTurn, DomainTemporalAdapter, TemporalRule, Violation
+from .evaluator import TemporalRuleEvaluator, TrajectoryEvaluation
+
+
+class StreamingTemporalEvaluator:
+    """Incremental counterpart of `TemporalRuleEvaluator`.
+
+    Usage:
+        stream = StreamingTemporalEvaluator(rules, adapter)
+        for row in iter_audit_rows(path):
+            for v in stream.push(row):
+                ...  # handle violation as it happens
+        result = stream.result(model="m", condition="c", run="Run_1")
+    """
+
+    def __init__(
+        self,
+        rules: List[TemporalRule],
+        adapter: DomainTemporalAdapter,
+        keep_violations: bool = True,
+    ):
+        self.rules = rules
+        self.adapter = adapter
+        self.keep_violations = keep_violations
+        windows = [getattr(rule, "window_size", None) for rule in rules]
+        # A rule without a declared window sees the full history.
+        self.horizon: Optional[int] = (
+            None if any(w is None for w in windows) else max(windows, default=0)
+        )
+        self.n_decisions = 0
+        self.by_rule: Dict[str, int] = defaultdict(int)
+        self.violations: List[Violation] = []
+        self._history: Dict[str, Deque[AgentTurn]] = {}
+        self._last_year: Dict[str, int] = {}
+
+    def push(self, row: Dict[str, Any]) -> List[Violation]:
+        """Evaluate one audit row; returns the violations it triggers."""
+        turn = TemporalRuleEvaluator._row_to_turn(row)
+        agent_id = turn.agent_id
+        last_year = self._last_year.get(agent_id)
+        if last_year is not None and turn.year < last_year:
+            raise ValueError(
+                f"Agent {agent_id!r} rows out of order: year {turn.year} after "
+                f"{last_year}; sort by (agent_id, year) or use TemporalRuleEvaluator"
+            )
+        self._last_year[agent_id] = turn.year
+
+        history = self._history.get(agent_id)
+        if history is None:
+            history = self._history[agent_id] = deque()
+        if self.horizon is not None:
+            while history and history[0].year < turn.year - self.horizon:
+                history.popleft()
+
+        window = list(history)
+        found: List[Violation] = []
+        for rule in self.rules:
+            v = rule.check(turn, window, self.adapter)
+            if v is not None:
+                found.append(v)
+                self.by_rule[v.rule_id] += 1
+        history.append(turn)
+
+        self.n_decisions += 1
+        if self.keep_violations:
+            self.violations.extend(found)
+        return found
+
+    def evaluate_stream(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Violation]:
+        """Push every row, yielding violations as they are found."""
+        for row in rows:
+            yield from self.push(row)
+
+    def result(
+        self,
+        *,
+        model: str = "",
+        condition: str = "",
+        run: str = "",
+    ) -> TrajectoryEvaluation:
+        """Aggregate of everything pushed so far."""
+        rate_by_rule: Dict[str, float] = {}
+        for rule in self.rules:
+            rate_by_rule[rule.rule_id] = (
+                100.0 * self.by_rule.get(rule.rule_id, 0) / self.n_decisions
+                if self.n_decisions else 0.0
+            )
+        return TrajectoryEvaluation(
+            model=model,
+            condition=condition,
+            run=run,
+            n_decisions=self.n_decisions,
+            violations=list(self.violations),
+            by_rule=dict(self.by_rule),
+            rate_by_rule=rate_by_rule,
+        )
+
+
+# ---------- audit readers ----------
+
+def iter_audit_rows(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """Lazily yield evaluator rows from an audit file.
+
+    `.csv` files are governance-audit CSVs and are read row by row.
+    `.jsonl` files are raw traces: each is flattened with the audit
+    CSV row builder and carries its retrieved memories as `_memories`;
+    compact-storage files are decoded first. Metadata records and a torn
+    final line are skipped.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".jsonl":
+        from broker.components.analytics.audit import trace_to_csv_row
+        from broker.components.analytics.trace_store import iter_jsonl_traces
+
+        for trace in iter_jsonl_traces(path):
+            if "_metadata" in trace:
+                continue
+            row = trace_to_csv_row(trace)
+            memories = (trace.get("memory_audit") or {}).get("memories") or []
+            row["_memories"] = [m for m in memories if isinstance(m, dict)]
+            yield row
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f)
+
+
+# ---------- multi-run sweeps ----------
+
+RunSpec = Tuple[str, str, str, str]  # (model, condition, run, audit path)
+
+
+def _evaluate_run_job(
+    job: Tuple[RunSpec, List[TemporalRule], DomainTemporalAdapter, bool],
+) -> TrajectoryEvaluation:
+    (model, condition, run, path), rules, adapter, keep_violations = job
+    stream = StreamingTemporalEvaluator(rules, adapter, keep_violations=keep_violations)
+    for _ in stream.evaluate_stream(iter_audit_rows(path)):
+        pass
+    return stream.result(model=model, condition=condition, run=run)
+
+
+def evaluate_runs(
+    runs: Sequence[RunSpec],
+    rules: List[TemporalRule],
+    adapter: DomainTemporalAdapter,
+    max_workers: Optional[int] = None,
+    keep_violations: bool = False,
+    on_result: Optional[Callable[[TrajectoryEvaluation], None]] = None,
+) -> List[TrajectoryEvaluation]:
+    """Stream-evaluate many audit files, one worker process per file.
+
+    `runs` holds `(model, condition, run, path)` tuples; results come
+    back in the same order. Rules and adapter must be picklable
+    (module-level classes are). `max_workers=1` runs in-process.
+    `on_result` is called as each run's result is collected.
+    """
+    jobs = [
+        ((model, condition, run, str(path)), rules, adapter, keep_violations)
+        for model, condition, run, path in runs
+    ]
+    results: List[TrajectoryEvaluation] = []
+    if max_workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            results.append(_evaluate_run_job(job))
+            if on_result:
+                on_result(results[-1])
+        return results
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for result in executor.map(_evaluate_run_job, jobs):
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results
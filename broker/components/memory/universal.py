@@ -18,6 +18,7 @@ References:
 
 from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
 from datetime import datetime
+import heapq
 import logging
 
 if TYPE_CHECKING:
@@ -498,8 +499,9 @@ class UniversalCognitiveEngine:
             reasoning.append(f"  -> Selected {len(recent)} most recent working memories")
 
             # Top-k significant from long-term
-            sorted_lt = sorted(longterm, key=lambda m: m.get('importance', 0), reverse=True)
-            significant = sorted_lt[:top_k_significant]
+            significant = heapq.nlargest(
+                top_k_significant, longterm, key=lambda m: m.get('importance', 0)
+            )
             reasoning.append(f"  -> Selected top {len(significant)} significant long-term memories")
 
             all_memories = significant + recent
@@ -534,9 +536,9 @@ class UniversalCognitiveEngine:
                     'boost': boost
                 }))
 
-            scored.sort(key=lambda x: x[1], reverse=True)
+            scored = heapq.nlargest(top_k, scored, key=lambda x: x[1])
 
-            for i, (m, score, breakdown) in enumerate(scored[:top_k]):
+            for i, (m, score, breakdown) in enumerate(scored):
                 content = m.get('content', '')
                 content_preview = content[:50] + "..." if len(content) > 50 else content
                 reasoning.append(
@@ -544,7 +546,7 @@ class UniversalCognitiveEngine:
                     f"(R={breakdown['recency']:.2f}, I={breakdown['importance']:.2f}, B={breakdown['boost']:.2f})"
                 )
 
-            memories = [m.get('content', '') for m, _, _ in scored[:top_k]]
+            memories = [m.get('content', '') for m, _, _ in scored]
 
         return memories, reasoning
 
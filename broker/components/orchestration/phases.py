@@ -7,7 +7,8 @@ configurable phase definitions. Supports:
 - Per-phase agent type filtering
 - Sequential, parallel, and random ordering within phases
 - YAML-based configuration
-- Dependency ordering between phases
+- Dependency ordering between phases, grouped into waves of phases
+  that may run concurrently (see ``get_execution_waves``)
 
 Design Principles:
 1. Non-invasive: works alongside ExperimentRunner via hooks
@@ -45,6 +46,8 @@ class PhaseOrchestrator:
             For the water-domain 4-phase layout use from_domain("flood")
             or pass phases= explicitly.
         seed: Random seed for deterministic "random" ordering.
+        max_concurrent_phases: Upper bound on phases of one dependency
+            wave that ExperimentRunner executes at the same time.
     """
 
     def __init__(
@@ -52,10 +55,16 @@ class PhaseOrchestrator:
         phases: Optional[List[PhaseConfig]] = None,
         seed: int = 42,
         saga_coordinator: Optional[Any] = None,
+        max_concurrent_phases: int = 4,
     ):
+        if max_concurrent_phases < 1:
+            raise InvalidPhaseConfigError(
+                f"max_concurrent_phases must be >= 1, got {max_concurrent_phases}"
+            )
         self.phases = phases or self._generic_phases()
         self._rng = random.Random(seed)
         self.saga_coordinator = saga_coordinator
+        self.max_concurrent_phases = max_concurrent_phases
         self._validate_phases()
 
     # Phase 6Q-A (2026-05-26): removed ``_default_phases()`` — a
@@ -214,6 +223,41 @@ class PhaseOrchestrator:
 
         return plan
 
+    def get_execution_waves(
+        self,
+        agents: Dict[str, Any],
+        current_step: int = 0,
+    ) -> List[List[Tuple[PhaseConfig, List[str]]]]:
+        """Group phases into dependency waves.
+
+        Every phase in a wave depends only on phases of earlier waves, so
+        the phases of one wave may execute concurrently. Within a wave,
+        phases keep their declaration order, which is the order in which
+        ExperimentRunner merges their results.
+
+        Args:
+            agents: Dictionary of agent_id -> agent objects.
+
+        Returns:
+            List of waves; each wave is a list of (phase_config, [agent_ids]).
+        """
+        self._topological_order()  # raises PhaseDependencyCycleError on cycles
+        waves: List[List[Tuple[PhaseConfig, List[str]]]] = []
+        done = set()
+        remaining = list(self.phases)
+        while remaining:
+            level = [
+                pc for pc in remaining
+                if all(dep in done for dep in pc.depends_on)
+            ]
+            waves.append([
+                (pc, self._apply_ordering(self._select_agents(pc, agents), pc.ordering))
+                for pc in level
+            ])
+            done.update(pc.phase for pc in level)
+            remaining = [pc for pc in remaining if all(pc is not l for l in level)]
+        return waves
+
     def advance_sagas(self, current_step: int = 0) -> None:
         """Advance all active sagas at phase boundaries."""
         if not self.saga_coordinator:
@@ -262,13 +306,15 @@ class PhaseOrchestrator:
 
         Expected YAML format::
 
+            max_concurrent_phases: 2   # optional, default 4
             phases:
               - phase: institutional
                 agent_types: [government, insurance]
                 ordering: sequential
               - phase: household
                 agent_types: [household_owner, household_renter]
-                ordering: sequential
+                ordering: parallel
+                max_workers: 4
               - phase: resolution
                 agent_types: []
                 depends_on: [institutional, household]
@@ -327,7 +373,11 @@ class PhaseOrchestrator:
                 depends_on=depends,
             ))
 
-        return cls(phases=phases, seed=seed)
+        return cls(
+            phases=phases,
+            seed=seed,
+            max_concurrent_phases=data.get("max_concurrent_phases", 4),
+        )
 
     # ------------------------------------------------------------------
     # Internals
@@ -371,7 +421,9 @@ class PhaseOrchestrator:
             self._rng.shuffle(ids)
             return ids
         elif ordering == "parallel":
-            return list(agent_ids)  # Same order; parallelism handled by caller
+            # Same order; ExperimentRunner runs the phase with
+            # PhaseConfig.max_workers threads and merges in this order.
+            return list(agent_ids)
         else:  # sequential (default)
             return list(agent_ids)
 
@@ -429,11 +481,13 @@ class PhaseOrchestrator:
         """Return orchestrator configuration summary."""
         return {
             "num_phases": len(self.phases),
+            "max_concurrent_phases": self.max_concurrent_phases,
             "phases": [
                 {
                     "phase": pc.phase.value,
                     "agent_types": pc.agent_types,
                     "ordering": pc.ordering,
+                    "max_workers": pc.max_workers,
                     "depends_on": [d.value for d in pc.depends_on],
                 }
                 for pc in self.phases
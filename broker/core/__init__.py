@@ -25,7 +25,7 @@ from .agent_initializer import (
     generate_initial_memories,
     initialize_agents,
 )
-from .efficiency import CognitiveCache
+from .efficiency import CognitiveCache, ContextDigester
 from .experiment import ExperimentBuilder, ExperimentConfig, ExperimentRunner
 from .psychometric import (
     ConstructDef,
@@ -69,6 +69,7 @@ __all__ = [
     "CSVLoader",
     "CognitiveCache",
     "ConstructDef",
+    "ContextDigester",
     "ExperimentBuilder",
     "ExperimentConfig",
     "ExperimentRunner",
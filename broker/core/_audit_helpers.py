@@ -6,13 +6,12 @@ standard Python mixin pattern where the mixin is always combined with
 the host class via multiple inheritance.
 """
 from typing import Any, Dict, List, Optional
-import hashlib
-import json
 
 from ..interfaces.skill_types import (
     ExecutionResult, SkillOutcome,
 )
 from ..utils.logging import logger
+from .efficiency import ContextDigester
 
 
 def _classify_decision_source(approved_skill) -> str:
@@ -140,6 +139,25 @@ def _safe_social_audit(context: Dict[str, Any]) -> Dict[str, Any]:
         return {}
 
 
+# Context keys `AuditMixin._write_audit_trace` reads ("personal" only
+# for its "agent_type")
+AUDIT_CONTEXT_KEYS = ("agent_type", "state", "local", "_prompt_budget", "preflight_pruned")
+
+
+def audit_context(context: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of a prompt context the audit trace reads.
+
+    Writing a trace from the result gives the same trace as from the
+    full context, which also holds memories, global news and skill
+    definitions.
+    """
+    slim = {key: context[key] for key in AUDIT_CONTEXT_KEYS if key in context}
+    personal = context.get("personal")
+    if isinstance(personal, dict):
+        slim["personal"] = {k: personal[k] for k in ("agent_type",) if k in personal}
+    return slim
+
+
 class AuditMixin:
     """Mixin providing audit trace writing and state management helpers."""
 
@@ -193,7 +211,7 @@ class AuditMixin:
             "retrieval_mode": "humancentric" if memory_pre else "",
         }
 
-        self.audit_writer.write_trace(agent_type_final, {
+        trace = {
             "run_id": run_id,
             "step_id": step_id,
             "timestamp": timestamp,
@@ -245,7 +263,22 @@ class AuditMixin:
             "retry_count": retry_count,
             "format_retries": format_retry_count,
             "llm_stats": total_llm_stats,
-        }, all_validation_history)
+            # Final prompt size as counted by the context builder's token
+            # budget (tokenizer or len//4), plus any tier trimming applied.
+            "prompt_budget": context.get("_prompt_budget"),
+        }
+        # Skills left out of the options by pre-flight pruning, with the
+        # rules that blocked them (only when pruning removed something)
+        if context.get("preflight_pruned"):
+            trace["preflight_pruned"] = context["preflight_pruned"]
+        # AuditMixin hosts without a profiler (tests, replay) skip timings
+        profiler = getattr(self, "profiler", None)
+        if profiler is not None and profiler.include_in_trace:
+            timing = profiler.current()
+            if timing is not None:
+                # Stages completed so far (the audit write itself is excluded)
+                trace["stage_timings_ms"] = timing.to_ms()
+        self.audit_writer.write_trace(agent_type_final, trace, all_validation_history)
 
     # ------------------------------------------------------------------
     # State helpers
@@ -300,5 +333,8 @@ class AuditMixin:
         return []
 
     def _hash_context(self, context: Dict) -> str:
-        """Create hash of context for audit."""
-        return hashlib.md5(json.dumps(context, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        """Create hash of context for audit (from memoised section digests)."""
+        digester = getattr(self, "context_digester", None)
+        if digester is None:
+            digester = self.context_digester = ContextDigester()
+        return digester.context_hash(context)
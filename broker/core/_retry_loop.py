@@ -50,11 +50,13 @@ class RetryMixin:
         format_retry_count = 0
         max_initial_attempts = 2
         total_llm_stats = {"llm_retries": 0, "llm_success": False}
+        stage = self.profiler.stage
 
         while initial_attempts <= max_initial_attempts and not skill_proposal:
             initial_attempts += 1
             try:
-                res = llm_invoke(prompt)
+                with stage("llm"):
+                    res = llm_invoke(prompt)
                 if isinstance(res, tuple):
                     raw_output, llm_stats_obj = res
                     total_llm_stats["llm_retries"] += llm_stats_obj.retries
@@ -69,6 +71,8 @@ class RetryMixin:
                             total_llm_stats.get("context_utilization", 0.0),
                             round(llm_stats_obj.context_utilization, 4),
                         )
+                    self._accumulate_draft_stats(total_llm_stats, llm_stats_obj)
+                    self._accumulate_prompt_cache(total_llm_stats, agent_type, llm_stats_obj)
                     if hasattr(llm_stats_obj, 'empty_content_retries'):
                         for _ in range(llm_stats_obj.empty_content_retries):
                             self.auditor.log_empty_content_retry()
@@ -84,13 +88,14 @@ class RetryMixin:
                 if isinstance(raw_output, SkillProposal):
                     skill_proposal = raw_output
                 else:
-                    skill_proposal = self.model_adapter.parse_output(raw_output, {
-                        "agent_id": agent_id,
-                        "agent_type": agent_type,
-                        "retry_attempt": initial_attempts - 1,
-                        "current_year": env_context.get("current_year") if env_context else "?",
-                        **context
-                    })
+                    with stage("parse"):
+                        skill_proposal = self.model_adapter.parse_output(raw_output, {
+                            "agent_id": agent_id,
+                            "agent_type": agent_type,
+                            "retry_attempt": initial_attempts - 1,
+                            "current_year": env_context.get("current_year") if env_context else "?",
+                            **context
+                        })
 
                 if skill_proposal is None:
                     # Phase 6C-v4 Finding 3: distinguish actual empty LLM
@@ -141,6 +146,41 @@ class RetryMixin:
 
         return skill_proposal, raw_output, format_retry_count, total_llm_stats
 
+    @staticmethod
+    def _accumulate_draft_stats(total_llm_stats: Dict, llm_stats_obj) -> None:
+        """Count SpeculativeDrafter outcomes across all calls of one decision.
+
+        Each status (accepted, completed, rejected, ignored, fallback) is
+        counted on its own; draft-model latency and tokens are summed
+        next to them.
+        """
+        spec = getattr(llm_stats_obj, "speculative", None)
+        if not spec:
+            return
+        agg = total_llm_stats.setdefault("speculative", {
+            "accepted": 0, "completed": 0, "rejected": 0, "ignored": 0, "fallback": 0,
+            "draft_ms": 0.0, "main_ms": 0.0, "draft_prompt_tokens": 0, "draft_response_tokens": 0,
+        })
+        status = spec.get("status", "fallback")
+        agg[status] = agg.get(status, 0) + 1
+        agg["draft_ms"] = round(agg["draft_ms"] + spec.get("draft_ms", 0.0), 3)
+        agg["main_ms"] = round(agg["main_ms"] + spec.get("main_ms", 0.0), 3)
+        agg["draft_prompt_tokens"] += spec.get("draft_prompt_tokens", 0)
+        agg["draft_response_tokens"] += spec.get("draft_response_tokens", 0)
+
+    def _accumulate_prompt_cache(self, total_llm_stats: Dict, agent_type: str, llm_stats_obj) -> None:
+        """Sum reported cached prompt tokens / prefill time and count the call
+        in ``self.prefix_reuse`` (see broker.core.prefix_scheduling)."""
+        cached = getattr(llm_stats_obj, "cached_prompt_tokens", None)
+        if cached is not None:
+            total_llm_stats["cached_prompt_tokens"] = total_llm_stats.get("cached_prompt_tokens", 0) + cached
+        prefill_ms = getattr(llm_stats_obj, "prefill_ms", 0.0) or 0.0
+        if prefill_ms > 0:
+            total_llm_stats["prefill_ms"] = round(total_llm_stats.get("prefill_ms", 0.0) + prefill_ms, 3)
+        reuse = getattr(self, "prefix_reuse", None)
+        if reuse is not None:
+            reuse.record(agent_type, llm_stats_obj)
+
     # ------------------------------------------------------------------
     # Helper statics for early-exit detection
     # ------------------------------------------------------------------
@@ -196,6 +236,13 @@ class RetryMixin:
         up to self.max_retries attempts. Logs fallout diagnostics on
         exhaustion.
 
+        If ``llm_invoke`` has a ``chat(messages)`` attribute, retries are
+        sent as a continuation (original prompt, rejected answer, short
+        feedback turn) instead of the feedback prepended to a fresh copy
+        of the prompt, so providers with prompt/KV caching only process
+        the new turns. ``retry_prompt_tokens`` in ``total_llm_stats``
+        records each retry's prompt tokens.
+
         Includes early-exit optimisation: if the first retry is blocked
         by the exact same rule IDs as the initial attempt, remaining
         retries are skipped (the blocking conditions are static and
@@ -206,6 +253,11 @@ class RetryMixin:
         Mutates total_llm_stats and all_validation_history in-place.
         """
         retry_count = 0
+        stage = self.profiler.stage
+        # An llm_invoke with a ``chat`` attribute (retry_mode: continuation)
+        # takes retries as a continuation of the original conversation
+        chat = getattr(llm_invoke, "chat", None)
+        messages = [{"role": "user", "content": prompt}] if callable(chat) else None
         prev_blocking_rules = self._extract_blocking_rule_ids(validation_results)
         while not all_valid and retry_count < self.max_retries:
             retry_count += 1
@@ -238,8 +290,32 @@ class RetryMixin:
                     e for v in validation_results if v and hasattr(v, 'errors') for e in v.errors
                 ]
 
-            retry_prompt = self.model_adapter.format_retry_prompt(prompt, errors_to_send, max_reports=self.max_reports)
-            res = llm_invoke(retry_prompt)
+            res = None
+            if messages is not None and isinstance(raw_output, str):
+                # Continuation: the rejected answer and the feedback are
+                # appended to the conversation, so its prefix is unchanged
+                with stage("format_prompt"):
+                    feedback = self.model_adapter.format_retry_prompt(
+                        "", errors_to_send, max_reports=self.max_reports
+                    ).rstrip()
+                messages.extend([
+                    {"role": "assistant", "content": raw_output},
+                    {"role": "user", "content": feedback},
+                ])
+                with stage("llm"):
+                    res = chat(messages)
+                content = res[0] if isinstance(res, tuple) else res
+                if isinstance(content, str) and content.strip():
+                    total_llm_stats["retry_mode"] = "continuation"
+                else:
+                    logger.warning(f"[Governance:Retry] Continuation returned no content for {agent_id}; resending full prompt.")
+                    messages = None
+                    res = None
+            if res is None:
+                with stage("format_prompt"):
+                    retry_prompt = self.model_adapter.format_retry_prompt(prompt, errors_to_send, max_reports=self.max_reports)
+                with stage("llm"):
+                    res = llm_invoke(retry_prompt)
 
             if isinstance(res, tuple):
                 raw_output, llm_stats_obj = res
@@ -254,6 +330,10 @@ class RetryMixin:
                         total_llm_stats.get("context_utilization", 0.0),
                         round(llm_stats_obj.context_utilization, 4),
                     )
+                    # Prompt tokens processed by each governance retry
+                    total_llm_stats.setdefault("retry_prompt_tokens", []).append(llm_stats_obj.prompt_tokens)
+                self._accumulate_draft_stats(total_llm_stats, llm_stats_obj)
+                self._accumulate_prompt_cache(total_llm_stats, agent_type, llm_stats_obj)
             else:
                 raw_output = res
                 from ..utils.llm_utils import get_llm_stats
@@ -261,16 +341,18 @@ class RetryMixin:
                 total_llm_stats["llm_retries"] += stats.get("current_retries", 0)
                 total_llm_stats["llm_success"] = stats.get("current_success", True)
 
-            skill_proposal = self.model_adapter.parse_output(raw_output, {
-                **context,
-                "agent_id": agent_id,
-                "agent_type": agent_type,
-                "retry_attempt": retry_count,
-                "current_year": env_context.get("current_year") if env_context else "?",
-            })
+            with stage("parse"):
+                skill_proposal = self.model_adapter.parse_output(raw_output, {
+                    **context,
+                    "agent_id": agent_id,
+                    "agent_type": agent_type,
+                    "retry_attempt": retry_count,
+                    "current_year": env_context.get("current_year") if env_context else "?",
+                })
 
             if skill_proposal:
-                validation_results = self._run_validators(skill_proposal, validation_context)
+                with stage("validation"):
+                    validation_results = self._run_validators(skill_proposal, validation_context)
                 all_validation_history.extend(validation_results)
                 all_valid = all(v.valid for v in validation_results)
                 if not all_valid:
@@ -5,9 +5,11 @@ access ``self.*`` attributes defined on SkillBrokerEngine; this is the
 standard Python mixin pattern where the mixin is always combined with
 the host class via multiple inheritance.
 """
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from ..interfaces.skill_types import SkillProposal
 from ..utils.logging import logger
+from ..validators.governance.base_validator import is_state_only
 
 
 class SkillFilterMixin:
@@ -33,7 +35,12 @@ class SkillFilterMixin:
                     blocked.add(s)
         return [s for s in skills if s not in blocked]
 
-    def _inject_filtered_skills(self, context: Dict[str, Any], agent_type: str) -> None:
+    def _inject_filtered_skills(
+        self,
+        context: Dict[str, Any],
+        agent_type: str,
+        env_context: Optional[Dict[str, Any]] = None,
+    ) -> None:
         state = context.get("state", {})
         action_ids = self._get_action_ids(agent_type)
         if not action_ids:
@@ -49,9 +56,66 @@ class SkillFilterMixin:
             }
             action_ids = [a for a in action_ids if a in pre_ids]
         filtered = self._filter_identity_skills(agent_type, action_ids, state)
+        if getattr(self, "preflight_pruning", False):
+            filtered = self._preflight_prune(context, agent_type, filtered, env_context)
         context["available_skills"] = filtered
         self._inject_options_text(context, filtered)
 
+    def _preflight_checks(self) -> List[Any]:
+        """Validators that can judge a skill from pre-decision state alone.
+
+        A validator takes part through a ``preflight`` attribute with the
+        ``(proposal, context, registry)`` signature (``AgentValidator.preflight``),
+        or, for a custom validator, by being marked ``@state_only`` itself.
+        """
+        checks = [getattr(v, "preflight", None) for v in self.validators]
+        for fn in self.custom_validators:
+            checks.append(getattr(fn, "preflight", fn if is_state_only(fn) else None))
+        return [c for c in checks if callable(c)]
+
+    def _preflight_prune(
+        self,
+        context: Dict[str, Any],
+        agent_type: str,
+        skills: List[str],
+        env_context: Optional[Dict[str, Any]],
+    ) -> List[str]:
+        """Drop skills that state-only governance would reject anyway.
+
+        Each candidate is validated as a reasoning-free proposal before
+        the prompt is built; the blocked ones and the rules that blocked
+        them are recorded in ``context["preflight_pruned"]`` for the
+        audit trace. Pruning is skipped when it would leave no option.
+        The normal validators still run on the chosen skill.
+        """
+        checks = self._preflight_checks()
+        if not checks or not skills:
+            return skills
+        agent_id = context.get("agent_id", "unknown")
+        base_context = self._validation_context(context, agent_type, env_context)
+
+        pruned: Dict[str, List[str]] = {}
+        for skill in skills:
+            proposal = SkillProposal(skill_name=skill, agent_id=agent_id, reasoning={}, agent_type=agent_type)
+            validation_context = self._scope_context(proposal, base_context)
+            rule_ids: List[str] = []
+            for check in checks:
+                results = check(proposal, validation_context, self.skill_registry)
+                for r in results if isinstance(results, list) else [results]:
+                    if r is not None and not r.valid:
+                        meta = r.metadata or {}
+                        rule_ids.extend(meta.get("rules_hit") or [meta.get("rule_id") or r.validator_name])
+            if rule_ids:
+                # A domain check can reach both AgentValidator and a custom validator
+                pruned[skill] = list(dict.fromkeys(rule_ids))
+
+        kept = [s for s in skills if s not in pruned]
+        if not pruned or not kept:
+            return skills
+        logger.debug(f" [Governance:Preflight] {agent_id} | Pruned {sorted(pruned)}")
+        context["preflight_pruned"] = pruned
+        return kept
+
     def _inject_options_text(self, context: Dict[str, Any], skills: List[str]) -> None:
         if not skills:
             return
@@ -0,0 +1,380 @@
+"""
+Year-boundary checkpoints for ExperimentRunner.
+
+A checkpoint captures everything the simulation loop carries from one
+year into the next: agent dynamic state, memory engine contents, the
+social graph, simulation/environment state, global RNG states, the
+cognitive cache, audit counters and the byte length of every raw audit
+JSONL file.  Resuming restores the last complete checkpoint *in place*
+(so every component that holds a reference to an agent, the memory
+engine or the hub keeps working), truncates audit files back to the
+recorded lengths so a crash mid-year leaves no partial tail, and lets
+the loop continue with the next year.  The audit writer's CSV trace
+buffer is not captured; it is rebuilt from those files.
+
+Checkpoints are written atomically: the snapshot goes to a temporary
+file that is fsynced and renamed into place, then the ``latest.json``
+pointer is replaced the same way.  A crash at any point leaves the
+previous checkpoint intact.
+
+Snapshots are pickles and are only ever loaded from the run's own
+output directory; do not resume from checkpoints of unknown origin.
+
+Usage:
+    runner = (ExperimentBuilder()
+              ...
+              .with_checkpointing(resume=args.resume)
+              .build())
+    runner.run()
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+CHECKPOINT_DIR = "checkpoints"
+LATEST_POINTER = "latest.json"
+FORMAT_VERSION = 1
+KEEP_LAST = 2
+
+# Attributes never captured: the audit writer's CSV trace buffer grows with
+# the run and is rebuilt from the raw JSONL files on resume.
+NOT_CAPTURED: Dict[str, Tuple[str, ...]] = {"audit_writer": ("_trace_buffer",)}
+
+
+class _RootPickler(pickle.Pickler):
+    """Pickler that stores live root objects by key instead of by value.
+
+    References from one root to another (an agent holding the memory
+    engine, the hub holding the agents dict, ...) are restored to the
+    *live* object on resume, so identity between components survives.
+    """
+
+    def __init__(self, file, roots_by_id: Dict[int, str]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._roots_by_id = roots_by_id
+
+    def persistent_id(self, obj):
+        return self._roots_by_id.get(id(obj))
+
+
+class _RootUnpickler(pickle.Unpickler):
+    def __init__(self, file, roots: Dict[str, Any]):
+        super().__init__(file)
+        self._roots = roots
+
+    def persistent_load(self, pid):
+        if pid not in self._roots:
+            raise RuntimeError(
+                f"Checkpoint does not match this experiment: missing live object '{pid}'"
+            )
+        return self._roots[pid]
+
+
+def _dumps(obj: Any, roots_by_id: Dict[int, str]) -> bytes:
+    buf = io.BytesIO()
+    _RootPickler(buf, roots_by_id).dump(obj)
+    return buf.getvalue()
+
+
+def _fsync_write(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` atomically (temp file + fsync + rename)."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class CheckpointManager:
+    """Save and restore year-boundary snapshots of an ExperimentRunner.
+
+    Args:
+        output_dir: Run output directory; snapshots go to
+            ``<output_dir>/checkpoints``.
+        keep_last: Number of snapshots kept on disk.
+    """
+
+    def __init__(self, output_dir: Path, keep_last: int = KEEP_LAST):
+        self.output_dir = Path(output_dir)
+        self.checkpoint_dir = self.output_dir / CHECKPOINT_DIR
+        self.keep_last = max(1, keep_last)
+        # Root key -> attributes an earlier save found unpicklable
+        self._unpicklable: Dict[str, set] = {}
+
+    # ------------------------------------------------------------------
+    # Roots
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def collect_roots(runner: Any) -> Dict[str, Any]:
+        """Live objects whose state is captured, keyed by stable names.
+
+        Agent keys follow ``runner.agents`` order; objects registered via
+        ``runner.register_checkpoint_object`` are included as ``extra:<name>``.
+        """
+        broker = runner.broker
+        roots: Dict[str, Any] = {"agents": runner.agents}
+        for agent_id, agent in runner.agents.items():
+            roots[f"agent:{agent_id}"] = agent
+        candidates = [
+            ("memory_engine", runner.memory_engine),
+            ("sim_engine", runner.sim_engine),
+            ("cognitive_cache", getattr(runner, "efficiency", None)),
+            ("phase_orchestrator", getattr(runner, "phase_orchestrator", None)),
+            ("audit_writer", getattr(broker, "audit_writer", None)),
+            ("governance_auditor", getattr(broker, "auditor", None)),
+            ("broker_stats", getattr(broker, "stats", None)),
+        ]
+        hub = getattr(getattr(broker, "context_builder", None), "hub", None)
+        if hub is not None:
+            candidates.append(("hub", hub))
+            candidates.append(("social_graph", getattr(hub, "graph", None)))
+        for name, obj in getattr(runner, "checkpoint_objects", {}).items():
+            candidates.append((f"extra:{name}", obj))
+
+        seen = {id(obj) for obj in roots.values()}
+        for name, obj in candidates:
+            if obj is None or id(obj) in seen:
+                continue
+            roots[name] = obj
+            seen.add(id(obj))
+        return roots
+
+    @staticmethod
+    def _root_state(obj: Any) -> Tuple[str, Dict[str, Any]]:
+        if isinstance(obj, dict):
+            return "dict", dict(obj)
+        if hasattr(obj, "__dict__"):
+            return "object", dict(vars(obj))
+        raise TypeError(f"Cannot checkpoint {type(obj).__name__}: no __dict__")
+
+    # ------------------------------------------------------------------
+    # Save
+    # ------------------------------------------------------------------
+
+    def save(self, runner: Any, year: int, run_id: str) -> Path:
+        """Write the snapshot for a completed ``year`` and return its path."""
+        roots = self.collect_roots(runner)
+        roots_by_id = {id(obj): key for key, obj in roots.items()}
+
+        root_states: Dict[str, Dict[str, Any]] = {}
+        for key, obj in roots.items():
+            kind, state = self._root_state(obj)
+            excluded = set(NOT_CAPTURED.get(key, ())) | self._unpicklable.get(key, set())
+            skipped = [attr for attr in state if attr in excluded]
+            root_states[key] = {
+                "kind": kind,
+                "state": {attr: v for attr, v in state.items() if attr not in excluded},
+                "skipped": skipped,
+                "order": list(state),
+            }
+
+        payload = {
+            "format_version": FORMAT_VERSION,
+            "year": year,
+            "run_id": run_id,
+            "step_counter": getattr(runner, "step_counter", 0),
+            "rng": {"random": random.getstate(), "numpy": np.random.get_state()},
+            "audit_offsets": self._audit_offsets(),
+            "roots": root_states,
+        }
+        # One dump so objects shared between roots stay shared on restore.
+        try:
+            data = _dumps(payload, roots_by_id)
+        except Exception:
+            for key, entry in root_states.items():
+                self._drop_unpicklable(key, entry, roots_by_id)
+            data = _dumps(payload, roots_by_id)
+
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        path = self.checkpoint_dir / f"year_{year:04d}.pkl"
+        _fsync_write(path, data)
+        pointer = {
+            "year": year,
+            "file": path.name,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "saved_at": datetime.now().isoformat(),
+        }
+        _fsync_write(
+            self.checkpoint_dir / LATEST_POINTER,
+            json.dumps(pointer, indent=2).encode("utf-8"),
+        )
+        self._prune()
+        logger.info(f"[Checkpoint] Saved year {year} -> {path}")
+        return path
+
+    def _drop_unpicklable(self, key: str, entry: Dict[str, Any], roots_by_id: Dict[int, str]) -> None:
+        """Move attributes of one root that cannot be pickled to ``skipped``.
+
+        Locks, open handles and model clients carry no run state and stay
+        live across resume. They are remembered, so later saves pickle the
+        snapshot in a single pass.
+        """
+        try:
+            _dumps(entry["state"], roots_by_id)
+            return
+        except Exception:
+            pass
+        for attr, value in list(entry["state"].items()):
+            try:
+                _dumps(value, roots_by_id)
+            except Exception:
+                del entry["state"][attr]
+                entry["skipped"].append(attr)
+                self._unpicklable.setdefault(key, set()).add(attr)
+        logger.debug(f"[Checkpoint] {key}: not captured {sorted(map(str, entry['skipped']))}")
+
+    def _audit_offsets(self) -> Dict[str, int]:
+        raw_dir = self.output_dir / "raw"
+        if not raw_dir.exists():
+            return {}
+        return {
+            p.name: p.stat().st_size for p in sorted(raw_dir.glob("*.jsonl"))
+        }
+
+    def _prune(self) -> None:
+        snapshots = sorted(self.checkpoint_dir.glob("year_*.pkl"))
+        for old in snapshots[:-self.keep_last]:
+            try:
+                old.unlink()
+            except OSError as e:
+                logger.warning(f"[Checkpoint] Could not remove old snapshot {old}: {e}")
+
+    # ------------------------------------------------------------------
+    # Load / restore
+    # ------------------------------------------------------------------
+
+    def _candidates(self) -> List[Tuple[Path, Optional[str]]]:
+        """Snapshot files to try, newest complete one first."""
+        candidates: List[Tuple[Path, Optional[str]]] = []
+        pointer_path = self.checkpoint_dir / LATEST_POINTER
+        if pointer_path.exists():
+            try:
+                pointer = json.loads(pointer_path.read_text(encoding="utf-8"))
+                candidates.append((self.checkpoint_dir / pointer["file"], pointer.get("sha256")))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"[Checkpoint] Ignoring unreadable {pointer_path}: {e}")
+        for path in sorted(self.checkpoint_dir.glob("year_*.pkl"), reverse=True):
+            if all(path != c[0] for c in candidates):
+                candidates.append((path, None))
+        return candidates
+
+    def _load_latest(self, roots: Dict[str, Any]) -> Optional[Tuple[Path, Dict[str, Any]]]:
+        """Newest snapshot that reads, matches its digest and unpickles."""
+        for path, digest in self._candidates():
+            try:
+                data = path.read_bytes()
+                if digest and hashlib.sha256(data).hexdigest() != digest:
+                    raise ValueError("digest does not match latest.json")
+                return path, _RootUnpickler(io.BytesIO(data), roots).load()
+            except (OSError, EOFError, ValueError, pickle.UnpicklingError) as e:
+                logger.warning(f"[Checkpoint] Skipping incomplete snapshot {path.name}: {e}")
+        return None
+
+    def restore(self, runner: Any) -> Optional[Dict[str, Any]]:
+        """Restore the newest complete snapshot into ``runner``.
+
+        Returns:
+            ``{"year", "run_id", "path"}`` or ``None`` when no snapshot exists.
+
+        Raises:
+            RuntimeError: If the snapshot does not match the live runner
+                (different agents or missing components) or the audit
+                files are shorter than recorded.
+        """
+        if not self.checkpoint_dir.exists():
+            return None
+        roots = self.collect_roots(runner)
+        found = self._load_latest(roots)
+        if found is None:
+            return None
+        path, payload = found
+        if payload.get("format_version") != FORMAT_VERSION:
+            raise RuntimeError(
+                f"Checkpoint {path} has format version {payload.get('format_version')}; "
+                f"expected {FORMAT_VERSION}"
+            )
+        missing = sorted(set(payload["roots"]) - set(roots))
+        if missing:
+            raise RuntimeError(
+                f"Checkpoint {path} does not match this experiment: "
+                f"missing live objects {missing}"
+            )
+
+        self.truncate_audit(payload["audit_offsets"])
+
+        for key, entry in payload["roots"].items():
+            obj, state = roots[key], entry["state"]
+            if entry["kind"] == "dict":
+                live_skipped = {k: obj[k] for k in entry["skipped"] if k in obj}
+                obj.clear()
+                for k in entry["order"]:
+                    if k in state:
+                        obj[k] = state[k]
+                    elif k in live_skipped:
+                        obj[k] = live_skipped[k]
+                continue
+            live = vars(obj)
+            keep = set(state) | set(entry["skipped"])
+            for attr in [a for a in live if a not in keep]:
+                del live[attr]
+            live.update(state)
+
+        audit_writer = roots.get("audit_writer")
+        if hasattr(audit_writer, "reload_trace_buffer"):
+            audit_writer.reload_trace_buffer()
+
+        runner.step_counter = payload["step_counter"]
+        random.setstate(payload["rng"]["random"])
+        np.random.set_state(payload["rng"]["numpy"])
+        logger.info(f"[Checkpoint] Resumed from year {payload['year']} ({path})")
+        return {"year": payload["year"], "run_id": payload["run_id"], "path": path}
+
+    def truncate_audit(self, offsets: Dict[str, int]) -> None:
+        """Cut raw audit files back to their length at snapshot time."""
+        raw_dir = self.output_dir / "raw"
+        if not raw_dir.exists():
+            if any(offsets.values()):
+                raise RuntimeError(f"Audit directory {raw_dir} is missing; cannot resume")
+            return
+        for path in sorted(raw_dir.glob("*.jsonl")):
+            size = path.stat().st_size
+            expected = offsets.get(path.name)
+            if expected is None:
+                logger.info(f"[Checkpoint] Removing audit file written after snapshot: {path.name}")
+                path.unlink()
+            elif size < expected:
+                raise RuntimeError(
+                    f"Audit file {path.name} is {size} bytes, shorter than the "
+                    f"{expected} bytes recorded in the checkpoint"
+                )
+            elif size > expected:
+                logger.info(
+                    f"[Checkpoint] Truncating {size - expected} bytes of partial-year "
+                    f"audit tail from {path.name}"
+                )
+                with open(path, "r+b") as f:
+                    f.truncate(expected)
+                    f.flush()
+                    os.fsync(f.fileno())
+        for name, expected in offsets.items():
+            if expected and not (raw_dir / name).exists():
+                raise RuntimeError(f"Audit file {name} recorded in the checkpoint is missing")
+
+
+__all__ = ["CHECKPOINT_DIR", "CheckpointManager"]
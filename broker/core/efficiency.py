@@ -5,7 +5,9 @@ and Batch Management to enable large-scale Agent-Based Modeling.
 """
 import hashlib
 import json
-from typing import Dict, Any, Optional
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from pathlib import Path
 
 from broker.utils.logging import setup_logger
@@ -13,6 +15,76 @@ from broker.utils.logging import setup_logger
 logger = setup_logger(__name__)
 
 
+# Top-level context keys that carry the same value for every agent in a
+# step; their digests are memoised once rather than per agent.
+_SHARED_CONTEXT_KEYS = frozenset({"environment_context", "global", "institutional"})
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, default=str).encode()
+
+
+def _value_digest(value: Any) -> str:
+    return hashlib.blake2b(_canonical(value), digest_size=8).hexdigest()
+
+
+def combine_digests(digests: Dict[str, str]) -> str:
+    """16-hex-char hash of named section digests (order-independent)."""
+    joined = ";".join(f"{name}={d}" for name, d in sorted(digests.items()))
+    return hashlib.blake2b(joined.encode(), digest_size=8).hexdigest()
+
+
+class ContextDigester:
+    """Per-section digests of built agent contexts, recomputed only on change.
+
+    Each top-level context key is a section (identity, ``state``,
+    ``personal``, ``memory``, ``local`` social data,
+    ``environment_context``, ...), with ``personal["memory"]`` split out
+    as ``personal.memory``. A section's digest is the blake2b of its
+    canonical (sorted-key) JSON, so it depends only on content, not on
+    what the agent sent before, and hashes are stable across processes,
+    runs and resumes. The canonical form last digested for each agent
+    and section is kept; an unchanged section reuses its digest.
+    """
+
+    def __init__(self):
+        self._memo: Dict[Tuple[Any, str], Tuple[bytes, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def section_digest(self, agent_id: Any, key: str, value: Any) -> str:
+        memo_key = (None if key in _SHARED_CONTEXT_KEYS else agent_id, key)
+        canonical = _canonical(value)
+        cached = self._memo.get(memo_key)
+        if cached is not None and cached[0] == canonical:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        digest = hashlib.blake2b(canonical, digest_size=8).hexdigest()
+        self._memo[memo_key] = (canonical, digest)
+        return digest
+
+    def sections(self, context: Dict[str, Any]) -> Dict[str, str]:
+        """Digest of every section of ``context``."""
+        agent_id = context.get("agent_id")
+        digests: Dict[str, str] = {}
+        for key, value in context.items():
+            if key == "personal" and isinstance(value, dict) and "memory" in value:
+                digests["personal.memory"] = self.section_digest(
+                    agent_id, "personal.memory", value["memory"]
+                )
+                value = {k: v for k, v in value.items() if k != "memory"}
+            digests[key] = self.section_digest(agent_id, key, value)
+        return digests
+
+    def context_hash(self, context: Dict[str, Any]) -> str:
+        """Hash of the whole context, combined from its section digests."""
+        return combine_digests(self.sections(context))
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+
 class CognitiveCache:
     """In-memory cache for skipping redundant LLM decisions."""
     
@@ -28,6 +100,8 @@ class CognitiveCache:
         self._max_size = max_size
         self._hits = 0
         self._misses = 0
+        # Shared with the broker's audit context hash (same sections)
+        self.digester = ContextDigester()
         
         if persistence_path and persistence_path.exists():
             self._load()
@@ -41,27 +115,24 @@ class CognitiveCache:
         Returns:
             A hex string representing the context hash.
         """
-        # Extract key components for hashing (domain-agnostic)
-        # Include full agent state so any state change invalidates the cache
-        state = context.get("state", {})
+        # Key components (domain-agnostic): full agent state so any state
+        # change invalidates the cache, the environment for year-to-year
+        # changes, and memory. Section digests are memoised by the digester.
+        agent_id = context.get("agent_id")
         personal = context.get("personal", {})
-        hash_components = {
-            "agent_id": context.get("agent_id"),
-            # Generic agent state hash (captures ALL state fields for any domain)
-            "state_hash": hashlib.md5(
-                json.dumps(state, sort_keys=True, default=str).encode()
-            ).hexdigest()[:8],
-            # Environment state (captures year-to-year changes for any domain)
-            "env_state_hash": hashlib.md5(
-                json.dumps(context.get("environment_context", {}), sort_keys=True, default=str).encode()
-            ).hexdigest()[:8],
-            "memory_hash": hashlib.md5(
-                json.dumps(personal.get("memory", context.get("memory", [])), sort_keys=True, default=str).encode()
-            ).hexdigest()[:8],
-        }
-        
-        serialized = json.dumps(hash_components, sort_keys=True)
-        return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+        if isinstance(personal, dict) and "memory" in personal:
+            memory_key, memory = "personal.memory", personal["memory"]
+        else:
+            memory_key, memory = "memory", context.get("memory", [])
+        section = self.digester.section_digest
+        return combine_digests({
+            "agent_id": _value_digest(agent_id),
+            "state": section(agent_id, "state", context.get("state", {})),
+            "environment_context": section(
+                agent_id, "environment_context", context.get("environment_context", {})
+            ),
+            "memory": section(agent_id, memory_key, memory),
+        })
     
     def get(self, context_hash: str) -> Optional[Dict[str, Any]]:
         """Retrieve a cached decision if available."""
@@ -121,7 +192,222 @@ class CognitiveCache:
             logger.warning(f"[Efficiency:Load] Failed to load cache: {e}")
 
 
-# Future Efficiency Tools
+# Draft outcomes where the draft (or template prefix) ends up in the final
+# response. "rejected", "ignored" and "fallback" mean it was discarded.
+DRAFT_ACCEPTED_STATUSES = ("accepted", "completed")
+
+
 class SpeculativeDrafter:
-    """Place-holder for future speculative decoding/drafting logic."""
-    pass
+    """Draft-then-verify layer in front of the main LLM provider.
+
+    Ollama and OpenAI-compatible endpoints do not expose token-level
+    speculative decoding, so drafting works at response granularity:
+
+    * **Draft model** (``draft_invoke`` given): a small local model writes
+      the whole response. If it parses to a JSON object carrying every
+      response-format field, the main provider sees it under the prompt and
+      either replies ``ACCEPT`` (a one-word decode) or writes its own
+      response, which is used instead (status ``rejected``).
+    * **Template** (no draft model): the JSON skeleton derived from the
+      response format is given to the main provider as an already-written
+      prefix, so it only generates the field values (status
+      ``completed``). When the invoke has a ``chat`` attribute the prefix
+      is sent as a trailing assistant turn, which chat providers that
+      support prefill (Anthropic, Ollama ``/api/chat``) continue;
+      otherwise it is appended to the prompt text, which only
+      completion-style endpoints continue. A reply that ignores the
+      prefix and starts its own response is used as-is (status
+      ``ignored``).
+
+    A draft that cannot be used (malformed, or an unusable verdict) falls
+    back to a normal call on the original prompt (status ``fallback``), so
+    output quality never depends on the drafter. Each call's outcome is
+    attached to ``LLMStats.speculative`` (with the draft model's latency
+    and tokens, which are not part of the main call's counts) and
+    accumulated into the audit trace's ``llm_stats``.
+    """
+
+    VERIFY_INSTRUCTION = (
+        "\n\n### [DRAFT RESPONSE]\n{draft}\n\n"
+        "If this draft is exactly the response you would give, reply with the "
+        "single word ACCEPT. Otherwise ignore it and write your own complete "
+        "response in the required format."
+    )
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        delimiters: Tuple[str, str] = ("<<<DECISION_START>>>", "<<<DECISION_END>>>"),
+        draft_invoke: Optional[Callable] = None,
+    ):
+        """Initialize the drafter.
+
+        Args:
+            fields: Response-format field keys, in prompt order. A draft is
+                well-formed only if it carries all of them.
+            delimiters: Response-format start/end delimiters.
+            draft_invoke: Optional draft-model invoke (same signature as the
+                main ``llm_invoke``). ``None`` selects template drafting.
+        """
+        if not fields:
+            raise ValueError("SpeculativeDrafter needs at least one response-format field")
+        self.fields = list(fields)
+        self.delimiters = tuple(delimiters)
+        self.draft_invoke = draft_invoke
+        self._lock = threading.Lock()
+        self._counts = {"accepted": 0, "completed": 0, "rejected": 0, "ignored": 0, "fallback": 0}
+
+    @classmethod
+    def from_response_format(
+        cls, builder: Any, draft_invoke: Optional[Callable] = None
+    ) -> "SpeculativeDrafter":
+        """Build a drafter from a ``ResponseFormatBuilder``."""
+        return cls(
+            fields=list(builder.get_field_types()),
+            delimiters=builder.get_delimiters(),
+            draft_invoke=draft_invoke,
+        )
+
+    def template_prefix(self) -> str:
+        """Skeleton the main provider continues in template mode."""
+        return f'{self.delimiters[0]}\n{{\n  "{self.fields[0]}":'
+
+    def extract_fields(self, text: str) -> Optional[Dict[str, Any]]:
+        """Parse the JSON object between the delimiters, if any."""
+        if not isinstance(text, str):
+            return None
+        start, end = self.delimiters
+        body = text.split(start, 1)[1] if start in text else text
+        body = body.split(end, 1)[0]
+        i, j = body.find("{"), body.rfind("}")
+        if i < 0 or j < i:
+            return None
+        try:
+            obj = json.loads(body[i:j + 1])
+        except ValueError:
+            return None
+        return obj if isinstance(obj, dict) else None
+
+    def is_well_formed(self, text: str) -> bool:
+        obj = self.extract_fields(text)
+        return obj is not None and all(f in obj for f in self.fields)
+
+    def wrap(self, llm_invoke: Callable) -> Callable:
+        """Return an ``llm_invoke`` that routes every call through the drafter.
+
+        A ``chat`` attribute (continuation retries) is forwarded to the
+        main model as is: the history already holds its rejected answer.
+        """
+        def speculative_invoke(prompt: str):
+            return self.invoke(prompt, llm_invoke)
+
+        chat = getattr(llm_invoke, "chat", None)
+        if callable(chat):
+            speculative_invoke.chat = chat
+        return speculative_invoke
+
+    def invoke(self, prompt: str, llm_invoke: Callable):
+        """Draft, verify with ``llm_invoke``, fall back if needed.
+
+        Returns:
+            ``(content, LLMStats)`` with token counts summed over every main
+            provider call and ``speculative`` set to the outcome.
+        """
+        main_stats = []
+        draft_ms = main_ms = 0.0
+        draft_stats = None
+        content = None
+
+        if self.draft_invoke is not None:
+            draft, draft_stats, draft_ms = _timed_call(self.draft_invoke, prompt)
+            status = "fallback"
+            if self.is_well_formed(draft):
+                verdict, stats, main_ms = _timed_call(
+                    llm_invoke, prompt + self.VERIFY_INSTRUCTION.format(draft=draft.strip())
+                )
+                main_stats.append(stats)
+                if verdict.strip().upper().startswith("ACCEPT"):
+                    status, content = "accepted", draft
+                elif self.is_well_formed(verdict):
+                    status, content = "rejected", verdict
+        else:
+            prefix = self.template_prefix()
+            chat = getattr(llm_invoke, "chat", None)
+            if callable(chat):
+                completion, stats, main_ms = _timed_call(chat, [
+                    {"role": "user", "content": prompt},
+                    {"role": "assistant", "content": prefix},
+                ])
+            else:
+                completion, stats, main_ms = _timed_call(llm_invoke, f"{prompt}\n\n{prefix}")
+            main_stats.append(stats)
+            status = "fallback"
+            if self.delimiters[0] in completion:
+                if self.is_well_formed(completion):
+                    status, content = "ignored", completion
+            elif self.is_well_formed(prefix + completion):
+                status, content = "completed", prefix + completion
+
+        if content is None:
+            content, stats, ms = _timed_call(llm_invoke, prompt)
+            main_stats.append(stats)
+            main_ms += ms
+
+        with self._lock:
+            self._counts[status] += 1
+        logger.debug(f"[Efficiency:Draft] {status} (draft {draft_ms:.0f}ms, main {main_ms:.0f}ms)")
+        speculative = {"status": status, "draft_ms": round(draft_ms, 3), "main_ms": round(main_ms, 3)}
+        if draft_stats is not None:
+            speculative["draft_prompt_tokens"] = getattr(draft_stats, "prompt_tokens", 0)
+            speculative["draft_response_tokens"] = getattr(draft_stats, "response_tokens", 0)
+        return content, _merge_stats(main_stats, speculative)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get drafting statistics."""
+        with self._lock:
+            counts = dict(self._counts)
+        total = sum(counts.values())
+        accepted = sum(counts[s] for s in DRAFT_ACCEPTED_STATUSES)
+        return {
+            **counts,
+            "total": total,
+            "acceptance_rate": accepted / total if total > 0 else 0.0,
+        }
+
+
+def _timed_call(invoke: Callable, prompt: Any):
+    """Call an ``llm_invoke`` (or its ``chat``) and normalize to ``(content, LLMStats, ms)``."""
+    from broker.utils.llm_utils import LLMStats, get_llm_stats
+
+    t0 = time.perf_counter()
+    res = invoke(prompt)
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    if isinstance(res, tuple):
+        content, stats = res
+    else:
+        legacy = get_llm_stats()
+        content = res
+        stats = LLMStats(
+            retries=legacy.get("current_retries", 0),
+            success=legacy.get("current_success", True),
+        )
+    return content or "", stats, elapsed_ms
+
+
+def _merge_stats(stats_list: List[Any], speculative: Dict[str, Any]):
+    """Sum per-call ``LLMStats`` into one, tagged with the draft outcome."""
+    from broker.utils.llm_utils import LLMStats
+
+    merged = LLMStats(speculative=speculative)
+    for stats in stats_list:
+        merged.retries += stats.retries
+        merged.success = stats.success
+        merged.empty_content_retries += getattr(stats, "empty_content_retries", 0)
+        merged.empty_content_failure = getattr(stats, "empty_content_failure", False)
+        merged.prompt_tokens += getattr(stats, "prompt_tokens", 0)
+        merged.response_tokens += getattr(stats, "response_tokens", 0)
+        merged.num_ctx = max(merged.num_ctx, getattr(stats, "num_ctx", 0))
+        merged.context_utilization = max(
+            merged.context_utilization, getattr(stats, "context_utilization", 0.0)
+        )
+    return merged
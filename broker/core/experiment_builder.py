@@ -38,12 +38,77 @@ class ExperimentBuilder:
         self._auto_tune = False  # PR: Adaptive Performance Module
         self._exact_output = False # New: bypass model subfolder
         self._phase_order = None  # Agent type groups for phased execution
+        self._phase_orchestrator = None  # DAG phase scheduling
+        self._checkpoint = False  # Year-boundary snapshots
+        self._resume = False      # Continue from the last snapshot
+        self._readiness = None    # Live readiness tracking options
+        self._stage_timings_in_trace = False  # Per-step stage latencies in audit traces
+        self._trace_storage = "full"  # Raw JSONL trace storage: full | compact
+        self._pack_decisions = 0  # Same-type agents per packed LLM call (0 = off)
+        self._preflight_pruning = False  # Drop state-blocked skills from the options
+        self._adaptive_concurrency: Optional[Dict[str, Any]] = None  # AdaptiveConcurrencyConfig fields
+        self._process_workers = 0  # Worker processes deciding agent shards (0 = in-process)
+        self._prefix_scheduling: Optional[Dict[str, Any]] = None  # PrefixScheduler options
+        self._token_budget: Optional[Dict[str, Any]] = None  # TokenBudget options
+        self._batch_execution = False  # One sim_engine.execute_skills() call per phase
 
     def with_workers(self, workers: int = 4):
         """Set number of parallel workers for LLM calls. 1=sequential (default)."""
         self.workers = workers
         return self
 
+    def with_processes(self, processes: int = 4):
+        """Decide agent steps on ``processes`` forked worker processes.
+
+        Agents are sharded across the workers, which build contexts,
+        retrieve memories, call the LLM (``with_workers`` threads each)
+        and validate; execution, state changes and audit traces stay in
+        this process, in agent order. See ``broker.core.process_pool``.
+        ``0`` or ``1`` turns it off. Needs the ``fork`` start method.
+        """
+        self._process_workers = processes
+        return self
+
+    def with_batched_execution(self, enabled: bool = True):
+        """Execute each phase's skills in one ``sim_engine.execute_skills()`` call.
+
+        The phase's agents decide first (``with_workers`` threads), then
+        their approved (or default-fallback) skills are handed to the
+        simulation engine together, in agent order, and audited. The
+        engine must implement ``execute_skills(approved_skills) ->
+        [ExecutionResult]``. Not combinable with packed decisions or
+        worker processes.
+        """
+        self._batch_execution = enabled
+        return self
+
+    def with_adaptive_concurrency(self, min_workers: int = 1, max_workers: int = 8, **options):
+        """Run agents in parallel with an in-flight LLM limit that adapts
+        to observed latency and failures.
+
+        The limit starts at ``min_workers`` and moves between the bounds
+        (AIMD: +1 while latency holds, halved when the median latency
+        degrades or calls fail). ``options`` are further
+        ``AdaptiveConcurrencyConfig`` fields (``window``,
+        ``latency_tolerance``, ``max_error_rate``, ``timeout_s`` ...).
+        Limit changes are recorded in the run manifest.
+        """
+        self._adaptive_concurrency = {"min_limit": min_workers, "max_limit": max_workers, **options}
+        return self
+
+    def with_prefix_scheduling(self, enabled: bool = True, persona_attribute: Optional[str] = None):
+        """Dispatch each phase's LLM requests grouped by shared prompt prefix.
+
+        Agents are ordered by (prompt template, agent type, persona) so the
+        serving engine's prompt cache is not evicted between types. Step
+        ids, seeds and result order stay those of the agent list. The
+        persona is ``agent.config.persona`` unless ``persona_attribute``
+        names another agent attribute (e.g. ``"tenure"``). See
+        ``broker.core.prefix_scheduling``.
+        """
+        self._prefix_scheduling = {"persona_attribute": persona_attribute} if enabled else None
+        return self
+
     def with_auto_tune(self, enabled: bool = True):
         """
         Enable automatic performance tuning based on model size and available VRAM.
@@ -189,6 +254,124 @@ class ExperimentBuilder:
         self._phase_order = phases
         return self
 
+    def with_phase_orchestrator(self, orchestrator: Any):
+        """Schedule phases with a PhaseOrchestrator instead of ``phase_order``.
+
+        Phases whose ``depends_on`` are satisfied run concurrently (bounded
+        by ``orchestrator.max_concurrent_phases``), a phase with
+        ``ordering: parallel`` runs its agents on ``max_workers`` threads,
+        and results are merged in plan order after each dependency wave.
+        Packed decisions and worker processes apply per phase; with
+        either, the phases of a wave run one after another.
+        """
+        self._phase_orchestrator = orchestrator
+        return self
+
+    def with_checkpointing(self, enabled: bool = True, resume: bool = False):
+        """Snapshot run state at every year boundary; optionally resume.
+
+        With ``resume=True`` the runner restores the last complete snapshot
+        in the output directory, truncates partial-year audit tails and
+        continues from the following year. Existing traces are kept rather
+        than cleared, so resume needs the same output path as the killed run.
+        """
+        self._checkpoint = enabled or resume
+        self._resume = resume
+        return self
+
+    def with_readiness_monitor(
+        self,
+        profile: Optional[str] = "functional",
+        snapshot_every: int = 50,
+        early_stop: bool = False,
+        min_decisions: int = 100,
+        profile_yaml: Optional[str] = None,
+    ):
+        """Maintain readiness metrics live while traces are written.
+
+        Rewrites ``readiness_live.json`` in the output directory every
+        ``snapshot_every`` decisions. With ``early_stop=True`` the run
+        stops at the next year boundary once the profile's approval or
+        terminal-rate threshold is clearly breached (after at least
+        ``min_decisions`` decisions).
+        """
+        self._readiness = {
+            "profile": profile,
+            "snapshot_every": snapshot_every,
+            "early_stop": early_stop,
+            "min_decisions": min_decisions,
+            "profile_yaml": profile_yaml,
+        }
+        return self
+
+    def with_stage_timings_in_trace(self, enabled: bool = True):
+        """Add each step's stage latencies (ms) to its audit trace.
+
+        Stage timing itself is always on; the aggregate p50/p95/p99 per
+        stage is written to ``performance_summary.json`` at the end of
+        the run either way.
+        """
+        self._stage_timings_in_trace = enabled
+        return self
+
+    def with_trace_storage(self, mode: str = "compact"):
+        """Choose how raw/*_traces.jsonl is stored: ``"full"`` or ``"compact"``.
+
+        Compact storage writes prompt sections, memory items and state
+        dicts once as content-addressed blobs and memory snapshots as
+        deltas; see ``broker.components.analytics.trace_store``.
+        """
+        self._trace_storage = mode
+        return self
+
+    def with_packed_decisions(self, group_size: int = 8):
+        """Ask up to ``group_size`` same-type agents in one LLM call.
+
+        Shared prompt sections are sent once and the model answers with
+        one decision per agent; each decision is still validated on its
+        own and failing agents are re-asked individually. See
+        ``broker.core.packed_decisions``. ``0`` or ``1`` turns it off.
+        """
+        self._pack_decisions = group_size
+        return self
+
+    def with_token_budget(self, tier_budgets: Optional[Dict[str, int]] = None,
+                          num_ctx: Optional[int] = None, reserve_output: Optional[int] = None,
+                          tokenizer_path: Optional[str] = None, tokenizer_dir: Optional[str] = None):
+        """Fit every prompt to a ``TokenBudget`` (trimming events, social, memory).
+
+        ``num_ctx`` defaults to the smallest context window configured for
+        the agents' types (``llm_params`` over ``global_config.llm`` over
+        ``LLM_CONFIG``) and ``reserve_output`` to their largest positive
+        ``num_predict`` (2048 when unlimited). A ``num_ctx`` above the
+        configured window is logged as a warning: the provider would
+        truncate such prompts. The counter follows the model's tokenizer
+        family (see ``TokenBudget.for_model``). A ``TieredContextBuilder``
+        trims tiers to fit; other context builders only enforce the limit.
+        """
+        self._token_budget = {
+            "tier_budgets": dict(tier_budgets or {}),
+            "num_ctx": num_ctx,
+            "reserve_output": reserve_output,
+            "tokenizer_path": tokenizer_path,
+            "tokenizer_dir": tokenizer_dir,
+        }
+        return self
+
+    def with_preflight_pruning(self, enabled: bool = True):
+        """Leave skills that governance would block on state alone out of
+        the prompt's options.
+
+        Before prompting, each candidate skill is checked by the
+        state-only validators (``AgentValidator.preflight``, which also
+        runs the configured domain's ``@state_only`` builtin checks, and
+        custom validators marked ``@state_only``); blocked skills are not
+        offered and are listed in the trace's ``preflight_pruned``. The
+        chosen skill is still validated as usual.
+        """
+        self._preflight_pruning = enabled
+        return self
+
     def with_governance(self, profile: str, config_path: str):
         self.profile = profile
         self.agent_types_path = config_path
@@ -256,6 +439,25 @@ class ExperimentBuilder:
             )
         if self.workers < 1:
             errors.append(f"Workers must be >= 1, got {self.workers}.")
+        if self._adaptive_concurrency is not None:
+            from broker.utils.performance_tuner import AdaptiveConcurrencyConfig
+            try:
+                AdaptiveConcurrencyConfig(**self._adaptive_concurrency)
+            except (TypeError, ValueError) as e:
+                errors.append(f"Invalid adaptive concurrency settings: {e}")
+        if self._process_workers < 0:
+            errors.append(f"Process worker count must be >= 0, got {self._process_workers}.")
+        elif self._process_workers > 1:
+            from broker.core.process_pool import fork_available
+            if not fork_available():
+                errors.append("Process-pool execution needs the 'fork' start method (Linux, macOS).")
+        if self._pack_decisions < 0:
+            errors.append(f"Packed decision group size must be >= 0, got {self._pack_decisions}.")
+        if self._batch_execution:
+            if not callable(getattr(self.sim_engine, "execute_skills", None)):
+                errors.append("Batched execution needs a simulation engine with execute_skills().")
+            if self._pack_decisions > 1 or self._process_workers > 1:
+                errors.append("Batched execution cannot be combined with packed decisions or worker processes.")
         if self.num_years < 1 and (self.num_steps is None or self.num_steps < 1):
             errors.append("Simulation must run for at least 1 year/step.")
         return errors
@@ -367,7 +569,9 @@ class ExperimentBuilder:
 
         audit_cfg = AuditConfig(
             output_dir=str(final_output_path),
-            experiment_name=self.model
+            experiment_name=self.model,
+            clear_existing_traces=not self._resume,
+            trace_storage=self._trace_storage,
         )
         audit_writer = GenericAuditWriter(audit_cfg)
 
@@ -421,6 +625,15 @@ class ExperimentBuilder:
         from broker.utils.agent_config import AgentTypeConfig
         config = AgentTypeConfig.load(self.agent_types_path)
 
+        if self._token_budget is not None:
+            if hasattr(ctx_builder, 'token_budget'):
+                ctx_builder.token_budget = self._build_token_budget(config)
+            else:
+                logger.warning(
+                    f"[Context:TokenBudget] {type(ctx_builder).__name__} does not support "
+                    f"token budgets; with_token_budget() is ignored"
+                )
+
         broker = SkillBrokerEngine(
             skill_registry=reg,
             model_adapter=adapter,
@@ -430,8 +643,10 @@ class ExperimentBuilder:
             config=config,           # Added for generic logging
             audit_writer=audit_writer,
             log_prompt=self.verbose,
-            custom_validators=self.custom_validators # Pass custom validators
+            custom_validators=self.custom_validators, # Pass custom validators
+            preflight_pruning=self._preflight_pruning,
         )
+        broker.profiler.include_in_trace = self._stage_timings_in_trace
 
         # PR 11: Pass active project dir to adapter
         if hasattr(adapter, 'project_dir') and self.agent_types_path:
@@ -447,6 +662,13 @@ class ExperimentBuilder:
             verbose=self.verbose,
             workers=self.workers,  # PR: Multiprocessing Core
             phase_order=getattr(self, '_phase_order', None),
+            checkpoint=self._checkpoint,
+            resume=self._resume,
+            pack_decisions=self._pack_decisions,
+            adaptive_concurrency=self._adaptive_concurrency,
+            process_workers=self._process_workers,
+            prefix_scheduling=self._prefix_scheduling,
+            batch_execution=self._batch_execution,
         )
 
         runner = ExperimentRunner(
@@ -455,6 +677,63 @@ class ExperimentBuilder:
             agents=self.agents,
             config=exp_config,
             memory_engine=mem_engine,
-            hooks=self.hooks
+            hooks=self.hooks,
+            phase_orchestrator=self._phase_orchestrator,
         )
+        if self._readiness is not None:
+            runner.attach_readiness_tracker(
+                self._build_readiness_tracker(final_output_path)
+            )
         return runner
+
+    def _build_token_budget(self, config: Any) -> Any:
+        """``TokenBudget`` sized from the agents' configured context windows."""
+        from broker.components.context.token_budget import TokenBudget
+        from broker.utils.llm_utils import LLM_CONFIG
+
+        opts = self._token_budget
+        agent_types = sorted({getattr(a, 'agent_type', 'default') for a in self.agents.values()})
+        params = [config.get_llm_params(t) for t in agent_types] or [{}]
+        window = min(p.get("num_ctx", LLM_CONFIG.num_ctx) for p in params)
+        predicts = [p.get("num_predict", LLM_CONFIG.num_predict) for p in params]
+        reserve = opts["reserve_output"]
+        if reserve is None:
+            reserve = max((n for n in predicts if n > 0), default=2048)
+        num_ctx = opts["num_ctx"] if opts["num_ctx"] is not None else window
+        if num_ctx > window:
+            logger.warning(
+                f"[Context:TokenBudget] Budget num_ctx={num_ctx} exceeds the configured "
+                f"context window ({window} tokens); the provider will truncate longer prompts"
+            )
+        budget = TokenBudget.for_model(
+            self.model, num_ctx=num_ctx, reserve_output=reserve,
+            tier_budgets=opts["tier_budgets"],
+            tokenizer_path=opts["tokenizer_path"], tokenizer_dir=opts["tokenizer_dir"],
+        )
+        logger.info(
+            f"[Context:TokenBudget] Prompt limit {budget.prompt_limit} tokens "
+            f"(num_ctx={num_ctx}, reserve_output={reserve})"
+        )
+        return budget
+
+    def _build_readiness_tracker(self, output_dir: Path) -> Any:
+        from broker.components.analytics.readiness import (
+            LIVE_SNAPSHOT_FILE,
+            ReadinessTracker,
+        )
+        from broker.components.validation.readiness_profile import (
+            load_readiness_profile,
+        )
+
+        opts = self._readiness
+        profile = None
+        if opts["profile"]:
+            yaml_path = Path(opts["profile_yaml"]) if opts["profile_yaml"] else None
+            profile = load_readiness_profile(opts["profile"], yaml_path=yaml_path)
+        return ReadinessTracker(
+            profile=profile,
+            snapshot_path=output_dir / LIVE_SNAPSHOT_FILE,
+            snapshot_every=opts["snapshot_every"],
+            early_stop=opts["early_stop"],
+            min_decisions=opts["min_decisions"],
+        )
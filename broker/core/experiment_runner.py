@@ -3,11 +3,13 @@ Experiment Runner — simulation loop engine.
 
 Extracted from experiment.py (Phase 2.1 split).
 """
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 import json
 import random
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from broker.agents import BaseAgent
@@ -16,9 +18,45 @@ from ..interfaces.lifecycle_protocols import PreYearHook, PostStepHook, PostYear
 from .skill_broker_engine import SkillBrokerEngine
 from ..components.context.builder import BaseAgentContextBuilder
 from ..components.memory.engine import MemoryEngine, WindowMemoryEngine, HierarchicalMemoryEngine
+from ..components.analytics.latency import StageProfiler
 from ..utils.agent_config import GovernanceAuditor
 from ..utils.logging import logger
-from .efficiency import CognitiveCache
+from .efficiency import CognitiveCache, SpeculativeDrafter
+from .checkpoint import CheckpointManager
+from .packed_decisions import PackedDecisionBatch
+from .process_pool import AgentProcessPool
+from .prefix_scheduling import PrefixReuseStats, PrefixScheduler
+from ..utils.performance_tuner import AdaptiveConcurrencyConfig, AdaptiveConcurrencyController
+
+
+class _DeferredAuditWriter:
+    """Audit writer stand-in used while phases of one wave run concurrently.
+
+    Traces are held until the wave finishes and then written in plan
+    order (phase declaration order, then agent order within the phase),
+    so audit files do not depend on thread scheduling.
+    """
+
+    def __init__(self, writer: Any):
+        self._writer = writer
+        self._lock = threading.Lock()
+        self._pending: List[tuple] = []
+
+    def write_trace(self, agent_type: str, trace: Dict[str, Any], *args, **kwargs) -> None:
+        with self._lock:
+            self._pending.append((trace.get("agent_id"), agent_type, trace, args, kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._writer, name)
+
+    def flush(self, agent_order: List[str]) -> None:
+        rank = {aid: i for i, aid in enumerate(agent_order)}
+        # sorted() is stable: one agent's traces keep their write order.
+        pending = sorted(self._pending, key=lambda p: rank.get(p[0], len(rank)))
+        self._pending = []
+        for _, agent_type, trace, args, kwargs in pending:
+            self._writer.write_trace(agent_type, trace, *args, **kwargs)
+
 
 @dataclass
 class ExperimentConfig:
@@ -34,6 +72,16 @@ class ExperimentConfig:
     verbose: bool = False
     workers: int = 1  # Number of parallel workers for LLM calls (1=sequential)
     phase_order: Optional[List[List[str]]] = None  # Agent type groups for phased execution
+    checkpoint: bool = False  # Snapshot state at every year boundary
+    resume: bool = False  # Continue from the last complete checkpoint (implies checkpoint)
+    pack_decisions: int = 0  # Same-type agents per packed LLM call (0/1 = one call per agent)
+    # AdaptiveConcurrencyConfig fields; set = parallel run with an adaptive in-flight limit
+    adaptive_concurrency: Optional[Dict[str, Any]] = None
+    process_workers: int = 0  # Worker processes deciding agent shards (0/1 = in-process)
+    # PrefixScheduler options; set = dispatch each phase grouped by prompt prefix
+    prefix_scheduling: Optional[Dict[str, Any]] = None
+    # Execute each phase's skills in one sim_engine.execute_skills() call
+    batch_execution: bool = False
 
 class ExperimentRunner:
     """Engine that runs the simulation loop."""
@@ -43,7 +91,8 @@ class ExperimentRunner:
                  agents: Dict[str, BaseAgent],
                  config: ExperimentConfig,
                  memory_engine: Optional[MemoryEngine] = None,
-                 hooks: Optional[Dict[str, Callable]] = None):
+                 hooks: Optional[Dict[str, Callable]] = None,
+                 phase_orchestrator: Optional[Any] = None):
         self.broker = broker
         self.sim_engine = sim_engine
         self.agents = agents
@@ -51,6 +100,8 @@ class ExperimentRunner:
         self.step_counter = 0
         self.memory_engine = memory_engine or WindowMemoryEngine(window_size=3)
         self.hooks = hooks or {}
+        # PhaseOrchestrator: DAG phase scheduling (takes precedence over phase_order)
+        self.phase_orchestrator = phase_orchestrator
 
         # Validate hook signatures (warning only, non-breaking)
         _hook_protocols = {
@@ -72,10 +123,47 @@ class ExperimentRunner:
 
         # Cache for llm_invoke functions per agent type
         self._llm_cache = {}
+        # SpeculativeDrafter per agent type (llm_params.speculative)
+        self.drafters: Dict[str, SpeculativeDrafter] = {}
+        # Agent types whose speculative drafting another setting turned off, with why
+        self.drafting_disabled: Dict[str, str] = {}
+        # LLM calls made in packed decision mode (config.pack_decisions)
+        self.packed_stats = {"packed_calls": 0, "individual_calls": 0}
+        # Adaptive in-flight LLM request limit (config.adaptive_concurrency)
+        self.concurrency: Optional[AdaptiveConcurrencyController] = None
+        if config.adaptive_concurrency is not None:
+            self.concurrency = AdaptiveConcurrencyController(
+                AdaptiveConcurrencyConfig(**config.adaptive_concurrency)
+            )
+        self._gated_llm: Dict[str, tuple] = {}
+        # Forked at the first phase in process mode (config.process_workers)
+        self._process_pool: Optional[AgentProcessPool] = None
+        # Dispatch order grouped by shared prompt prefix (config.prefix_scheduling)
+        self.prefix_scheduler: Optional[PrefixScheduler] = None
+        if config.prefix_scheduling is not None:
+            self.prefix_scheduler = PrefixScheduler(
+                templates=getattr(self.broker.context_builder, "prompt_templates", None),
+                **config.prefix_scheduling,
+            )
 
         # [Efficiency Hub] Cognitive Caching for decision reuse
         persistence_path = config.output_dir / "cognitive_cache.json"
         self.efficiency = CognitiveCache(persistence_path=persistence_path)
+        # The broker's audit context hash reuses the same section digests
+        self.broker.context_digester = self.efficiency.digester
+
+        # Extra stateful objects captured by year-boundary checkpoints
+        self.checkpoint_objects: Dict[str, Any] = {}
+        self.checkpoints = CheckpointManager(config.output_dir)
+        # Live readiness metrics (see attach_readiness_tracker)
+        self.readiness_tracker: Optional[Any] = None
+        # Stage latency histograms survive resume with the run
+        profiler = getattr(self.broker, "profiler", None)
+        if isinstance(profiler, StageProfiler):
+            self.register_checkpoint_object("stage_profiler", profiler)
+        prefix_reuse = getattr(self.broker, "prefix_reuse", None)
+        if isinstance(prefix_reuse, PrefixReuseStats):
+            self.register_checkpoint_object("prefix_reuse", prefix_reuse)
 
     @property
     def llm_invoke(self) -> Callable:
@@ -95,6 +183,19 @@ class ExperimentRunner:
 
         If ``model`` is not specified in ``llm_params``, the CLI/builder model
         (``self.config.model``) is used as fallback.
+
+        ``llm_params.speculative`` routes the type's calls through a
+        :class:`~broker.core.efficiency.SpeculativeDrafter` built from its
+        response format (``draft_model`` omitted = template drafting;
+        ignored with packed decisions):
+
+        .. code-block:: yaml
+
+            household:
+              llm_params:
+                speculative:
+                  enabled: true
+                  draft_model: gemma3:1b
         """
         if agent_type not in self._llm_cache:
             from broker.utils.llm_utils import create_llm_invoke
@@ -113,14 +214,84 @@ class ExperimentRunner:
             }:
                 model_override = None
             model_name = model_override or self.config.model
+            speculative_cfg = overrides.pop("speculative", None) or {}
 
-            self._llm_cache[agent_type] = create_llm_invoke(
+            llm_invoke = create_llm_invoke(
                 model_name,
                 verbose=self.config.verbose,
                 overrides=overrides
             )
+            if speculative_cfg.get("enabled", False):
+                if self.config.pack_decisions > 1:
+                    # A draft holds one decision; packed prompts ask for an array
+                    self._disable_drafting(agent_type, "pack_decisions")
+                else:
+                    llm_invoke = self._wrap_speculative(agent_type, llm_invoke, speculative_cfg)
+            self._llm_cache[agent_type] = llm_invoke
         return self._llm_cache[agent_type]
 
+    def _gated_llm_invoke(self, agent_type: str) -> Callable:
+        """``get_llm_invoke`` behind the adaptive concurrency limit, if any."""
+        llm_invoke = self.get_llm_invoke(agent_type)
+        controller = getattr(self, "concurrency", None)
+        if controller is None:
+            return llm_invoke
+        cached = self._gated_llm.get(agent_type)
+        if cached is None or cached[0] is not llm_invoke:
+            cached = (llm_invoke, controller.wrap(llm_invoke))
+            self._gated_llm[agent_type] = cached
+        return cached[1]
+
+    def _wrap_speculative(self, agent_type: str, llm_invoke: Callable, speculative_cfg: Dict) -> Callable:
+        """Wrap ``llm_invoke`` in a SpeculativeDrafter for ``agent_type``."""
+        from broker.components.response_format import ResponseFormatBuilder
+        from broker.utils.llm_utils import create_llm_invoke
+
+        cfg = self.broker.config
+        shared_config = {"response_format": cfg.get_shared("response_format", {})}
+        builder = ResponseFormatBuilder(cfg.get(agent_type) or {}, shared_config)
+        if not builder.get_field_types():
+            self._disable_drafting(agent_type, "no_response_format_fields")
+            return llm_invoke
+
+        draft_model = speculative_cfg.get("draft_model")
+        draft_invoke = create_llm_invoke(draft_model, verbose=self.config.verbose) if draft_model else None
+        drafter = SpeculativeDrafter.from_response_format(builder, draft_invoke=draft_invoke)
+        self.drafters[agent_type] = drafter
+        logger.info(
+            f"[Efficiency:Draft] Speculative drafting for '{agent_type}' "
+            f"({'draft model ' + draft_model if draft_model else 'template'})"
+        )
+        return drafter.wrap(llm_invoke)
+
+    def _disable_drafting(self, agent_type: str, reason: str) -> None:
+        """Record (and warn) that ``agent_type``'s configured drafting is off."""
+        self.drafting_disabled[agent_type] = reason
+        logger.warning(
+            f"[Efficiency:Draft] Speculative drafting for '{agent_type}' is enabled "
+            f"in llm_params but disabled ({reason}); calls go straight to the model"
+        )
+
+    def register_checkpoint_object(self, name: str, obj: Any) -> None:
+        """Include a domain object (e.g. a lifecycle-hook state holder) in checkpoints.
+
+        Agents, the memory engine, the simulation engine, the interaction
+        hub, the cognitive cache and audit/governance counters are captured
+        automatically; register anything else that carries state across years.
+        """
+        self.checkpoint_objects[name] = obj
+
+    def attach_readiness_tracker(self, tracker: Any) -> None:
+        """Feed every audit trace to a ``ReadinessTracker``.
+
+        The tracker is checkpointed with the run, and when it flags a
+        clear profile breach (``early_stop=True``) the loop stops at the
+        next year boundary and finalizes normally.
+        """
+        self.readiness_tracker = tracker
+        self.broker.audit_writer.readiness_tracker = tracker
+        self.register_checkpoint_object("readiness_tracker", tracker)
+
     @property
     def current_step(self) -> int:
         """Alias for the simulation loop cycle."""
@@ -130,7 +301,23 @@ class ExperimentRunner:
     def run(self, llm_invoke: Optional[Callable] = None):
         """Standardized simulation loop."""
         llm_invoke = llm_invoke or self.llm_invoke
-        run_id = f"exp_{random.randint(1000, 9999)}"
+        start_step = 1
+        resumed = self.checkpoints.restore(self) if self.config.resume else None
+        if resumed:
+            run_id = resumed["run_id"]
+            start_step = resumed["year"] + 1
+            if self.readiness_tracker is not None:
+                # A snapshot taken without a tracker restores the writer's slot to None.
+                self.broker.audit_writer.readiness_tracker = self.readiness_tracker
+        else:
+            if self.config.resume:
+                logger.warning(
+                    f"[Checkpoint] --resume requested but no checkpoint found in "
+                    f"{self.checkpoints.checkpoint_dir}; starting from the beginning"
+                )
+                # Traces were kept for the resume; without a snapshot they are stale.
+                self.checkpoints.truncate_audit({})
+            run_id = f"exp_{random.randint(1000, 9999)}"
         logger.info(f"Starting Experiment: {self.config.experiment_name} | Model: {self.config.model}")
 
         # Inject model name into broker for audit trace enrichment
@@ -151,7 +338,7 @@ class ExperimentRunner:
         iterations = self.config.num_steps or self.config.num_years
 
         try:
-            for step in range(1, iterations + 1):
+            for step in range(start_step, iterations + 1):
                 self._current_year = step # internal tracker
                 # Environment update (Attempt advance_step first, fallback to advance_year)
                 if hasattr(self.sim_engine, 'advance_step'):
@@ -175,38 +362,36 @@ class ExperimentRunner:
                 if "pre_year" in self.hooks:
                     self.hooks["pre_year"](step, env, self.agents)
 
-                # Filter only active agents (Generic approach)
-                active_agents = [
-                    a for a in self.agents.values()
-                    if getattr(a, 'is_active', True)
-                ]
-
-                # Partition agents into phases (if phase_order configured)
-                if self.config.phase_order:
-                    agent_phases = self._partition_by_phase(active_agents)
+                if self.phase_orchestrator is not None:
+                    self._run_phase_waves(step, run_id, llm_invoke, env)
                 else:
-                    agent_phases = [active_agents]  # Single phase (backward compatible)
-
-                # Execute each phase sequentially, agents within phase sequential or parallel
-                for phase_agents in agent_phases:
-                    if not phase_agents:
-                        continue
-                    if self.config.workers > 1:
-                        results = self._run_agents_parallel(phase_agents, run_id, llm_invoke, env)
+                    # Filter only active agents (Generic approach)
+                    active_agents = [
+                        a for a in self.agents.values()
+                        if getattr(a, 'is_active', True)
+                    ]
+
+                    # Partition agents into phases (if phase_order configured)
+                    if self.config.phase_order:
+                        agent_phases = self._partition_by_phase(active_agents)
                     else:
-                        results = self._run_agents_sequential(phase_agents, run_id, llm_invoke, env)
-
-                    # Apply results and trigger post-step hooks
-                    for agent, result in results:
-                        if result.outcome in (SkillOutcome.REJECTED, SkillOutcome.UNCERTAIN):
-                            # REJECTED: no state change, no memory — only audit trace
-                            if "post_step" in self.hooks:
-                                self.hooks["post_step"](agent, result)
+                        agent_phases = [active_agents]  # Single phase (backward compatible)
+
+                    # Execute each phase sequentially, agents within phase sequential or parallel
+                    for phase_agents in agent_phases:
+                        if not phase_agents:
                             continue
-                        if result.execution_result and result.execution_result.success:
-                            self._apply_state_changes(agent, result)
-                        if "post_step" in self.hooks:
-                            self.hooks["post_step"](agent, result)
+                        step_ids = None
+                        dispatched = phase_agents
+                        if self.prefix_scheduler is not None:
+                            step_ids = list(range(self.step_counter + 1, self.step_counter + 1 + len(phase_agents)))
+                            self.step_counter += len(phase_agents)
+                            dispatched, step_ids = self._prefix_order(phase_agents, step_ids)
+                        results = self._dispatch_agents(dispatched, run_id, llm_invoke, env, step_ids=step_ids)
+                        if dispatched is not phase_agents:
+                            rank = {id(a): i for i, a in enumerate(phase_agents)}
+                            results = sorted(results, key=lambda r: rank[id(r[0])])
+                        self._apply_results(results)
 
                 # --- Lifecycle Hook: Post-Step-End / Post-Year ---
                 # Dual trigger for generic compatibility
@@ -216,11 +401,133 @@ class ExperimentRunner:
                     self.hooks["post_year"](step, self.agents)
 
                 self._finalize_step(step)
+                if self.config.checkpoint or self.config.resume:
+                    self.checkpoints.save(self, step, run_id)
+                if self.readiness_tracker is not None and self.readiness_tracker.should_stop:
+                    logger.warning(
+                        f"[Readiness] Stopping after {term.lower()} {step}/{iterations}: "
+                        f"{self.readiness_tracker.stop_reason}"
+                    )
+                    break
         finally:
             self._finalize_experiment(iterations)
 
+    def _apply_results(self, results: List) -> None:
+        """Apply results and trigger post-step hooks, in the given order."""
+        for agent, result in results:
+            if result.outcome in (SkillOutcome.REJECTED, SkillOutcome.UNCERTAIN):
+                # REJECTED: no state change, no memory — only audit trace
+                if "post_step" in self.hooks:
+                    self.hooks["post_step"](agent, result)
+                continue
+            if result.execution_result and result.execution_result.success:
+                self._apply_state_changes(agent, result)
+            if "post_step" in self.hooks:
+                self.hooks["post_step"](agent, result)
+
+    def _dispatch_agents(self, agents: List, run_id: str, llm_invoke: Callable, env: Dict,
+                         step_ids: Optional[List[int]] = None,
+                         workers: Optional[int] = None) -> List:
+        """Run one phase's agents in the configured execution mode.
+
+        ``pack_decisions``, ``process_workers`` and ``batch_execution``
+        take precedence; then threads (``config.workers`` or adaptive
+        concurrency), else sequential. ``workers`` is a PhaseOrchestrator phase's thread
+        count (1 for a sequential phase) and replaces ``config.workers``.
+        """
+        if self.config.pack_decisions > 1:
+            return self._run_agents_packed(agents, run_id, env, step_ids=step_ids)
+        if self.config.process_workers > 1:
+            return self._run_agents_processes(agents, run_id, env, step_ids=step_ids)
+        if self.config.batch_execution:
+            return self._run_agents_batched(agents, run_id, env, step_ids=step_ids, workers=workers)
+        if workers is None:
+            if self.config.workers > 1 or getattr(self, "concurrency", None) is not None:
+                return self._run_agents_parallel(agents, run_id, llm_invoke, env, step_ids=step_ids)
+        elif workers > 1:
+            return self._run_agents_parallel(agents, run_id, llm_invoke, env, workers=workers, step_ids=step_ids)
+        return self._run_agents_sequential(agents, run_id, llm_invoke, env, step_ids=step_ids)
+
+    def _run_phase_waves(self, step: int, run_id: str, llm_invoke: Callable, env: Dict) -> None:
+        """Execute one step as PhaseOrchestrator dependency waves.
+
+        Phases of a wave run concurrently (at most
+        ``max_concurrent_phases``); a phase with ``ordering: parallel``
+        runs its agents on ``max_workers`` threads. Nothing is applied
+        until the whole wave has finished; results, post-step hooks and
+        audit traces are then merged in plan order, and the next wave
+        sees the merged state. Step ids (and so per-call seeds) are
+        assigned in plan order up front, so the outcome does not depend
+        on scheduling.
+
+        Each phase goes through ``_dispatch_agents``, so packed decisions,
+        worker processes and batched execution apply here too; with any
+        of them, the phases of a wave run one after another, keeping
+        skill execution on the runner thread and the process pool
+        single-caller. Adaptive
+        concurrency gates the LLM calls of ``parallel`` phases.
+        """
+        orchestrator = self.phase_orchestrator
+        active = {
+            aid: a for aid, a in self.agents.items()
+            if getattr(a, 'is_active', True)
+        }
+        for wave in orchestrator.get_execution_waves(active, current_step=step):
+            wave = [(pc, ids) for pc, ids in wave if ids]
+            if not wave:
+                continue
+
+            step_ids = []
+            for _, ids in wave:
+                step_ids.append(list(range(self.step_counter + 1, self.step_counter + 1 + len(ids))))
+                self.step_counter += len(ids)
+
+            def run_phase(index: int) -> List:
+                pc, ids = wave[index]
+                phase_agents = [active[aid] for aid in ids]
+                phase_step_ids = step_ids[index]
+                if self.prefix_scheduler is not None:
+                    phase_agents, phase_step_ids = self._prefix_order(phase_agents, phase_step_ids)
+                workers = pc.max_workers if pc.ordering == "parallel" else 1
+                return self._dispatch_agents(
+                    phase_agents, run_id, llm_invoke, env, step_ids=phase_step_ids, workers=workers,
+                )
+
+            plan_order = [aid for _, ids in wave for aid in ids]
+            writer = self.broker.audit_writer
+            deferred = _DeferredAuditWriter(writer) if writer is not None else None
+            if deferred is not None:
+                self.broker.audit_writer = deferred
+            try:
+                concurrency = min(len(wave), orchestrator.max_concurrent_phases)
+                if (self.config.pack_decisions > 1 or self.config.process_workers > 1
+                        or self.config.batch_execution):
+                    concurrency = 1
+                if concurrency > 1:
+                    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                        phase_results = list(executor.map(run_phase, range(len(wave))))
+                else:
+                    phase_results = [run_phase(i) for i in range(len(wave))]
+            finally:
+                if deferred is not None:
+                    self.broker.audit_writer = writer
+                    deferred.flush(plan_order)
+
+            for (_, ids), results in zip(wave, phase_results):
+                rank = {id(active[aid]): i for i, aid in enumerate(ids)}
+                self._apply_results(sorted(results, key=lambda r: rank[id(r[0])]))
+
+    def _prefix_order(self, agents: List, step_ids: List[int]) -> Tuple[List, List[int]]:
+        """``agents`` and their step ids in prefix-grouped dispatch order."""
+        order = self.prefix_scheduler.order(agents)
+        return [agents[i] for i in order], [step_ids[i] for i in order]
+
     def _finalize_experiment(self, iterations: int):
         """Finalize outputs even if the run exits early."""
+        process_pool = getattr(self, "_process_pool", None)
+        if process_pool is not None:
+            process_pool.close()
+            self._process_pool = None
         if hasattr(self.broker.audit_writer, 'finalize'):
             self.broker.audit_writer.finalize()
 
@@ -241,6 +548,19 @@ class ExperimentRunner:
             "agent_types_config": str(self.broker.model_adapter.config_path) if hasattr(self.broker.model_adapter, 'config_path') else "unknown",
         }
         manifest.update(self._collect_reproducibility_metadata())
+        if getattr(self, "packed_stats", None) is not None and self.config.pack_decisions > 1:
+            # Packed prompts differ from per-agent ones; record the mode
+            manifest["packed_decisions"] = {"group_size": self.config.pack_decisions, **self.packed_stats}
+        if process_pool is not None:
+            manifest["process_workers"] = process_pool.processes
+        if getattr(self, "concurrency", None) is not None:
+            # Limit changes with the latency/failure window behind each
+            manifest["adaptive_concurrency"] = self.concurrency.to_dict()
+        if getattr(self, "prefix_scheduler", None) is not None:
+            manifest["prefix_scheduling"] = self.prefix_scheduler.to_dict()
+        prefix_reuse = getattr(self.broker, "prefix_reuse", None)
+        if isinstance(prefix_reuse, PrefixReuseStats) and prefix_reuse.reported:
+            manifest["prefix_reuse"] = prefix_reuse.to_dict()
         # Memory write policy snapshot (populated if the engine is wrapped by
         # PolicyFilteredMemoryEngine). This captures the policy and dropped-count
         # summary so the audit trace explains any "missing" memories unambiguously.
@@ -307,6 +627,13 @@ class ExperimentRunner:
                 exc_info=True,
             )
 
+        profiler = getattr(self.broker, "profiler", None)
+        if isinstance(profiler, StageProfiler):
+            try:
+                profiler.write_summary(self.config.output_dir)
+            except OSError as e:
+                logger.error(f"[Finalize] performance_summary.json write failed: {e}")
+
         try:
             self.broker.auditor.save_summary(summary_path)
         except OSError as e:
@@ -325,8 +652,9 @@ class ExperimentRunner:
         # 1. Query Ollama for model digest
         try:
             import requests
+            from broker.utils.llm_utils import ollama_base_url
             r = requests.post(
-                "http://localhost:11434/api/show",
+                f"{ollama_base_url()}/api/show",
                 json={"name": self.config.model},
                 timeout=5,
             )
@@ -379,6 +707,15 @@ class ExperimentRunner:
         except Exception:
             pass
 
+        # 4b. Speculative drafting outcomes per agent type
+        drafters = getattr(self, "drafters", None)
+        if drafters:
+            metadata["speculative_drafting"] = {
+                agent_type: drafter.get_stats() for agent_type, drafter in drafters.items()
+            }
+        if getattr(self, "drafting_disabled", None):
+            metadata["speculative_drafting_disabled"] = dict(self.drafting_disabled)
+
         # 5. Timestamp and Python version
         import sys
         from datetime import datetime
@@ -511,82 +848,104 @@ class ExperimentRunner:
         """Legacy alias for _finalize_step."""
         self._finalize_step(year)
 
-    def _run_agents_sequential(self, agents: List, run_id: str, llm_invoke: Callable, env: Dict) -> List:
-        """Execute agent steps sequentially. Default mode."""
+    def _cache_lookup(self, agent: BaseAgent, env: Dict,
+                      tag: str = "Efficiency") -> Tuple[Optional[SkillBrokerResult], str]:
+        """Cognitive cache check: ``(cached result or None, context hash)``.
+
+        A hit is re-validated by governance first; an entry governance
+        now rejects is invalidated and reported as a miss.
+        """
+        # Build context early to compute hash
+        context = self.broker.context_builder.build(agent.id, env_context=env)
+        context_hash = self.efficiency.compute_hash(context)
+
+        cached_data = self.efficiency.get(context_hash)
+        if not cached_data:
+            return None, context_hash
+        logger.info(f"[{tag}] Cache HIT for {agent.id} (Hash={context_hash[:8]}). Bypassing LLM.")
+
+        # Restore reasoning metadata to ensure AuditWriter can find appraisals
+        cached_proposal = cached_data.get("skill_proposal") or {}
+        proposal = SkillProposal(
+            skill_name=(cached_proposal.get("skill_name") or self.broker.skill_registry.get_default_skill()),
+            agent_id=agent.id,
+            reasoning=cached_proposal.get("reasoning", {}),
+            agent_type=cached_proposal.get("agent_type", "default")
+        )
+
+        # Basic reconstruction (Logic here should match SkillBrokerResult structure)
+        result = SkillBrokerResult(
+            outcome=SkillOutcome(cached_data.get("outcome", "APPROVED")),
+            skill_proposal=proposal, # Restore proposal for audit
+            approved_skill=ApprovedSkill(
+                skill_name=(cached_data.get("approved_skill", {}).get("skill_name") or self.broker.skill_registry.get_default_skill()),
+                agent_id=agent.id,
+                approval_status="APPROVED",
+                execution_mapping=cached_data.get("approved_skill", {}).get("mapping", "sim.noop")
+            ),
+            execution_result=ExecutionResult(
+                success=True,
+                state_changes=cached_data.get("execution_result", {}).get("state_changes", {})
+            ),
+            validation_errors=[],
+            retry_count=0
+        )
+        if hasattr(self.broker, "_run_validators"):
+            cached_proposal_obj = SkillProposal(
+                skill_name=(cached_data.get("approved_skill", {}).get("skill_name") or self.broker.skill_registry.get_default_skill()),
+                agent_id=agent.id,
+                reasoning=cached_data.get("skill_proposal", {}).get("reasoning", {}),
+                agent_type=getattr(agent, 'agent_type', 'default')
+            )
+            # Wrap context the same way process_step() does for custom validators
+            cache_validation_context = {
+                "agent_state": context,
+                "agent_type": getattr(agent, 'agent_type', 'default'),
+                "env_state": env,
+                **context.get("state", {}),
+                **env
+            }
+            val_results = self.broker._run_validators(cached_proposal_obj, cache_validation_context)
+            if not all(v.valid for v in val_results):
+                logger.warning(f"[{tag}] Cache HIT for {agent.id} INVALIDATED by governance. Re-running.")
+                self.efficiency.invalidate(context_hash)
+                return None, context_hash
+        return result, context_hash
+
+    def _run_agents_sequential(self, agents: List, run_id: str, llm_invoke: Callable, env: Dict,
+                               step_ids: Optional[List[int]] = None,
+                               llm_invoke_for: Optional[Callable] = None) -> List:
+        """Execute agent steps sequentially. Default mode.
+
+        ``step_ids`` supplies pre-assigned step ids (one per agent) instead
+        of advancing ``step_counter``; ``llm_invoke_for(agent)`` replaces
+        the agent type's ``llm_invoke``.
+        """
         results = []
-        for agent in agents:
-            try:
+        for i, agent in enumerate(agents):
+            if step_ids is None:
                 self.step_counter += 1
+                step_id = self.step_counter
+            else:
+                step_id = step_ids[i]
+            try:
 
                 # [Efficiency Hub] Cognitive Cache Check
-                ctx_builder = self.broker.context_builder
-                # Build context early to compute hash
-                context = ctx_builder.build(agent.id, env_context=env)
-                context_hash = self.efficiency.compute_hash(context)
-
-                cached_data = self.efficiency.get(context_hash)
-                if cached_data:
-                    logger.info(f"[Efficiency] Cache HIT for {agent.id} (Hash={context_hash[:8]}). Bypassing LLM.")
-                    # Reconstruct result from cache
-
-                    # Restore reasoning metadata to ensure AuditWriter can find appraisals
-                    cached_proposal = cached_data.get("skill_proposal") or {}
-                    proposal = SkillProposal(
-                        skill_name=(cached_proposal.get("skill_name") or self.broker.skill_registry.get_default_skill()),
-                        agent_id=agent.id,
-                        reasoning=cached_proposal.get("reasoning", {}),
-                        agent_type=cached_proposal.get("agent_type", "default")
-                    )
-
-                    # Basic reconstruction (Logic here should match SkillBrokerResult structure)
-                    result = SkillBrokerResult(
-                        outcome=SkillOutcome(cached_data.get("outcome", "APPROVED")),
-                        skill_proposal=proposal, # Restore proposal for audit
-                        approved_skill=ApprovedSkill(
-                            skill_name=(cached_data.get("approved_skill", {}).get("skill_name") or self.broker.skill_registry.get_default_skill()),
-                            agent_id=agent.id,
-                            approval_status="APPROVED",
-                            execution_mapping=cached_data.get("approved_skill", {}).get("mapping", "sim.noop")
-                        ),
-                        execution_result=ExecutionResult(
-                            success=True,
-                            state_changes=cached_data.get("execution_result", {}).get("state_changes", {})
-                        ),
-                        validation_errors=[],
-                        retry_count=0
-                    )
-                    if hasattr(self.broker, "_run_validators"):
-                        cached_proposal_obj = SkillProposal(
-                            skill_name=(cached_data.get("approved_skill", {}).get("skill_name") or self.broker.skill_registry.get_default_skill()),
-                            agent_id=agent.id,
-                            reasoning=cached_data.get("skill_proposal", {}).get("reasoning", {}),
-                            agent_type=getattr(agent, 'agent_type', 'default')
-                        )
-                        # Wrap context the same way process_step() does for custom validators
-                        cache_validation_context = {
-                            "agent_state": context,
-                            "agent_type": getattr(agent, 'agent_type', 'default'),
-                            "env_state": env,
-                            **context.get("state", {}),
-                            **env
-                        }
-                        val_results = self.broker._run_validators(cached_proposal_obj, cache_validation_context)
-                        if not all(v.valid for v in val_results):
-                            logger.warning(f"[Efficiency] Cache HIT for {agent.id} INVALIDATED by governance. Re-running.")
-                            self.efficiency.invalidate(context_hash)
-                        else:
-                            results.append((agent, result))
-                            continue
-                    else:
-                        results.append((agent, result))
-                        continue
+                cached, context_hash = self._cache_lookup(agent, env)
+                if cached is not None:
+                    results.append((agent, cached))
+                    continue
 
+                if llm_invoke_for is not None:
+                    agent_invoke = llm_invoke_for(agent)
+                else:
+                    agent_invoke = self.get_llm_invoke(getattr(agent, 'agent_type', 'default'))
                 result = self.broker.process_step(
                     agent_id=agent.id,
-                    step_id=self.step_counter,
+                    step_id=step_id,
                     run_id=run_id,
-                    seed=self.config.seed + self.step_counter,
-                    llm_invoke=self.get_llm_invoke(getattr(agent, 'agent_type', 'default')),
+                    seed=self.config.seed + step_id,
+                    llm_invoke=agent_invoke,
                     agent_type=getattr(agent, 'agent_type', 'default'),
                     env_context=env
                 )
@@ -610,7 +969,7 @@ class ExperimentRunner:
                     f"[Sequential] Agent {agent.id} failed: {e}",
                     exc_info=True,
                 )
-                self._write_aborted_trace(agent, run_id, env, e)
+                self._write_aborted_trace(agent, run_id, env, e, step_id=step_id)
                 error_result = SkillBrokerResult(
                     outcome=SkillOutcome.ABORTED,
                     skill_proposal=None,
@@ -624,12 +983,238 @@ class ExperimentRunner:
                 results.append((agent, error_result))
         return results
 
+    def _decide_agent(self, agent, step_id: int, run_id: str, env: Dict,
+                      llm_invoke: Callable, tag: str) -> Tuple:
+        """Steps ①-④ of one agent's step: ``(kind, payload, context_hash, timing)``.
+
+        ``kind`` is ``"cached"`` (payload: the cached result), ``"decided"``
+        (payload: the `StepDecision`, or the ABORTED result of unparsable
+        output; timing: stage seconds and elapsed seconds) or ``"failed"``
+        (payload: the exception). `_complete_agent` finishes the step.
+        """
+        broker = self.broker
+        agent_type = getattr(agent, 'agent_type', 'default')
+        try:
+            cached, context_hash = self._cache_lookup(agent, env, tag=f"Efficiency:{tag}")
+            if cached is not None:
+                return "cached", cached, context_hash, None
+            timing = broker.profiler.begin_step(agent_type)
+            try:
+                decision = broker.decide_step(
+                    agent_id=agent.id,
+                    step_id=step_id,
+                    run_id=run_id,
+                    seed=self.config.seed + step_id,
+                    llm_invoke=llm_invoke,
+                    agent_type=agent_type,
+                    env_context=env,
+                )
+            finally:
+                broker.profiler.end_step()
+            stages = (dict(timing.stages), time.perf_counter() - timing.start) if timing else None
+            return "decided", decision, context_hash, stages
+        except Exception as e:
+            logger.error(f"[{tag}] Agent {agent.id} failed: {e}", exc_info=True)
+            return "failed", e, None, None
+
+    def _complete_agent(self, agent, step_id: int, run_id: str, env: Dict, outcome: Tuple,
+                        tag: str, on_put: Optional[Callable] = None,
+                        executed: Optional[Tuple] = None) -> SkillBrokerResult:
+        """Steps ⑤-⑥ for an outcome of `_decide_agent`: execution, audit
+        trace and cache store (also passed to ``on_put``). ``executed``
+        is passed on to ``complete_step`` (skills already executed)."""
+        kind, payload, context_hash, timing = outcome
+        if kind == "cached" or isinstance(payload, SkillBrokerResult):
+            # Cache hit, or output that could not be parsed (ABORTED)
+            return payload
+        profiler = self.broker.profiler
+        try:
+            if kind == "failed":
+                raise payload
+            step = profiler.begin_step(payload.agent_type)
+            if step is not None and timing is not None:
+                # Continue the step timed while deciding
+                step.stages.update(timing[0])
+                step.start -= timing[1]
+            try:
+                result = self.broker.complete_step(payload, executed=executed)
+            finally:
+                profiler.end_step()
+            if result.outcome in [SkillOutcome.APPROVED, SkillOutcome.RETRY_SUCCESS]:
+                decision = result.to_dict()
+                self.efficiency.put(context_hash, decision)
+                if on_put is not None:
+                    on_put(context_hash, decision)
+            return result
+        except Exception as e:
+            if kind != "failed":  # decide failures were logged when they happened
+                logger.error(f"[{tag}] Agent {agent.id} failed: {e}", exc_info=True)
+            self._write_aborted_trace(agent, run_id, env, e, step_id=step_id)
+            return SkillBrokerResult(
+                outcome=SkillOutcome.ABORTED,
+                skill_proposal=None,
+                approved_skill=None,
+                execution_result=None,
+                validation_errors=[
+                    f"agent_step_exception: {type(e).__name__}: "
+                    f"{str(e)[:500]}"
+                ],
+            )
+
+    def _run_agents_packed(self, agents: List, run_id: str, env: Dict,
+                           step_ids: Optional[List[int]] = None) -> List:
+        """Execute agent steps with packed LLM calls (``config.pack_decisions``).
+
+        Agents are grouped by type, in order, into groups of at most
+        ``pack_decisions``. A group decides on one thread per agent, so
+        its first LLM calls become one packed call (see
+        ``broker.core.packed_decisions``) while governance and retries
+        stay per agent. The decisions are then executed and audited on
+        this thread, in agent order, so simulation engines need not be
+        thread-safe. Groups run one after another.
+        """
+        if step_ids is None:
+            step_ids = list(range(self.step_counter + 1, self.step_counter + 1 + len(agents)))
+            self.step_counter += len(agents)
+        step_of = {id(a): sid for a, sid in zip(agents, step_ids)}
+
+        by_type: Dict[str, List] = {}
+        for agent in agents:
+            by_type.setdefault(getattr(agent, 'agent_type', 'default'), []).append(agent)
+        size = self.config.pack_decisions
+        groups = [
+            members[i:i + size]
+            for members in by_type.values()
+            for i in range(0, len(members), size)
+        ]
+
+        results = []
+        for group in groups:
+            agent_type = getattr(group[0], 'agent_type', 'default')
+            batch = PackedDecisionBatch([a.id for a in group], self._gated_llm_invoke(agent_type))
+
+            def decide(agent):
+                try:
+                    return self._decide_agent(
+                        agent, step_of[id(agent)], run_id, env, batch.invoke_for(agent.id), tag="Packed",
+                    )
+                finally:
+                    batch.withdraw(agent.id)
+
+            with ThreadPoolExecutor(max_workers=len(group)) as executor:
+                outcomes = list(executor.map(decide, group))
+            for agent, outcome in zip(group, outcomes):
+                results.append((agent, self._complete_agent(
+                    agent, step_of[id(agent)], run_id, env, outcome, tag="Packed",
+                )))
+            self.packed_stats["packed_calls"] += batch.packed_calls
+            self.packed_stats["individual_calls"] += batch.individual_calls
+
+        rank = {id(a): i for i, a in enumerate(agents)}
+        return sorted(results, key=lambda r: rank[id(r[0])])
+
+    def _run_agents_batched(self, agents: List, run_id: str, env: Dict,
+                            step_ids: Optional[List[int]] = None,
+                            workers: Optional[int] = None) -> List:
+        """Decide a phase's agents, then execute their skills in one
+        ``sim_engine.execute_skills()`` call (``config.batch_execution``).
+
+        Decisions run on ``workers`` threads (default ``config.workers``)
+        and never touch the simulation engine. The skills ``complete_step``
+        would execute one by one (approved skill, or the default skill
+        for REJECTED / UNCERTAIN) are handed over together in agent
+        order, then secondary skills whose primary succeeded in a second
+        call. Audit traces are written here, in agent order. If the
+        batch call raises, every decided agent of the phase is ABORTED.
+        """
+        if step_ids is None:
+            step_ids = list(range(self.step_counter + 1, self.step_counter + 1 + len(agents)))
+            self.step_counter += len(agents)
+        workers = self.config.workers if workers is None else workers
+
+        def decide(agent, step_id):
+            agent_type = getattr(agent, 'agent_type', 'default')
+            return self._decide_agent(
+                agent, step_id, run_id, env, self._gated_llm_invoke(agent_type), tag="Batched",
+            )
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(decide, agents, step_ids))
+        else:
+            outcomes = [decide(agent, step_id) for agent, step_id in zip(agents, step_ids)]
+
+        broker = self.broker
+        pending = [
+            i for i, (kind, payload, _, _) in enumerate(outcomes)
+            if kind == "decided" and not isinstance(payload, SkillBrokerResult)
+        ]
+        executed: Dict[int, Tuple] = {}
+        try:
+            skills = {i: broker.execution_skill(outcomes[i][1]) for i in pending}
+            batch = [i for i in pending if skills[i] is not None]
+            primary = dict(zip(batch, self.sim_engine.execute_skills([skills[i] for i in batch]))) if batch else {}
+            for i in pending:
+                executed[i] = (primary.get(i) or ExecutionResult(success=False, state_changes={}), None)
+            secondary = [
+                i for i in batch
+                if skills[i] is outcomes[i][1].approved_skill
+                and outcomes[i][1].secondary_approved and primary[i].success
+            ]
+            if secondary:
+                second = self.sim_engine.execute_skills(
+                    [outcomes[i][1].secondary_approved for i in secondary]
+                )
+                for i, result in zip(secondary, second):
+                    executed[i] = (executed[i][0], result)
+        except Exception as e:
+            logger.error(f"[Batched] execute_skills failed for {len(pending)} agents: {e}", exc_info=True)
+            for i in pending:
+                outcomes[i] = ("failed", e, None, None)
+
+        return [
+            (agent, self._complete_agent(
+                agent, step_id, run_id, env, outcome, tag="Batched", executed=executed.get(i),
+            ))
+            for i, (agent, step_id, outcome) in enumerate(zip(agents, step_ids, outcomes))
+        ]
+
+    def _run_agents_processes(self, agents: List, run_id: str, env: Dict,
+                              step_ids: Optional[List[int]] = None) -> List:
+        """Execute agent steps on worker processes (``config.process_workers``).
+
+        Each worker decides the steps of the agents it owns; decisions
+        are then executed and audited here, in agent order (see
+        ``broker.core.process_pool``).
+        """
+        if step_ids is None:
+            step_ids = list(range(self.step_counter + 1, self.step_counter + 1 + len(agents)))
+            self.step_counter += len(agents)
+        if self._process_pool is None:
+            self._process_pool = AgentProcessPool(
+                self, self.config.process_workers, threads=max(1, self.config.workers),
+            )
+        pool = self._process_pool
+        outcomes = pool.decide(list(zip(agents, step_ids)), run_id, env)
+
+        results = []
+        for agent, step_id in zip(agents, step_ids):
+            record_put = lambda context_hash, decision, aid=agent.id: pool.record(
+                aid, "cognitive_cache", "put", (context_hash, decision)
+            )
+            result = self._complete_agent(
+                agent, step_id, run_id, env, outcomes[agent.id], tag="Process", on_put=record_put,
+            )
+            results.append((agent, result))
+        return results
+
     def _write_aborted_trace(
         self,
         agent,
         run_id: str,
         env: Dict,
         error: Exception,
+        step_id: Optional[int] = None,
     ) -> None:
         """F1 fix (post-Phase-6T audit, 2026-05-27): emit a sentinel
         audit trace for an agent whose step raised.
@@ -655,6 +1240,8 @@ class ExperimentRunner:
         error_type = type(error).__name__
         error_msg = str(error)[:500]
         agent_type = getattr(agent, 'agent_type', 'default')
+        if step_id is None:
+            step_id = self.step_counter
 
         try:
             audit_writer = getattr(self.broker, 'audit_writer', None)
@@ -662,10 +1249,10 @@ class ExperimentRunner:
                 return
             audit_writer.write_trace(agent_type, {
                 "run_id": run_id,
-                "step_id": self.step_counter,
+                "step_id": step_id,
                 "timestamp": datetime.now().isoformat(),
                 "year": env.get("current_year") if isinstance(env, dict) else None,
-                "seed": self.config.seed + self.step_counter,
+                "seed": self.config.seed + step_id,
                 "agent_id": agent.id,
                 "agent_type": agent_type,
                 "model": getattr(self, '_model_name', 'unknown'),
@@ -688,74 +1275,28 @@ class ExperimentRunner:
                 exc_info=True,
             )
 
-    def _run_agents_parallel(self, agents: List, run_id: str, llm_invoke: Callable, env: Dict) -> List:
-        """Execute agent steps in parallel using ThreadPoolExecutor."""
+    def _run_agents_parallel(self, agents: List, run_id: str, llm_invoke: Callable, env: Dict,
+                             workers: Optional[int] = None,
+                             step_ids: Optional[List[int]] = None) -> List:
+        """Execute agent steps in parallel using ThreadPoolExecutor.
+
+        ``workers`` overrides ``config.workers``; ``step_ids`` supplies
+        pre-assigned step ids (one per agent).
+        """
         results = []
 
         def process_agent(agent, step_id):
             # [Efficiency Hub] Cognitive Cache Check
-            ctx_builder = self.broker.context_builder
-            context = ctx_builder.build(agent.id, env_context=env)
-            context_hash = self.efficiency.compute_hash(context)
-
-            cached_data = self.efficiency.get(context_hash)
-            if cached_data:
-                logger.info(f"[Efficiency:Parallel] Cache HIT for {agent.id} (Hash={context_hash[:8]}). Bypassing LLM.")
-
-                cached_proposal = cached_data.get("skill_proposal") or {}
-                proposal = SkillProposal(
-                    skill_name=(cached_proposal.get("skill_name") or self.broker.skill_registry.get_default_skill()),
-                    agent_id=agent.id,
-                    reasoning=cached_proposal.get("reasoning", {}),
-                    agent_type=cached_proposal.get("agent_type", "default")
-                )
-
-                result = SkillBrokerResult(
-                    outcome=SkillOutcome(cached_data.get("outcome", "APPROVED")),
-                    skill_proposal=proposal,
-                    approved_skill=ApprovedSkill(
-                        skill_name=(cached_data.get("approved_skill", {}).get("skill_name") or self.broker.skill_registry.get_default_skill()),
-                        agent_id=agent.id,
-                        approval_status="APPROVED",
-                        execution_mapping=cached_data.get("approved_skill", {}).get("mapping", "sim.noop")
-                    ),
-                    execution_result=ExecutionResult(
-                        success=True,
-                        state_changes=cached_data.get("execution_result", {}).get("state_changes", {})
-                    ),
-                    validation_errors=[],
-                    retry_count=0
-                )
-                if hasattr(self.broker, "_run_validators"):
-                    cached_proposal_obj = SkillProposal(
-                        skill_name=(cached_data.get("approved_skill", {}).get("skill_name") or self.broker.skill_registry.get_default_skill()),
-                        agent_id=agent.id,
-                        reasoning=cached_data.get("skill_proposal", {}).get("reasoning", {}),
-                        agent_type=getattr(agent, 'agent_type', 'default')
-                    )
-                    # Wrap context the same way process_step() does for custom validators
-                    cache_validation_context = {
-                        "agent_state": context,
-                        "agent_type": getattr(agent, 'agent_type', 'default'),
-                        "env_state": env,
-                        **context.get("state", {}),
-                        **env
-                    }
-                    val_results = self.broker._run_validators(cached_proposal_obj, cache_validation_context)
-                    if not all(v.valid for v in val_results):
-                        logger.warning(f"[Efficiency:Parallel] Cache HIT for {agent.id} INVALIDATED by governance. Re-running.")
-                        self.efficiency.invalidate(context_hash)
-                    else:
-                        return agent, result
-                else:
-                    return agent, result
+            cached, context_hash = self._cache_lookup(agent, env, tag="Efficiency:Parallel")
+            if cached is not None:
+                return agent, cached
 
             result = self.broker.process_step(
                 agent_id=agent.id,
                 step_id=step_id,
                 run_id=run_id,
                 seed=self.config.seed + step_id,
-                llm_invoke=self.get_llm_invoke(getattr(agent, 'agent_type', 'default')),
+                llm_invoke=self._gated_llm_invoke(getattr(agent, 'agent_type', 'default')),
                 agent_type=getattr(agent, 'agent_type', 'default'),
                 env_context=env
             )
@@ -765,11 +1306,20 @@ class ExperimentRunner:
 
             return agent, result
 
-        with ThreadPoolExecutor(max_workers=self.config.workers) as executor:
+        if workers is None:
+            workers = self.config.workers
+            if getattr(self, "concurrency", None) is not None:
+                # Threads up to the upper bound; the controller gates the LLM calls
+                workers = max(workers, self.concurrency.config.max_limit)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             futures = {}
-            for agent in agents:
-                self.step_counter += 1
-                futures[executor.submit(process_agent, agent, self.step_counter)] = agent
+            for i, agent in enumerate(agents):
+                if step_ids is None:
+                    self.step_counter += 1
+                    step_id = self.step_counter
+                else:
+                    step_id = step_ids[i]
+                futures[executor.submit(process_agent, agent, step_id)] = (agent, step_id)
 
             for future in as_completed(futures):
                 try:
@@ -786,12 +1336,12 @@ class ExperimentRunner:
                     # ``--workers 4`` for MA flood scale-up) had the
                     # same v0.88.15-class denominator-shrink: failed
                     # agents vanished from the audit CSV.
-                    failed_agent = futures[future]
+                    failed_agent, failed_step_id = futures[future]
                     logger.error(
                         f"[Parallel] Agent {failed_agent.id} failed: {e}",
                         exc_info=True,
                     )
-                    self._write_aborted_trace(failed_agent, run_id, env, e)
+                    self._write_aborted_trace(failed_agent, run_id, env, e, step_id=failed_step_id)
                     error_result = SkillBrokerResult(
                         outcome=SkillOutcome.ABORTED,
                         skill_proposal=None,
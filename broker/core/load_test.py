@@ -0,0 +1,287 @@
+"""Load tests: the full broker pipeline against a stand-in LLM server.
+
+A load test starts a :class:`~broker.utils.stand_in_llm.StandInLLMServer`
+and runs the same experiment once per worker count against it, so
+throughput and stage latencies can be compared across concurrency
+levels and hardware without a real model:
+
+- **Cells.** ``cell(workers, output_dir, llm_url)`` runs one experiment,
+  either in-process or as a command (:class:`LoadTestCommand`, which
+  points the run at the stand-in through ``OLLAMA_HOST`` and
+  ``OPENAI_BASE_URL``).
+- **Report.** Per worker count: wall time, steps and steps per second,
+  the requests, injected failures and tokens the stand-in served, and
+  per-stage latency from the run's ``performance_summary.json``
+  (:class:`~broker.components.analytics.latency.StageProfiler`).
+  Written to ``<output_root>/load_test_report.json``.
+- **Populations.** :func:`synthesize_population` grows an agent profile
+  CSV (e.g. an example domain's) to any size by resampling its rows, so
+  the same domain can be tested at 10x or 100x its real population.
+
+Usage::
+
+    def cell(workers, output_dir, llm_url):
+        build_runner(workers, output_dir, llm_url).run()
+
+    report = run_load_test(cell, [1, 2, 4, 8], "results/load_test",
+                           StandInConfig(latency_s=0.3, tokens_per_s=40))
+    print(format_report(report))
+
+See ``python -m broker.tools.load_test`` for the command-line version.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+from broker.components.analytics.latency import PERFORMANCE_SUMMARY_FILE
+from broker.utils.logging import setup_logger
+from broker.utils.stand_in_llm import StandInConfig, StandInLLMServer
+
+logger = setup_logger(__name__)
+
+REPORT_FILE = "load_test_report.json"
+
+# Stages shown by format_report, in pipeline order, when present
+REPORT_STAGES = (
+    "context_build", "skill_retrieval", "format_prompt", "llm", "parse",
+    "validation", "governance_retry", "execution", "audit_write", "framework", "total",
+)
+
+LoadTestCell = Callable[[int, Path, str], Any]
+
+_ID_COLUMNS = ("id", "agent_id")
+_NUMBER_RE = re.compile(r"^-?\d+(\.\d+)?$")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic populations
+# ---------------------------------------------------------------------------
+
+def _id_column(rows: Sequence[Mapping[str, str]], columns: Sequence[str]) -> Optional[str]:
+    for name in columns:
+        if name.lower() in _ID_COLUMNS or name.lower().endswith("_id"):
+            values = [row[name] for row in rows]
+            if len(set(values)) == len(values):
+                return name
+    return None
+
+
+def _id_maker(template: str) -> Callable[[int], str]:
+    """``Agent_7`` -> ``Agent_<n>``; ``H0007`` -> ``H<n, zero-padded to 4>``."""
+    match = re.match(r"^(.*?)(\d+)$", template)
+    if not match:
+        return lambda n: f"{template}_{n}"
+    prefix, digits = match.groups()
+    width = len(digits) if digits.startswith("0") else 0
+    return lambda n: f"{prefix}{n:0{width}d}"
+
+
+def synthesize_population(
+    rows: Sequence[Mapping[str, str]],
+    n: int,
+    seed: Optional[int] = None,
+    id_column: Optional[str] = None,
+    jitter: float = 0.1,
+) -> List[Dict[str, str]]:
+    """``n`` synthetic profiles resampled from ``rows`` (CSV-style strings).
+
+    Each profile copies a randomly drawn source row, so correlations
+    between columns survive. Decimal columns are then jittered by
+    ``jitter`` standard deviations and clamped to the observed range,
+    keeping the source's precision; integer, boolean and text columns
+    are kept as drawn. The id column (``id_column``, else the first
+    unique ``id``/``agent_id``/``*_id`` column) is renumbered 1..n in the
+    source's format.
+    """
+    if not rows:
+        raise ValueError("Cannot synthesize a population from no rows")
+    if n < 1:
+        raise ValueError(f"Population size must be >= 1, got {n}")
+    columns = list(rows[0])
+    id_column = id_column or _id_column(rows, columns)
+    rng = random.Random(seed)
+
+    decimals: Dict[str, tuple] = {}
+    for name in columns:
+        values = [row[name] for row in rows]
+        if name != id_column and all(_NUMBER_RE.match(v or "") for v in values) and any("." in v for v in values):
+            numbers = [float(v) for v in values]
+            spread = statistics.pstdev(numbers) * jitter
+            places = max(len(v.split(".")[1]) if "." in v else 0 for v in values)
+            decimals[name] = (min(numbers), max(numbers), spread, places)
+
+    make_id = _id_maker(rows[0][id_column]) if id_column else None
+    population = []
+    for i in range(1, n + 1):
+        profile = dict(rng.choice(rows))
+        for name, (low, high, spread, places) in decimals.items():
+            if spread:
+                value = min(high, max(low, float(profile[name]) + rng.gauss(0.0, spread)))
+                profile[name] = f"{value:.{places}f}"
+        if make_id is not None:
+            profile[id_column] = make_id(i)
+        population.append(profile)
+    return population
+
+
+def synthesize_population_csv(
+    source: Union[str, Path],
+    target: Union[str, Path],
+    n: int,
+    seed: Optional[int] = None,
+    id_column: Optional[str] = None,
+) -> Path:
+    """Write ``n`` profiles synthesized from the CSV ``source`` to ``target``."""
+    with open(source, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = list(reader.fieldnames or [])
+        rows = list(reader)
+    population = synthesize_population(rows, n, seed=seed, id_column=id_column)
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(population)
+    return target
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+class LoadTestCommand:
+    """Load-test cell that runs a shell command.
+
+    ``template`` is formatted with ``workers``, ``output_dir``,
+    ``llm_url`` and ``params``; output goes to
+    ``<output_dir>/load_test.log``. ``OLLAMA_HOST`` and
+    ``OPENAI_BASE_URL`` point the command's LLM clients at the stand-in.
+    """
+
+    def __init__(self, template: str, cwd: Optional[Union[str, Path]] = None,
+                 params: Optional[Dict[str, Any]] = None):
+        self.template = template
+        self.cwd = str(cwd) if cwd else None
+        self.params = dict(params or {})
+
+    def __call__(self, workers: int, output_dir: Path, llm_url: str) -> Dict[str, Any]:
+        command = self.template.format(
+            workers=workers, output_dir=output_dir, llm_url=llm_url, **self.params,
+        )
+        env = dict(os.environ, OLLAMA_HOST=llm_url, OPENAI_BASE_URL=f"{llm_url}/v1")
+        with open(output_dir / "load_test.log", "w", encoding="utf-8") as log:
+            proc = subprocess.run(
+                command, shell=True, cwd=self.cwd, env=env,
+                stdout=log, stderr=subprocess.STDOUT,
+            )
+        if proc.returncode != 0:
+            raise RuntimeError(f"command exited with {proc.returncode}: {command}")
+        return {"command": command}
+
+
+def _stage_rows(summary: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    keep = ("count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    return {
+        name: {k: stats[k] for k in keep if k in stats}
+        for name, stats in summary.get("stages", {}).items()
+    }
+
+
+def run_load_test(
+    cell: LoadTestCell,
+    worker_counts: Sequence[int],
+    output_root: Union[str, Path],
+    stand_in: Optional[StandInConfig] = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> Dict[str, Any]:
+    """Run ``cell`` once per worker count against one stand-in server.
+
+    Each run gets ``<output_root>/workers_<n>`` as its output directory.
+    A failing run is recorded with its error and the rest continue.
+    Returns the report, also written to ``<output_root>/load_test_report.json``.
+    """
+    output_root = Path(output_root)
+    output_root.mkdir(parents=True, exist_ok=True)
+    server = StandInLLMServer(stand_in, host=host, port=port)
+    runs: List[Dict[str, Any]] = []
+    with server:
+        for workers in worker_counts:
+            output_dir = output_root / f"workers_{workers}"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            server.reset_stats()
+            entry: Dict[str, Any] = {"workers": workers, "output_dir": str(output_dir), "error": ""}
+            start = time.perf_counter()
+            try:
+                result = cell(workers, output_dir, server.url)
+                if isinstance(result, dict):
+                    entry.update(result)
+            except Exception as e:
+                entry["error"] = f"{type(e).__name__}: {e}"
+                logger.error(f"[LoadTest] workers={workers} failed: {entry['error']}")
+            wall_s = time.perf_counter() - start
+
+            served = server.stats()
+            served.pop("config", None)
+            summary_path = output_dir / PERFORMANCE_SUMMARY_FILE
+            summary = json.loads(summary_path.read_text(encoding="utf-8")) if summary_path.exists() else {}
+            steps = summary.get("n_steps", 0)
+            entry.update({
+                "wall_s": round(wall_s, 3),
+                "steps": steps,
+                "steps_per_s": round(steps / wall_s, 3) if wall_s > 0 else 0.0,
+                "llm_share": summary.get("llm_share", 0.0),
+                "server": served,
+                "stages": _stage_rows(summary),
+            })
+            if not served["requests"] and not entry["error"]:
+                logger.warning(
+                    f"[LoadTest] workers={workers}: no requests reached the stand-in; "
+                    f"is the run's model served over HTTP (not 'mock')?"
+                )
+            runs.append(entry)
+
+    report = {"stand_in": server.stats()["config"], "runs": runs}
+    with open(output_root / REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Plain-text tables: throughput per worker count, then mean/p95 ms per stage."""
+    runs = report["runs"]
+    lines = [
+        f"{'workers':>7} {'wall_s':>9} {'steps':>7} {'steps/s':>9} {'requests':>9} "
+        f"{'malformed':>9} {'timeouts':>8} {'peak':>5}  error",
+    ]
+    for run in runs:
+        server = run["server"]
+        lines.append(
+            f"{run['workers']:>7} {run['wall_s']:>9.2f} {run['steps']:>7} {run['steps_per_s']:>9.2f} "
+            f"{server['requests']:>9} {server['malformed']:>9} {server['timed_out']:>8} "
+            f"{server['max_in_flight']:>5}  {run['error']}"
+        )
+
+    present = {name for run in runs for name in run["stages"]}
+    stages = [s for s in REPORT_STAGES if s in present]
+    stages += sorted(present - set(REPORT_STAGES))
+    if stages:
+        lines.append("")
+        lines.append(f"{'stage (mean / p95 ms)':<28}" + "".join(f"{'w=' + str(r['workers']):>20}" for r in runs))
+        for name in stages:
+            cells = []
+            for run in runs:
+                stats = run["stages"].get(name)
+                cells.append(f"{stats['mean_ms']:>9.1f} / {stats['p95_ms']:<8.1f}" if stats else f"{'-':>20}")
+            lines.append(f"{name:<28}" + "".join(f"{c:>20}" for c in cells))
+    return "\n".join(lines)
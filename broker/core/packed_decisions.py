@@ -0,0 +1,232 @@
+"""Packed decisions: several same-type agents answered by one LLM call.
+
+In packed mode (``ExperimentConfig.pack_decisions``) the runner decides
+a group of same-type agents together (``decide_step``, one thread per
+agent), then executes the decisions in agent order. Each agent
+builds its own prompt as usual; `PackedDecisionBatch` collects the
+group's first prompts, sends them as one packed prompt and hands each
+agent its own slice of the response. Sections common to every prompt
+(system instructions, skill list, response format) are sent once; the
+rest goes under a ``### Agent <id>`` heading, and the model is asked
+for a JSON array with one object per agent.
+
+Everything after the first call stays per agent: each slice is parsed
+into that agent's `SkillProposal` and validated on its own, and every
+later call from the same agent (format or governance retries) goes to
+the plain ``llm_invoke``, so only failing agents are re-asked, one at a
+time. An agent missing from the packed response, or a packed call that
+raises, also falls back to an individual call. Audit traces stay one
+per agent.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from broker.utils.logging import setup_logger
+
+from .efficiency import _timed_call
+
+logger = setup_logger(__name__)
+
+SECTION_SEPARATOR = "\n\n"
+AGENT_HEADING = "### Agent "
+
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL | re.IGNORECASE)
+
+
+def build_packed_prompt(prompts: Dict[str, str]) -> str:
+    """One prompt asking for the decisions of every agent in ``prompts``.
+
+    Prompts are split on blank lines; sections found in every prompt are
+    written once, in the first prompt's order, ahead of the per-agent
+    blocks.
+    """
+    sections = {aid: p.split(SECTION_SEPARATOR) for aid, p in prompts.items()}
+    common = set.intersection(*(set(s) for s in sections.values()))
+
+    parts: List[str] = []
+    seen = set()
+    for section in next(iter(sections.values())):
+        if section in common and section not in seen:
+            seen.add(section)
+            parts.append(section)
+    for aid, own in sections.items():
+        body = SECTION_SEPARATOR.join(s for s in own if s not in common)
+        parts.append(f"{AGENT_HEADING}{aid}\n{body}".rstrip())
+    parts.append(
+        f"### Packed response\n"
+        f"Decide separately for each of the {len(prompts)} agents above, "
+        f"each from its own situation. Return ONLY a JSON array with one object "
+        f"per agent, in the order listed. Each object has an \"agent_id\" field "
+        f"and the fields of the decision format above."
+    )
+    return SECTION_SEPARATOR.join(parts)
+
+
+def _objects(text: str) -> List[Dict[str, Any]]:
+    """JSON objects in ``text``: the outermost array, else every decodable object."""
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if match:
+        try:
+            data = json.loads(re.sub(r",\s*([\]}])", r"\1", match.group(0)))
+            if isinstance(data, list):
+                return [d for d in data if isinstance(d, dict)]
+        except json.JSONDecodeError:
+            pass
+    # Truncated or malformed array: keep the objects that did complete
+    decoder = json.JSONDecoder()
+    found: List[Dict[str, Any]] = []
+    pos = text.find("{")
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            pos = text.find("{", pos + 1)
+            continue
+        if isinstance(obj, dict):
+            found.append(obj)
+        pos = text.find("{", end)
+    return found
+
+
+def split_packed_response(raw: str, agent_ids: Sequence[str]) -> Dict[str, Optional[str]]:
+    """Map each agent id to its decision (a JSON object string) or None.
+
+    Objects are matched on ``agent_id`` (case-insensitive); when no
+    object carries one and the count matches, they are taken in order.
+    """
+    results: Dict[str, Optional[str]] = {aid: None for aid in agent_ids}
+    objects = _objects(_THINK_RE.sub("", raw or ""))
+    if not objects:
+        return results
+
+    by_id = {str(aid).lower(): aid for aid in agent_ids}
+    labelled = [o for o in objects if "agent_id" in o]
+    if not labelled and len(objects) == len(agent_ids):
+        pairs = list(zip(agent_ids, objects))
+    else:
+        pairs = []
+        for obj in labelled:
+            aid = by_id.get(str(obj["agent_id"]).strip().lower())
+            if aid is not None and results[aid] is None:
+                pairs.append((aid, obj))
+
+    for aid, obj in pairs:
+        decision = {k: v for k, v in obj.items() if k != "agent_id"}
+        results[aid] = json.dumps(decision, ensure_ascii=False)
+    return results
+
+
+def _share(stats: Any, n: int) -> Any:
+    """One agent's share of a packed call's ``LLMStats`` (tokens split evenly)."""
+    return dataclasses.replace(
+        stats,
+        prompt_tokens=stats.prompt_tokens // n,
+        response_tokens=stats.response_tokens // n,
+    )
+
+
+class PackedDecisionBatch:
+    """Barrier that turns a group's first LLM calls into one packed call.
+
+    Every agent in ``agent_ids`` must either call the invoke returned by
+    `invoke_for` or be `withdraw`-n (cache hit, error before the LLM,
+    finished step); the last one to do either sends the packed call
+    while the others wait. Agents must run concurrently, one thread each.
+
+    Args:
+        agent_ids: The group, all of one agent type.
+        llm_invoke: The type's normal ``llm_invoke``.
+    """
+
+    def __init__(self, agent_ids: Sequence[str], llm_invoke: Callable):
+        self.llm_invoke = llm_invoke
+        self._cond = threading.Condition()
+        self._order = list(agent_ids)
+        self._waiting = set(agent_ids)
+        self._prompts: Dict[str, str] = {}
+        self._answers: Dict[str, Tuple[str, Any]] = {}
+        self._done = False
+        self.packed_calls = 0
+        self.individual_calls = 0
+
+    def invoke_for(self, agent_id: str) -> Callable:
+        """``llm_invoke`` to hand to ``process_step`` for ``agent_id``."""
+        def invoke(prompt: str):
+            return self._invoke(agent_id, prompt)
+
+        llm_chat = getattr(self.llm_invoke, "chat", None)
+        if callable(llm_chat):
+            # Continuation retries (retry_mode) are individual calls too
+            def chat(messages):
+                with self._cond:
+                    self.individual_calls += 1
+                return llm_chat(messages)
+            invoke.chat = chat
+        return invoke
+
+    def withdraw(self, agent_id: str) -> None:
+        """Stop waiting for ``agent_id``; safe to call more than once."""
+        with self._cond:
+            if agent_id not in self._waiting:
+                return
+            self._waiting.discard(agent_id)
+            leader = not self._waiting and not self._done
+        if leader:
+            self._dispatch()
+
+    def _invoke(self, agent_id: str, prompt: str):
+        with self._cond:
+            joined = agent_id in self._waiting and not self._done
+            if joined:
+                self._waiting.discard(agent_id)
+                self._prompts[agent_id] = prompt
+                leader = not self._waiting
+                while not leader and not self._done:
+                    self._cond.wait()
+        if not joined:
+            return self._individual(prompt)
+        if leader:
+            self._dispatch()
+        with self._cond:
+            answer = self._answers.pop(agent_id, None)
+        return answer if answer is not None else self._individual(prompt)
+
+    def _individual(self, prompt: str):
+        with self._cond:
+            self.individual_calls += 1
+        return self.llm_invoke(prompt)
+
+    def _dispatch(self) -> None:
+        # Group order, not arrival order, so the packed prompt is reproducible
+        prompts = {aid: self._prompts[aid] for aid in self._order if aid in self._prompts}
+        answers: Dict[str, Tuple[str, Any]] = {}
+        try:
+            if len(prompts) > 1:
+                content, stats, ms = _timed_call(self.llm_invoke, build_packed_prompt(prompts))
+                self.packed_calls += 1
+                share = _share(stats, len(prompts))
+                parts = split_packed_response(content, list(prompts))
+                answers = {aid: (part, share) for aid, part in parts.items() if part is not None}
+                missing = [aid for aid, part in parts.items() if part is None]
+                logger.debug(
+                    f"[Packed] {len(prompts)} agents in one call ({ms:.0f} ms); "
+                    f"{len(missing)} re-asked individually"
+                )
+                if missing:
+                    logger.warning(f"[Packed] No decision for {missing} in packed response")
+        except Exception as e:
+            logger.warning(f"[Packed] Packed call failed, re-asking {len(prompts)} agents individually: {e}")
+        finally:
+            # A lone prompt (or anything unanswered) gets an individual call
+            with self._cond:
+                self._answers = answers
+                self._done = True
+                self._cond.notify_all()
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"packed_calls": self.packed_calls, "individual_calls": self.individual_calls}
@@ -0,0 +1,159 @@
+"""Prefix-cache-aware dispatch order and prompt-cache statistics.
+
+Context builders put the static sections of a prompt (system prompt,
+type template, persona) first, so consecutive prompts of the same kind
+share a long prefix that a serving engine can reuse from its prompt /
+KV cache. Dispatching agents in population order interleaves agent
+types and personas, and with few cache slots every request evicts the
+prefix the next one needs.
+
+With ``ExperimentConfig.prefix_scheduling`` the runner dispatches each
+phase in `PrefixScheduler.order`: agents grouped by prefix key
+(prompt template, agent type, persona), groups in order of first
+appearance, agents within a group in population order. Step ids (and
+so per-call seeds) are still assigned in population order and results
+are applied in population order, so only the order of LLM requests
+changes. In sequential mode audit traces follow the dispatch order.
+
+`PrefixReuseStats` (``SkillBrokerEngine.prefix_reuse``) counts, per
+agent type, the prompt tokens each call reported, the cached share of
+them where the provider reports cached prompt tokens (OpenAI-compatible
+``prompt_tokens_details.cached_tokens``), and prefill time where it
+reports that (Ollama ``prompt_eval_duration``). It is written to the
+reproducibility manifest as ``prefix_reuse``.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+class PrefixScheduler:
+    """Orders agents so requests sharing a prompt prefix are adjacent.
+
+    Args:
+        persona_attribute: Agent attribute naming its persona block
+            (looked up on the agent, then in ``fixed_attributes`` and
+            ``custom_attributes``). Default: ``agent.config.persona``.
+        templates: Prompt template per agent type, usually the context
+            builder's ``prompt_templates``; types sharing a template are
+            dispatched next to each other.
+    """
+
+    def __init__(self, persona_attribute: Optional[str] = None,
+                 templates: Optional[Dict[str, str]] = None):
+        self.persona_attribute = persona_attribute
+        self.templates = templates or {}
+        self.groups_dispatched = 0
+        self.agents_dispatched = 0
+
+    def persona(self, agent: Any) -> str:
+        if self.persona_attribute is None:
+            return str(getattr(getattr(agent, "config", None), "persona", "") or "")
+        name = self.persona_attribute
+        if hasattr(agent, name):
+            return str(getattr(agent, name))
+        for holder in ("fixed_attributes", "custom_attributes"):
+            attrs = getattr(agent, holder, None)
+            if isinstance(attrs, dict) and name in attrs:
+                return str(attrs[name])
+        return ""
+
+    def key(self, agent: Any) -> Tuple[str, str, str]:
+        """(template digest, agent type, persona) of ``agent``'s prompt prefix."""
+        agent_type = getattr(agent, "agent_type", "default")
+        template = self.templates.get(agent_type, "")
+        digest = hashlib.sha1(template.encode("utf-8")).hexdigest()[:12] if template else agent_type
+        return digest, agent_type, self.persona(agent)
+
+    def order(self, agents: Sequence[Any]) -> List[int]:
+        """Dispatch order of ``agents`` as a permutation of their indices."""
+        keys = [self.key(agent) for agent in agents]
+        first: List[Dict[Hashable, int]] = [{}, {}, {}]
+        for key in keys:
+            for level in range(3):
+                first[level].setdefault(key[:level + 1], len(first[level]))
+        ranks = [tuple(first[level][key[:level + 1]] for level in range(3)) for key in keys]
+        self.groups_dispatched += len(first[2])
+        self.agents_dispatched += len(agents)
+        return sorted(range(len(agents)), key=lambda i: ranks[i])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "persona_attribute": self.persona_attribute,
+            "groups_dispatched": self.groups_dispatched,
+            "agents_dispatched": self.agents_dispatched,
+        }
+
+
+class PrefixReuseStats:
+    """Per-agent-type prompt-cache counters of LLM calls (thread-safe).
+
+    Counters are integer dicts keyed by agent type, so process-pool
+    workers can return them as deltas.
+    """
+
+    _FIELDS = ("calls", "prompt_tokens", "cache_reported_calls", "cache_reported_tokens",
+               "cached_prompt_tokens", "prefill_calls", "prefill_us")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        for name in self._FIELDS:
+            setattr(self, name, {})
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record(self, agent_type: str, stats: Any) -> None:
+        """Count one call's ``LLMStats``."""
+        prompt_tokens = getattr(stats, "prompt_tokens", 0) or 0
+        cached = getattr(stats, "cached_prompt_tokens", None)
+        prefill_ms = getattr(stats, "prefill_ms", 0.0) or 0.0
+        with self._lock:
+            self._add("calls", agent_type, 1)
+            self._add("prompt_tokens", agent_type, prompt_tokens)
+            if cached is not None:
+                self._add("cache_reported_calls", agent_type, 1)
+                self._add("cache_reported_tokens", agent_type, prompt_tokens)
+                self._add("cached_prompt_tokens", agent_type, cached)
+            if prefill_ms > 0:
+                self._add("prefill_calls", agent_type, 1)
+                self._add("prefill_us", agent_type, int(prefill_ms * 1000))
+
+    def _add(self, field: str, agent_type: str, n: int) -> None:
+        counts = getattr(self, field)
+        counts[agent_type] = counts.get(agent_type, 0) + n
+
+    @property
+    def reported(self) -> bool:
+        """Whether any call reported cached tokens or prefill time."""
+        return bool(self.cache_reported_calls or self.prefill_calls)
+
+    def _summary(self, get: Callable[[str], int]) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {"calls": get("calls"), "prompt_tokens": get("prompt_tokens")}
+        if get("cache_reported_calls"):
+            reported = get("cache_reported_tokens")
+            summary["cached_prompt_tokens"] = get("cached_prompt_tokens")
+            summary["prefix_reuse_rate"] = round(get("cached_prompt_tokens") / reported, 4) if reported else 0.0
+        if get("prefill_calls"):
+            summary["prefill_ms_total"] = round(get("prefill_us") / 1000.0, 3)
+            summary["prefill_ms_mean"] = round(get("prefill_us") / 1000.0 / get("prefill_calls"), 3)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {name: dict(getattr(self, name)) for name in self._FIELDS}
+        types = sorted(snapshot["calls"])
+        overall = self._summary(lambda name: sum(snapshot[name].values()))
+        overall["by_agent_type"] = {
+            agent_type: self._summary(lambda name, t=agent_type: snapshot[name].get(t, 0))
+            for agent_type in types
+        }
+        return overall
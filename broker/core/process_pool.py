@@ -0,0 +1,407 @@
+"""Process-pool agent execution (``ExperimentConfig.process_workers``).
+
+Context building, memory retrieval scoring, response parsing and
+validation are pure-Python work that worker threads serialise on the
+GIL. In process mode the runner forks ``process_workers`` copies of
+the experiment at the first phase of a run and shards the agents
+across them by position in ``runner.agents``. A worker decides the
+steps of the agents it owns (`SkillBrokerEngine.decide_step`: context,
+memory retrieval, LLM call, parsing, validation, governance retries)
+on ``config.workers`` threads; the coordinator then executes every
+decision and writes its audit trace (`SkillBrokerEngine.complete_step`)
+in agent order, applies the results and runs the hooks as in the other
+modes.
+
+Per phase only compact inputs and results cross the process boundary:
+
+* Shared objects (hub, social graph, simulation engine, registered
+  checkpoint objects) are sent to every worker when their state has
+  changed since the last phase; an agent whose state changed is sent
+  only to the worker that owns it. Without an interaction hub nothing
+  a worker runs reads another shard's agents; with one, social context
+  reads neighbours, so agents then go to every worker. Objects are
+  pickled the way checkpoints are: a reference to another live object
+  travels as its key and resolves to the worker's own copy.
+* Memory writes made in the coordinator (``add_memory``,
+  ``add_memory_for_agent``, ``clear``, ``forget``) and new cognitive
+  cache entries are journalled and replayed in the worker that owns
+  the agent, whose memory engine is the one its retrievals run on.
+* Decisions, cache hits, the cache entries governance invalidated and
+  the counter deltas of the broker, governance, cache, prompt reuse,
+  packed calls and speculative drafters come back. A decision carries
+  only what `SkillBrokerEngine.complete_step` reads: its context is cut
+  to the audit keys (``audit_context``) and the environment, which the
+  coordinator sent, is not sent back. The prompt and the retrieved
+  memories stay, as the trace's ``input`` and ``memory_pre``.
+
+Memory is owned by the workers for retrieval, but the coordinator keeps
+a full copy: post-step and post-year hooks (memory writes, reflection),
+checkpoints and the end-of-run memory outputs all run in the
+coordinator and read memory directly, so a shard-only memory would turn
+every such read into a round trip to the owning worker. The copy costs
+one replayed write per memory write. Side effects of retrieval itself
+(access statistics, lazy seeding) stay in the worker. As in
+thread-parallel mode, all agents of a phase decide on the state at the
+start of the phase. Adaptive concurrency does not apply to worker
+processes. Requires the ``fork`` start method (Linux, macOS).
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import multiprocessing
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from broker.utils.logging import setup_logger
+
+from ._audit_helpers import audit_context
+from .checkpoint import CheckpointManager, _dumps, _RootUnpickler
+
+logger = setup_logger(__name__)
+
+MEMORY_WRITES = ("add_memory", "add_memory_for_agent", "clear", "forget")
+
+# Roots the coordinator alone updates (or journals); never synced
+_COORDINATOR_ONLY = frozenset({
+    "agents", "memory_engine", "cognitive_cache", "phase_orchestrator",
+    "audit_writer", "governance_auditor", "broker_stats",
+    "extra:stage_profiler", "extra:readiness_tracker", "extra:prefix_reuse",
+})
+# Roots whose integer counters workers advance and the coordinator merges
+_COUNTED = ("governance_auditor", "broker_stats", "cognitive_cache", "extra:prefix_reuse")
+
+
+def _counted(runner: Any, roots: Dict[str, Any]) -> Dict[str, Any]:
+    """Objects whose integer counters a worker advances, by key: the
+    `_COUNTED` roots, the runner's packed-call counts and its drafters."""
+    counted = {key: roots[key] for key in _COUNTED if key in roots}
+    if isinstance(getattr(runner, "packed_stats", None), dict):
+        counted["packed_stats"] = runner.packed_stats
+    for agent_type, drafter in getattr(runner, "drafters", {}).items():
+        counted[f"drafter:{agent_type}"] = drafter
+    return counted
+
+
+def fork_available() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _loads(data: bytes, roots: Dict[str, Any]) -> Any:
+    return _RootUnpickler(io.BytesIO(data), roots).load()
+
+
+def _is_count(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _counters(obj: Any) -> Dict[str, Any]:
+    """Integer attributes (or items) of ``obj`` and its dicts of integers."""
+    items = obj.items() if isinstance(obj, dict) else vars(obj).items()
+    found: Dict[str, Any] = {}
+    for name, value in items:
+        if _is_count(value):
+            found[name] = value
+        elif isinstance(value, dict) and value and all(_is_count(v) for v in value.values()):
+            found[name] = dict(value)
+    return found
+
+
+def _counter_delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    delta: Dict[str, Any] = {}
+    for name, value in after.items():
+        old = before.get(name)
+        if isinstance(value, dict):
+            old = old if isinstance(old, dict) else {}
+            changed = {k: v - old.get(k, 0) for k, v in value.items() if v != old.get(k, 0)}
+            if changed:
+                delta[name] = changed
+        elif value != (old or 0):
+            delta[name] = value - (old or 0)
+    return delta
+
+
+def _add_counters(obj: Any, delta: Dict[str, Any]) -> None:
+    target = obj if isinstance(obj, dict) else vars(obj)
+    for name, value in delta.items():
+        if isinstance(value, dict):
+            counts = target.setdefault(name, {})
+            for key, n in value.items():
+                counts[key] = counts.get(key, 0) + n
+        else:
+            target[name] = target.get(name, 0) + value
+
+
+def _portable_error(error: Exception) -> Exception:
+    """``error`` if it survives pickling, else a RuntimeError naming it."""
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def _owner_of(args: Sequence[Any]) -> Optional[str]:
+    """Agent a memory write is for: an agent id or an agent as first argument."""
+    if not args:
+        return None
+    first = args[0]
+    if isinstance(first, str):
+        return first
+    return getattr(first, "id", None)
+
+
+def _decide_one(runner: Any, agent_id: str, step_id: int, run_id: str, env: Dict) -> Tuple:
+    """One agent's step in a worker (see `ExperimentRunner._decide_agent`)."""
+    agent = runner.agents[agent_id]
+    llm_invoke = runner.get_llm_invoke(getattr(agent, "agent_type", "default"))
+    kind, payload, context_hash, timing = runner._decide_agent(
+        agent, step_id, run_id, env, llm_invoke, tag="Process",
+    )
+    if kind == "failed":
+        payload = _portable_error(payload)
+    elif kind == "decided" and hasattr(payload, "context"):
+        # StepDecision: the coordinator puts its env back (see AgentProcessPool.decide)
+        payload = replace(payload, context=audit_context(payload.context), env_context=None)
+    return kind, payload, context_hash, timing
+
+
+def _worker_main(runner: Any, conn: Any, threads: int) -> None:
+    """Worker loop: apply sync and journal, decide the tasks, reply."""
+    roots = CheckpointManager.collect_roots(runner)
+    roots_by_id = {id(obj): key for key, obj in roots.items()}
+    invalidated: List[str] = []
+    cache = roots.get("cognitive_cache")
+    if cache is not None:
+        invalidate = cache.invalidate
+
+        def recording_invalidate(context_hash):
+            # A cache hit governance now rejects; the coordinator drops it too
+            invalidated.append(context_hash)
+            return invalidate(context_hash)
+
+        cache.invalidate = recording_invalidate
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except EOFError:
+            break
+        request = _loads(data, roots)
+        if request is None:
+            break
+        for key, blob in request["sync"].items():
+            vars(roots[key]).update(_loads(blob, roots))
+        for key, method, args, kwargs in request["journal"]:
+            getattr(roots[key], method)(*args, **kwargs)
+
+        before = {key: _counters(obj) for key, obj in _counted(runner, roots).items()}
+        invalidated.clear()
+        tasks, run_id, env = request["tasks"], request["run_id"], request["env"]
+
+        def decide(task):
+            agent_id, step_id = task
+            return agent_id, _decide_one(runner, agent_id, step_id, run_id, env)
+
+        if threads > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                outcomes = dict(executor.map(decide, tasks))
+        else:
+            outcomes = dict(map(decide, tasks))
+        # Drafters created during these decisions count from zero
+        reply = {
+            "outcomes": outcomes,
+            "counters": {
+                key: _counter_delta(before.get(key, {}), _counters(obj))
+                for key, obj in _counted(runner, roots).items()
+            },
+            "invalidated": list(invalidated),
+        }
+        conn.send_bytes(_dumps(reply, roots_by_id))
+
+
+class AgentProcessPool:
+    """Forked workers deciding agent steps for an `ExperimentRunner`.
+
+    Args:
+        runner: The coordinator's runner; each worker is a fork of it.
+        processes: Number of worker processes (agent shards).
+        threads: Threads per worker, i.e. concurrent LLM calls per shard.
+    """
+
+    def __init__(self, runner: Any, processes: int, threads: int = 1):
+        if not fork_available():
+            raise RuntimeError("Process-pool execution needs the 'fork' start method")
+        ctx = multiprocessing.get_context("fork")
+        self.runner = runner
+        self.processes = processes
+        self.owner = {aid: i % processes for i, aid in enumerate(runner.agents)}
+        self._conns = []
+        self._procs = []
+        for _ in range(processes):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker_main, args=(runner, child, threads), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+        self._roots = CheckpointManager.collect_roots(runner)
+        self._roots_by_id = {id(obj): key for key, obj in self._roots.items()}
+        self._synced = {
+            key: obj for key, obj in self._roots.items()
+            if key not in _COORDINATOR_ONLY and not isinstance(obj, dict) and hasattr(obj, "__dict__")
+        }
+        # Social context reads other shards' agents only through a hub
+        self.broadcast_agents = "hub" in self._roots
+        self._digests: Dict[str, bytes] = {}
+        self._unpicklable: Dict[str, set] = {}
+        self._journal: List[Tuple] = []
+        self._watched: List[Tuple[Any, str]] = []
+        # Workers were forked with the current state; only later writes are journalled
+        self._watch("memory_engine", MEMORY_WRITES)
+        for key in self._synced:
+            self._state_blob(key)
+
+    # ------------------------------------------------------------------
+    # Coordinator -> worker state
+    # ------------------------------------------------------------------
+
+    def _watch(self, key: str, methods: Sequence[str]) -> None:
+        obj = self._roots.get(key)
+        if obj is None:
+            return
+        for name in methods:
+            method = getattr(obj, name, None)
+            if not callable(method):
+                continue
+
+            def recorder(*args, _method=method, _name=name, **kwargs):
+                self.record(_owner_of(args), key, _name, args, kwargs)
+                return _method(*args, **kwargs)
+
+            setattr(obj, name, recorder)
+            self._watched.append((obj, name))
+
+    def record(self, owner: Optional[str], key: str, method: str,
+               args: Sequence[Any], kwargs: Optional[Dict[str, Any]] = None) -> None:
+        """Replay ``roots[key].method(*args, **kwargs)`` in the worker owning
+        ``owner`` (every worker when ``owner`` is not an agent) before its
+        next decisions."""
+        self._journal.append((owner, key, method, tuple(args), dict(kwargs or {})))
+
+    def _state_blob(self, key: str) -> Optional[bytes]:
+        """Pickled state of ``key`` if it changed since last sent, else None."""
+        skipped = self._unpicklable.setdefault(key, set())
+        state = {k: v for k, v in vars(self._synced[key]).items() if k not in skipped}
+        try:
+            blob = _dumps(state, self._roots_by_id)
+        except Exception:
+            # Locks, handles and clients stay as forked, like in checkpoints
+            for attr, value in list(state.items()):
+                try:
+                    _dumps(value, self._roots_by_id)
+                except Exception:
+                    skipped.add(attr)
+                    del state[attr]
+            blob = _dumps(state, self._roots_by_id)
+        digest = hashlib.sha1(blob).digest()
+        if self._digests.get(key) == digest:
+            return None
+        self._digests[key] = digest
+        return blob
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def _sync_shard(self, key: str) -> Optional[int]:
+        """Worker that alone receives ``key``'s state, or None for every worker."""
+        if key.startswith("agent:") and not self.broadcast_agents:
+            return self.owner.get(key[len("agent:"):])
+        return None
+
+    def _requests(self, tasks: Sequence[Tuple[Any, int]], run_id: str, env: Dict) -> List[Dict]:
+        """One request per worker: state sync, journal and its tasks."""
+        requests = [
+            {"sync": {}, "journal": [], "tasks": [], "run_id": run_id, "env": env}
+            for _ in self._conns
+        ]
+        for key in self._synced:
+            blob = self._state_blob(key)
+            if blob is None:
+                continue
+            shard = self._sync_shard(key)
+            for request in (requests if shard is None else [requests[shard]]):
+                request["sync"][key] = blob
+        for owner, key, method, args, kwargs in self._journal:
+            shard = self.owner.get(owner)
+            targets = requests if shard is None else [requests[shard]]
+            for request in targets:
+                request["journal"].append((key, method, args, kwargs))
+        self._journal = []
+        for agent, step_id in tasks:
+            if agent.id not in self.owner:
+                raise RuntimeError(f"Agent {agent.id} was added after the process pool started")
+            requests[self.owner[agent.id]]["tasks"].append((agent.id, step_id))
+        return requests
+
+    def decide(self, tasks: Sequence[Tuple[Any, int]], run_id: str, env: Dict) -> Dict[str, Tuple]:
+        """Decide ``(agent, step_id)`` tasks on their owners' workers.
+
+        Returns each agent id's ``(kind, payload, context_hash, timing)``
+        outcome (see ``_decide_one``); worker counter deltas and cache
+        invalidations are applied to the coordinator's objects.
+        """
+        requests = self._requests(tasks, run_id, env)
+        # Every worker gets its sync and journal, even without tasks
+        for conn, request in zip(self._conns, requests):
+            conn.send_bytes(_dumps(request, self._roots_by_id))
+        outcomes: Dict[str, Tuple] = {}
+        for shard, conn in enumerate(self._conns):
+            try:
+                reply = _loads(conn.recv_bytes(), self._roots)
+            except EOFError:
+                raise RuntimeError(f"Process-pool worker {shard} exited unexpectedly") from None
+            for agent_id, (kind, payload, context_hash, timing) in reply["outcomes"].items():
+                if kind == "decided" and hasattr(payload, "env_context"):
+                    payload.env_context = env
+                outcomes[agent_id] = (kind, payload, context_hash, timing)
+            for key, delta in reply["counters"].items():
+                target = self._counter_target(key)
+                if target is not None:
+                    _add_counters(target, delta)
+            cache = self._roots.get("cognitive_cache")
+            for context_hash in reply["invalidated"]:
+                if cache is not None:
+                    cache.invalidate(context_hash)
+        return outcomes
+
+    def _counter_target(self, key: str) -> Any:
+        """The coordinator's object for a ``_counted`` key."""
+        if key == "packed_stats":
+            return self.runner.packed_stats
+        if key.startswith("drafter:"):
+            agent_type = key[len("drafter:"):]
+            if agent_type not in self.runner.drafters:
+                self.runner.get_llm_invoke(agent_type)  # builds the type's drafter
+            return self.runner.drafters.get(agent_type)
+        return self._roots.get(key)
+
+    def close(self) -> None:
+        """Stop the workers and restore the watched methods."""
+        for obj, name in self._watched:
+            vars(obj).pop(name, None)
+        self._watched = []
+        for conn in self._conns:
+            try:
+                conn.send_bytes(_dumps(None, {}))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        self._conns, self._procs = [], []
@@ -34,7 +34,8 @@ out-of-range magnitudes are corrected at execution time via bounded Gaussian
 resampling rather than rejected. The audit trail records advisory flags
 alongside binding rejections so reviewers can distinguish the two.
 """
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from ..interfaces.skill_types import (
@@ -50,13 +51,49 @@ from ..utils.agent_config import GovernanceAuditor, load_agent_config
 from ..components.analytics.interaction import InteractionHub
 from ..components.analytics.audit import AuditWriter
 from ..components.governance.retriever import SkillRetriever
+from ..components.analytics.latency import StageProfiler
 from ..utils.logging import logger
 
+from .prefix_scheduling import PrefixReuseStats
 from ._retry_loop import RetryMixin
 from ._audit_helpers import AuditMixin
 from ._skill_filtering import SkillFilterMixin
 
 
+@dataclass
+class StepDecision:
+    """A governed decision awaiting execution (see `SkillBrokerEngine.decide_step`).
+
+    Holds what `SkillBrokerEngine.complete_step` needs to execute the
+    approved skill and write the audit trace, so the two halves of a
+    step can run in different processes.
+    """
+    agent_id: str
+    agent_type: str
+    run_id: str
+    step_id: int
+    seed: int
+    timestamp: str
+    env_context: Dict[str, Any]
+    context: Dict[str, Any]
+    context_hash: str
+    prompt: str
+    raw_output: Any
+    memory_pre: List[Any]
+    skill_proposal: SkillProposal
+    approved_skill: ApprovedSkill
+    outcome: SkillOutcome
+    all_valid: bool
+    retry_count: int
+    format_retry_count: int
+    total_llm_stats: Dict[str, Any]
+    validation_results: List[ValidationResult]
+    all_validation_history: List[ValidationResult]
+    secondary_proposal: Optional[SkillProposal] = None
+    secondary_approved: Optional[ApprovedSkill] = None
+    composite_errors: List[str] = field(default_factory=list)
+
+
 class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
     """
     Skill-Governed Broker Engine.
@@ -87,7 +124,9 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
         audit_writer: Optional[Any] = None,
         max_retries: int = 3,
         log_prompt: bool = False,
-        custom_validators: Optional[List[Callable]] = None # New parameter
+        custom_validators: Optional[List[Callable]] = None, # New parameter
+        profiler: Optional[StageProfiler] = None,
+        preflight_pruning: bool = False,
     ):
         self.skill_registry = skill_registry
         self.model_adapter = model_adapter
@@ -96,6 +135,9 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
         self.context_builder = context_builder
         self.config = config or load_agent_config()
         self.custom_validators = custom_validators or [] # Store custom validators
+        # Drop skills that state-only governance would block from the
+        # prompt's options (see SkillFilterMixin._preflight_prune)
+        self.preflight_pruning = preflight_pruning
         
         if skill_retriever:
             self.skill_retriever = skill_retriever
@@ -126,6 +168,10 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
             "aborted": 0
         }
         self.auditor = GovernanceAuditor()
+        # Per-stage latency histograms (performance_summary.json)
+        self.profiler = profiler or StageProfiler()
+        # Prompt-cache reuse per agent type, where providers report it
+        self.prefix_reuse = PrefixReuseStats()
 
     
     def process_step(
@@ -148,14 +194,59 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
         ④ ApprovedSkill creation
         ⑤ Execution (simulation engine ONLY)
         ⑥ Audit trace
+
+        Stage latencies are recorded in ``self.profiler``.
+        """
+        self.profiler.begin_step(agent_type)
+        try:
+            return self._process_step(
+                agent_id, step_id, run_id, seed, llm_invoke, agent_type, env_context,
+            )
+        finally:
+            self.profiler.end_step()
+
+    def _process_step(
+        self,
+        agent_id: str,
+        step_id: int,
+        run_id: str,
+        seed: int,
+        llm_invoke: Callable[[str], str],
+        agent_type: str,
+        env_context: Optional[Dict[str, Any]],
+    ) -> SkillBrokerResult:
+        decision = self.decide_step(
+            agent_id, step_id, run_id, seed, llm_invoke, agent_type, env_context,
+        )
+        if isinstance(decision, SkillBrokerResult):
+            return decision
+        return self.complete_step(decision)
+
+    def decide_step(
+        self,
+        agent_id: str,
+        step_id: int,
+        run_id: str,
+        seed: int,
+        llm_invoke: Callable[[str], str],
+        agent_type: str = "default",
+        env_context: Optional[Dict[str, Any]] = None,
+    ) -> Union[SkillBrokerResult, StepDecision]:
+        """Steps ①-④ of `process_step`: everything before execution.
+
+        Returns the `StepDecision` to pass to `complete_step`, or the
+        ABORTED result when the output could not be parsed. Stage
+        latencies go to the current profiler step, if one is open.
         """
+        stage = self.profiler.stage
         self.stats["total"] += 1
         timestamp = datetime.now().isoformat()
         
         # ① Build bounded context (READ-ONLY)
-        context = self.context_builder.build(agent_id, step_id=step_id, run_id=run_id, env_context=env_context)
-        self._inject_filtered_skills(context, agent_type)
-        context_hash = self._hash_context(context)
+        with stage("context_build"):
+            context = self.context_builder.build(agent_id, step_id=step_id, run_id=run_id, env_context=env_context)
+            self._inject_filtered_skills(context, agent_type, env_context)
+            context_hash = self._hash_context(context)
 
         # Phase 28: Dynamic Skill Retrieval (RAG)
         # Re-alignment: Only apply RAG for advanced engines (Hierarchical, Importance, HumanCentric)
@@ -171,24 +262,25 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
             if isinstance(mem_engine, WindowMemoryEngine):
                 should_rag = False
         
-        if should_rag:
-            raw_skill_ids = context["available_skills"]
-            # Convert IDs to full definitions for retriever
-            eligible_skills = []
-            for sid in raw_skill_ids:
-                s_def = self.skill_registry.get(sid)
-                if s_def:
-                    eligible_skills.append(s_def)
+        with stage("skill_retrieval"):
+            if should_rag:
+                raw_skill_ids = context["available_skills"]
+                # Convert IDs to full definitions for retriever
+                eligible_skills = []
+                for sid in raw_skill_ids:
+                    s_def = self.skill_registry.get(sid)
+                    if s_def:
+                        eligible_skills.append(s_def)
             
-            # Retrieve top relevant skills
-            retrieved_skills = self.skill_retriever.retrieve(context, eligible_skills)
-            logger.debug(f" [RAG] Retrieved {len(retrieved_skills)} relevant skills for {agent_id}")
+                # Retrieve top relevant skills
+                retrieved_skills = self.skill_retriever.retrieve(context, eligible_skills)
+                logger.debug(f" [RAG] Retrieved {len(retrieved_skills)} relevant skills for {agent_id}")
             
-            # Update context with retrieved skill IDs
-            context["available_skills"] = [s.skill_id for s in retrieved_skills]
-            # Also store full definitions for ContextBuilder to show descriptions if needed
-            context["retrieved_skill_definitions"] = retrieved_skills
-            self._inject_options_text(context, [s.skill_id for s in retrieved_skills])
+                # Update context with retrieved skill IDs
+                context["available_skills"] = [s.skill_id for s in retrieved_skills]
+                # Also store full definitions for ContextBuilder to show descriptions if needed
+                context["retrieved_skill_definitions"] = retrieved_skills
+                self._inject_options_text(context, [s.skill_id for s in retrieved_skills])
 
         # Robust memory extraction for audit (handles nesting and stringification)
         raw_mem = context.get("memory")
@@ -202,7 +294,8 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
             memory_pre = list(raw_mem).copy() if raw_mem else []
         
         # ② LLM output → ModelAdapter → SkillProposal (with retry for empty/failed parse)
-        prompt = self.context_builder.format_prompt(context)
+        with stage("format_prompt"):
+            prompt = self.context_builder.format_prompt(context)
         skill_proposal, raw_output, format_retry_count, total_llm_stats = (
             self._invoke_llm_with_retries(prompt, llm_invoke, context, agent_id, agent_type, env_context)
         )
@@ -237,19 +330,14 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
                     f"Consider using distinct key names."
                 )
 
-        validation_context = {
-            "agent_state": context,
-            "agent_type": agent_type,
-            "env_state": env_context,  # The "New Standard" source of truth
-            **flat_state,              # Flatten agent state for custom validators
-            **flat_env,                # Flat injection for legacy validator lookups
-        }
+        validation_context = self._validation_context(context, agent_type, env_context)
 
         # Inject proposed magnitude into validation context (activates magnitude_cap_check)
         if skill_proposal and skill_proposal.magnitude_pct is not None:
             validation_context["proposed_magnitude"] = skill_proposal.magnitude_pct
 
-        validation_results = self._run_validators(skill_proposal, validation_context)
+        with stage("validation"):
+            validation_results = self._run_validators(skill_proposal, validation_context)
         all_validation_history = list(validation_results)
         all_valid = all(v.valid for v in validation_results)
         
@@ -295,18 +383,19 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
                 logger.info(f" [Governance:Warning] {agent_id} | {v.warnings[0]}")
 
         # Governance retry loop
-        skill_proposal, raw_output, validation_results, all_validation_history, all_valid, retry_count = (
-            self._governance_retry_loop(
-                all_valid=all_valid, skill_proposal=skill_proposal,
-                validation_results=validation_results,
-                all_validation_history=all_validation_history,
-                validation_context=validation_context,
-                prompt=prompt, llm_invoke=llm_invoke, context=context,
-                agent_id=agent_id, agent_type=agent_type,
-                env_context=env_context, raw_output=raw_output,
-                total_llm_stats=total_llm_stats,
+        with stage("governance_retry"):
+            skill_proposal, raw_output, validation_results, all_validation_history, all_valid, retry_count = (
+                self._governance_retry_loop(
+                    all_valid=all_valid, skill_proposal=skill_proposal,
+                    validation_results=validation_results,
+                    all_validation_history=all_validation_history,
+                    validation_context=validation_context,
+                    prompt=prompt, llm_invoke=llm_invoke, context=context,
+                    agent_id=agent_id, agent_type=agent_type,
+                    env_context=env_context, raw_output=raw_output,
+                    total_llm_stats=total_llm_stats,
+                )
             )
-        )
 
         # ④ Create ApprovedSkill or use fallback
         approved_skill, outcome = self._build_approved_skill(
@@ -323,7 +412,6 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
         # ④b Multi-skill: validate + build secondary (if enabled)
         secondary_proposal = None
         secondary_approved = None
-        secondary_execution = None
         composite_errors = []
         ms_cfg = self.config.get_multi_skill_config(agent_type) if self.config else {}
         if ms_cfg and skill_proposal and all_valid:
@@ -371,73 +459,123 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
                         logger.warning(f" [Multi-Skill] {agent_id} | Secondary '{sec_skill}' failed: {sec_errs}")
                         secondary_proposal = None
 
+        return StepDecision(
+            agent_id=agent_id, agent_type=agent_type, run_id=run_id,
+            step_id=step_id, seed=seed, timestamp=timestamp,
+            env_context=env_context, context=context, context_hash=context_hash,
+            prompt=prompt, raw_output=raw_output, memory_pre=memory_pre,
+            skill_proposal=skill_proposal, approved_skill=approved_skill,
+            outcome=outcome, all_valid=all_valid, retry_count=retry_count,
+            format_retry_count=format_retry_count, total_llm_stats=total_llm_stats,
+            validation_results=validation_results,
+            all_validation_history=all_validation_history,
+            secondary_proposal=secondary_proposal,
+            secondary_approved=secondary_approved,
+            composite_errors=composite_errors,
+        )
+
+    def complete_step(
+        self,
+        decision: StepDecision,
+        executed: Optional[Tuple[ExecutionResult, Optional[ExecutionResult]]] = None,
+    ) -> SkillBrokerResult:
+        """Steps ⑤-⑥ of `process_step`: execution and the audit trace.
+
+        ``executed`` is ``(execution_result, secondary_execution)`` when
+        the caller already ran `execution_skill` (and the secondary
+        skill) on the simulation engine, e.g. in one batched call for a
+        whole phase; step ⑤ is then skipped.
+        """
+        stage = self.profiler.stage
+        agent_id, outcome = decision.agent_id, decision.outcome
+        approved_skill = decision.approved_skill
+        secondary_approved = decision.secondary_approved
+        secondary_execution = None
+
         # ⑤ Execution (simulation engine ONLY — skip if REJECTED)
-        if self.simulation_engine and outcome not in (SkillOutcome.REJECTED, SkillOutcome.UNCERTAIN):
-            execution_result = self.simulation_engine.execute_skill(approved_skill)
-            # ⑤b Sequential secondary execution
-            if secondary_approved and execution_result.success:
-                secondary_execution = self.simulation_engine.execute_skill(secondary_approved)
-        elif outcome in (SkillOutcome.REJECTED, SkillOutcome.UNCERTAIN):
-            # REJECTED: execute the registry's default skill as fallback so the
-            # agent's state is recalculated (instead of a full no-op that
-            # freezes state).
-            if self.simulation_engine:
-                # Phase 6J-E (2026-05-22): get_default_skill() now raises
-                # if unconfigured (Phase 6J-C), so the only branch left to
-                # guard is whether the configured id is actually registered.
-                fallback_skill = self.skill_registry.get_default_skill()
-                if self.skill_registry.exists(fallback_skill):
-                    fallback = ApprovedSkill(
-                        skill_name=fallback_skill,
-                        agent_id=approved_skill.agent_id,
-                        approval_status="REJECTED_FALLBACK",
-                    )
-                    execution_result = self.simulation_engine.execute_skill(fallback)
-                else:
-                    logger.warning(f"Default skill '{fallback_skill}' not in registry for {approved_skill.agent_id}")
+        with stage("execution"):
+            if executed is not None:
+                execution_result, secondary_execution = executed
+            elif self.simulation_engine:
+                skill = self.execution_skill(decision)
+                if skill is None:
                     execution_result = ExecutionResult(success=False, state_changes={})
-            else:
+                else:
+                    execution_result = self.simulation_engine.execute_skill(skill)
+                # ⑤b Sequential secondary execution
+                if skill is approved_skill and secondary_approved and execution_result.success:
+                    secondary_execution = self.simulation_engine.execute_skill(secondary_approved)
+            elif outcome in (SkillOutcome.REJECTED, SkillOutcome.UNCERTAIN):
                 execution_result = ExecutionResult(success=False, state_changes={})
-        else:
-            # Standalone mode: Default to pseudo-execution
-            execution_result = ExecutionResult(
-                success=True,
-                state_changes={}
-            )
+            else:
+                # Standalone mode: Default to pseudo-execution
+                execution_result = ExecutionResult(
+                    success=True,
+                    state_changes={}
+                )
 
         # Capture memory state after execution (before experiment-layer updates)
         memory_post = self._get_memory_snapshot(agent_id)
 
         # ⑥ Audit trace
         if self.audit_writer:
-            self._write_audit_trace(
-                agent_type=agent_type, context=context,
-                run_id=run_id, step_id=step_id, timestamp=timestamp,
-                env_context=env_context, seed=seed, agent_id=agent_id,
-                all_valid=all_valid, prompt=prompt, raw_output=raw_output,
-                context_hash=context_hash, memory_pre=memory_pre,
-                memory_post=memory_post, skill_proposal=skill_proposal,
-                approved_skill=approved_skill, execution_result=execution_result,
-                outcome=outcome, retry_count=retry_count,
-                format_retry_count=format_retry_count,
-                total_llm_stats=total_llm_stats,
-                all_validation_history=all_validation_history,
-            )
+            with stage("audit_write"):
+                self._write_audit_trace(
+                    agent_type=decision.agent_type, context=decision.context,
+                    run_id=decision.run_id, step_id=decision.step_id,
+                    timestamp=decision.timestamp, env_context=decision.env_context,
+                    seed=decision.seed, agent_id=agent_id,
+                    all_valid=decision.all_valid, prompt=decision.prompt,
+                    raw_output=decision.raw_output,
+                    context_hash=decision.context_hash, memory_pre=decision.memory_pre,
+                    memory_post=memory_post, skill_proposal=decision.skill_proposal,
+                    approved_skill=approved_skill, execution_result=execution_result,
+                    outcome=outcome, retry_count=decision.retry_count,
+                    format_retry_count=decision.format_retry_count,
+                    total_llm_stats=decision.total_llm_stats,
+                    all_validation_history=decision.all_validation_history,
+                )
 
         return SkillBrokerResult(
             outcome=outcome,
-            skill_proposal=skill_proposal,
+            skill_proposal=decision.skill_proposal,
             approved_skill=approved_skill,
             execution_result=execution_result,
-            validation_errors=[e for v in validation_results if v and hasattr(v, 'errors') for e in v.errors],
-            retry_count=retry_count,
-            format_retries=format_retry_count,
-            secondary_proposal=secondary_proposal,
+            validation_errors=[
+                e for v in decision.validation_results if v and hasattr(v, 'errors') for e in v.errors
+            ],
+            retry_count=decision.retry_count,
+            format_retries=decision.format_retry_count,
+            secondary_proposal=decision.secondary_proposal,
             secondary_approved=secondary_approved,
             secondary_execution=secondary_execution,
-            composite_validation_errors=composite_errors,
+            composite_validation_errors=decision.composite_errors,
         )
     
+    def execution_skill(self, decision: StepDecision) -> Optional[ApprovedSkill]:
+        """The skill step ⑤ hands to the simulation engine for ``decision``.
+
+        The approved skill, or for REJECTED / UNCERTAIN the registry's
+        default skill as a fallback so the agent's state is recalculated
+        (instead of a full no-op that freezes state). ``None`` if that
+        default skill is not registered.
+        """
+        approved_skill = decision.approved_skill
+        if decision.outcome not in (SkillOutcome.REJECTED, SkillOutcome.UNCERTAIN):
+            return approved_skill
+        # Phase 6J-E (2026-05-22): get_default_skill() now raises
+        # if unconfigured (Phase 6J-C), so the only branch left to
+        # guard is whether the configured id is actually registered.
+        fallback_skill = self.skill_registry.get_default_skill()
+        if self.skill_registry.exists(fallback_skill):
+            return ApprovedSkill(
+                skill_name=fallback_skill,
+                agent_id=approved_skill.agent_id,
+                approval_status="REJECTED_FALLBACK",
+            )
+        logger.warning(f"Default skill '{fallback_skill}' not in registry for {approved_skill.agent_id}")
+        return None
+
     def _build_approved_skill(
         self, *, all_valid: bool, skill_proposal, agent_id: str,
         agent_type: str, retry_count: int, validation_results: List,
@@ -516,11 +654,22 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
 
         return approved_skill, outcome
 
-    def _run_validators(self, proposal: SkillProposal, context: Dict) -> List[ValidationResult]:
-        """Run all validators on the skill proposal."""
-        if context is None:
-            context = {}
+    @staticmethod
+    def _validation_context(
+        context: Dict[str, Any], agent_type: str, env_context: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Context handed to validators: nested sources plus flat state/env keys."""
+        env_context = env_context or {}
+        return {
+            "agent_state": context,
+            "agent_type": agent_type,
+            "env_state": env_context,          # The "New Standard" source of truth
+            **context.get("state", {}),        # Flatten agent state for custom validators
+            **env_context,                     # Flat injection for legacy validator lookups
+        }
 
+    def _scope_context(self, proposal: SkillProposal, context: Dict) -> Dict:
+        """Add ``agent_type``/``base_type`` so agent-type-scoped checks apply."""
         proposal_agent_type = getattr(proposal, "agent_type", None)
         agent_type = context.get("agent_type")
         if not agent_type and proposal_agent_type and proposal_agent_type != "default":
@@ -539,10 +688,19 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
                     if isinstance(base_type, str) and base_type:
                         scoped_context["base_type"] = base_type
             context = scoped_context
+        return context
 
+    def _run_validators(self, proposal: SkillProposal, context: Dict) -> List[ValidationResult]:
+        """Run all validators on the skill proposal."""
+        if context is None:
+            context = {}
+        context = self._scope_context(proposal, context)
+
+        stage = self.profiler.stage
         results = []
         for validator in self.validators:
-            result = validator.validate(proposal, context, self.skill_registry)
+            with stage(f"validator:{type(validator).__name__}"):
+                result = validator.validate(proposal, context, self.skill_registry)
             if isinstance(result, list):
                 results.extend(result)
             else:
@@ -550,7 +708,9 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
 
         # Run custom validators
         for custom_validator_func in self.custom_validators:
-            custom_results = custom_validator_func(proposal, context, self.skill_registry)
+            name = getattr(custom_validator_func, "__name__", type(custom_validator_func).__name__)
+            with stage(f"validator:{name}"):
+                custom_results = custom_validator_func(proposal, context, self.skill_registry)
             if isinstance(custom_results, list):
                 results.extend(custom_results)
             else:
@@ -574,9 +734,10 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
                     except (ValueError, TypeError):
                         output_fields["decision"] = num_str
                     break
-            schema_result = self.skill_registry.validate_output_schema(
-                proposal.skill_name, output_fields
-            )
+            with stage("validator:output_schema"):
+                schema_result = self.skill_registry.validate_output_schema(
+                    proposal.skill_name, output_fields
+                )
             if schema_result:
                 if not schema_result.valid:
                     schema_result.metadata["rules_hit"] = ["output_schema_violation"]
@@ -588,9 +749,10 @@ class SkillBrokerEngine(RetryMixin, AuditMixin, SkillFilterMixin):
                 and self.skill_registry.exists(proposal.skill_name)):
             agent_ctx = context.get("agent_state", {})
             state = agent_ctx.get("state", {}) if isinstance(agent_ctx, dict) else {}
-            precond_result = self.skill_registry.check_preconditions(
-                proposal.skill_name, state
-            )
+            with stage("validator:preconditions"):
+                precond_result = self.skill_registry.check_preconditions(
+                    proposal.skill_name, state
+                )
             if precond_result:
                 if not precond_result.valid:
                     precond_result.metadata["rules_hit"] = ["precondition_violation"]
@@ -0,0 +1,465 @@
+"""Parallel multi-seed sweep orchestration.
+
+Runs a ``(model x seed x ablation)`` matrix of experiment cells across
+worker processes, replacing one-process-per-seed ``.bat`` loops:
+
+- **Shared read-only inputs.** ``shared_loader`` runs once in the
+  parent (agent profiles, grids, parsed YAML). Workers receive the
+  result through the pool initializer, so under the ``fork`` start
+  method it is inherited copy-on-write and under ``spawn`` (Windows) it
+  is unpickled once per worker rather than once per cell. Cells read
+  it via :func:`shared_inputs` and must treat it as immutable.
+- **Global LLM budget.** ``llm_concurrency`` caps in-flight calls
+  against the (single) LLM endpoint across all workers with one
+  cross-process semaphore. Cells opt in by wrapping their invoke
+  function with :func:`throttle` or a block with :func:`llm_slot`.
+- **Retries and resume.** Each cell's status, attempts and output
+  directory are recorded in ``sweep_manifest.json`` after every
+  completion; re-running the same sweep skips finished cells and
+  retries failed or interrupted ones.
+- **Consolidated index.** ``sweep_index.csv`` lists every cell with its
+  status and output directory.
+
+Usage::
+
+    def run_cell(cell, output_dir, shared):   # module-level, picklable
+        invoke = throttle(create_llm_invoke(cell.model))
+        ...
+        return {"n_decisions": n}
+
+    runner = SweepRunner(run_cell, "results/sweep_v21", max_workers=6,
+                         llm_concurrency=4, shared_loader=load_profiles)
+    summary = runner.run(build_matrix(["gemma3:4b"], [42, 43, 44],
+                                      {"governed": {}, "ungoverned": {"no_governance": True}}))
+
+``CommandCell`` runs an existing CLI script per cell instead of a
+Python callable (see ``python -m broker.tools.run_sweep``).
+"""
+from __future__ import annotations
+
+import csv
+import functools
+import json
+import multiprocessing as mp
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from broker.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+MANIFEST_FILE = "sweep_manifest.json"
+INDEX_FILE = "sweep_index.csv"
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(text)).strip("_") or "x"
+
+
+@dataclass(frozen=True)
+class SweepCell:
+    """One point of the sweep matrix.
+
+    Attributes:
+        model: LLM model identifier (e.g. ``gemma3:4b``).
+        seed: Random seed.
+        ablation: Ablation / condition name.
+        params: Extra parameters for the cell (not part of its identity).
+    """
+    model: str
+    seed: int
+    ablation: str = "default"
+    params: Dict[str, Any] = field(default_factory=dict, compare=False, hash=False)
+
+    @property
+    def cell_id(self) -> str:
+        """Filesystem-safe identifier, also the default output subdirectory."""
+        return f"{_slug(self.model)}__seed{self.seed}__{_slug(self.ablation)}"
+
+
+def build_matrix(
+    models: Sequence[str],
+    seeds: Sequence[int],
+    ablations: Union[Sequence[str], Mapping[str, Dict[str, Any]], None] = None,
+) -> List[SweepCell]:
+    """Cartesian product in model -> ablation -> seed order.
+
+    ``ablations`` is a list of names or a ``{name: params}`` mapping;
+    ``None`` gives a single ``"default"`` ablation.
+    """
+    if ablations is None:
+        ablations = {"default": {}}
+    elif not isinstance(ablations, Mapping):
+        ablations = {name: {} for name in ablations}
+    return [
+        SweepCell(model=model, seed=int(seed), ablation=name, params=dict(params))
+        for model in models
+        for name, params in ablations.items()
+        for seed in seeds
+    ]
+
+
+@dataclass
+class CellRecord:
+    """Manifest entry for one cell."""
+    cell_id: str
+    model: str
+    seed: int
+    ablation: str
+    output_dir: str
+    status: str = STATUS_PENDING
+    attempts: int = 0
+    duration_s: float = 0.0
+    error: str = ""
+    result: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "cell_id": self.cell_id,
+            "model": self.model,
+            "seed": self.seed,
+            "ablation": self.ablation,
+            "output_dir": self.output_dir,
+            "status": self.status,
+            "attempts": self.attempts,
+            "duration_s": round(self.duration_s, 3),
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class SweepManifest:
+    """Resumable record of a sweep, persisted as ``sweep_manifest.json``.
+
+    Writes are atomic (temp file + ``os.replace``), so an interrupted
+    sweep always leaves a readable manifest. Cells found ``running`` on
+    load were interrupted and are treated as pending.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.records: Dict[str, CellRecord] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for entry in data.get("cells", []):
+                record = CellRecord(**entry)
+                if record.status == STATUS_RUNNING:
+                    record.status = STATUS_PENDING
+                self.records[record.cell_id] = record
+
+    def register(self, cell: SweepCell, output_dir: Path) -> CellRecord:
+        record = self.records.get(cell.cell_id)
+        if record is None:
+            record = self.records[cell.cell_id] = CellRecord(
+                cell_id=cell.cell_id,
+                model=cell.model,
+                seed=cell.seed,
+                ablation=cell.ablation,
+                output_dir=str(output_dir),
+            )
+        return record
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"updated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "cells": [r.to_dict() for r in self.records.values()]},
+                f, indent=2, default=str,
+            )
+        os.replace(tmp, self.path)
+
+    def write_index(self, path: Union[str, Path]) -> None:
+        """One row per cell: identity, status, attempts, output directory."""
+        columns = ["cell_id", "model", "seed", "ablation", "status",
+                   "attempts", "duration_s", "output_dir"]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for record in self.records.values():
+                writer.writerow(record.to_dict())
+
+
+@dataclass
+class SweepSummary:
+    """Outcome of one :meth:`SweepRunner.run` call."""
+    n_total: int = 0
+    n_skipped: int = 0
+    n_done: int = 0
+    n_failed: int = 0
+    n_retried: int = 0
+    records: List[CellRecord] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "n_total": self.n_total,
+            "n_skipped": self.n_skipped,
+            "n_done": self.n_done,
+            "n_failed": self.n_failed,
+            "n_retried": self.n_retried,
+            "failed": [r.cell_id for r in self.records if r.status == STATUS_FAILED],
+        }
+
+
+# ---------- worker side ----------
+
+_SHARED: Any = None
+_LLM_SLOTS: Any = None
+
+
+def _init_worker(shared: Any, slots: Any) -> None:
+    global _SHARED, _LLM_SLOTS
+    _SHARED = shared
+    _LLM_SLOTS = slots
+
+
+def shared_inputs() -> Any:
+    """The sweep's shared read-only inputs inside a running cell."""
+    return _SHARED
+
+
+@contextmanager
+def llm_slot() -> Iterator[None]:
+    """Hold one unit of the sweep's global LLM concurrency budget.
+
+    A no-op outside a sweep or when the sweep has no budget.
+    """
+    slots = _LLM_SLOTS
+    if slots is None:
+        yield
+        return
+    slots.acquire()
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+def throttle(invoke: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an LLM invoke function so every call holds an :func:`llm_slot`.
+
+    A ``chat`` attribute (continuation retries) is throttled the same way.
+    """
+    @functools.wraps(invoke)
+    def throttled(*args, **kwargs):
+        with llm_slot():
+            return invoke(*args, **kwargs)
+
+    chat = getattr(invoke, "chat", None)
+    if callable(chat):
+        throttled.chat = throttle(chat)
+    return throttled
+
+
+CellFn = Callable[[SweepCell, Path, Any], Optional[Dict[str, Any]]]
+
+
+def _run_cell_job(job: Tuple[CellFn, SweepCell, str]) -> Tuple[bool, Optional[Dict[str, Any]], str, float]:
+    run_cell, cell, output_dir = job
+    start = time.perf_counter()
+    try:
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        result = run_cell(cell, out, _SHARED)
+        return True, result, "", time.perf_counter() - start
+    except Exception as e:
+        return False, None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+class CommandCell:
+    """Cell function that runs a shell command per cell.
+
+    ``template`` is formatted with ``model``, ``seed``, ``ablation``,
+    ``output_dir`` and the cell's ``params``; output goes to
+    ``<output_dir>/sweep_cell.log``. The whole command holds one LLM
+    slot, so ``llm_concurrency`` bounds concurrent LLM-driven runs.
+    """
+
+    def __init__(self, template: str, cwd: Optional[Union[str, Path]] = None):
+        self.template = template
+        self.cwd = str(cwd) if cwd else None
+
+    def __call__(self, cell: SweepCell, output_dir: Path, shared: Any) -> Dict[str, Any]:
+        command = self.template.format(
+            model=cell.model, seed=cell.seed, ablation=cell.ablation,
+            output_dir=output_dir, **cell.params,
+        )
+        with llm_slot(), open(output_dir / "sweep_cell.log", "w", encoding="utf-8") as log:
+            proc = subprocess.run(
+                command, shell=True, cwd=self.cwd,
+                stdout=log, stderr=subprocess.STDOUT,
+            )
+        if proc.returncode != 0:
+            raise RuntimeError(f"command exited with {proc.returncode}: {command}")
+        return {"command": command}
+
+
+class SweepRunner:
+    """Runs sweep cells over a process pool with retries and a manifest.
+
+    Args:
+        run_cell: Module-level ``(cell, output_dir, shared) -> dict | None``.
+            Raising marks the attempt failed.
+        output_root: Sweep directory; holds the manifest, the index and
+            one ``<cell_id>`` output directory per cell.
+        max_workers: Worker processes (``1`` runs in-process).
+        llm_concurrency: Global cap on in-flight LLM calls, or ``None``.
+        max_retries: Extra attempts per cell within one run.
+        shared_loader: Called once in the parent to build shared inputs.
+        start_method: Multiprocessing start method; defaults to ``fork``
+            where available (copy-on-write sharing), else ``spawn``.
+    """
+
+    def __init__(
+        self,
+        run_cell: CellFn,
+        output_root: Union[str, Path],
+        max_workers: Optional[int] = None,
+        llm_concurrency: Optional[int] = None,
+        max_retries: int = 1,
+        shared_loader: Optional[Callable[[], Any]] = None,
+        start_method: Optional[str] = None,
+    ):
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be >= 0, got {max_retries}")
+        if llm_concurrency is not None and llm_concurrency < 1:
+            raise ValueError(f"llm_concurrency must be >= 1, got {llm_concurrency}")
+        self.run_cell = run_cell
+        self.output_root = Path(output_root)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.llm_concurrency = llm_concurrency
+        self.max_retries = max_retries
+        self.shared_loader = shared_loader
+        if start_method is None:
+            start_method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+        self.start_method = start_method
+        self.manifest = SweepManifest(self.output_root / MANIFEST_FILE)
+
+    def output_dir_for(self, cell: SweepCell) -> Path:
+        return self.output_root / cell.cell_id
+
+    def run(self, cells: Sequence[SweepCell]) -> SweepSummary:
+        """Run every unfinished cell; returns per-run counts and records."""
+        ids = [cell.cell_id for cell in cells]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Sweep cells must have unique (model, seed, ablation)")
+
+        summary = SweepSummary(n_total=len(cells))
+        pending: List[SweepCell] = []
+        for cell in cells:
+            record = self.manifest.register(cell, self.output_dir_for(cell))
+            if record.status == STATUS_DONE:
+                summary.n_skipped += 1
+            else:
+                pending.append(cell)
+        self.manifest.save()
+        if summary.n_skipped:
+            logger.info(
+                f"[Sweep] Resuming: {summary.n_skipped}/{len(cells)} cells done, "
+                f"{len(pending)} to run"
+            )
+
+        shared = self.shared_loader() if (pending and self.shared_loader) else None
+        if pending:
+            if self.max_workers == 1:
+                self._run_inline(pending, shared, summary)
+            else:
+                self._run_pool(pending, shared, summary)
+
+        self.manifest.save()
+        self.manifest.write_index(self.output_root / INDEX_FILE)
+        summary.records = [self.manifest.records[cid] for cid in ids]
+        if summary.n_failed:
+            logger.warning(
+                f"[Sweep] {summary.n_failed}/{len(cells)} cells failed; "
+                f"re-run the sweep to retry them"
+            )
+        return summary
+
+    def _job(self, cell: SweepCell) -> Tuple[CellFn, SweepCell, str]:
+        record = self.manifest.records[cell.cell_id]
+        record.status = STATUS_RUNNING
+        record.attempts += 1
+        return self.run_cell, cell, record.output_dir
+
+    def _collect(self, cell: SweepCell, outcome, tries: Dict[str, int], summary: SweepSummary) -> bool:
+        """Record one attempt; returns True when the cell should be retried."""
+        ok, result, error, duration = outcome
+        record = self.manifest.records[cell.cell_id]
+        record.duration_s = duration
+        tries[cell.cell_id] += 1
+        if ok:
+            record.status, record.error, record.result = STATUS_DONE, "", result
+            summary.n_done += 1
+            logger.info(f"[Sweep] {cell.cell_id} done in {duration:.1f}s")
+            retry = False
+        else:
+            record.error = error
+            retry = tries[cell.cell_id] <= self.max_retries
+            record.status = STATUS_PENDING if retry else STATUS_FAILED
+            if retry:
+                summary.n_retried += 1
+            else:
+                summary.n_failed += 1
+            logger.warning(
+                f"[Sweep] {cell.cell_id} attempt {record.attempts} failed: {error}"
+                + (" (retrying)" if retry else "")
+            )
+        self.manifest.save()
+        return retry
+
+    def _run_inline(self, pending: List[SweepCell], shared: Any, summary: SweepSummary) -> None:
+        tries = {cell.cell_id: 0 for cell in pending}
+        saved = (_SHARED, _LLM_SLOTS)
+        _init_worker(shared, None)
+        try:
+            for cell in pending:
+                while self._collect(cell, _run_cell_job(self._job(cell)), tries, summary):
+                    pass
+        finally:
+            _init_worker(*saved)
+
+    def _run_pool(self, pending: List[SweepCell], shared: Any, summary: SweepSummary) -> None:
+        ctx = mp.get_context(self.start_method)
+        slots = ctx.BoundedSemaphore(self.llm_concurrency) if self.llm_concurrency else None
+        tries = {cell.cell_id: 0 for cell in pending}
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(pending)),
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(shared, slots),
+        ) as executor:
+            running: Dict[Future, SweepCell] = {
+                executor.submit(_run_cell_job, self._job(cell)): cell for cell in pending
+            }
+            self.manifest.save()
+            try:
+                while running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        cell = running.pop(future)
+                        if self._collect(cell, future.result(), tries, summary):
+                            running[executor.submit(_run_cell_job, self._job(cell))] = cell
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory): leave the unfinished
+                # cells pending in the manifest so a re-run picks them up.
+                for record in self.manifest.records.values():
+                    if record.status == STATUS_RUNNING:
+                        record.status = STATUS_PENDING
+                self.manifest.save()
+                raise
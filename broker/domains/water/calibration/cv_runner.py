@@ -25,6 +25,14 @@ Usage (auto-detect)::
     plan = runner.plan           # inspect what will run
     report = runner.run_posthoc()
 
+Usage (multi-seed sweep, one process per trace)::
+
+    reports = CVRunner.run_batch(
+        {f"seed{s}": f"results/seed{s}/simulation_log.csv" for s in seeds},
+        framework="pmt", group="B",
+    )
+    table = CVRunner.compare_groups(reports)
+
 Part of WAGF C&V Framework (feature/calibration-validation).
 """
 
@@ -32,9 +40,10 @@ from __future__ import annotations
 
 import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -317,13 +326,26 @@ class CVRunner:
     # Data loading
     # ------------------------------------------------------------------
 
-    def load_trace(self, path: Optional[str | Path] = None) -> pd.DataFrame:
-        """Load simulation trace CSV.
+    def load_trace(
+        self,
+        path: Optional[str | Path] = None,
+        columns: Optional[List[str]] = None,
+        chunksize: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Load simulation trace (CSV or Parquet).
 
         Parameters
         ----------
         path : str or Path, optional
             Override trace_path from constructor.
+        columns : list[str], optional
+            Only load these columns.  Columns absent from the file are
+            ignored, so the list can name optional columns.  Long
+            ``reasoning`` text usually dominates trace size; leaving it
+            out keeps multi-seed sweeps small when EGS is not needed.
+        chunksize : int, optional
+            Parse a CSV in chunks of this many rows, keeping the parser's
+            peak memory bounded on very large traces.
 
         Returns
         -------
@@ -335,7 +357,23 @@ class CVRunner:
         if not p.exists():
             raise FileNotFoundError(f"Trace file not found: {p}")
 
-        self._df = pd.read_csv(p)
+        if p.suffix.lower() in (".parquet", ".pq"):
+            if columns is not None:
+                import pyarrow.parquet as pq
+                available = set(pq.read_schema(p).names)
+                columns = [c for c in columns if c in available]
+            self._df = pd.read_parquet(p, columns=columns)
+            return self._df
+
+        usecols = None
+        if columns is not None:
+            wanted = set(columns)
+            usecols = lambda c: c in wanted  # noqa: E731
+        if chunksize:
+            chunks = pd.read_csv(p, usecols=usecols, chunksize=chunksize)
+            self._df = pd.concat(list(chunks), ignore_index=True)
+        else:
+            self._df = pd.read_csv(p, usecols=usecols)
         return self._df
 
     @property
@@ -551,6 +589,54 @@ class CVRunner:
     # Batch comparison
     # ------------------------------------------------------------------
 
+    @classmethod
+    def run_batch(
+        cls,
+        traces: Dict[str, str | Path],
+        max_workers: Optional[int] = None,
+        levels: Optional[List[int]] = None,
+        columns: Optional[List[str]] = None,
+        chunksize: Optional[int] = None,
+        **runner_kwargs: Any,
+    ) -> Dict[str, CVReport]:
+        """Run post-hoc C&V over many traces in worker processes.
+
+        Each trace is loaded and validated in its own process, so a
+        sweep over seeds and model sizes uses every core.  The returned
+        dict preserves the order of *traces* and can be passed straight
+        to :meth:`compare_groups`.
+
+        Parameters
+        ----------
+        traces : dict
+            {label: trace_path} — e.g. ``{"gemma3_4b/seed42": ...}``.
+        max_workers : int, optional
+            Process count (default: ``os.cpu_count()``).  ``1`` runs
+            in-process, which is useful under debuggers.
+        levels : list[int], optional
+            Levels passed to :meth:`run_posthoc`.
+        columns, chunksize :
+            Forwarded to :meth:`load_trace`.
+        **runner_kwargs :
+            Constructor arguments shared by every runner (framework,
+            column names, group, start_year, reference_data).
+
+        Returns
+        -------
+        dict
+            {label: CVReport}
+        """
+        jobs = [
+            (label, str(path), levels, columns, chunksize, runner_kwargs)
+            for label, path in traces.items()
+        ]
+        if max_workers == 1 or len(jobs) <= 1:
+            results = [_run_trace_job(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_run_trace_job, jobs))
+        return dict(results)
+
     @staticmethod
     def compare_groups(
         reports: Dict[str, CVReport],
@@ -574,3 +660,16 @@ class CVRunner:
             rows.append(row)
 
         return pd.DataFrame(rows)
+
+
+def _run_trace_job(
+    job: Tuple[str, str, Optional[List[int]], Optional[List[str]],
+               Optional[int], Dict[str, Any]],
+) -> Tuple[str, CVReport]:
+    """Worker entry point for :meth:`CVRunner.run_batch` (must be picklable)."""
+    label, path, levels, columns, chunksize, runner_kwargs = job
+    runner = CVRunner(trace_path=path, **runner_kwargs)
+    runner.load_trace(columns=columns, chunksize=chunksize)
+    report = runner.run_posthoc(levels=levels)
+    report.metadata["trace_path"] = path
+    return label, report
@@ -433,20 +433,15 @@ class DistributionMatcher:
         float
             Fraction of years where dominant action exceeds echo threshold.
         """
-        echo_years = 0
-        total_years = 0
-
-        for year in df["year"].unique():
-            yr_df = df[df["year"] == year]
-            counts = yr_df[decision_col].value_counts()
-            if len(counts) == 0:
-                continue
-            total_years += 1
-            dominant_pct = counts.iloc[0] / counts.sum()
-            if dominant_pct > self._echo_threshold:
-                echo_years += 1
-
-        return echo_years / total_years if total_years > 0 else 0.0
+        # One (year, action) count table; years without any recorded
+        # decision drop out, as with a per-year ``value_counts``.
+        counts = df.groupby(["year", decision_col], observed=True).size()
+        if counts.empty:
+            return 0.0
+        by_year = counts.groupby(level=0)
+        dominant_pct = by_year.max() / by_year.sum()
+        echo_years = int((dominant_pct > self._echo_threshold).sum())
+        return echo_years / len(dominant_pct)
 
     # ------------------------------------------------------------------
     # MA-EBE decomposition
@@ -0,0 +1,332 @@
+"""
+Psychometric Probe Runner — concurrent, resumable battery execution.
+
+Fires the archetype x scenario x replicate probe grid of a
+:class:`PsychometricBattery` at an LLM provider with bounded
+concurrency.  Every successful raw response is appended to an on-disk
+JSONL cache keyed by (model, prompt, archetype, scenario, replicate,
+governed), so an interrupted battery re-run only issues the probes that
+are still missing.
+
+The provider can be an :class:`~broker.utils.llm_utils.LLMProvider` or
+any ``invoke(prompt)`` callable returning ``content``,
+``(content, LLMStats)`` or the legacy ``(content, success_bool)``.
+
+Usage::
+
+    runner = ProbeRunner(provider, cache_dir="results/cv/probe_cache",
+                         max_concurrency=8)
+    summary = runner.run(
+        battery, archetypes,
+        build_prompt=build_probe_prompt,
+        parse_response=lambda raw, task: ProbeResponse(...),
+        replicates=30,
+    )
+    report = battery.compute_full_report()
+
+Part of WAGF C&V Framework (feature/calibration-validation).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from broker.utils.llm_utils import LLMProvider
+
+from .psychometric_battery import PsychometricBattery
+from .psychometric_types import ProbeResponse, Scenario
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = "probe_cache.jsonl"
+
+
+@dataclass
+class ProbeTask:
+    """One cell of the probe grid.
+
+    Attributes:
+        archetype: Archetype name.
+        archetype_data: Archetype definition passed to ``build_prompt``.
+        scenario: Scenario presented.
+        replicate: Replicate number (1-based).
+        prompt: Rendered prompt text.
+        governed: Whether WAGF governance is active for this battery.
+    """
+    archetype: str
+    archetype_data: Any
+    scenario: Scenario
+    replicate: int
+    prompt: str
+    governed: bool = False
+
+    def cache_key(self, model: str) -> str:
+        payload = json.dumps(
+            [model, self.archetype, self.scenario.id, self.replicate,
+             self.governed, self.prompt],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ProbeRunSummary:
+    """Outcome of one :meth:`ProbeRunner.run` call.
+
+    Attributes:
+        n_total: Probes in the grid.
+        n_cached: Probes answered from the disk cache.
+        n_invoked: Probes sent to the provider in this run.
+        n_failed: Probes with no usable response after retries.
+        n_unparsed: Responses that ``parse_response`` rejected.
+        failed: ``(archetype, scenario_id, replicate)`` of failed probes.
+    """
+    n_total: int = 0
+    n_cached: int = 0
+    n_invoked: int = 0
+    n_failed: int = 0
+    n_unparsed: int = 0
+    failed: List[Tuple[str, str, int]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "n_total": self.n_total,
+            "n_cached": self.n_cached,
+            "n_invoked": self.n_invoked,
+            "n_failed": self.n_failed,
+            "n_unparsed": self.n_unparsed,
+            "failed": [list(f) for f in self.failed],
+        }
+
+
+class ProbeRunner:
+    """Concurrent probe executor with an append-only response cache.
+
+    Parameters
+    ----------
+    provider : LLMProvider or callable
+        Model to probe (see module docstring for accepted callables).
+    cache_dir : Path, optional
+        Directory for ``probe_cache.jsonl``.  ``None`` disables caching
+        and resume.
+    max_concurrency : int
+        Maximum in-flight provider calls.
+    max_retries : int
+        Extra attempts for a probe whose call fails or returns nothing.
+    model : str, optional
+        Model identifier for cache keys (default: ``provider.model_name``).
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider | Callable[[str], Any],
+        cache_dir: Optional[str | Path] = None,
+        max_concurrency: int = 4,
+        max_retries: int = 1,
+        model: Optional[str] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be >= 0, got {max_retries}")
+        self._invoke = provider.invoke if isinstance(provider, LLMProvider) else provider
+        self.model = model or getattr(provider, "model_name", "") or ""
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._cache_path = Path(cache_dir) / CACHE_FILE if cache_dir else None
+        self._cache: Dict[str, str] = self._load_cache()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _load_cache(self) -> Dict[str, str]:
+        cache: Dict[str, str] = {}
+        if self._cache_path is None or not self._cache_path.exists():
+            return cache
+        with open(self._cache_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        for line in text.splitlines():
+            try:
+                entry = json.loads(line)
+                cache[entry["key"]] = entry["raw"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue  # torn final line from an interrupted run
+        if text and not text.endswith("\n"):
+            # Terminate the torn line so the next append starts cleanly.
+            with open(self._cache_path, "a", encoding="utf-8") as f:
+                f.write("\n")
+        return cache
+
+    def _store(self, key: str, task: ProbeTask, raw: str) -> None:
+        with self._lock:
+            self._cache[key] = raw
+            if self._cache_path is None:
+                return
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "key": key,
+                    "archetype": task.archetype,
+                    "scenario_id": task.scenario.id,
+                    "replicate": task.replicate,
+                    "governed": task.governed,
+                    "raw": raw,
+                }, ensure_ascii=False) + "\n")
+
+    @property
+    def n_cached(self) -> int:
+        """Number of responses currently in the cache."""
+        return len(self._cache)
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def build_tasks(
+        self,
+        scenarios: List[Scenario],
+        archetypes: Dict[str, Any],
+        build_prompt: Callable[[Any, Scenario], str],
+        replicates: int,
+        governed: bool = False,
+    ) -> List[ProbeTask]:
+        """Expand the grid in archetype -> scenario -> replicate order."""
+        tasks = []
+        for arch_name, arch_data in archetypes.items():
+            for scenario in scenarios:
+                prompt = build_prompt(arch_data, scenario)
+                for rep in range(1, replicates + 1):
+                    tasks.append(ProbeTask(
+                        archetype=arch_name,
+                        archetype_data=arch_data,
+                        scenario=scenario,
+                        replicate=rep,
+                        prompt=prompt,
+                        governed=governed,
+                    ))
+        return tasks
+
+    def run(
+        self,
+        battery: PsychometricBattery,
+        archetypes: Dict[str, Any],
+        build_prompt: Callable[[Any, Scenario], str],
+        parse_response: Callable[[str, ProbeTask], Optional[ProbeResponse]],
+        replicates: int = 30,
+        governed: bool = False,
+        scenarios: Optional[List[Scenario]] = None,
+        progress_every: int = 50,
+    ) -> ProbeRunSummary:
+        """Probe every grid cell and add the parsed responses to *battery*.
+
+        Responses are added in grid order regardless of completion order,
+        so the battery (and every statistic computed from it) is the same
+        whether a run was resumed or not.
+
+        Parameters
+        ----------
+        battery : PsychometricBattery
+            Receives the parsed responses.
+        archetypes : dict
+            {archetype_name: archetype_data}.
+        build_prompt : callable
+            ``(archetype_data, scenario) -> prompt``.
+        parse_response : callable
+            ``(raw, task) -> ProbeResponse`` or ``None`` to discard.
+        replicates : int
+            Replicates per archetype-scenario pair.
+        governed : bool
+            Stamped on tasks and part of the cache key.
+        scenarios : list, optional
+            Scenarios to probe (default: ``battery.scenarios``).
+        progress_every : int
+            Log progress every N completed provider calls.
+
+        Returns
+        -------
+        ProbeRunSummary
+        """
+        if scenarios is None:
+            scenarios = list(battery.scenarios.values())
+        tasks = self.build_tasks(scenarios, archetypes, build_prompt, replicates, governed)
+        keys = [t.cache_key(self.model) for t in tasks]
+        summary = ProbeRunSummary(n_total=len(tasks))
+
+        pending = [i for i, key in enumerate(keys) if key not in self._cache]
+        summary.n_cached = len(tasks) - len(pending)
+        if summary.n_cached:
+            logger.info(
+                f"[Probe] Resuming: {summary.n_cached}/{len(tasks)} probes cached, "
+                f"{len(pending)} to run"
+            )
+
+        if pending:
+            done = 0
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                futures = {
+                    executor.submit(self._probe, tasks[i]): i for i in pending
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    raw = future.result()
+                    summary.n_invoked += 1
+                    if raw:
+                        self._store(keys[i], tasks[i], raw)
+                    done += 1
+                    if progress_every and (done % progress_every == 0 or done == len(pending)):
+                        logger.info(f"[Probe] {done}/{len(pending)} probes complete")
+
+        responses = []
+        for task, key in zip(tasks, keys):
+            raw = self._cache.get(key)
+            if not raw:
+                summary.n_failed += 1
+                summary.failed.append((task.archetype, task.scenario.id, task.replicate))
+                continue
+            response = parse_response(raw, task)
+            if response is None:
+                summary.n_unparsed += 1
+                continue
+            responses.append(response)
+        battery.add_responses(responses)
+
+        if summary.n_failed:
+            logger.warning(
+                f"[Probe] {summary.n_failed}/{len(tasks)} probes failed; "
+                f"re-run to retry them"
+            )
+        return summary
+
+    def _probe(self, task: ProbeTask) -> str:
+        """Invoke the provider with retries; returns '' on failure."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                raw = self._content(self._invoke(task.prompt))
+            except Exception as e:
+                logger.warning(
+                    f"[Probe] {task.archetype} x {task.scenario.id} rep {task.replicate} "
+                    f"attempt {attempt + 1} failed: {e}"
+                )
+                continue
+            if raw:
+                return raw
+        return ""
+
+    @staticmethod
+    def _content(result: Any) -> str:
+        """Normalise provider return values to the response text."""
+        if isinstance(result, tuple):
+            content, status = result[0], result[1] if len(result) > 1 else True
+            if status is False or getattr(status, "success", True) is False:
+                return ""
+            return content or ""
+        return result or ""
@@ -51,6 +51,9 @@ from .psychometric_stats import (  # noqa: F401
     compute_icc_2_1,
     compute_cronbach_alpha,
     compute_fleiss_kappa,
+    compute_fleiss_kappa_counts,
+    build_replicate_matrix,
+    pairwise_jaccard,
 )
 
 
@@ -86,6 +89,7 @@ class PsychometricBattery:
         self._scenario_dir = scenario_dir or vignette_dir or SCENARIO_DIR
         self._scenarios: Dict[str, Scenario] = {}
         self._responses: List[ProbeResponse] = []
+        self._df_cache: Optional[pd.DataFrame] = None
 
     # ------------------------------------------------------------------
     # Scenario management
@@ -133,10 +137,12 @@ class PsychometricBattery:
     def add_response(self, response: ProbeResponse) -> None:
         """Add a single probe response."""
         self._responses.append(response)
+        self._df_cache = None
 
     def add_responses(self, responses: List[ProbeResponse]) -> None:
         """Add multiple probe responses."""
         self._responses.extend(responses)
+        self._df_cache = None
 
     @property
     def responses(self) -> List[ProbeResponse]:
@@ -144,9 +150,16 @@ class PsychometricBattery:
 
     def responses_to_dataframe(self) -> pd.DataFrame:
         """Convert collected responses to DataFrame."""
+        return self._frame().copy()
+
+    def _frame(self) -> pd.DataFrame:
+        """Cached response DataFrame shared by the analysis methods (read-only)."""
+        if self._df_cache is not None:
+            return self._df_cache
         if not self._responses:
-            return pd.DataFrame()
-        return pd.DataFrame([
+            self._df_cache = pd.DataFrame()
+            return self._df_cache
+        self._df_cache = pd.DataFrame([
             {
                 "scenario_id": r.scenario_id,
                 "vignette_id": r.scenario_id,  # backward compat column
@@ -161,6 +174,7 @@ class PsychometricBattery:
             }
             for r in self._responses
         ])
+        return self._df_cache
 
     # ------------------------------------------------------------------
     # Analysis
@@ -194,7 +208,7 @@ class PsychometricBattery:
         ICCResult
         """
         sid = scenario_id or vignette_id
-        df = self.responses_to_dataframe()
+        df = self._frame()
         if df.empty:
             return ICCResult(construct=construct, icc_value=0.0)
 
@@ -211,23 +225,15 @@ class PsychometricBattery:
         # Determine subject key
         n_scenarios = df["scenario_id"].nunique()
         if n_scenarios > 1 and not sid:
-            df = df.copy()
-            df["_subject"] = df["archetype"] + "|" + df["scenario_id"]
+            subjects = df["archetype"] + "|" + df["scenario_id"]
         else:
-            df = df.copy()
-            df["_subject"] = df["archetype"]
-
-        subjects = sorted(df["_subject"].unique())
-        max_rep = int(df["replicate"].max())
+            subjects = df["archetype"]
 
         # Pivot to matrix form: subjects x replicates
-        matrix = np.full((len(subjects), max_rep), np.nan)
-        for i, subj in enumerate(subjects):
-            subj_df = df[df["_subject"] == subj].sort_values("replicate")
-            for _, row in subj_df.iterrows():
-                rep = int(row["replicate"]) - 1
-                if rep < max_rep:
-                    matrix[i, rep] = row[ordinal_col]
+        matrix = build_replicate_matrix(
+            subjects.to_numpy(), df["replicate"].to_numpy(),
+            df[ordinal_col].to_numpy(),
+        )
 
         # Remove columns (replicates) with any NaN
         valid_cols = ~np.any(np.isnan(matrix), axis=0)
@@ -249,7 +255,7 @@ class PsychometricBattery:
 
         Treats TP and CP ordinal ratings as two "items" in a scale.
         """
-        df = self.responses_to_dataframe()
+        df = self._frame()
         if df.empty:
             return ConsistencyResult(alpha=0.0)
 
@@ -282,7 +288,7 @@ class PsychometricBattery:
     ) -> float:
         """Compute Fleiss' kappa for action agreement across replicates."""
         sid = scenario_id or vignette_id
-        df = self.responses_to_dataframe()
+        df = self._frame()
         if df.empty:
             return 0.0
 
@@ -291,21 +297,24 @@ class PsychometricBattery:
         if governed is not None:
             df = df[df["governed"] == governed]
 
-        decision_lists = []
-        for arch, arch_df in df.groupby("archetype"):
-            decisions = arch_df.sort_values("replicate")["decision"].tolist()
-            if len(decisions) >= 2:
-                decision_lists.append(decisions)
-
-        if not decision_lists:
+        sizes = df.groupby("archetype").size()
+        df = df[df["archetype"].isin(sizes.index[sizes >= 2])]
+        if df.empty:
             return 0.0
-        max_len = max(len(d) for d in decision_lists)
-        padded = [
-            d + [d[-1]] * (max_len - len(d))
-            for d in decision_lists
-        ]
 
-        return compute_fleiss_kappa(padded)
+        # Archetype x decision counts; shorter archetypes are padded with
+        # their last (highest-replicate) decision up to the longest one.
+        df = df.sort_values(["archetype", "replicate"], kind="stable")
+        counts = pd.crosstab(df["archetype"], df["decision"])
+        sizes = sizes.loc[counts.index]
+        max_len = int(sizes.max())
+        last = df.groupby("archetype")["decision"].last().loc[counts.index]
+        matrix = counts.to_numpy(dtype=float, copy=True)
+        matrix[
+            np.arange(len(counts)), counts.columns.get_indexer(last)
+        ] += (max_len - sizes).to_numpy()
+
+        return compute_fleiss_kappa_counts(matrix, max_len)
 
     def evaluate_coherence(
         self,
@@ -322,7 +331,7 @@ class PsychometricBattery:
         if not scenario:
             return 0.0, 0.0
 
-        df = self.responses_to_dataframe()
+        df = self._frame()
         if df.empty:
             return 0.0, 0.0
 
@@ -335,23 +344,19 @@ class PsychometricBattery:
 
         n = len(df)
         expected = scenario.expected_responses
-        n_coherent = 0
-        n_incoherent = 0
-
-        for _, row in df.iterrows():
-            tp_expected = expected.get("TP_LABEL", {})
-            tp_incoherent = tp_expected.get("incoherent", [])
-            if row["tp_label"] in tp_incoherent:
-                n_incoherent += 1
-                continue
 
-            dec_expected = expected.get("decision", {})
-            dec_incoherent = dec_expected.get("incoherent", [])
-            dec_acceptable = dec_expected.get("acceptable", [])
-            if row["decision"] in dec_incoherent:
-                n_incoherent += 1
-            elif row["decision"] in dec_acceptable:
-                n_coherent += 1
+        tp_incoherent = df["tp_label"].isin(
+            expected.get("TP_LABEL", {}).get("incoherent", [])
+        )
+        dec_expected = expected.get("decision", {})
+        dec_incoherent = ~tp_incoherent & df["decision"].isin(
+            dec_expected.get("incoherent", [])
+        )
+        dec_acceptable = ~tp_incoherent & ~dec_incoherent & df["decision"].isin(
+            dec_expected.get("acceptable", [])
+        )
+        n_incoherent = int(tp_incoherent.sum() + dec_incoherent.sum())
+        n_coherent = int(dec_acceptable.sum())
 
         return (
             n_coherent / n if n > 0 else 0.0,
@@ -371,7 +376,7 @@ class PsychometricBattery:
     ) -> ICCResult:
         """Compute ICC on decision choices (construct-free)."""
         sid = scenario_id or vignette_id
-        df = self.responses_to_dataframe()
+        df = self._frame()
         if df.empty:
             return ICCResult(construct="decision", icc_value=0.0)
 
@@ -389,21 +394,13 @@ class PsychometricBattery:
                 a: i + 1 for i, a in enumerate(unique_actions)
             }
 
-        df = df.copy()
-        df["decision_ordinal"] = df["decision"].map(
+        decision_ordinal = df["decision"].map(
             lambda x: action_ordinal_map.get(x, 0)
         )
-
-        archetypes = sorted(df["archetype"].unique())
-        max_rep = int(df["replicate"].max()) if not df.empty else 0
-
-        matrix = np.full((len(archetypes), max_rep), np.nan)
-        for i, arch in enumerate(archetypes):
-            arch_df = df[df["archetype"] == arch].sort_values("replicate")
-            for _, row in arch_df.iterrows():
-                rep = int(row["replicate"]) - 1
-                if 0 <= rep < max_rep:
-                    matrix[i, rep] = row["decision_ordinal"]
+        matrix = build_replicate_matrix(
+            df["archetype"].to_numpy(), df["replicate"].to_numpy(),
+            decision_ordinal.to_numpy(),
+        )
 
         valid_cols = ~np.any(np.isnan(matrix), axis=0)
         matrix = matrix[:, valid_cols]
@@ -437,36 +434,28 @@ class PsychometricBattery:
         for r in responses:
             groups[(r.scenario_id, r.archetype)].append(r.reasoning)
 
-        all_similarities: List[float] = []
-        per_archetype: Dict[str, List[float]] = defaultdict(list)
+        all_similarities: List[np.ndarray] = []
+        per_archetype: Dict[str, List[np.ndarray]] = defaultdict(list)
 
         for (vid, arch), texts in groups.items():
             if len(texts) < 2:
                 continue
+            sims = pairwise_jaccard(texts)
+            all_similarities.append(sims)
+            per_archetype[arch].append(sims)
 
-            token_sets = [set(t.lower().split()) for t in texts]
-
-            for i in range(len(token_sets)):
-                for j in range(i + 1, len(token_sets)):
-                    intersection = len(token_sets[i] & token_sets[j])
-                    union = len(token_sets[i] | token_sets[j])
-                    sim = intersection / union if union > 0 else 0.0
-                    all_similarities.append(sim)
-                    per_archetype[arch].append(sim)
-
-        mean_consistency = (
-            float(np.mean(all_similarities)) if all_similarities else 0.0
-        )
+        all_sims = np.concatenate(all_similarities) if all_similarities else np.zeros(0)
+        mean_consistency = float(np.mean(all_sims)) if all_sims.size else 0.0
 
         archetype_means = {
-            arch: round(float(np.mean(sims)), 4)
+            arch: round(float(np.mean(np.concatenate(sims))), 4)
             for arch, sims in per_archetype.items()
         }
 
         return {
             "mean_consistency": round(mean_consistency, 4),
             "per_archetype": archetype_means,
-            "n_pairs": len(all_similarities),
+            "n_pairs": int(all_sims.size),
         }
 
     # ------------------------------------------------------------------
@@ -479,7 +468,7 @@ class PsychometricBattery:
         governed: Optional[bool] = None,
     ) -> EffectSizeResult:
         """Compute eta-squared (between-archetype effect size)."""
-        df = self.responses_to_dataframe()
+        df = self._frame()
         if df.empty:
             return EffectSizeResult(construct=construct, eta_squared=0.0)
 
@@ -543,7 +532,7 @@ class PsychometricBattery:
         """Compute convergent validity: TP ordinal vs scenario severity."""
         severity_ordinal = {"low": 1, "medium": 2, "high": 3, "extreme": 4}
 
-        df = self.responses_to_dataframe()
+        df = self._frame()
         if df.empty:
             return ConvergentValidityResult(
                 construct="tp", criterion="scenario_severity",
@@ -593,7 +582,7 @@ class PsychometricBattery:
         governed: Optional[bool] = None,
     ) -> float:
         """Compute TP-CP discriminant correlation."""
-        df = self.responses_to_dataframe()
+        df = self._frame()
         if df.empty:
             return 0.0
 
@@ -692,7 +681,7 @@ class PsychometricBattery:
             "n_ungoverned": ungov_report.n_total_probes,
         }
 
-        df = self.responses_to_dataframe()
+        df = self._frame()
         gov_tp = df[df["governed"] == True]["tp_ordinal"].values  # noqa: E712
         ungov_tp = df[df["governed"] == False]["tp_ordinal"].values  # noqa: E712
 
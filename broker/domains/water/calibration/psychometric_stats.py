@@ -3,14 +3,15 @@ Psychometric Battery — Statistical computations.
 
 Extracted from psychometric_battery.py for modularity.
 Contains pure statistical functions: ICC(2,1), Cronbach's alpha,
-and Fleiss' kappa.
+Fleiss' kappa, and the array builders that feed them.
 """
 
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Any, Dict, List, Sequence
 
 import numpy as np
+import pandas as pd
 
 from .psychometric_types import ICCResult
 
@@ -164,23 +165,44 @@ def compute_fleiss_kappa(
     if not decisions:
         return 0.0
 
-    # Collect all unique categories
-    categories = sorted(set(d for sublist in decisions for d in sublist))
-    n_cat = len(categories)
-    cat_idx = {c: i for i, c in enumerate(categories)}
-
     n_subjects = len(decisions)
-    n_raters = len(decisions[0]) if decisions else 0
-
-    if n_subjects < 2 or n_raters < 2 or n_cat < 2:
+    n_raters = len(decisions[0])
+    flat = np.array([d for sublist in decisions for d in sublist], dtype=object)
+    if flat.size == 0:
         return 0.0
 
     # Build rating matrix: n_subjects x n_categories
-    rating_matrix = np.zeros((n_subjects, n_cat), dtype=float)
-    for i, subject_decisions in enumerate(decisions):
-        for d in subject_decisions:
-            if d in cat_idx:
-                rating_matrix[i, cat_idx[d]] += 1
+    categories, codes = np.unique(flat, return_inverse=True)
+    subject_idx = np.repeat(np.arange(n_subjects), [len(d) for d in decisions])
+    rating_matrix = np.zeros((n_subjects, len(categories)), dtype=float)
+    np.add.at(rating_matrix, (subject_idx, codes), 1)
+
+    return compute_fleiss_kappa_counts(rating_matrix, n_raters)
+
+
+def compute_fleiss_kappa_counts(
+    rating_matrix: np.ndarray,
+    n_raters: int,
+) -> float:
+    """Compute Fleiss' kappa from a subjects x categories count matrix.
+
+    Parameters
+    ----------
+    rating_matrix : ndarray, shape (n_subjects, n_categories)
+        Number of raters (replicates) assigning each subject to each
+        category; every row should sum to ``n_raters``.
+    n_raters : int
+        Raters per subject.
+
+    Returns
+    -------
+    float
+        Fleiss' kappa (-1 to 1).
+    """
+    n_subjects, n_cat = rating_matrix.shape
+
+    if n_subjects < 2 or n_raters < 2 or n_cat < 2:
+        return 0.0
 
     # Proportion of ratings per category
     p_j = np.sum(rating_matrix, axis=0) / (n_subjects * n_raters)
@@ -200,3 +222,62 @@ def compute_fleiss_kappa(
 
     kappa = (p_bar - p_e) / (1 - p_e)
     return float(np.clip(kappa, -1.0, 1.0))
+
+
+def build_replicate_matrix(
+    subjects: Sequence[Any],
+    replicates: Sequence[int],
+    values: Sequence[float],
+) -> np.ndarray:
+    """Pivot long-form ratings into a subjects x replicates matrix.
+
+    Rows follow the sorted unique ``subjects``; replicate ``r`` lands in
+    column ``r - 1``.  Missing cells are NaN, and when a (subject,
+    replicate) pair repeats the last value wins.
+
+    Returns
+    -------
+    ndarray, shape (n_subjects, max(replicates))
+    """
+    subj_codes, subj_labels = pd.factorize(pd.Series(subjects), sort=True)
+    reps = np.asarray(replicates, dtype=int) - 1
+    vals = np.asarray(values, dtype=float)
+    n_cols = int(reps.max()) + 1 if reps.size else 0
+    matrix = np.full((len(subj_labels), max(n_cols, 0)), np.nan)
+    ok = reps >= 0
+    matrix[subj_codes[ok], reps[ok]] = vals[ok]
+    return matrix
+
+
+def pairwise_jaccard(texts: Sequence[str]) -> np.ndarray:
+    """Jaccard similarity of lower-cased token sets for every text pair.
+
+    Returns
+    -------
+    ndarray, shape (n * (n - 1) / 2,)
+        Similarities for pairs ``(i, j)`` with ``i < j`` in row-major
+        order; an empty union scores 0.
+    """
+    n = len(texts)
+    if n < 2:
+        return np.zeros(0)
+
+    vocab: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    for i, text in enumerate(texts):
+        for token in set(text.lower().split()):
+            rows.append(i)
+            cols.append(vocab.setdefault(token, len(vocab)))
+
+    incidence = np.zeros((n, len(vocab)), dtype=np.int32)
+    incidence[rows, cols] = 1
+    intersection = incidence @ incidence.T
+    sizes = incidence.sum(axis=1)
+
+    iu, ju = np.triu_indices(n, k=1)
+    inter = intersection[iu, ju]
+    union = sizes[iu] + sizes[ju] - inter
+    return np.divide(
+        inter, union, out=np.zeros(len(inter)), where=union > 0,
+    )
@@ -39,6 +39,24 @@ import pandas as pd
 LABEL_ORDER: Dict[str, int] = {"VL": 0, "L": 1, "M": 2, "H": 3, "VH": 4}
 
 
+def _entropy_by_group(
+    df: pd.DataFrame,
+    group_col: str,
+    value_col: str,
+) -> Dict[Any, float]:
+    """Shannon entropy (bits) of *value_col* within each *group_col* group.
+
+    Computed from a single grouped count table rather than one
+    ``value_counts`` per group.  Missing values are ignored, matching
+    ``Series.value_counts``.
+    """
+    counts = df.groupby([group_col, value_col], observed=True).size()
+    if counts.empty:
+        return {}
+    probs = counts / counts.groupby(level=0).transform("sum")
+    return (-(probs * np.log2(probs))).groupby(level=0).sum().to_dict()
+
+
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
@@ -180,7 +198,7 @@ class ActionStabilityValidator:
         """
         df = df[df["year"] >= start_year].sort_values(
             ["agent_id", "year"]
-        ).copy()
+        )
 
         if df.empty or self._decision_col not in df.columns:
             return {
@@ -190,26 +208,25 @@ class ActionStabilityValidator:
                 "agent_switch_rates": {},
             }
 
-        total_transitions = 0
-        total_switches = 0
-        agent_switches: Dict[str, float] = {}
-
-        for agent_id, agent_df in df.groupby("agent_id"):
-            decisions = agent_df[self._decision_col].tolist()
-            if len(decisions) < 2:
-                agent_switches[str(agent_id)] = 0.0
-                continue
-
-            n_trans = len(decisions) - 1
-            n_switch = sum(
-                1 for i in range(1, len(decisions))
-                if decisions[i] != decisions[i - 1]
-            )
-            total_transitions += n_trans
-            total_switches += n_switch
-            agent_switches[str(agent_id)] = (
-                n_switch / n_trans if n_trans > 0 else 0.0
+        # Transitions are consecutive rows of the same agent in the
+        # (agent_id, year)-sorted frame; count them column-wise instead
+        # of looping over per-agent groups.
+        agent_df = df[df["agent_id"].notna()]
+        codes, agents = pd.factorize(agent_df["agent_id"])
+        decisions = agent_df[self._decision_col].to_numpy()
+        same_agent = codes[1:] == codes[:-1]
+        switched = (decisions[1:] != decisions[:-1]) & same_agent
+
+        n_trans = np.bincount(codes[1:][same_agent], minlength=len(agents))
+        n_switch = np.bincount(codes[1:][switched], minlength=len(agents))
+        total_transitions = int(n_trans.sum())
+        total_switches = int(n_switch.sum())
+        agent_switches: Dict[str, float] = {
+            str(agent_id): (
+                int(n_switch[i]) / int(n_trans[i]) if n_trans[i] > 0 else 0.0
             )
+            for i, agent_id in enumerate(agents)
+        }
 
         switch_rate = (
             total_switches / total_transitions
@@ -220,15 +237,17 @@ class ActionStabilityValidator:
             / len(agent_switches) if agent_switches else 0.0
         )
 
-        # Per-year entropy
-        entropy_by_year: Dict[int, float] = {}
-        for year, year_df in df.groupby("year"):
-            counts = year_df[self._decision_col].value_counts(normalize=True)
-            probs = counts.values
-            entropy = float(-sum(
-                p * np.log2(p) for p in probs if p > 0
-            ))
-            entropy_by_year[int(year)] = round(entropy, 4)
+        # Per-year entropy from one (year, action) count table.  Years
+        # whose decisions are all missing keep an entropy of 0.
+        entropy_by_year: Dict[int, float] = {
+            int(year): 0.0 for year in df["year"].dropna().unique()
+        }
+        entropy_by_year.update(
+            {int(year): round(h, 4)
+             for year, h in _entropy_by_group(
+                 df, "year", self._decision_col).items()}
+        )
+        entropy_by_year = dict(sorted(entropy_by_year.items()))
 
         return {
             "switch_rate": round(switch_rate, 4),
@@ -294,101 +313,101 @@ class TemporalCoherenceValidator:
         -------
         TemporalReport
         """
-        df = df[df["year"] >= start_year].sort_values(["agent_id", "year"]).copy()
+        df = df[df["year"] >= start_year].sort_values(["agent_id", "year"])
+        df = df[df["agent_id"].notna()]
 
         # Track per-construct transition matrices
         n_labels = len(self._labels)
         label_to_idx = {l: i for i, l in enumerate(self._labels)}
+        constructs = [c for c in self._construct_cols if c in df.columns]
+        positions = np.arange(n_labels)
+        jump_mask = (
+            np.abs(positions[:, None] - positions[None, :]) > self._max_jump
+        )
         construct_counts = {
-            c: np.zeros((n_labels, n_labels), dtype=int)
-            for c in self._construct_cols if c in df.columns
-        }
-        construct_impossible = {
-            c: np.zeros((n_labels, n_labels), dtype=bool)
-            for c in self._construct_cols if c in df.columns
+            c: np.zeros((n_labels, n_labels), dtype=int) for c in constructs
         }
+        construct_impossible = {c: jump_mask.copy() for c in constructs}
+
+        # Transition k links row k-1 to row k of the same agent in the
+        # (agent_id, year)-sorted frame.
+        codes, agents = pd.factorize(df["agent_id"])
+        n_agents = len(agents)
+        same_agent = codes[1:] == codes[:-1]
+        trans_agent = codes[1:]
+        years = df["year"].to_numpy()[1:]
+
+        if self._event_col and self._event_col in df.columns:
+            event_occurred = df[self._event_col].astype(bool).to_numpy()[1:]
+        else:
+            event_occurred = np.zeros(len(trans_agent), dtype=bool)
+        if self._relocated_col in df.columns:
+            prev_relocated = (
+                df[self._relocated_col].astype(bool).to_numpy()[:-1]
+            )
+        else:
+            prev_relocated = np.zeros(len(trans_agent), dtype=bool)
 
-        # Pre-compute impossible mask based on max_jump
-        for c in construct_counts:
-            for i in range(n_labels):
-                for j in range(n_labels):
-                    if abs(i - j) > self._max_jump:
-                        construct_impossible[c][i, j] = True
+        agent_transitions = np.zeros(n_agents, dtype=int)
+        impossible_parts: List[Tuple[np.ndarray, int, np.ndarray, np.ndarray]] = []
 
-        agent_results: List[AgentTCSResult] = []
-        total_impossible = 0
-        total_transitions = 0
-
-        for agent_id, agent_df in df.groupby("agent_id"):
-            if len(agent_df) < 2:
-                agent_results.append(AgentTCSResult(
-                    agent_id=str(agent_id), tcs=1.0, total_transitions=0
-                ))
-                continue
-
-            agent_impossible: List[Tuple[int, str, str, str]] = []
-            agent_transitions = 0
-
-            for i in range(1, len(agent_df)):
-                prev_row = agent_df.iloc[i - 1]
-                curr_row = agent_df.iloc[i]
-                curr_year = int(curr_row["year"])
-
-                # Check if event justifies large jump
-                event_occurred = False
-                if self._event_col and self._event_col in curr_row.index:
-                    event_occurred = bool(curr_row[self._event_col])
-
-                # Check if agent is relocated (should be frozen)
-                prev_relocated = False
-                if self._relocated_col in prev_row.index:
-                    prev_relocated = bool(prev_row[self._relocated_col])
-
-                for construct in construct_counts:
-                    if construct not in curr_row.index:
-                        continue
-
-                    prev_label = str(prev_row.get(construct, "M")).upper()
-                    curr_label = str(curr_row.get(construct, "M")).upper()
-
-                    if prev_label not in label_to_idx or curr_label not in label_to_idx:
-                        continue
-
-                    prev_idx = label_to_idx[prev_label]
-                    curr_idx = label_to_idx[curr_label]
-
-                    construct_counts[construct][prev_idx, curr_idx] += 1
-                    agent_transitions += 1
-                    total_transitions += 1
-
-                    # Check for impossible transition
-                    is_impossible = False
-
-                    if prev_relocated and prev_label != curr_label:
-                        # Relocated agent changed construct — impossible
-                        is_impossible = True
-
-                    elif not event_occurred and construct_impossible[construct][prev_idx, curr_idx]:
-                        # Large jump without triggering event
-                        is_impossible = True
-
-                    if is_impossible:
-                        agent_impossible.append(
-                            (curr_year, construct, prev_label, curr_label)
-                        )
-                        total_impossible += 1
-
-            agent_tcs = (
-                1.0 - len(agent_impossible) / agent_transitions
-                if agent_transitions > 0 else 1.0
+        for c_pos, construct in enumerate(constructs):
+            idx = (
+                df[construct].astype(str).str.upper()
+                .map(label_to_idx).to_numpy(dtype=float)
+            )
+            prev_idx, curr_idx = idx[:-1], idx[1:]
+            valid = same_agent & ~np.isnan(prev_idx) & ~np.isnan(curr_idx)
+            prev_i = prev_idx[valid].astype(int)
+            curr_i = curr_idx[valid].astype(int)
+
+            np.add.at(construct_counts[construct], (prev_i, curr_i), 1)
+            agent_transitions += np.bincount(
+                trans_agent[valid], minlength=n_agents,
+            )
+
+            # Relocated agent changed construct, or a large jump without
+            # a triggering event.
+            is_impossible = (
+                (prev_relocated[valid] & (prev_i != curr_i))
+                | (~event_occurred[valid] & jump_mask[prev_i, curr_i])
+            )
+            k = np.flatnonzero(valid)[is_impossible]
+            impossible_parts.append(
+                (k, c_pos, prev_i[is_impossible], curr_i[is_impossible])
             )
+
+        # Per-agent impossible lists ordered by transition, then construct.
+        agent_impossible: List[List[Tuple[int, str, str, str]]] = [
+            [] for _ in range(n_agents)
+        ]
+        flagged = sorted(
+            (int(k), c_pos, int(p), int(q))
+            for ks, c_pos, ps, qs in impossible_parts
+            for k, p, q in zip(ks, ps, qs)
+        )
+        for k, c_pos, p, q in flagged:
+            agent_impossible[trans_agent[k]].append(
+                (int(years[k]), constructs[c_pos],
+                 self._labels[p], self._labels[q])
+            )
+
+        agent_results: List[AgentTCSResult] = []
+        for i, agent_id in enumerate(agents):
+            n_trans = int(agent_transitions[i])
             agent_results.append(AgentTCSResult(
                 agent_id=str(agent_id),
-                tcs=agent_tcs,
-                impossible_transitions=agent_impossible,
-                total_transitions=agent_transitions,
+                tcs=(
+                    1.0 - len(agent_impossible[i]) / n_trans
+                    if n_trans > 0 else 1.0
+                ),
+                impossible_transitions=agent_impossible[i],
+                total_transitions=n_trans,
             ))
 
+        total_transitions = int(agent_transitions.sum())
+        total_impossible = len(flagged)
+
         # Build transition matrices
         matrices: List[TransitionMatrix] = []
         tcs_by_construct: Dict[str, float] = {}
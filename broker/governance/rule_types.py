@@ -201,6 +201,13 @@ class GovernanceRule:
 
         return False
 
+    @property
+    def is_state_only(self) -> bool:
+        """True when the rule reads only pre-decision state (no constructs)."""
+        if self.conditions:
+            return all(c.type in ("precondition", "expression") for c in self.conditions)
+        return bool(self.precondition) and not self.construct
+
     def _normalize_label(self, label: str) -> str:
         """Normalize construct labels to standard format (VL/L/M/H/VH)."""
         if not label:
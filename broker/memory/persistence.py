@@ -54,6 +54,7 @@ class MemorySerializer:
         Returns:
             Dictionary representation
         """
+        item.importance  # materialize any pending lazy decay
         data = {
             "content": item.content,
             "timestamp": item.timestamp,
@@ -13,6 +13,7 @@ Memory capacity constraints are based on cognitive science literature:
 Reference: Task-040 Memory Module Optimization, Task-050E Cognitive Constraints
 """
 
+import heapq
 import logging
 from typing import Dict, List, Optional, Any, TYPE_CHECKING
 import time
@@ -337,11 +338,8 @@ class AdaptiveRetrievalEngine:
                 "semantic": semantic_score # Store semantic score for trace
             })
 
-        # Sort by score descending
-        scored_items.sort(key=lambda x: x["final_score"], reverse=True)
-
-        # Take top-k
-        top_items = scored_items[:top_k]
+        # Top-k by score descending (same order as a stable sort + slice)
+        top_items = heapq.nlargest(top_k, scored_items, key=lambda x: x["final_score"])
 
         # Build trace
         self._last_trace = {
@@ -7,10 +7,15 @@ of important memories from working to long-term storage.
 Reference: Task-040 Memory Module Optimization
 """
 
-from typing import Dict, List, Optional, Any
+from bisect import bisect_right, insort
+from typing import Dict, List, Optional, Any, Tuple
 import time
 
-from .unified_engine import UnifiedMemoryItem
+from .unified_engine import DecayClock, UnifiedMemoryItem
+
+
+def _rank_key(item: UnifiedMemoryItem) -> float:
+    return -item.importance
 
 
 class UnifiedMemoryStore:
@@ -26,6 +31,11 @@ class UnifiedMemoryStore:
     - Importance-based consolidation to long-term
     - Configurable thresholds and capacity
     - Full agent isolation
+    - Lazy decay: ``apply_decay`` is O(1) per agent; items recompute their
+      decayed importance on the next read (see ``DecayClock``)
+    - Long-term importance ranking kept sorted on insert, so
+      ``top_longterm`` is O(k) and is only rebuilt after a decay epoch
+      or an explicit importance change
 
     Args:
         working_capacity: Max items in working memory per agent (default: 10)
@@ -52,6 +62,10 @@ class UnifiedMemoryStore:
         # Memory stores: agent_id -> List[UnifiedMemoryItem]
         self._working: Dict[str, List[UnifiedMemoryItem]] = {}
         self._longterm: Dict[str, List[UnifiedMemoryItem]] = {}
+        # agent_id -> decay clock shared by the agent's items
+        self._clocks: Dict[str, DecayClock] = {}
+        # agent_id -> (clock revision, long-term items by importance desc)
+        self._ranked: Dict[str, Tuple[int, List[UnifiedMemoryItem]]] = {}
 
     @property
     def working(self) -> Dict[str, List[UnifiedMemoryItem]]:
@@ -75,6 +89,9 @@ class UnifiedMemoryStore:
             is enabled, oldest items will be checked for consolidation.
         """
         agent_id = item.agent_id
+        clock = self._clock(agent_id)
+        item._decay_clock = clock
+        item._decay_gen = clock.generation
 
         # Initialize if needed
         if agent_id not in self._working:
@@ -112,9 +129,7 @@ class UnifiedMemoryStore:
         # Consolidate important ones
         for item in to_remove:
             if item.importance >= self.consolidation_threshold:
-                if agent_id not in self._longterm:
-                    self._longterm[agent_id] = []
-                self._longterm[agent_id].append(item)
+                self._add_longterm(agent_id, item)
 
     def consolidate(
         self,
@@ -143,17 +158,60 @@ class UnifiedMemoryStore:
         if not to_consolidate:
             return 0
 
-        # Initialize long-term if needed
-        if agent_id not in self._longterm:
-            self._longterm[agent_id] = []
-
         # Move to long-term
         for item in to_consolidate:
-            self._longterm[agent_id].append(item)
+            self._add_longterm(agent_id, item)
             working.remove(item)
 
         return len(to_consolidate)
 
+    def _add_longterm(self, agent_id: str, item: UnifiedMemoryItem) -> None:
+        """Append to long-term memory and to the ranking if it is current."""
+        self._longterm.setdefault(agent_id, []).append(item)
+        cached = self._ranked.get(agent_id)
+        if cached is not None and cached[0] == self._clock(agent_id).revision:
+            # insort places it after equal-importance items, matching a
+            # stable sort of the long-term list.
+            insort(cached[1], item, key=_rank_key)
+
+    def _clock(self, agent_id: str) -> DecayClock:
+        clock = self._clocks.get(agent_id)
+        if clock is None:
+            clock = self._clocks[agent_id] = DecayClock()
+        return clock
+
+    def apply_decay(self, agent_id: str, decay_rate: float, current_time: float) -> None:
+        """Decay every stored item of an agent as of ``current_time``.
+
+        O(1): items recompute ``base_importance / (1 + decay_rate *
+        age_days)`` on their next importance read. Items added later keep
+        their importance until the next call, as with an eager sweep.
+        """
+        clock = self._clock(agent_id)
+        clock.generation += 1
+        clock.epoch = current_time
+        clock.rate = decay_rate
+        clock.revision += 1
+
+    def ranked_longterm(self, agent_id: str) -> List[UnifiedMemoryItem]:
+        """Long-term memories by importance, highest first (ties in insertion order).
+
+        Maintained on insert; rebuilt only when the agent's importances
+        changed (a decay epoch or an explicit ``importance`` assignment)
+        or the long-term list was modified directly.
+        """
+        longterm = self._longterm.get(agent_id, [])
+        revision = self._clock(agent_id).revision
+        cached = self._ranked.get(agent_id)
+        if cached is None or cached[0] != revision or len(cached[1]) != len(longterm):
+            cached = (revision, sorted(longterm, key=_rank_key))
+            self._ranked[agent_id] = cached
+        return cached[1]
+
+    def top_longterm(self, agent_id: str, k: int) -> List[UnifiedMemoryItem]:
+        """The ``k`` most important long-term memories of an agent."""
+        return self.ranked_longterm(agent_id)[:k]
+
     def get_all(self, agent_id: str) -> List[UnifiedMemoryItem]:
         """Get all memories (working + long-term) for an agent."""
         working = self._working.get(agent_id, [])
@@ -174,6 +232,7 @@ class UnifiedMemoryStore:
             del self._working[agent_id]
         if agent_id in self._longterm:
             del self._longterm[agent_id]
+        self._ranked.pop(agent_id, None)
 
     def forget(
         self,
@@ -201,11 +260,19 @@ class UnifiedMemoryStore:
             forgotten += len(working) - len(remaining)
             self._working[agent_id] = remaining
 
-            # Forget from long-term too
-            longterm = self._longterm.get(agent_id, [])
-            remaining_lt = [m for m in longterm if m.importance >= threshold]
-            forgotten += len(longterm) - len(remaining_lt)
-            self._longterm[agent_id] = remaining_lt
+            # Forget from long-term too: the forgotten items are the tail
+            # of the importance ranking, so nothing is scanned when none
+            # fall below the threshold.
+            ranked = self.ranked_longterm(agent_id)
+            keep = bisect_right(ranked, -threshold, key=_rank_key)
+            if keep < len(ranked):
+                doomed = {id(m) for m in ranked[keep:]}
+                longterm = self._longterm[agent_id]
+                self._longterm[agent_id] = [m for m in longterm if id(m) not in doomed]
+                forgotten += len(doomed)
+                del ranked[keep:]
+            else:
+                self._longterm.setdefault(agent_id, [])
 
         elif strategy == "age":
             # Forget old memories (threshold = max age in seconds)
@@ -221,6 +288,7 @@ class UnifiedMemoryStore:
             remaining_lt = [m for m in longterm if (current_time - m.timestamp) < max_age]
             forgotten += len(longterm) - len(remaining_lt)
             self._longterm[agent_id] = remaining_lt
+            self._ranked.pop(agent_id, None)
 
         return forgotten
 
@@ -248,3 +316,5 @@ class UnifiedMemoryStore:
         """Reset all memory stores."""
         self._working.clear()
         self._longterm.clear()
+        self._clocks.clear()
+        self._ranked.clear()
@@ -21,6 +21,23 @@ import numpy as np # Ensure numpy is imported
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class DecayClock:
+    """Per-agent decay epoch shared by that agent's memory items.
+
+    ``UnifiedMemoryStore.apply_decay`` only advances ``generation`` and
+    records ``epoch`` / ``rate``; an item whose importance was last set in
+    an older generation reads it as
+    ``base_importance / (1 + rate * (epoch - timestamp) / 86400)``.
+    ``revision`` changes whenever any importance of the agent may have
+    changed, so cached rankings know when to rebuild.
+    """
+    generation: int = 0
+    epoch: float = 0.0
+    rate: float = 0.0
+    revision: int = 0
+
+
 @dataclass
 class UnifiedMemoryItem:
     """
@@ -72,9 +89,21 @@ class UnifiedMemoryItem:
     # Computed importance (can be updated by decay)
     _current_importance: Optional[float] = field(default=None, repr=False)
 
+    # Lazy decay: the owning agent's clock (attached by UnifiedMemoryStore)
+    # and the clock generation in which the importance above was set.
+    _decay_clock: Optional[DecayClock] = field(default=None, repr=False, compare=False)
+    _decay_gen: int = field(default=0, repr=False, compare=False)
+
     @property
     def importance(self) -> float:
         """Get current importance (with decay applied if set)."""
+        clock = self._decay_clock
+        if clock is not None and clock.generation > self._decay_gen:
+            # Decayed since last read: materialize once from base importance.
+            age = clock.epoch - self.timestamp
+            decay_factor = 1.0 / (1.0 + clock.rate * age / 86400)  # Per day
+            self._current_importance = max(0.0, min(1.0, self.base_importance * decay_factor))
+            self._decay_gen = clock.generation
         if self._current_importance is not None:
             return self._current_importance
         return self.base_importance
@@ -83,6 +112,10 @@ class UnifiedMemoryItem:
     def importance(self, value: float):
         """Set current importance (after decay)."""
         self._current_importance = max(0.0, min(1.0, value))
+        clock = self._decay_clock
+        if clock is not None:
+            self._decay_gen = clock.generation
+            clock.revision += 1
 
     def compute_importance(
         self,
@@ -559,18 +592,13 @@ class UnifiedCognitiveEngine:
         return state
 
     def apply_decay(self, agent_id: str) -> None:
-        """Apply time-based decay to importance scores."""
-        current_time = time.time()
-
-        for item in self._store.working.get(agent_id, []):
-            age = current_time - item.timestamp
-            decay_factor = 1.0 / (1.0 + self.decay_rate * age / 86400)  # Per day
-            item.importance = item.base_importance * decay_factor
-
-        for item in self._store.longterm.get(agent_id, []):
-            age = current_time - item.timestamp
-            decay_factor = 1.0 / (1.0 + self.decay_rate * age / 86400)
-            item.importance = item.base_importance * decay_factor
+        """Apply time-based decay to importance scores.
+
+        O(1): the agent's decay clock is advanced and each stored item
+        recomputes ``base_importance / (1 + decay_rate * age_days)`` the
+        next time its importance is read.
+        """
+        self._store.apply_decay(agent_id, self.decay_rate, time.time())
 
     def reset(self) -> None:
         """Reset engine state for new simulation."""
@@ -282,3 +282,97 @@ def test_main_cli_returns_2_on_missing_results_dir(capsys, tmp_path):
     err = capsys.readouterr().err
     assert "results dir not found" in err
     assert rc == 2
+
+
+# ---------------------------------------------------------------------------
+# Live tracking (ReadinessTracker fed by GenericAuditWriter)
+# ---------------------------------------------------------------------------
+
+
+class _Result:
+    def __init__(self, rule_id, valid):
+        self.valid = valid
+        self.errors = [] if valid else [f"{rule_id} blocked"]
+        self.warnings = []
+        self.metadata = {"rule_id": rule_id}
+        self.validator_name = "V"
+
+
+def _live_trace(i):
+    status = "APPROVED" if i % 4 else "REJECTED"
+    return {
+        "agent_id": f"A{i % 5}",
+        "year": i // 5 + 1,
+        "step_id": i,
+        "approved_skill": {"status": status, "skill_name": f"skill_{i % 3}"},
+        "retry_count": i % 3,
+        "format_retries": 1 if i % 7 == 0 else 0,
+    }
+
+
+def test_live_tracker_matches_post_hoc_report(tmp_path):
+    from broker.components.analytics.audit import AuditConfig, GenericAuditWriter
+    from broker.components.analytics.readiness import ReadinessTracker
+
+    writer = GenericAuditWriter(AuditConfig(output_dir=str(tmp_path)))
+    tracker = ReadinessTracker()
+    writer.readiness_tracker = tracker
+    for i in range(40):
+        results = [_Result("rule_a", valid=bool(i % 4)), _Result("rule_b", valid=True)]
+        writer.write_trace("agent", _live_trace(i), results)
+    writer.finalize()
+
+    live = tracker.metrics()
+    post = compute_readiness_report(tmp_path, load_readiness_profile("stress")).metrics
+    assert live == post
+    assert live.approval_rate == 0.75
+    assert live.retry_distribution == {"0": 14, "1": 13, "2": 13}
+    assert live.validator_firing_diversity == 1
+    assert live.dead_validators == ["rule_b"]
+
+
+def test_live_tracker_snapshot_every_n(tmp_path):
+    from broker.components.analytics.readiness import ReadinessTracker
+
+    snap = tmp_path / "readiness_live.json"
+    tracker = ReadinessTracker(
+        load_readiness_profile("functional"), snapshot_path=snap, snapshot_every=10,
+    )
+    for i in range(9):
+        tracker.observe_trace(_live_trace(i))
+    assert not snap.exists()
+    tracker.observe_trace(_live_trace(9))
+    data = json.loads(snap.read_text(encoding="utf-8"))
+    assert data["n_decisions"] == 10
+    assert data["profile_name"] == "functional"
+    assert data["metrics"]["approved_count"] == 7
+    assert data["passing"] is False  # approval 0.7 < 0.8
+    assert not (tmp_path / "readiness_live.json.tmp").exists()
+
+
+def test_live_tracker_early_stop_only_on_clear_breach():
+    from broker.components.analytics.readiness import ReadinessTracker
+
+    profile = load_readiness_profile("functional")  # min_approval_rate 0.80
+
+    def feed(tracker, approved_every, n):
+        for i in range(n):
+            status = "APPROVED" if i % approved_every else "REJECTED"
+            tracker.observe({"status": status, "final_skill": "x", "retry_count": 0})
+
+    clear = ReadinessTracker(profile, snapshot_every=10, early_stop=True, min_decisions=50)
+    feed(clear, 2, 40)  # 50% approval, but below min_decisions
+    assert not clear.should_stop
+    feed(clear, 2, 20)
+    assert clear.should_stop
+    assert "approval_rate" in clear.stop_reason
+
+    # 75% approval over 100 decisions: below 0.80 but within the interval.
+    marginal = ReadinessTracker(profile, snapshot_every=10, early_stop=True, min_decisions=50)
+    feed(marginal, 4, 100)
+    assert not marginal.should_stop
+
+    # Monitoring only: never flags a stop.
+    passive = ReadinessTracker(profile, snapshot_every=10)
+    feed(passive, 2, 200)
+    assert not passive.should_stop
@@ -246,3 +246,62 @@ class TestAuditTrail:
         # Order matches: first audit author appears in first post line
         assert audit_authors[0] in post_lines[0]
         assert audit_authors[1] in post_lines[1]
+
+
+class TestMaterialisedFeeds:
+    def _world(self, n_agents=40, n_authors=8):
+        import random
+
+        rng = random.Random(7)
+        env = TieredEnvironment()
+        net = FollowerNetwork()
+        tiers = ["official_authority", "verified_account", "peer_post", "bot"]
+        for a in range(n_authors):
+            for i in range(6):
+                env.add_post(_make_post(
+                    text=f"a{a}-p{i}", author_id=f"au{a}", event_year=rng.randint(1, 4),
+                    tier_id=rng.choice(tiers), engagement_score=rng.choice([0.0, 0.0, 1.0, 2.5]),
+                ))
+        agents = {}
+        for h in range(n_agents):
+            agents[f"hh{h}"] = {"id": f"hh{h}"}
+            for a in rng.sample(range(n_authors), rng.randint(0, n_authors)):
+                net.add_edge(author_id=f"au{a}", follower_id=f"hh{h}")
+        return env, net, agents
+
+    def test_merge_matches_per_agent_ranking(self):
+        env, net, agents = self._world()
+        pack = _StubPack(suppressed={"bot"}, drop_for_agents={"hh3", "hh9"})
+        provider = SocialMediaProvider(env, net, pack, top_k=4)
+        for agent_id in agents:
+            followed = net.get_followed(agent_id)
+            expected = provider._rank_per_agent(
+                agents[agent_id], followed, env.social_feeds, {"bot"}, 4,
+            )
+            assert provider._rank_merged(
+                agents[agent_id], followed, env.social_feeds, {"bot"}, 4,
+            ) == expected
+
+    def test_author_feed_rebuilt_on_new_post_and_year(self, env, graph):
+        env.add_post(_make_post(text="old", author_id="gov", event_year=1, tier_id="peer_post"))
+        provider = SocialMediaProvider(env, graph, _StubPack(), top_k=1)
+        ctx: Dict[str, Any] = {}
+        provider.provide("hh1", {"hh1": {"id": "hh1"}}, ctx, year=1)
+        assert "old" in ctx["social_media_feed"]
+
+        env.add_post(_make_post(text="fresh", author_id="gov", event_year=2))
+        provider.provide("hh1", {"hh1": {"id": "hh1"}}, ctx, year=2)
+        assert "fresh" in ctx["social_media_feed"]
+        assert provider._feeds_year == 2
+
+    def test_transforming_filter_falls_back_per_agent(self, env, graph):
+        class _TaggingPack(_StubPack):
+            def social_media_post_filter(self, agent, post):
+                return Post(**{**post.__dict__, "text": post.text + " [tagged]"})
+
+        env.add_post(_make_post(text="hello", author_id="gov", event_year=1))
+        provider = SocialMediaProvider(env, graph, _TaggingPack())
+        ctx: Dict[str, Any] = {}
+        provider.provide("hh1", {"hh1": {"id": "hh1"}}, ctx, year=1)
+        assert "hello [tagged]" in ctx["social_media_feed"]
+        assert provider._transforming_filter
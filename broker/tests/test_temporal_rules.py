@@ -8,9 +8,13 @@ Covers:
 - T5: TemporalRuleEvaluator end-to-end on synthetic trajectory
 - T6: Framework is domain-agnostic (no flood/irrigation tokens in
       broker/components/governance/temporal_rules/ via grep)
+- T7: StreamingTemporalEvaluator matches the batch evaluator
 """
 from __future__ import annotations
 
+import csv
+import json
+import random
 import re
 from pathlib import Path
 from typing import Any, Dict, List, Set
@@ -25,8 +29,11 @@ from broker.components.governance.temporal_rules import (
     DomainTemporalAdapter,
     EvidenceGroundedIrreversibility,
     NullTemporalAdapter,
+    StreamingTemporalEvaluator,
     TemporalRuleEvaluator,
     Violation,
+    evaluate_runs,
+    iter_audit_rows,
 )
 
 
@@ -300,3 +307,91 @@ def test_framework_has_no_domain_specific_tokens():
     assert not allowed_relaxed, (
         f"Domain-specific tokens leaked into framework: {allowed_relaxed}"
     )
+
+
+# =============================================================================
+# T7: StreamingTemporalEvaluator
+# =============================================================================
+
+def _random_rows(n_agents=12, n_years=15, seed=0) -> List[Dict[str, Any]]:
+    """Year-major rows (the order audit writers produce)."""
+    rng = random.Random(seed)
+    rows = []
+    for year in range(1, n_years + 1):
+        for a in range(n_agents):
+            rows.append(dict(
+                agent_id=f"agent_{a}", year=year,
+                construct_TP_LABEL=rng.choice(["VL", "L", "M", "H", "VH", ""]),
+                final_skill=rng.choice(["do_nothing", "do_nothing", "skill_irreversible", "skill_b"]),
+                mem_top_emotion=rng.choice(["routine", "routine", "critical", "major"]),
+            ))
+    return rows
+
+
+def _key(v: Violation):
+    return (v.agent_id, v.year, v.rule_id, v.rationale, tuple(v.window_years))
+
+
+def test_streaming_matches_batch_in_agent_year_order():
+    rows = sorted(_random_rows(), key=lambda r: (r["agent_id"], r["year"]))
+    batch = TemporalRuleEvaluator(DEFAULT_RULES, _TestAdapter()).evaluate_experiment(rows)
+    stream = StreamingTemporalEvaluator(DEFAULT_RULES, _TestAdapter())
+    emitted = list(stream.evaluate_stream(rows))
+    result = stream.result()
+    assert [_key(v) for v in emitted] == [_key(v) for v in batch.violations]
+    assert result.by_rule == batch.by_rule and result.rate_by_rule == batch.rate_by_rule
+    assert result.n_decisions == batch.n_decisions
+    assert set(batch.by_rule) == {"M1", "M2", "M3"}  # every rule exercised
+
+
+def test_streaming_matches_batch_in_year_major_order():
+    rows = _random_rows(seed=1)
+    batch = TemporalRuleEvaluator(DEFAULT_RULES, _TestAdapter()).evaluate_experiment(rows)
+    stream = StreamingTemporalEvaluator(DEFAULT_RULES, _TestAdapter())
+    emitted = list(stream.evaluate_stream(rows))
+    assert sorted(map(_key, emitted)) == sorted(map(_key, batch.violations))
+    # Only the largest rule window is retained per agent.
+    assert stream.horizon == 5
+    assert all(len(h) <= stream.horizon + 1 for h in stream._history.values())
+
+
+def test_streaming_rejects_out_of_order_rows():
+    stream = StreamingTemporalEvaluator(DEFAULT_RULES, _TestAdapter())
+    stream.push(dict(agent_id="A", year=3))
+    with pytest.raises(ValueError, match="out of order"):
+        stream.push(dict(agent_id="A", year=2))
+
+
+def test_iter_audit_rows_csv_and_jsonl(tmp_path):
+    rows = _random_rows(n_agents=3, n_years=6, seed=2)
+    csv_path = tmp_path / "household_governance_audit.csv"
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    jsonl_path = tmp_path / "household_traces.jsonl"
+    with open(jsonl_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"_metadata": {"schema": 1}}) + "\n")
+        for r in rows:
+            f.write(json.dumps({
+                "agent_id": r["agent_id"], "year": r["year"],
+                "skill_proposal": {"reasoning": {"TP_LABEL": r["construct_TP_LABEL"]}},
+                "approved_skill": {"skill_name": r["final_skill"]},
+                "memory_audit": {"memories": [{"content": "", "emotion": r["mem_top_emotion"]}]},
+            }) + "\n")
+        f.write('{"agent_id": "agent_0", "ye')  # torn tail
+
+    expected = TemporalRuleEvaluator(DEFAULT_RULES, _TestAdapter()).evaluate_experiment(rows)
+    for path in (csv_path, jsonl_path):
+        stream = StreamingTemporalEvaluator(DEFAULT_RULES, _TestAdapter())
+        emitted = list(stream.evaluate_stream(iter_audit_rows(path)))
+        assert stream.n_decisions == len(rows)
+        assert sorted(map(_key, emitted)) == sorted(map(_key, expected.violations)), path.name
+
+    results = evaluate_runs(
+        [("m", "c", "Run_1", csv_path), ("m", "c", "Run_2", jsonl_path)],
+        DEFAULT_RULES, _TestAdapter(), max_workers=2,
+    )
+    assert [r.run for r in results] == ["Run_1", "Run_2"]
+    assert all(r.by_rule == expected.by_rule for r in results)
+    assert all(r.violations == [] for r in results)  # counts only by default
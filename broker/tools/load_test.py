@@ -0,0 +1,110 @@
+"""Load-test an experiment script against a stand-in LLM server.
+
+Starts a local server speaking the Ollama and OpenAI wire formats (see
+``broker.utils.stand_in_llm``) and runs ``--cmd`` once per ``--workers``
+value, formatted with ``{workers}``, ``{output_dir}``, ``{llm_url}``
+and, with ``--population``, ``{population}`` (a synthetic profile CSV
+of ``--agents`` rows) and ``{agents}``. The command reaches the
+stand-in through ``OLLAMA_HOST`` / ``OPENAI_BASE_URL``; it must use a
+real model name, since ``mock`` never makes HTTP calls.
+
+Usage::
+
+    python -m broker.tools.load_test \\
+        --cmd "python examples/single_agent/run_flood.py --model gemma3:4b --years 3 --agents {agents} --initial-agents {population} --workers {workers} --output {output_dir}" \\
+        --population examples/single_agent/agent_initial_profiles.csv --agents 1000 \\
+        --workers 1 2 4 8 --latency-ms 400 --tokens-per-s 40 --malformed-rate 0.02 \\
+        --output-root results/load_test
+
+Prints throughput per worker count and mean/p95 latency per stage;
+the full report is ``<output-root>/load_test_report.json``. Exit code 0
+when every run finished, 1 when any run failed.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from broker.core.load_test import LoadTestCommand, format_report, run_load_test, synthesize_population_csv
+from broker.utils.stand_in_llm import LATENCY_DISTRIBUTIONS, StandInConfig
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="load_test",
+        description="Throughput/latency of an experiment per worker count, against a stand-in LLM.",
+    )
+    parser.add_argument("--cmd", required=True,
+                        help="Command template; {workers} {output_dir} {llm_url} {population} {agents} are substituted.")
+    parser.add_argument("--output-root", required=True, type=Path,
+                        help="Report directory, with one workers_<n> subdirectory per run.")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8],
+                        help="Worker counts to compare (default: 1 2 4 8).")
+    parser.add_argument("--population", type=Path, default=None,
+                        help="Agent profile CSV to synthesize {population} from.")
+    parser.add_argument("--agents", type=int, default=100,
+                        help="Synthetic population size (default: 100).")
+    parser.add_argument("--cwd", type=Path, default=None,
+                        help="Working directory for the command (default: current).")
+
+    server = parser.add_argument_group("stand-in server")
+    server.add_argument("--port", type=int, default=0,
+                        help="Port to serve on (default: any free port; 11434 stands in for Ollama).")
+    server.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal",
+                        help="Base latency distribution (default: lognormal).")
+    server.add_argument("--latency-ms", type=float, default=50.0,
+                        help="Median base latency per request (default: 50).")
+    server.add_argument("--latency-spread", type=float, default=0.5,
+                        help="Uniform half-width fraction / lognormal sigma (default: 0.5).")
+    server.add_argument("--prefill-tokens-per-s", type=float, default=0.0,
+                        help="Prompt processing rate; 0 = free (default).")
+    server.add_argument("--tokens-per-s", type=float, default=0.0,
+                        help="Generation rate; 0 = free (default).")
+    server.add_argument("--response-tokens", type=int, default=0,
+                        help="Tokens generated per answer; 0 = estimate from the answer (default).")
+    server.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="Share of answers that are truncated, prose or empty.")
+    server.add_argument("--timeout-rate", type=float, default=0.0,
+                        help="Share of requests that stall and are dropped.")
+    server.add_argument("--stall-s", type=float, default=30.0,
+                        help="How long a dropped request stalls first (default: 30).")
+    server.add_argument("--capacity", type=int, default=0,
+                        help="Requests served at once, the rest queue; 0 = unlimited (default).")
+    server.add_argument("--prefix-cache-slots", type=int, default=0,
+                        help="Recent prompts whose prefixes skip prefill; 0 = no prompt cache (default).")
+    server.add_argument("--seed", type=int, default=None,
+                        help="Seed for latencies, failures and the synthetic population.")
+    args = parser.parse_args(argv)
+
+    stand_in = StandInConfig(
+        latency=args.latency,
+        latency_s=args.latency_ms / 1000.0,
+        latency_spread=args.latency_spread,
+        prefill_tokens_per_s=args.prefill_tokens_per_s,
+        tokens_per_s=args.tokens_per_s,
+        response_tokens=args.response_tokens,
+        malformed_rate=args.malformed_rate,
+        timeout_rate=args.timeout_rate,
+        stall_s=args.stall_s,
+        capacity=args.capacity,
+        prefix_cache_slots=args.prefix_cache_slots,
+        seed=args.seed,
+    )
+    params = {"agents": args.agents, "population": ""}
+    if args.population is not None:
+        target = args.output_root / f"population_{args.agents}.csv"
+        params["population"] = synthesize_population_csv(args.population, target, args.agents, seed=args.seed)
+
+    report = run_load_test(
+        LoadTestCommand(args.cmd, cwd=args.cwd, params=params),
+        args.workers, args.output_root, stand_in, port=args.port,
+    )
+    print(format_report(report))
+    print(f"\nReport: {args.output_root / 'load_test_report.json'}")
+    return 1 if any(run["error"] for run in report["runs"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
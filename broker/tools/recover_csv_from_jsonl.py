@@ -37,6 +37,11 @@ from broker.components.analytics.audit import (
     trace_to_csv_row,
     compute_csv_fieldnames,
 )
+from broker.components.analytics.trace_store import (
+    TraceDecodeError,
+    TraceDecoder,
+    is_blob_record,
+)
 
 
 def _read_jsonl_safely_with_metadata(
@@ -47,9 +52,12 @@ def _read_jsonl_safely_with_metadata(
     Returns (parsed traces, skipped_line_count, metadata). Skipped lines are
     the last-line-incomplete case (mid-write crash leaves a partial JSON
     object). Mid-file malformed lines also get skipped with a warning.
+    Compact-storage files are decoded back to full traces; a compact
+    trace whose blobs or delta base were lost counts as skipped.
     """
     traces: List[Dict[str, Any]] = []
     skipped = 0
+    decoder = TraceDecoder()
     metadata: Optional[Dict[str, Any]] = None
     seen_json_record = False
     with open(path, "r", encoding="utf-8") as f:
@@ -77,7 +85,13 @@ def _read_jsonl_safely_with_metadata(
                 # valid JSON but not a trace object (bare array/number/string)
                 skipped += 1
                 continue
-            traces.append(record)
+            if is_blob_record(record):
+                decoder.add_blob(record)
+                continue
+            try:
+                traces.append(decoder.decode(record))
+            except TraceDecodeError:
+                skipped += 1
     return traces, skipped, metadata
 
 
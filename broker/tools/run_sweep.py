@@ -0,0 +1,68 @@
+"""Run a (model x seed x ablation) command sweep in parallel.
+
+Replaces per-seed ``.bat`` loops: each cell runs ``--cmd`` formatted
+with ``{model}``, ``{seed}``, ``{ablation}`` and ``{output_dir}``, over
+``--workers`` processes, with at most ``--llm-concurrency`` cells
+driving the LLM endpoint at once. Progress is kept in
+``<output-root>/sweep_manifest.json``; re-running the same command
+skips finished cells. ``<output-root>/sweep_index.csv`` lists every
+cell's output directory.
+
+Usage::
+
+    python -m broker.tools.run_sweep \\
+        --cmd "python examples/irrigation_abm/run_fql_baseline.py --years 42 --real --seed {seed} --output {output_dir}" \\
+        --seeds 42 43 44 --output-root results/fql_sweep --workers 3
+
+Exit code 0 when every cell finished, 1 when any cell failed.
+For in-process cells with shared inputs use ``broker.core.sweep``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from broker.core.sweep import CommandCell, SweepRunner, build_matrix
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="run_sweep",
+        description="Parallel, resumable multi-seed sweep of a command template.",
+    )
+    parser.add_argument("--cmd", required=True,
+                        help="Command template; {model} {seed} {ablation} {output_dir} are substituted.")
+    parser.add_argument("--output-root", required=True, type=Path,
+                        help="Sweep directory (manifest, index, one subdirectory per cell).")
+    parser.add_argument("--models", nargs="+", default=["none"],
+                        help="Model identifiers (default: a single 'none' model).")
+    parser.add_argument("--seeds", nargs="+", type=int, required=True)
+    parser.add_argument("--ablations", nargs="+", default=None,
+                        help="Ablation names (default: a single 'default' ablation).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Concurrent cells (default: CPU count).")
+    parser.add_argument("--llm-concurrency", type=int, default=None,
+                        help="Max cells using the LLM endpoint at once (default: unlimited).")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="Extra attempts per failed cell (default: 1).")
+    parser.add_argument("--cwd", type=Path, default=None,
+                        help="Working directory for the command (default: current).")
+    args = parser.parse_args(argv)
+
+    runner = SweepRunner(
+        CommandCell(args.cmd, cwd=args.cwd),
+        args.output_root,
+        max_workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        max_retries=args.retries,
+    )
+    summary = runner.run(build_matrix(args.models, args.seeds, args.ablations))
+    print(json.dumps(summary.to_dict(), indent=2))
+    return 1 if summary.n_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
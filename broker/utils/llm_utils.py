@@ -10,10 +10,11 @@ Provides common logic for:
 v2.0: invoke functions now return (content, stats) tuple for thread-safety.
 v2.1: Added global LLM_CONFIG for configurable parameters.
 """
+import dataclasses
 import logging
 import os
 from pathlib import Path
-from typing import Callable, Dict, Tuple, Union, Optional, Any
+from typing import Callable, Dict, List, Tuple, Union, Optional, Any
 from dataclasses import dataclass, field
 
 _LOGGER = logging.getLogger(__name__)
@@ -70,6 +71,13 @@ class LLMConfig:
     thinking_mode: str = "auto"
     thinking_budget_tokens: Optional[int] = None  # Optional: limit thinking token count
 
+    # How governance retries are sent (overridable per agent type via
+    # llm_params.retry_mode):
+    #   "fresh"        = feedback + the full original prompt as a new request (default)
+    #   "continuation" = original prompt, rejected answer and a feedback turn as a
+    #                    chat history, so prompt/KV caching skips the shared prefix
+    retry_mode: str = "fresh"
+
     def to_ollama_params(self) -> Dict[str, Any]:
         """Convert config to Ollama parameter dict, excluding None values."""
         params = {
@@ -184,6 +192,7 @@ def _load_global_config() -> LLMConfig:
             model_quirks=quirks,
             thinking_mode=global_llm.get("thinking_mode", "auto"),
             thinking_budget_tokens=global_llm.get("thinking_budget_tokens"),
+            retry_mode=global_llm.get("retry_mode", "fresh"),
         )
     except Exception as e:
         _LOGGER.warning(f"Could not load global LLM config: {e}. Using defaults.")
@@ -204,6 +213,12 @@ class LLMStats:
     response_tokens: int = 0  # Response token count from Ollama (eval_count)
     num_ctx: int = 0          # Context window size used for this call
     context_utilization: float = 0.0  # prompt_tokens / num_ctx
+    # Prompt-cache reuse: cached prompt tokens (None = not reported by the
+    # provider) and prefill time in ms (0 = not reported)
+    cached_prompt_tokens: Optional[int] = None
+    prefill_ms: float = 0.0
+    # Draft/verify outcome when the call went through SpeculativeDrafter
+    speculative: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict:
         d = {
@@ -217,6 +232,12 @@ class LLMStats:
             d["response_tokens"] = self.response_tokens
             d["num_ctx"] = self.num_ctx
             d["context_utilization"] = round(self.context_utilization, 4)
+        if self.cached_prompt_tokens is not None:
+            d["cached_prompt_tokens"] = self.cached_prompt_tokens
+        if self.prefill_ms > 0:
+            d["prefill_ms"] = round(self.prefill_ms, 3)
+        if self.speculative:
+            d["speculative"] = dict(self.speculative)
         return d
 
 
@@ -256,16 +277,63 @@ class LLMProvider(ABC):
 # Type alias for the invoke function signature (legacy compatibility)
 LLMInvokeFunc = Callable[[str], Tuple[str, LLMStats]]
 
+RETRY_MODES = ("fresh", "continuation")
+
+
+def _render_messages(messages: List[Dict[str, str]]) -> str:
+    """Flatten a chat history into one prompt (providers without chat)."""
+    return "\n\n".join(m["content"] for m in messages)
+
+
+DEFAULT_OLLAMA_HOST = "http://localhost:11434"
+
+
+def ollama_base_url() -> str:
+    """Ollama server URL: ``OLLAMA_HOST`` when set, else the local default.
 
-def _invoke_ollama_direct(model: str, prompt: str, params: Dict[str, Any], verbose: bool) -> Tuple[str, LLMStats]:
+    Like the Ollama CLI, a bare ``host:port`` is taken as plain HTTP.
+    """
+    host = os.environ.get("OLLAMA_HOST", "").strip().rstrip("/")
+    if not host:
+        return DEFAULT_OLLAMA_HOST
+    return host if "://" in host else f"http://{host}"
+
+
+def mock_content(prompt: str) -> str:
+    """The mock model's answer: the first numbered option in ``prompt``.
+
+    Packed prompts (``### Agent <id>`` blocks, see
+    broker.core.packed_decisions) get a JSON array with one object per agent.
+    """
+    import json
+    import re
+
+    # Extract the first numbered option from prompt (works for any domain)
+    options = re.findall(r'(\d+)\.\s+\w+', prompt)
+    decision_id = int(options[0]) if options else 1
+
+    agent_ids = re.findall(r'^### Agent (\S+)$', prompt, re.MULTILINE)
+    if agent_ids:
+        return json.dumps([{"agent_id": aid, "decision": decision_id} for aid in agent_ids])
+    # Minimal valid JSON — no domain-specific construct names
+    return json.dumps({"decision": decision_id})
+
+
+def _invoke_ollama_direct(
+    model: str, prompt: str, params: Dict[str, Any], verbose: bool,
+    messages: Optional[List[Dict[str, str]]] = None,
+) -> Tuple[str, LLMStats]:
     """
     Phase 46: Invoke Ollama direct via API to avoid LangChain/Python 3.14 issues
     and enable native JSON-mode.
+
+    With ``messages`` the chat endpoint is used instead of ``prompt``;
+    Ollama then only prefills the turns past its cached prefix.
     """
     import requests
     import json
     
-    url = "http://localhost:11434/api/generate"
+    url = f"{ollama_base_url()}/api/chat" if messages else f"{ollama_base_url()}/api/generate"
     
     # Standardize options — only include sampling params if explicitly set
     # (None / missing = use Ollama model default, e.g. temperature ~0.8)
@@ -289,7 +357,7 @@ def _invoke_ollama_direct(model: str, prompt: str, params: Dict[str, Any], verbo
 
     data = {
         "model": model,
-        "prompt": prompt,
+        **({"messages": messages} if messages else {"prompt": prompt}),
         "stream": False,
         "format": None, # DISABLED globally for Reasoning Model compatibility
         "options": options,
@@ -309,7 +377,10 @@ def _invoke_ollama_direct(model: str, prompt: str, params: Dict[str, Any], verbo
         
         if response.status_code == 200:
             result = response.json()
-            content = result.get('response', '')
+            if messages:
+                content = (result.get('message') or {}).get('content', '')
+            else:
+                content = result.get('response', '')
             if verbose:
                 _LOGGER.debug(f" [LLM:Direct] Model '{model}' responded successfully ({len(content)} chars).")
             # R5-C: Extract token counts from Ollama response
@@ -323,6 +394,8 @@ def _invoke_ollama_direct(model: str, prompt: str, params: Dict[str, Any], verbo
                 response_tokens=response_tokens,
                 num_ctx=ctx,
                 context_utilization=ctx_util,
+                # Ollama counts only the prompt tokens it had to evaluate
+                prefill_ms=(result.get('prompt_eval_duration', 0) or 0) / 1e6,
             )
             return content, stats
         else:
@@ -351,7 +424,16 @@ def create_llm_invoke(model: str, verbose: bool = False, overrides: Optional[Dic
     
     Returns:
         A callable that takes prompt str and returns (content, LLMStats) tuple.
+        With ``retry_mode: continuation`` (``overrides`` or global config)
+        and a provider that takes chat histories, the callable also has a
+        ``chat(messages)`` attribute used for governance retries.
     """
+    overrides = dict(overrides) if overrides else None
+    retry_mode = (overrides.pop("retry_mode", None) if overrides else None) or LLM_CONFIG.retry_mode
+    if retry_mode not in RETRY_MODES:
+        raise ValueError(f"retry_mode must be one of {RETRY_MODES}, got {retry_mode!r}")
+    continuation = retry_mode == "continuation"
+
     # Phase 0.3: Route to modern provider factory ONLY for known cloud providers
     # This prevents "gemma3:4b" from being split into provider="gemma3"
     KNOWN_PROVIDERS = ["gemini", "openai", "azure", "anthropic", "claude"]
@@ -374,26 +456,17 @@ def create_llm_invoke(model: str, verbose: bool = False, overrides: Optional[Dic
             if overrides:
                 config.update(overrides)
             
-            return create_provider_invoke(config, verbose=verbose)
+            return create_provider_invoke(config, verbose=verbose, retry_mode=retry_mode)
 
 
     # Domain-agnostic mock for testing — returns minimal JSON that
     # ModelAdapter can parse.  No PMT-specific constructs here; the
     # governance retry loop and ResponseFormatBuilder handle the rest.
     if model.lower().startswith("mock"):
-        import json as _json
         def mock_invoke(prompt: str) -> Tuple[str, LLMStats]:
-            import re
-            stats = LLMStats(retries=0, success=True)
-
-            # Extract the first numbered option from prompt (works for any domain)
-            option_pattern = r'(\d+)\.\s+\w+'
-            options = re.findall(option_pattern, prompt)
-            decision_id = int(options[0]) if options else 1
-
-            # Return minimal valid JSON — no domain-specific construct names
-            content = _json.dumps({"decision": decision_id})
-            return content, stats
+            return mock_content(prompt), LLMStats(retries=0, success=True)
+        if continuation:
+            mock_invoke.chat = lambda messages: mock_invoke(_render_messages(messages))
         return mock_invoke
     
     try:
@@ -460,7 +533,10 @@ def create_llm_invoke(model: str, verbose: bool = False, overrides: Optional[Dic
                         stripped_content = content.strip()
                     
                     if stripped_content and stripped_content.strip():
-                        return content, LLMStats(retries=llm_retries, success=True, empty_content_retries=empty_content_retries)  # Return full content for logging
+                        # Return full content for logging; keep the call's token counts
+                        return content, dataclasses.replace(
+                            stats, retries=llm_retries, empty_content_retries=empty_content_retries,
+                        )
                     else:
                         llm_retries += 1
                         empty_content_retries += 1  # 045-H: Track empty content retries
@@ -489,7 +565,16 @@ def create_llm_invoke(model: str, verbose: bool = False, overrides: Optional[Dic
                         continue
                     return "", LLMStats(retries=llm_retries, success=False, empty_content_retries=empty_content_retries)
             return "", LLMStats(retries=llm_retries, success=False, empty_content_retries=empty_content_retries)
-        
+
+        if continuation:
+            def chat(messages: List[Dict[str, str]]) -> Tuple[str, LLMStats]:
+                # Quirks (e.g. /no_think) go on the newest turn so earlier turns stay cacheable
+                last = messages[-1]
+                content_text, _ = LLM_CONFIG.apply_model_quirks(model, last["content"], 0)
+                sent = messages[:-1] + [{**last, "content": content_text}]
+                return _invoke_ollama_direct(model, "", ollama_params, verbose, messages=sent)
+            invoke.chat = chat
+
         return invoke
     except ImportError:
         _LOGGER.warning("langchain-ollama not found. Falling back to mock LLM.")
@@ -499,7 +584,9 @@ def create_llm_invoke(model: str, verbose: bool = False, overrides: Optional[Dic
         return lambda p: ('{"decision": 1}', LLMStats())
 
 
-def create_provider_invoke(config: Dict[str, Any], verbose: bool = False) -> LLMInvokeFunc:
+def create_provider_invoke(
+    config: Dict[str, Any], verbose: bool = False, retry_mode: str = "fresh",
+) -> LLMInvokeFunc:
     """
     Creates an invocation function using the new v0.3 Provider Factory.
     This is the modern way to instantiate LLMs (Gemini, OpenAI, Ollama).
@@ -507,6 +594,8 @@ def create_provider_invoke(config: Dict[str, Any], verbose: bool = False) -> LLM
     Args:
         config: Provider configuration (type, model, temperature, etc.)
         verbose: Enable diagnostic logging
+        retry_mode: ``"continuation"`` adds a ``chat(messages)`` attribute
+            when the provider supports chat histories.
         
     Returns:
         A callable that takes prompt str and returns (content, LLMStats) tuple.
@@ -515,17 +604,27 @@ def create_provider_invoke(config: Dict[str, Any], verbose: bool = False) -> LLM
     provider = create_provider(config)
     
     def invoke(prompt: str) -> Tuple[str, LLMStats]:
+        return _call(provider.invoke, prompt, prompt)
+
+    def chat(messages: List[Dict[str, str]]) -> Tuple[str, LLMStats]:
+        return _call(provider.invoke_messages, messages, messages[-1]["content"])
+
+    def _call(method: Callable, payload: Any, prompt: str) -> Tuple[str, LLMStats]:
         if verbose:
             _LOGGER.debug(f"\n [LLM:Input] {provider.provider_name}:{provider.config.model} Prompt begins: {repr(prompt[:100])}...")
         
         try:
             # Note: Provider handles its own internal configuration (temp, tokens)
-            response = provider.invoke(prompt)
+            response = method(payload)
             
             # Map usage stats to framework standard
+            usage = response.usage or {}
             stats = LLMStats(
                 retries=0, 
-                success=True
+                success=True,
+                prompt_tokens=usage.get("prompt_tokens", 0) or 0,
+                response_tokens=usage.get("completion_tokens", 0) or 0,
+                cached_prompt_tokens=usage.get("cached_prompt_tokens"),
             )
             
             if verbose:
@@ -539,6 +638,8 @@ def create_provider_invoke(config: Dict[str, Any], verbose: bool = False) -> LLM
             _LOGGER.error(f" [LLM:Error] {provider.provider_name} {type(e).__name__}: {e}")
             return "", LLMStats(retries=0, success=False)
             
+    if retry_mode == "continuation" and provider.supports_messages():
+        invoke.chat = chat
     return invoke
 
 
@@ -10,12 +10,19 @@ Usage:
     from broker.utils.performance_tuner import get_optimal_config
     config = get_optimal_config(model_tag="qwen3:1.7b")
     # Returns: PerformanceConfig(num_ctx=4096, workers=2, num_predict=512)
+
+The presets pick a starting point before the run;
+`AdaptiveConcurrencyController` adjusts the number of in-flight LLM
+requests during the run from measured latency and failures.
 """
 import re
+import statistics
 import subprocess
 import logging
-from dataclasses import dataclass
-from typing import Optional, Tuple
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -225,6 +232,178 @@ def apply_to_llm_config(config: PerformanceConfig, num_ctx_override: Optional[in
     _LOGGER.info(f"[PerformanceTuner] Applied: num_ctx={final_ctx}, num_predict={final_predict} (Overrides: ctx={num_ctx_override}, pred={num_predict_override})")
 
 
+# =============================================================================
+# Adaptive Concurrency (AIMD)
+# =============================================================================
+@dataclass
+class AdaptiveConcurrencyConfig:
+    """Bounds and thresholds for `AdaptiveConcurrencyController`.
+
+    Every ``window`` completed calls the limit is reassessed: it is cut
+    to ``limit * decrease_factor`` when more than ``max_error_rate`` of
+    the window failed or its median latency exceeds ``latency_tolerance``
+    times the best median seen so far (the unloaded latency); otherwise
+    it grows by one if the window actually used the whole limit. A call
+    fails when it raises, returns ``success=False`` stats or empty
+    content, or takes longer than ``timeout_s``.
+    """
+    min_limit: int = 1
+    max_limit: int = 8
+    initial_limit: Optional[int] = None  # None = min_limit
+    window: int = 8
+    latency_tolerance: float = 2.0
+    max_error_rate: float = 0.1
+    decrease_factor: float = 0.5
+    timeout_s: Optional[float] = None
+
+    def __post_init__(self):
+        if self.min_limit < 1 or self.max_limit < self.min_limit:
+            raise ValueError(
+                f"Adaptive concurrency needs 1 <= min_limit <= max_limit, "
+                f"got {self.min_limit}..{self.max_limit}"
+            )
+        if self.window < 1 or not 0 < self.decrease_factor < 1:
+            raise ValueError("window must be >= 1 and decrease_factor in (0, 1)")
+
+
+class AdaptiveConcurrencyController:
+    """Limits in-flight LLM requests and adapts the limit (AIMD).
+
+    Wrap an ``llm_invoke`` with `wrap`; calls beyond the current limit
+    wait for a slot. Every limit change is kept in ``decisions`` (with
+    the window's median latency and failure rate) for the run manifest.
+    """
+
+    MAX_LOGGED_DECISIONS = 500
+
+    def __init__(self, config: Optional[AdaptiveConcurrencyConfig] = None):
+        self.config = config or AdaptiveConcurrencyConfig()
+        cfg = self.config
+        initial = cfg.initial_limit if cfg.initial_limit is not None else cfg.min_limit
+        self._limit = max(cfg.min_limit, min(initial, cfg.max_limit))
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._peak = 0
+        self._latencies: List[float] = []
+        self._failures = 0
+        self._baseline: Optional[float] = None
+        self._epoch = 0  # bumped on every limit change
+        self._start = time.perf_counter()
+        self.calls = 0
+        self.failed_calls = 0
+        self.decisions: List[Dict[str, Any]] = []
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def acquire(self) -> int:
+        """Wait for a slot; returns the epoch to pass back to `release`."""
+        with self._cond:
+            while self._in_flight >= self._limit:
+                self._cond.wait()
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+            return self._epoch
+
+    def release(self, latency_s: float, failed: bool = False, epoch: Optional[int] = None) -> None:
+        """Free a slot and record the call's outcome.
+
+        Calls started before the last limit change (``epoch``) only free
+        their slot: their latency reflects the old limit.
+        """
+        cfg = self.config
+        if cfg.timeout_s is not None and latency_s > cfg.timeout_s:
+            failed = True
+        with self._cond:
+            self._in_flight -= 1
+            self.calls += 1
+            self.failed_calls += int(failed)
+            if epoch is not None and epoch != self._epoch:
+                self._cond.notify_all()
+                return
+            self._latencies.append(latency_s)
+            self._failures += int(failed)
+            if len(self._latencies) >= cfg.window:
+                self._adjust()
+            self._cond.notify_all()
+
+    def _adjust(self) -> None:
+        cfg = self.config
+        p50 = statistics.median(self._latencies)
+        error_rate = self._failures / len(self._latencies)
+        saturated = self._peak >= self._limit
+        if self._baseline is None or p50 < self._baseline:
+            self._baseline = p50
+
+        old = self._limit
+        if error_rate > cfg.max_error_rate:
+            reason = "errors"
+            new = max(cfg.min_limit, int(old * cfg.decrease_factor))
+        elif p50 > self._baseline * cfg.latency_tolerance:
+            reason = "latency"
+            new = max(cfg.min_limit, int(old * cfg.decrease_factor))
+        elif saturated:
+            reason = "headroom"
+            new = min(cfg.max_limit, old + 1)
+        else:
+            reason, new = "idle", old
+
+        self._latencies = []
+        self._failures = 0
+        self._peak = self._in_flight
+        if new == old:
+            return
+        self._limit = new
+        self._epoch += 1
+        decision = {
+            "t_s": round(time.perf_counter() - self._start, 3),
+            "from": old,
+            "to": new,
+            "reason": reason,
+            "p50_ms": round(p50 * 1000, 1),
+            "baseline_ms": round(self._baseline * 1000, 1),
+            "error_rate": round(error_rate, 3),
+        }
+        if len(self.decisions) < self.MAX_LOGGED_DECISIONS:
+            self.decisions.append(decision)
+        _LOGGER.info(f"[PerformanceTuner] Concurrency {old} -> {new} ({reason}, p50={decision['p50_ms']}ms)")
+
+    def wrap(self, llm_invoke: Callable) -> Callable:
+        """``llm_invoke`` that waits for a slot and reports its latency."""
+        def gated(payload, call=llm_invoke):
+            epoch = self.acquire()
+            start = time.perf_counter()
+            failed = True
+            try:
+                res = call(payload)
+                content, stats = res if isinstance(res, tuple) else (res, None)
+                failed = (stats is not None and not getattr(stats, "success", True)) or (
+                    isinstance(content, str) and not content.strip()
+                )
+                return res
+            finally:
+                self.release(time.perf_counter() - start, failed, epoch)
+
+        def invoke(prompt):
+            return gated(prompt)
+
+        chat = getattr(llm_invoke, "chat", None)
+        if callable(chat):
+            invoke.chat = lambda messages: gated(messages, chat)
+        return invoke
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "config": asdict(self.config),
+                "final_limit": self._limit,
+                "calls": self.calls,
+                "failed_calls": self.failed_calls,
+                "decisions": list(self.decisions),
+            }
+
+
 def print_config_summary(model_tag: str):
     """Print a human-readable summary of optimal config."""
     config = get_optimal_config(model_tag)
@@ -0,0 +1,378 @@
+"""Local stand-in LLM server for load tests.
+
+`StandInLLMServer` is a threaded HTTP server that speaks the Ollama
+(``/api/generate``, ``/api/chat``) and OpenAI (``/v1/completions``,
+``/v1/chat/completions``) wire formats, so the broker's real HTTP
+clients can be driven at scale without a model. Answers are the mock
+model's (`mock_content`: first numbered option, one object per agent
+for packed prompts), or with ``answers="random"`` a seeded random
+option with every ``{"label": "VL/L/M/H/VH"}`` construct of the
+prompt's response template filled in, like a model that ignores the
+governance rules. `StandInConfig` also controls how answers arrive:
+
+- **Latency.** Each request waits for one of ``capacity`` serving slots
+  (0 = unlimited), then for a sampled base latency plus prompt tokens
+  at ``prefill_tokens_per_s`` and response tokens at ``tokens_per_s``.
+- **Malformed output.** With ``malformed_rate`` the answer is truncated
+  JSON, prose without JSON or empty, exercising format retries.
+- **Timeouts.** With ``timeout_rate`` the server stalls ``stall_s`` and
+  drops the connection without answering.
+- **Prompt cache.** With ``prefix_cache_slots`` the server keeps that
+  many recent prompts; the longest prefix a request shares with one of
+  them is cached and costs no prefill time. Cached tokens are reported
+  as OpenAI ``prompt_tokens_details.cached_tokens``, and as Ollama
+  does, left out of ``prompt_eval_count``.
+
+Token counts are estimated at four characters per token and reported
+in each format's usage fields. Usage::
+
+    with StandInLLMServer(StandInConfig(latency_s=0.3, tokens_per_s=40)) as server:
+        os.environ["OLLAMA_HOST"] = server.url
+        ...
+        print(server.stats())
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from broker.utils.llm_utils import _render_messages, mock_content
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+ANSWER_MODES = ("first", "random")
+
+OLLAMA_PATHS = ("/api/generate", "/api/chat")
+OPENAI_PATHS = ("/v1/completions", "/v1/chat/completions")
+
+_MALFORMED = (
+    lambda content: content[: max(1, len(content) // 2)],
+    lambda content: "I would go with the first option, it seems the most sensible.",
+    lambda content: "",
+)
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def random_content(prompt: str, rng: random.Random) -> str:
+    """A random numbered option of ``prompt`` with its label constructs filled.
+
+    The options are the last run of lines numbered ``1.``, ``2.``, ...;
+    each ``"<construct>": {"label": "VL/L/M/H/VH"`` in the response
+    template gets one of its labels. Packed prompts get one object per
+    agent, each with its own draw.
+    """
+    options: List[int] = []
+    for match in re.finditer(r"^\s*(\d+)\.\s+\w", prompt, re.MULTILINE):
+        n = int(match.group(1))
+        options = options + [n] if options and n == options[-1] + 1 else ([1] if n == 1 else options)
+    options = options or [1]
+    constructs = re.findall(r'"(\w+)":\s*\{\s*"label":\s*"([\w/]+)"', prompt)
+
+    def answer() -> Dict[str, Any]:
+        content: Dict[str, Any] = {"reasoning": "Stand-in answer."}
+        for name, labels in constructs:
+            content[name] = {"label": rng.choice(labels.split("/")), "reason": "Stand-in answer."}
+        content["decision"] = rng.choice(options)
+        return content
+
+    agent_ids = re.findall(r'^### Agent (\S+)$', prompt, re.MULTILINE)
+    if agent_ids:
+        return json.dumps([{"agent_id": aid, **answer()} for aid in agent_ids])
+    return json.dumps(answer())
+
+
+@dataclass
+class StandInConfig:
+    """Serving behaviour of `StandInLLMServer`.
+
+    ``latency_s`` is the median base latency. ``latency_spread`` is the
+    half-width of ``uniform`` as a fraction of it and the log-space sigma
+    of ``lognormal``; ``fixed`` and ``exponential`` (mean ``latency_s``)
+    ignore it. A rate of 0 tokens per second adds no time.
+    ``response_tokens`` (0 = estimated from the answer) is the length
+    the stand-in pretends to generate. ``answers`` is ``first`` (the mock
+    model's choice) or ``random`` (`random_content`, drawn from ``seed``). ``prefix_cache_slots`` (0 = no
+    prompt cache) is how many recent prompts the cache holds.
+    """
+    latency: str = "lognormal"
+    latency_s: float = 0.05
+    latency_spread: float = 0.5
+    prefill_tokens_per_s: float = 0.0
+    tokens_per_s: float = 0.0
+    response_tokens: int = 0
+    malformed_rate: float = 0.0
+    timeout_rate: float = 0.0
+    stall_s: float = 30.0
+    capacity: int = 0
+    prefix_cache_slots: int = 0
+    answers: str = "first"
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency must be one of {LATENCY_DISTRIBUTIONS}, got {self.latency!r}")
+        if self.answers not in ANSWER_MODES:
+            raise ValueError(f"answers must be one of {ANSWER_MODES}, got {self.answers!r}")
+        for name in ("malformed_rate", "timeout_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be in [0, 1], got {getattr(self, name)}")
+        if min(self.latency_s, self.latency_spread, self.prefill_tokens_per_s,
+               self.tokens_per_s, self.response_tokens, self.stall_s, self.capacity,
+               self.prefix_cache_slots) < 0:
+            raise ValueError("Stand-in latencies, rates and capacity must be non-negative")
+
+
+class StandInLLMServer:
+    """Stand-in model server on ``host``:``port`` (0 = any free port).
+
+    `start` serves from a background thread and returns `url`; the
+    server is also a context manager. `stats` counts requests per
+    endpoint, injected failures, tokens and peak concurrency.
+    """
+
+    def __init__(self, config: Optional[StandInConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StandInConfig()
+        self.host = host
+        self.port = port
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(self.config.capacity) if self.config.capacity else None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._cached_prompts: List[str] = []  # least recently used first
+        self._stats: Dict[str, Any] = {}
+        self.reset_stats()
+
+    # ---------- lifecycle ----------
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Stand-in server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        if self._server is None:
+            server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="stand-in-llm", daemon=True).start()
+            self._server = server
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StandInLLMServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---------- statistics ----------
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {
+                "requests": 0, "by_endpoint": {}, "malformed": 0, "timed_out": 0,
+                "prompt_tokens": 0, "cached_prompt_tokens": 0, "response_tokens": 0,
+                "in_flight": 0, "max_in_flight": 0,
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {k: v for k, v in self._stats.items() if k != "in_flight"}
+            stats["by_endpoint"] = dict(stats["by_endpoint"])
+        stats["config"] = asdict(self.config)
+        return stats
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += n
+
+    # ---------- serving ----------
+
+    def _draw(self) -> Tuple[float, bool, Optional[int]]:
+        """Base latency, whether to stall, and which malformed shape (if any)."""
+        cfg = self.config
+        with self._lock:
+            if cfg.latency == "fixed":
+                base = cfg.latency_s
+            elif cfg.latency == "uniform":
+                base = self._rng.uniform(1 - cfg.latency_spread, 1 + cfg.latency_spread) * cfg.latency_s
+            elif cfg.latency == "exponential":
+                base = self._rng.expovariate(1 / cfg.latency_s) if cfg.latency_s else 0.0
+            else:
+                base = cfg.latency_s * math.exp(self._rng.gauss(0.0, cfg.latency_spread))
+            stall = self._rng.random() < cfg.timeout_rate
+            malformed = self._rng.randrange(len(_MALFORMED)) if self._rng.random() < cfg.malformed_rate else None
+        return max(0.0, base), stall, malformed
+
+    def _cached_tokens(self, prompt: str) -> int:
+        """Tokens of ``prompt`` already in the prompt cache; caches ``prompt``."""
+        with self._lock:
+            cache = self._cached_prompts
+            best, shared = -1, 0
+            for i, cached in enumerate(cache):
+                n = len(os.path.commonprefix([cached, prompt]))
+                if n > shared:
+                    best, shared = i, n
+            # The request reuses (and overwrites) the slot it matched, else the LRU one
+            if best >= 0:
+                cache.pop(best)
+            elif len(cache) >= self.config.prefix_cache_slots:
+                cache.pop(0)
+            cache.append(prompt)
+        return shared // 4
+
+    def answer(self, prompt: str) -> Optional[Tuple[str, int, int, int, float, float]]:
+        """Serve one prompt: (content, prompt tokens, cached prompt tokens,
+        response tokens, prefill seconds, seconds), or None when the
+        request is to stall and be dropped."""
+        cfg = self.config
+        started = time.perf_counter()
+        if self._slots is not None:
+            self._slots.acquire()
+        try:
+            with self._lock:
+                self._stats["in_flight"] += 1
+                self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._stats["in_flight"])
+            base, stall, malformed = self._draw()
+            if stall:
+                self._count("timed_out")
+                time.sleep(cfg.stall_s)
+                return None
+            if cfg.answers == "random":
+                with self._lock:
+                    content = random_content(prompt, self._rng)
+            else:
+                content = mock_content(prompt)
+            if malformed is not None:
+                self._count("malformed")
+                content = _MALFORMED[malformed](content)
+            prompt_tokens = _tokens(prompt)
+            cached_tokens = min(self._cached_tokens(prompt), prompt_tokens) if cfg.prefix_cache_slots else 0
+            response_tokens = cfg.response_tokens or _tokens(content)
+            prefill = (prompt_tokens - cached_tokens) / cfg.prefill_tokens_per_s if cfg.prefill_tokens_per_s else 0.0
+            delay = base + prefill
+            if cfg.tokens_per_s:
+                delay += response_tokens / cfg.tokens_per_s
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self._stats["in_flight"] -= 1
+            if self._slots is not None:
+                self._slots.release()
+        self._count("prompt_tokens", prompt_tokens)
+        self._count("cached_prompt_tokens", cached_tokens)
+        self._count("response_tokens", response_tokens)
+        return content, prompt_tokens, cached_tokens, response_tokens, prefill, time.perf_counter() - started
+
+    def _handler_class(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path.rstrip("/") in ("/api/tags", "/v1/models"):
+                    models = [{"name": "stand-in", "model": "stand-in", "id": "stand-in"}]
+                    self._send({"models": models, "data": models, "object": "list"})
+                else:
+                    self._send({"error": f"unknown path {self.path}"}, status=404)
+
+            def do_POST(self):
+                path = self.path.split("?", 1)[0].rstrip("/")
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+                if path == "/api/show":
+                    self._send({"digest": "stand-in", "details": {"family": "stand-in"}})
+                    return
+                if path not in OLLAMA_PATHS + OPENAI_PATHS:
+                    self._send({"error": f"unknown path {self.path}"}, status=404)
+                    return
+                try:
+                    request = json.loads(body or b"{}")
+                except json.JSONDecodeError as e:
+                    self._send({"error": f"invalid JSON: {e}"}, status=400)
+                    return
+                with stand_in._lock:
+                    stand_in._stats["requests"] += 1
+                    by_endpoint = stand_in._stats["by_endpoint"]
+                    by_endpoint[path] = by_endpoint.get(path, 0) + 1
+
+                messages: Optional[List[Dict[str, str]]] = request.get("messages")
+                prompt = _render_messages(messages) if messages else str(request.get("prompt", ""))
+                served = stand_in.answer(prompt)
+                if served is None:
+                    self.close_connection = True
+                    return
+                self._send(_response(path, request.get("model", "stand-in"), stand_in.config, *served))
+
+            def _send(self, payload: Dict[str, Any], status: int = 200) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def _response(path: str, model: str, config: StandInConfig, content: str, prompt_tokens: int,
+              cached_tokens: int, response_tokens: int, prefill_s: float, seconds: float) -> Dict[str, Any]:
+    """``content`` in the response shape of the endpoint at ``path``."""
+    if path in OLLAMA_PATHS:
+        payload: Dict[str, Any] = {
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int(seconds * 1e9),
+            "prompt_eval_count": prompt_tokens - cached_tokens,
+            "prompt_eval_duration": int(prefill_s * 1e9),
+            "eval_count": response_tokens,
+        }
+        if path == "/api/chat":
+            payload["message"] = {"role": "assistant", "content": content}
+        else:
+            payload["response"] = content
+        return payload
+
+    usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": response_tokens,
+        "total_tokens": prompt_tokens + response_tokens,
+    }
+    if config.prefix_cache_slots:
+        usage["prompt_tokens_details"] = {"cached_tokens": cached_tokens}
+    if path == "/v1/chat/completions":
+        choice = {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        kind = "chat.completion"
+    else:
+        choice = {"index": 0, "text": content, "finish_reason": "stop"}
+        kind = "text_completion"
+    return {
+        "id": f"stand-in-{time.monotonic_ns()}",
+        "object": kind,
+        "created": int(time.time()),
+        "model": model,
+        "choices": [choice],
+        "usage": usage,
+    }
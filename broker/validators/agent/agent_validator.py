@@ -108,6 +108,64 @@ class AgentValidator:
             
         return self._validate_internal(*args, **kwargs)
 
+    def preflight(self, proposal, context: Dict[str, Any], registry=None) -> List[ValidationResult]:
+        """Checks of ``validate`` that need only pre-decision state.
+
+        Used by ``SkillBrokerEngine`` pre-flight pruning: ``proposal``
+        carries a candidate skill and no reasoning. Runs affordability
+        (when enabled), the thinking rules whose constructs are all
+        already in the agent's state, and the ``@state_only`` builtin
+        checks of the domain set in ``global_config.governance.domain``
+        (``validate_all(..., state_only=True)``); identity rules are
+        applied by the broker's option filter. Nothing is logged to the
+        auditor.
+        """
+        agent_type = context.get('agent_type', 'household')
+        base_type = self.config.get_base_type(agent_type)
+        agent_id = getattr(proposal, 'agent_id', context.get('agent_id', 'unknown'))
+        alias_map = self.config.get_action_alias_map(agent_type)
+        decision = proposal.skill_name
+        if alias_map:
+            decision = alias_map.get(decision.lower(), decision)
+        state = context.get('state', {})
+        if not state:
+            agent_state = context.get('agent_state', {})
+            if isinstance(agent_state, dict):
+                state = agent_state.get('state', agent_state.get('personal', agent_state))
+
+        results = []
+        if self.enable_financial_constraints:
+            is_affordable, affordability_reason = self.validate_affordability(agent_id, decision, context)
+            if not is_affordable:
+                results.append(ValidationResult(
+                    valid=False,
+                    validator_name="AgentValidator:affordability",
+                    errors=[affordability_reason],
+                    metadata={"rules_hit": ["affordability"], "deterministic": True},
+                ))
+
+        def keys(rule):
+            if rule.conditions and isinstance(rule.conditions, list):
+                return [c.get("construct") or c.get("field") if isinstance(c, dict) else None
+                        for c in rule.conditions]
+            return [rule.construct]
+
+        # With no reasoning a missing construct would read as "" / 0.0
+        rules = [
+            r for r in self.config.get_thinking_rules(base_type)
+            if all(k and k in state for k in keys(r))
+        ]
+        results.extend(self._run_rule_set(agent_id, decision, state, {}, rules, "thinking", log=False))
+
+        domain = self.config._config.get("global_config", {}).get("governance", {}).get("domain")
+        if domain:
+            from broker.validators.governance import validate_all
+            results.extend(validate_all(
+                decision, [], {**context, "state": state},
+                agent_type=agent_type, domain=domain, state_only=True,
+            ))
+        return results
+
     def _validate_internal(
         self,
         agent_type: str,
@@ -385,7 +443,8 @@ class AgentValidator:
         state: Dict[str, Any],
         reasoning: Dict[str, str],
         rules: List[Any],
-        tier_name: str
+        tier_name: str,
+        log: bool = True,
     ) -> List[ValidationResult]:
         """Generic engine for label-based rules."""
         results = []
@@ -490,9 +549,9 @@ class AgentValidator:
                 
                 if normalized_decision in blocked_normalized:
                     lv = ValidationLevel.ERROR if rule.level == "ERROR" else ValidationLevel.WARNING
-                    if lv == ValidationLevel.ERROR:
+                    if log and lv == ValidationLevel.ERROR:
                         self.auditor.log_intervention(rule.id, success=False, is_final=False)
-                    else:
+                    elif log:
                         self.auditor.log_warning(rule.id)
 
                     rule_msg = f"[Rule: {rule.id}] {rule.message or f'{tier_name.capitalize()} Block: {decision} restricted by {tier_name} rules'}"
@@ -16,7 +16,9 @@ import os
 from typing import List, Dict, Any, Optional, TYPE_CHECKING
 
 from broker.interfaces.skill_types import ValidationResult
-from broker.validators.governance.base_validator import BaseValidator, BuiltinCheck
+from broker.validators.governance.base_validator import (
+    BaseValidator, BuiltinCheck, is_state_only, scoped_to, state_only,
+)
 from broker.validators.governance.personal_validator import PersonalValidator
 from broker.validators.governance.social_validator import SocialValidator
 from broker.validators.governance.thinking_validator import ThinkingValidator
@@ -39,6 +41,9 @@ if TYPE_CHECKING:
 __all__ = [
     "BaseValidator",
     "BuiltinCheck",
+    "scoped_to",
+    "state_only",
+    "is_state_only",
     "PersonalValidator",
     "SocialValidator",
     "ThinkingValidator",
@@ -57,6 +62,7 @@ def validate_all(
     agent_type: Optional[str] = None,
     registry: Optional["AgentTypeRegistry"] = None,
     domain: Optional[str] = None,
+    state_only: bool = False,
 ) -> List[ValidationResult]:
     """
     Run all validators against a skill proposal.
@@ -68,6 +74,9 @@ def validate_all(
         agent_type: Optional agent type ID for per-type validation.
         registry: Optional AgentTypeRegistry instance for type validation.
         domain: Domain identifier controlling built-in checks.
+        state_only: Only run rules and built-in checks that depend on
+            pre-decision state alone (pre-flight skill pruning); per-type
+            validation is skipped.
 
     Returns:
         Combined list of ValidationResult from all validators
@@ -104,10 +113,10 @@ def validate_all(
 
     all_results = []
     for validator in validators:
-        results = validator.validate(skill_name, rules, context)
+        results = validator.validate(skill_name, rules, context, state_only=state_only)
         all_results.extend(results)
 
-    if agent_type:
+    if agent_type and not state_only:
         type_validator = TypeValidator(registry)
         type_results = type_validator.validate(skill_name, agent_type, context)
         all_results.extend(type_results)
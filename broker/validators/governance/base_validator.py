@@ -41,6 +41,21 @@ def scoped_to(*agent_types: str):
     return _wrap
 
 
+def state_only(fn):
+    """Mark a builtin check or custom validator as depending only on
+    pre-decision state (agent state, environment, history) — never on
+    the proposal's reasoning or magnitude. The broker can then evaluate
+    it for every candidate skill before prompting and leave blocked
+    skills out of the options (see ``SkillBrokerEngine.preflight_pruning``).
+    The check still runs after the decision as usual."""
+    fn._wagf_state_only = True
+    return fn
+
+
+def is_state_only(fn) -> bool:
+    return getattr(fn, "_wagf_state_only", False) is True
+
+
 class BaseValidator(ABC):
     """
     Abstract base class for governance validators.
@@ -148,7 +163,8 @@ class BaseValidator(ABC):
         self,
         skill_name: str,
         rules: List[GovernanceRule],
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        state_only: bool = False,
     ) -> List[ValidationResult]:
         """
         Validate a skill proposal against rules.
@@ -161,6 +177,9 @@ class BaseValidator(ABC):
             skill_name: Proposed skill name
             rules: List of governance rules to check
             context: Dictionary with reasoning, state, social_context
+            state_only: Only evaluate rules and checks that depend on
+                pre-decision state alone (``GovernanceRule.is_state_only``,
+                checks marked ``@state_only``).
 
         Returns:
             List of ValidationResult objects
@@ -168,7 +187,10 @@ class BaseValidator(ABC):
         results = []
 
         # --- 1. YAML-driven rules (domain-agnostic) ---
-        category_rules = [r for r in rules if r.category == self.category]
+        category_rules = [
+            r for r in rules
+            if r.category == self.category and (not state_only or r.is_state_only)
+        ]
 
         for rule in category_rules:
             if rule.evaluate(skill_name, context):
@@ -214,6 +236,8 @@ class BaseValidator(ABC):
             declared = getattr(check, "_wagf_agent_types", None)
             if declared and scope_types and not scope_types.intersection(declared):
                 continue
+            if state_only and not is_state_only(check):
+                continue
             for r in check(skill_name, rules, context):
                 if self.mode == "shadow" and not r.valid and r.errors:
                     results.append(self._to_shadow(r))
@@ -15,7 +15,7 @@ Default is empty (domain-agnostic).  Flood-domain checks live in
 from typing import List, Dict, Any, Optional
 from broker.interfaces.skill_types import ValidationResult
 from broker.governance.rule_types import GovernanceRule
-from broker.validators.governance.base_validator import BaseValidator, BuiltinCheck
+from broker.validators.governance.base_validator import BaseValidator, BuiltinCheck, is_state_only
 
 
 class SocialValidator(BaseValidator):
@@ -54,7 +54,8 @@ class SocialValidator(BaseValidator):
         self,
         skill_name: str,
         rules: List[GovernanceRule],
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        state_only: bool = False,
     ) -> List[ValidationResult]:
         """
         Validate social rules (WARNING only).
@@ -73,8 +74,8 @@ class SocialValidator(BaseValidator):
         results = []
         social_context = context.get("social_context", {})
 
-        # --- YAML-driven social rules (always WARNING) ---
-        social_rules = [r for r in rules if r.category == "social"]
+        # --- YAML-driven social rules (always WARNING, so never pruned) ---
+        social_rules = [r for r in rules if r.category == "social"] if not state_only else []
 
         for rule in social_rules:
             if rule.evaluate(skill_name, context):
@@ -96,6 +97,8 @@ class SocialValidator(BaseValidator):
 
         # --- Domain-specific built-in checks ---
         for check in self._builtin_checks:
+            if state_only and not is_state_only(check):
+                continue
             results.extend(check(skill_name, rules, context))
 
         return results
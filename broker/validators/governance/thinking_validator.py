@@ -281,7 +281,8 @@ class ThinkingValidator(BaseValidator):
         self,
         skill_name: str,
         rules: List[GovernanceRule],
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        state_only: bool = False,
     ) -> List[ValidationResult]:
         """
         Validate thinking rules with framework-specific consistency checks.
@@ -315,7 +316,10 @@ class ThinkingValidator(BaseValidator):
             context = {**context, "_extreme_actions": self._extreme_actions}
 
         # Step 1 + 3: Base class handles YAML rules + builtin_checks
-        results = super().validate(skill_name, rules, context)
+        results = super().validate(skill_name, rules, context, state_only=state_only)
+        if state_only:
+            # Multi-condition rules compare reasoning constructs
+            return results
 
         # Step 2: YAML multi-condition rules (always runs, domain-agnostic)
         framework = context.get("framework", self.framework)
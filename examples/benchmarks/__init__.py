@@ -0,0 +1 @@
+"""Benchmarks of broker execution modes on the example domains."""
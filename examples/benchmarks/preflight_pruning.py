@@ -0,0 +1,153 @@
+"""Governance retries with and without pre-flight pruning.
+
+Runs the irrigation (``examples/irrigation_abm/run_experiment.py``) and
+single-agent flood (``examples/single_agent/run_flood.py``) examples
+twice each, without and with ``--preflight-pruning``
+(``ExperimentBuilder.with_preflight_pruning``), and reports per domain:
+the share of decisions that needed a governance retry, the share of
+those retried on reasoning (thinking) rules alone, retries per
+decision, the share finally rejected, the share whose options were
+pruned and the LLM requests made.
+
+Pruning can only prevent retries caused by state: reasoning rules
+judge the appraisal labels of the answer itself. Both example context
+builders already hide some state-blocked options (an irrigation agent
+at its water-right cap is offered no increase), so pruning removes
+only what they leave in.
+
+By default the runs use the stand-in LLM server
+(``broker.utils.stand_in_llm``) with ``answers="random"``: each answer
+is a seeded random option with random appraisal labels, like a model
+that ignores the governance rules, so blocked options are picked as
+often as any other. ``--llm-url`` points the runs at a real Ollama server
+instead (with ``--model`` one of its models).
+
+Usage::
+
+    python -m examples.benchmarks.preflight_pruning --agents 20 --years 3
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from broker.utils.stand_in_llm import StandInConfig, StandInLLMServer
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[1]
+DOMAINS = {
+    "irrigation": EXAMPLES_DIR / "irrigation_abm" / "run_experiment.py",
+    "flood": EXAMPLES_DIR / "single_agent" / "run_flood.py",
+}
+
+
+def read_traces(output_dir: Path) -> List[Dict[str, Any]]:
+    traces = []
+    for path in sorted((output_dir / "raw").glob("*_traces.jsonl")):
+        for line in path.read_text(encoding="utf-8").splitlines():
+            trace = json.loads(line)
+            if "_metadata" not in trace:
+                traces.append(trace)
+    return traces
+
+
+def retry_summary(traces: List[Dict[str, Any]]) -> Dict[str, Any]:
+    n = len(traces)
+    if not n:
+        return {"decisions": 0}
+    retries = [t.get("retry_count") or 0 for t in traces]
+    retried = [t for t, r in zip(traces, retries) if r > 0]
+    reasoning = [
+        t for t in retried
+        if t.get("validation_issues")
+        and all("thinking" in issue.get("validator", "") for issue in t["validation_issues"])
+    ]
+    return {
+        "decisions": n,
+        "retried_share": len(retried) / n,
+        "reasoning_share": len(reasoning) / len(retried) if retried else 0.0,
+        "retries_per_decision": sum(retries) / n,
+        "rejected_share": sum(t.get("outcome") == "REJECTED" for t in traces) / n,
+        "pruned_share": sum(bool(t.get("preflight_pruned")) for t in traces) / n,
+    }
+
+
+def run_domain(script: Path, pruning: bool, args: argparse.Namespace, output_dir: Path,
+               llm_url: str) -> Dict[str, Any]:
+    cmd = [
+        sys.executable, str(script), "--model", args.model, "--years", str(args.years),
+        "--agents", str(args.agents), "--seed", str(args.seed), "--output", str(output_dir),
+    ]
+    if pruning:
+        cmd.append("--preflight-pruning")
+    env = {**os.environ, "OLLAMA_HOST": llm_url}
+    root = str(EXAMPLES_DIR.parent)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (root, env.get("PYTHONPATH")) if p)
+    with open(output_dir / "run.log", "w", encoding="utf-8") as log:
+        proc = subprocess.run(cmd, cwd=root, env=env, stdout=log, stderr=subprocess.STDOUT)
+    summary = retry_summary(read_traces(output_dir))
+    summary["error"] = f"exit code {proc.returncode}" if proc.returncode else ""
+    return summary
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'domain':<11} {'pruning':<8} {'decisions':>9} {'retried':>8} {'reasoning':>10} "
+             f"{'retries/dec':>12} {'rejected':>9} {'pruned':>7} {'requests':>9}  error"]
+    for row in rows:
+        if not row["decisions"]:
+            lines.append(f"{row['domain']:<11} {row['pruning']:<8} {0:>9}  {row['error'] or 'no traces'}")
+            continue
+        requests = "-" if row["requests"] is None else row["requests"]
+        lines.append(
+            f"{row['domain']:<11} {row['pruning']:<8} {row['decisions']:>9} {row['retried_share']:>8.1%} "
+            f"{row['reasoning_share']:>10.1%} {row['retries_per_decision']:>12.2f} "
+            f"{row['rejected_share']:>9.1%} {row['pruned_share']:>7.1%} {requests:>9}  {row['error']}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--domains", nargs="+", choices=sorted(DOMAINS), default=sorted(DOMAINS))
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--model", default="gemma3:4b",
+                        help="Model tag (any non-mock tag for the stand-in).")
+    parser.add_argument("--llm-url", default=None,
+                        help="Ollama server to use instead of the random stand-in.")
+    parser.add_argument("--output-root", type=Path, default=Path("results/benchmarks/preflight_pruning"))
+    args = parser.parse_args(argv)
+
+    rows = []
+    for domain in args.domains:
+        for pruning in (False, True):
+            output_dir = args.output_root / domain / ("pruned" if pruning else "plain")
+            output_dir.mkdir(parents=True, exist_ok=True)
+            if args.llm_url:
+                summary = run_domain(DOMAINS[domain], pruning, args, output_dir, args.llm_url)
+                summary["requests"] = None
+            else:
+                with StandInLLMServer(StandInConfig(latency="fixed", latency_s=0.0,
+                                                    answers="random", seed=args.seed)) as server:
+                    summary = run_domain(DOMAINS[domain], pruning, args, output_dir, server.url)
+                    summary["requests"] = server.stats()["requests"]
+                if not summary["requests"] and not summary["error"]:
+                    # create_llm_invoke falls back to the mock without langchain-ollama
+                    summary["error"] = "no requests reached the stand-in"
+            rows.append({"domain": domain, "pruning": "on" if pruning else "off", **summary})
+
+    report_path = args.output_root / "preflight_pruning_report.json"
+    report_path.write_text(json.dumps({"args": {k: str(v) for k, v in vars(args).items()}, "runs": rows},
+                                      indent=2), encoding="utf-8")
+    print(format_report(rows))
+    print(f"\nReport: {report_path}")
+    return 1 if any(row["error"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
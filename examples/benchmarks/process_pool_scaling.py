@@ -0,0 +1,159 @@
+"""Throughput of process-pool execution per worker-process count.
+
+Runs the fake-traffic domain (``examples/_test_fixtures/fake_traffic``)
+with ``--agents`` commuters once per ``--processes`` value, against the
+load-test stand-in LLM server (``broker.core.load_test``), and prints
+steps per second with the speedup over the first count. ``1`` is the
+in-process baseline.
+
+The traffic domain's own context and validation work is small, so each
+step also runs a pure-Python custom validator doing about ``--work-ms``
+of CPU work, standing in for the context building, memory scoring and
+governance work of the water domains; that is the GIL-bound share
+worker processes split. ``--threads`` is the thread count per process
+(``with_workers``), so with ``--threads 1`` concurrency grows with the
+process count alone.
+
+Usage::
+
+    python -m examples.benchmarks.process_pool_scaling --agents 120 --years 2 --processes 1 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from broker.agents import AgentConfig, BaseAgent
+from broker.agents.base import Skill, StateParam
+from broker.components.memory.engine import WindowMemoryEngine
+from broker.core.experiment import ExperimentBuilder
+from broker.core.load_test import run_load_test
+from broker.interfaces.skill_types import ExecutionResult
+from broker.utils.stand_in_llm import StandInConfig
+
+FIXTURE_DIR = Path(__file__).resolve().parents[1] / "_test_fixtures" / "fake_traffic"
+SKILLS = ["take_alternate_route", "delay_departure", "switch_to_transit", "carpool", "do_nothing"]
+
+
+class TrafficSimulation:
+    """Every executed skill adds 30 minutes of delay."""
+
+    def __init__(self):
+        self.year = 0
+
+    def advance_year(self) -> Dict[str, Any]:
+        self.year += 1
+        return {"current_year": self.year, "situation": f"Year {self.year}: heavy congestion."}
+
+    def execute_skill(self, approved_skill) -> ExecutionResult:
+        return ExecutionResult(success=True, state_changes={"delay_minutes": 30.0})
+
+
+def commuters(n: int) -> Dict[str, BaseAgent]:
+    skills = [Skill(name, name, "delay_minutes", "decrease") for name in SKILLS]
+    state = [StateParam("delay_minutes", (0, 120), 0.0, "Total commute delay")]
+    return {
+        f"commuter_{i}": BaseAgent(AgentConfig(
+            name=f"commuter_{i}", agent_type="commuter", state_params=state,
+            objectives=[], constraints=[], skills=skills,
+        ))
+        for i in range(1, n + 1)
+    }
+
+
+def _spin(iterations: int) -> int:
+    total = 0
+    for i in range(iterations):
+        total += i * i % 7
+    return total
+
+
+def spinning_validator(work_ms: float):
+    """Custom validator doing a fixed ~``work_ms`` of pure-Python CPU work.
+
+    The loop count is calibrated once, here, so every step does the same
+    amount of work however the processes share the CPUs.
+    """
+    start = time.perf_counter()
+    _spin(100_000)
+    iterations = int(100_000 * work_ms / 1000.0 / (time.perf_counter() - start))
+
+    def validate(proposal, context, skill_registry=None):
+        _spin(iterations)
+        return []
+    return validate
+
+
+def make_cell(agents: int, years: int, threads: int, work_ms: float, model: str):
+    validator = spinning_validator(work_ms)
+
+    def cell(processes: int, output_dir: Path, llm_url: str) -> Dict[str, Any]:
+        os.environ["OLLAMA_HOST"] = llm_url
+        runner = (
+            ExperimentBuilder()
+            .with_model(model)
+            .with_years(years)
+            .with_agents(commuters(agents))
+            .with_simulation(TrafficSimulation())
+            .with_skill_registry(str(FIXTURE_DIR / "traffic_skill_registry.yaml"))
+            .with_memory_engine(WindowMemoryEngine(window_size=3))
+            .with_governance("strict", str(FIXTURE_DIR / "traffic_agent_types.yaml"))
+            .with_custom_validators([validator])
+            .with_exact_output(str(output_dir))
+            .with_seed(42)
+            .with_workers(threads)
+            .with_processes(processes)
+        ).build()
+        runner.run()
+        return {"processes": processes}
+    return cell
+
+
+def format_scaling(report: Dict[str, Any]) -> str:
+    runs = report["runs"]
+    base = runs[0]["steps_per_s"] if runs and runs[0]["steps_per_s"] else 0.0
+    lines = [f"{'processes':>9} {'wall_s':>8} {'steps':>6} {'steps/s':>8} {'speedup':>8} {'requests':>9}  error"]
+    for run in runs:
+        speedup = run["steps_per_s"] / base if base else 0.0
+        lines.append(
+            f"{run['workers']:>9} {run['wall_s']:>8.2f} {run['steps']:>6} "
+            f"{run['steps_per_s']:>8.2f} {speedup:>7.2f}x {run['server']['requests']:>9}  {run['error']}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--agents", type=int, default=120)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--processes", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=1, help="Threads per process (default: 1).")
+    parser.add_argument("--work-ms", type=float, default=20.0,
+                        help="Pure-Python CPU work per step (default: 20).")
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="Stand-in LLM latency per request (default: 5).")
+    parser.add_argument("--model", default="gemma3:4b",
+                        help="Model name sent to the stand-in (any non-mock tag).")
+    parser.add_argument("--output-root", type=Path, default=Path("results/benchmarks/process_pool"))
+    args = parser.parse_args(argv)
+
+    report = run_load_test(
+        make_cell(args.agents, args.years, args.threads, args.work_ms, args.model),
+        args.processes, args.output_root,
+        StandInConfig(latency="fixed", latency_s=args.latency_ms / 1000.0),
+    )
+    for run in report["runs"]:
+        if not run["server"]["requests"] and not run["error"]:
+            # create_llm_invoke falls back to the mock without langchain-ollama
+            run["error"] = "no requests reached the stand-in"
+    print(format_scaling(report))
+    print(f"\nCPUs: {os.cpu_count()}; report: {args.output_root / 'load_test_report.json'}")
+    return 1 if any(run["error"] for run in report["runs"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
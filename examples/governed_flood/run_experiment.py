@@ -450,7 +450,13 @@ def main():
         .with_exact_output(str(output_dir))
         .with_workers(args.workers)
         .with_seed(seed)
+        .with_checkpointing(enabled=args.checkpoint, resume=args.resume)
     )
+    if args.readiness_profile:
+        builder.with_readiness_monitor(
+            profile=args.readiness_profile,
+            early_stop=args.readiness_early_stop,
+        )
     runner = builder.build()
 
     # --- Reflection engine (Pillar 2) ---
@@ -470,6 +476,8 @@ def main():
         "post_step": hooks.post_step,
         "post_year": hooks.post_year,
     }
+    runner.register_checkpoint_object("lifecycle_hooks", hooks)
+    runner.register_checkpoint_object("reflection_engine", reflection_engine)
 
     # --- Run ---
     print(f"--- Governed Flood Experiment | {args.model} | {args.agents} agents | {args.years} years | seed={seed} ---")
@@ -508,6 +516,15 @@ def parse_args():
     p.add_argument("--output", type=str, default=None)
     p.add_argument("--num-ctx", type=int, default=None)
     p.add_argument("--num-predict", type=int, default=None)
+    p.add_argument("--checkpoint", action="store_true",
+                   help="Snapshot run state at every year boundary (output/checkpoints/)")
+    p.add_argument("--resume", action="store_true",
+                   help="Continue a killed run from its last checkpoint (same --output and --seed)")
+    p.add_argument("--readiness-profile", type=str, default=None,
+                   choices=["functional", "behavioral", "stress"],
+                   help="Track readiness metrics live (output/readiness_live.json)")
+    p.add_argument("--readiness-early-stop", action="store_true",
+                   help="Stop at the next year boundary when the readiness profile is clearly breached")
     return p.parse_args()
 
 
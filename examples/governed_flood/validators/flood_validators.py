@@ -19,12 +19,14 @@ from typing import Any, Dict, List
 
 from broker.interfaces.skill_types import ValidationResult
 from broker.governance.rule_types import GovernanceRule
+from broker.validators.governance.base_validator import state_only
 
 
 # =============================================================================
 # Physical checks — state preconditions and immutability
 # =============================================================================
 
+@state_only
 def flood_already_elevated(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -51,6 +53,7 @@ def flood_already_elevated(
     )]
 
 
+@state_only
 def flood_already_relocated(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -80,6 +83,7 @@ def flood_already_relocated(
     )]
 
 
+@state_only
 def flood_renter_restriction(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -112,6 +116,7 @@ def flood_renter_restriction(
 # Personal checks — financial affordability
 # =============================================================================
 
+@state_only
 def flood_elevation_affordability(
     skill_name: str,
     rules: List[GovernanceRule],
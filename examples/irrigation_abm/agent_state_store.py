@@ -0,0 +1,248 @@
+"""
+Array-backed agent state for the irrigation environment.
+
+Struct-of-arrays storage for the per-agent quantities that
+``IrrigationEnvironment.advance_year`` aggregates over every year
+(water right, request, diversion, curtailment, allocation flags, basin
+and cluster).  The environment keeps exposing one mapping per agent
+through :class:`AgentRecord` views, so validators, context builders and
+tests that read or write ``env._agents[aid]`` behave exactly as with
+plain dicts; only the whole-population paths switch to array ops.
+
+Per-skill magnitude parameters (``skill_magnitude``, legacy
+``magnitude_*``, ``persona_scale``, ``exploration_rate``) are packed
+into :class:`MagnitudeTables` on first use and rebuilt whenever a
+non-array key is written through a record view.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+FLOAT_COLUMNS = ("water_right", "diversion", "request", "curtailment_ratio")
+BOOL_COLUMNS = ("at_allocation_cap", "below_minimum_utilisation")
+LABEL_COLUMNS = ("basin", "cluster")
+ARRAY_COLUMNS = FLOAT_COLUMNS + BOOL_COLUMNS + LABEL_COLUMNS
+
+# Per-agent random draws are generated in blocks of this many calls
+# per agent per year (one call = one executed magnitude skill).
+DRAWS_PER_BLOCK = 4
+
+
+@dataclass
+class SkillMagnitudeTable:
+    """Per-agent Gaussian parameters for one skill (v17 path)."""
+    has_config: np.ndarray
+    mu: np.ndarray
+    sigma: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+
+
+@dataclass
+class MagnitudeTables:
+    """Packed magnitude-sampling parameters for every agent.
+
+    Defaults mirror ``IrrigationEnvironment.execute_skill``: falsy
+    values fall back the same way the scalar path's ``or`` chains do.
+    """
+    persona_scale: np.ndarray
+    exploration_rate: np.ndarray
+    legacy_default: np.ndarray
+    legacy_sigma: np.ndarray
+    legacy_min: np.ndarray
+    legacy_max: np.ndarray
+    skills: Dict[str, SkillMagnitudeTable] = field(default_factory=dict)
+
+    @classmethod
+    def from_extras(cls, extras: List[Dict[str, Any]]) -> "MagnitudeTables":
+        def column(key: str, default: float) -> np.ndarray:
+            return np.array(
+                [float(e.get(key, default) or default) for e in extras],
+                dtype=float,
+            )
+
+        tables = cls(
+            persona_scale=column("persona_scale", 1.0),
+            exploration_rate=column("exploration_rate", 0.0),
+            legacy_default=column("magnitude_default", 10.0),
+            legacy_sigma=column("magnitude_sigma", 0.0),
+            legacy_min=column("magnitude_min", 1.0),
+            legacy_max=column("magnitude_max", 30.0),
+        )
+
+        skill_cfgs = [e.get("skill_magnitude", {}) or {} for e in extras]
+        skill_names = sorted({name for cfg in skill_cfgs for name in cfg})
+        for name in skill_names:
+            cfgs = [cfg.get(name, {}) or {} for cfg in skill_cfgs]
+            tables.skills[name] = SkillMagnitudeTable(
+                has_config=np.array([bool(c) for c in cfgs], dtype=bool),
+                mu=np.array([float(c.get("mu", 10.0)) for c in cfgs]),
+                sigma=np.array([float(c.get("sigma", 3.0)) for c in cfgs]),
+                min=np.array([float(c.get("min", 1.0)) for c in cfgs]),
+                max=np.array([float(c.get("max", 20.0)) for c in cfgs]),
+            )
+        return tables
+
+
+class AgentStateStore:
+    """Struct-of-arrays store for all irrigation agents.
+
+    Args:
+        records: ``{agent_id: state_dict}`` in population order.  Keys in
+            :data:`ARRAY_COLUMNS` become arrays; everything else is kept
+            per agent in ``extras``.
+    """
+
+    def __init__(self, records: Dict[str, Dict[str, Any]]):
+        self.agent_ids: List[str] = list(records)
+        self.index: Dict[str, int] = {
+            aid: i for i, aid in enumerate(self.agent_ids)
+        }
+        rows = list(records.values())
+
+        for key in FLOAT_COLUMNS:
+            setattr(self, key, np.array(
+                [float(r.get(key, 0.0)) for r in rows], dtype=float,
+            ))
+        for key in BOOL_COLUMNS:
+            setattr(self, key, np.array(
+                [bool(r.get(key, False)) for r in rows], dtype=bool,
+            ))
+        self.basin = np.array(
+            [r.get("basin", "lower_basin") for r in rows], dtype=object,
+        )
+        self.cluster = np.array(
+            [r.get("cluster", "unknown") for r in rows], dtype=object,
+        )
+        self.is_upper = self.basin == "upper_basin"
+        self.is_lower = self.basin == "lower_basin"
+
+        self.extras: List[Dict[str, Any]] = [
+            {k: v for k, v in r.items() if k not in ARRAY_COLUMNS}
+            for r in rows
+        ]
+        self._magnitude_tables: Optional[MagnitudeTables] = None
+
+        # Per-agent random streams: one block of draws per
+        # (seed, year, block) so each agent's sequence is independent of
+        # execution order and batching.
+        self.draw_year: Optional[int] = None
+        self.draw_cursor = np.zeros(len(rows), dtype=np.int64)
+        self.draw_blocks: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def __len__(self) -> int:
+        return len(self.agent_ids)
+
+    def record(self, agent_id: str) -> "AgentRecord":
+        """Dict-like view of one agent's state."""
+        return AgentRecord(self, self.index[agent_id])
+
+    @property
+    def magnitude_tables(self) -> MagnitudeTables:
+        if self._magnitude_tables is None:
+            self._magnitude_tables = MagnitudeTables.from_extras(self.extras)
+        return self._magnitude_tables
+
+    def invalidate_magnitude_tables(self) -> None:
+        """Drop packed magnitude parameters after an ``extras`` change."""
+        self._magnitude_tables = None
+
+    def next_draws(
+        self,
+        idx: np.ndarray,
+        seed: int,
+        year_index: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Next (uniform, standard normal) pair from each agent's stream.
+
+        Args:
+            idx: Unique agent indices.
+            seed: Environment seed.
+            year_index: Current simulation year index.
+        """
+        if self.draw_year != year_index:
+            self.draw_year = year_index
+            self.draw_cursor[:] = 0
+            self.draw_blocks = []
+
+        cursor = self.draw_cursor[idx]
+        block = cursor // DRAWS_PER_BLOCK
+        col = cursor % DRAWS_PER_BLOCK
+        n_blocks = int(block.max()) + 1 if len(idx) else 0
+        while len(self.draw_blocks) < n_blocks:
+            rng = np.random.default_rng(
+                [seed, year_index, len(self.draw_blocks)]
+            )
+            shape = (len(self.agent_ids), DRAWS_PER_BLOCK)
+            self.draw_blocks.append(
+                (rng.random(shape), rng.standard_normal(shape))
+            )
+
+        uniform = np.empty(len(idx))
+        normal = np.empty(len(idx))
+        for b in np.unique(block):
+            sel = block == b
+            u_block, z_block = self.draw_blocks[b]
+            uniform[sel] = u_block[idx[sel], col[sel]]
+            normal[sel] = z_block[idx[sel], col[sel]]
+        self.draw_cursor[idx] += 1
+        return uniform, normal
+
+
+class AgentRecord(MutableMapping):
+    """Mutable mapping view over one row of an :class:`AgentStateStore`.
+
+    Reads and writes of array columns go straight to the store, so code
+    written against the per-agent dicts keeps working unchanged.
+    """
+
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store: AgentStateStore, i: int):
+        self._store = store
+        self._i = i
+
+    def __getitem__(self, key: str) -> Any:
+        store, i = self._store, self._i
+        if key in FLOAT_COLUMNS:
+            return float(getattr(store, key)[i])
+        if key in BOOL_COLUMNS:
+            return bool(getattr(store, key)[i])
+        if key in LABEL_COLUMNS:
+            return getattr(store, key)[i]
+        return store.extras[i][key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        store, i = self._store, self._i
+        if key in ARRAY_COLUMNS:
+            getattr(store, key)[i] = value
+            if key == "basin":
+                store.is_upper[i] = value == "upper_basin"
+                store.is_lower[i] = value == "lower_basin"
+        else:
+            store.extras[i][key] = value
+            store.invalidate_magnitude_tables()
+
+    def __delitem__(self, key: str) -> None:
+        if key in ARRAY_COLUMNS:
+            raise KeyError(f"Array-backed column cannot be removed: {key}")
+        del self._store.extras[self._i][key]
+        self._store.invalidate_magnitude_tables()
+
+    def __iter__(self) -> Iterator[str]:
+        yield from ARRAY_COLUMNS
+        yield from self._store.extras[self._i]
+
+    def __len__(self) -> int:
+        return len(ARRAY_COLUMNS) + len(self._store.extras[self._i])
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"AgentRecord({dict(self)!r})"
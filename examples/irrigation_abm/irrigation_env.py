@@ -30,10 +30,23 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from examples.irrigation_abm.agent_state_store import AgentStateStore
+
 # Minimum utilisation floor: agents cannot reduce demand below this fraction
 # of their water right.  Prevents "economic hallucination" spiral to zero.
 MIN_UTIL = 0.10
 
+# Skill name → request update family used by execute_skills
+_SKILL_KIND: Dict[str, str] = {
+    "increase_large": "increase",
+    "increase_small": "increase",
+    "increase_demand": "increase",
+    "decrease_large": "decrease",
+    "decrease_small": "decrease",
+    "decrease_demand": "decrease",
+    "maintain_demand": "maintain",
+}
+
 
 @dataclass
 class WaterSystemConfig:
@@ -114,6 +127,19 @@ class IrrigationEnvironment:
         env.advance_year()
         context = env.get_agent_context("MohaveValleyIDD")
         # → dict with water signals for LLM prompt injection
+
+    With ``array_state=True`` per-agent state lives in an
+    :class:`~examples.irrigation_abm.agent_state_store.AgentStateStore`
+    (struct-of-arrays).  Curtailment, the Powell constraint and demand
+    aggregation become array ops, ``execute_skills`` applies a whole
+    phase's approved skills in one update (the runner calls it once per
+    phase with ``ExperimentBuilder.with_batched_execution()``), and
+    magnitude noise comes from per-agent random streams keyed on (seed,
+    year, agent index), so results do not depend on execution order or
+    batching.  Array mode
+    draws differ from the default sequential ``self.rng`` path and sums
+    can differ in the last float bits; keep it off to reproduce
+    published runs.
     """
 
     # Lake Mead elevation–storage relationship (USBR data)
@@ -124,7 +150,11 @@ class IrrigationEnvironment:
         [895.0, 950.0, 1000.0, 1025.0, 1050.0, 1075.0, 1100.0, 1150.0, 1200.0, 1220.0]
     )
 
-    def __init__(self, config: Optional[WaterSystemConfig] = None):
+    def __init__(
+        self,
+        config: Optional[WaterSystemConfig] = None,
+        array_state: bool = False,
+    ):
         self.config = config or WaterSystemConfig()
         self.rng = np.random.default_rng(self.config.seed)
 
@@ -158,6 +188,9 @@ class IrrigationEnvironment:
 
         # Agent-level state: agent_id → {diversion, request, water_right, basin}
         self._agents: Dict[str, Dict[str, Any]] = {}
+        # Optional struct-of-arrays backing for _agents (array_state=True)
+        self._array_state = array_state
+        self._state: Optional[AgentStateStore] = None
 
         # History for preceding factor computation
         self._precip_history: List[float] = []
@@ -200,6 +233,7 @@ class IrrigationEnvironment:
                 "below_minimum_utilisation": False,
                 "cluster": "unknown",
             }
+        self._sync_state_store()
 
     def initialize_from_profiles(self, profiles) -> None:
         """Initialise agents from IrrigationAgentProfile list.
@@ -235,6 +269,7 @@ class IrrigationEnvironment:
                 "magnitude_max": getattr(p, "magnitude_max", 30.0),
                 "exploration_rate": getattr(p, "exploration_rate", 0.0),
             }
+        self._sync_state_store()
 
     def initialize_synthetic(
         self,
@@ -368,6 +403,20 @@ class IrrigationEnvironment:
                 "exploration_rate": config["exploration_rate"],
             }
             agent_index += 1
+        self._sync_state_store()
+
+    def _sync_state_store(self) -> None:
+        """Rebuild the array-backed store from the current agent records."""
+        if not self._array_state:
+            return
+        records = {aid: dict(rec) for aid, rec in self._agents.items()}
+        self._state = AgentStateStore(records)
+        self._agents = {aid: self._state.record(aid) for aid in records}
+
+    @property
+    def state_store(self) -> Optional[AgentStateStore]:
+        """Array-backed agent state (``None`` unless ``array_state=True``)."""
+        return self._state
 
     def load_crss_precipitation(self, csv_path: str) -> None:
         """Load real CRSS/PRISM winter precipitation projections.
@@ -496,9 +545,12 @@ class IrrigationEnvironment:
         self._apply_powell_constraint()
 
         # Basin-level aggregate demand for ceiling validator
-        self._global["total_basin_demand"] = sum(
-            a["request"] for a in self._agents.values()
-        )
+        if self._state is not None:
+            self._global["total_basin_demand"] = float(self._state.request.sum())
+        else:
+            self._global["total_basin_demand"] = sum(
+                a["request"] for a in self._agents.values()
+            )
 
         return self._global.copy()
 
@@ -578,6 +630,9 @@ class IrrigationEnvironment:
         """
         from broker.interfaces.skill_types import ExecutionResult
 
+        if self._state is not None:
+            return self.execute_skills([approved_skill])[0]
+
         aid = approved_skill.agent_id
         skill = approved_skill.skill_name
         agent = self._agents.get(aid)
@@ -695,6 +750,134 @@ class IrrigationEnvironment:
 
         return ExecutionResult(success=True, state_changes=state_changes)
 
+    def execute_skills(self, approved_skills: List[Any]) -> List["ExecutionResult"]:
+        """Execute a phase's approved skills in one vectorized update.
+
+        Requires ``array_state=True``.  Skill semantics match
+        :meth:`execute_skill`; magnitude noise comes from each agent's own
+        random stream, so the outcome is the same whether skills are
+        applied one at a time or as a batch.  An agent appearing more than
+        once is applied in order (one vectorized round per repeat).
+
+        Args:
+            approved_skills: ``ApprovedSkill``-like objects with
+                ``.skill_name`` and ``.agent_id``.
+
+        Returns:
+            One ExecutionResult per input, in input order.
+        """
+        from broker.interfaces.skill_types import ExecutionResult
+
+        if self._state is None:
+            raise RuntimeError("execute_skills requires array_state=True")
+        store = self._state
+
+        results: List[Optional[ExecutionResult]] = [None] * len(approved_skills)
+        rounds: List[List[int]] = []
+        seen: Dict[str, int] = {}
+        for pos, approved in enumerate(approved_skills):
+            aid = approved.agent_id
+            skill = approved.skill_name
+            if aid not in store.index:
+                results[pos] = ExecutionResult(
+                    success=False, error=f"Unknown agent: {aid}")
+            elif skill not in _SKILL_KIND:
+                results[pos] = ExecutionResult(
+                    success=False, error=f"Unknown skill: {skill}")
+            else:
+                repeat = seen.get(aid, 0)
+                seen[aid] = repeat + 1
+                if repeat == len(rounds):
+                    rounds.append([])
+                rounds[repeat].append(pos)
+
+        for positions in rounds:
+            self._execute_round(approved_skills, positions, results)
+        return results  # type: ignore[return-value]
+
+    def _execute_round(
+        self,
+        approved_skills: List[Any],
+        positions: List[int],
+        results: List[Any],
+    ) -> None:
+        """Apply skills for distinct agents as array ops (see execute_skills)."""
+        from broker.interfaces.skill_types import ExecutionResult
+
+        store = self._state
+        tables = store.magnitude_tables
+        skills = [approved_skills[p].skill_name for p in positions]
+        idx = np.array(
+            [store.index[approved_skills[p].agent_id] for p in positions],
+            dtype=np.int64,
+        )
+        kind = np.array([_SKILL_KIND[s] for s in skills])
+        current = store.request[idx]
+        wr = store.water_right[idx]
+
+        # ═══ Magnitude sampling (v17 per-skill, v12 legacy fallback) ═══
+        magnitude_pct = np.zeros(len(idx))
+        is_exploration = np.zeros(len(idx), dtype=bool)
+        changes = np.flatnonzero(kind != "maintain")
+        if len(changes):
+            ci = idx[changes]
+            scale = tables.persona_scale[ci]
+            mu = tables.legacy_default[ci].copy()
+            sigma = tables.legacy_sigma[ci].copy()
+            lo = tables.legacy_min[ci].copy()
+            hi = tables.legacy_max[ci].copy()
+            change_skills = np.array([skills[c] for c in changes], dtype=object)
+            for name in set(change_skills):
+                table = tables.skills.get(name)
+                if table is None:
+                    continue
+                sel = (change_skills == name) & table.has_config[ci]
+                mu[sel] = table.mu[ci[sel]] * scale[sel]
+                sigma[sel] = table.sigma[ci[sel]] * scale[sel]
+                lo[sel] = table.min[ci[sel]]
+                hi[sel] = table.max[ci[sel]]
+
+            uniform, normal = store.next_draws(
+                ci, self.config.seed, self._year_index,
+            )
+            rate = tables.exploration_rate[ci]
+            explore = (sigma > 0) & (rate > 0) & (uniform < rate)
+            regular = (sigma > 0) & ~explore
+            mag = mu.copy()
+            mag[explore] = np.clip(
+                mu + normal * sigma * 2.0, 0.5, 100.0)[explore]
+            mag[regular] = np.clip(mu + normal * sigma, lo, hi)[regular]
+            magnitude_pct[changes] = mag
+            is_exploration[changes] = explore
+
+        change = current * (magnitude_pct / 100.0)
+        new_req = current.copy()
+        inc = kind == "increase"
+        new_req[inc] = np.minimum(current + change, wr)[inc]
+        dec = kind == "decrease"
+        if dec.any():
+            floor = wr * MIN_UTIL
+            safe_wr = np.where(wr > 0, wr, 1.0)
+            utilisation = np.where(wr > 0, current / safe_wr, 1.0)
+            taper = np.maximum(0.0, (utilisation - MIN_UTIL) / (1.0 - MIN_UTIL))
+            new_req[dec] = np.maximum(current - change * taper, floor)[dec]
+
+        # Vectorized update_agent_request
+        applied = np.maximum(0.0, np.minimum(new_req, wr))
+        store.request[idx] = applied
+        store.at_allocation_cap[idx] = applied >= wr * 0.99
+        store.below_minimum_utilisation[idx] = applied < wr * MIN_UTIL
+        store.diversion[idx] = applied * (1.0 - store.curtailment_ratio[idx])
+
+        for j, pos in enumerate(positions):
+            state_changes: Dict[str, Any] = {
+                "is_exploration": bool(is_exploration[j]),
+                "request": float(new_req[j]),
+            }
+            if kind[j] != "maintain":
+                state_changes["magnitude_pct_applied"] = float(magnitude_pct[j])
+            results[pos] = ExecutionResult(success=True, state_changes=state_changes)
+
     # -----------------------------------------------------------------
     # Internal: water signal generation
     # -----------------------------------------------------------------
@@ -759,10 +942,13 @@ class IrrigationEnvironment:
         natural_flow = max(6.0, min(17.0, natural_flow))  # M3: 17 MAF ops ceiling
 
         # --- Upper Basin diversions (constrained by Powell min release) ---
-        ub_div_maf = sum(
-            a["diversion"] for a in self._agents.values()
-            if a["basin"] == "upper_basin"
-        ) / 1e6
+        if self._state is not None:
+            ub_div_maf = float(self._state.diversion[self._state.is_upper].sum()) / 1e6
+        else:
+            ub_div_maf = sum(
+                a["diversion"] for a in self._agents.values()
+                if a["basin"] == "upper_basin"
+            ) / 1e6
         ub_flow_cap = max(0.0, natural_flow - cfg.min_powell_release_maf)
         ub_infra_cap = cfg.ub_infrastructure_cap_maf
         ub_div_effective = min(ub_div_maf, ub_flow_cap, ub_infra_cap)
@@ -770,10 +956,13 @@ class IrrigationEnvironment:
         mead_inflow = powell_release + cfg.lb_tributary_maf
 
         # --- Lake Mead outflow ---
-        lb_div_maf = sum(
-            a["diversion"] for a in self._agents.values()
-            if a["basin"] == "lower_basin"
-        ) / 1e6
+        if self._state is not None:
+            lb_div_maf = float(self._state.diversion[self._state.is_lower].sum()) / 1e6
+        else:
+            lb_div_maf = sum(
+                a["diversion"] for a in self._agents.values()
+                if a["basin"] == "lower_basin"
+            ) / 1e6
         prev_storage = self._mead_storage[-1]
 
         # Evaporation scales with surface area (storage fraction proxy)
@@ -865,6 +1054,15 @@ class IrrigationEnvironment:
         curtailment_map = {0: 0.0, 1: 0.05, 2: 0.10, 3: 0.20}
         ratio = curtailment_map.get(tier, 0.0)
 
+        if self._state is not None:
+            store = self._state
+            store.curtailment_ratio[:] = ratio
+            np.multiply(
+                np.minimum(store.request, store.water_right), 1.0 - ratio,
+                out=store.diversion,
+            )
+            return
+
         for agent in self._agents.values():
             agent["curtailment_ratio"] = ratio
             # Update actual diversion
@@ -888,15 +1086,22 @@ class IrrigationEnvironment:
         natural_flow = cfg.natural_flow_base_maf * (precip / cfg.precip_baseline_mm)
         natural_flow = max(6.0, min(17.0, natural_flow))
 
-        ub_agents = [a for a in self._agents.values()
-                     if a["basin"] == "upper_basin"]
-        ub_div_total = sum(a["diversion"] for a in ub_agents)
-
         # Binding constraint: min of flow-based and infrastructure caps
         ub_flow_cap_af = max(0.0, natural_flow - cfg.min_powell_release_maf) * 1e6
         ub_infra_cap_af = cfg.ub_infrastructure_cap_maf * 1e6
         ub_effective_cap = min(ub_flow_cap_af, ub_infra_cap_af)
 
+        if self._state is not None:
+            store = self._state
+            ub_div_total = float(store.diversion[store.is_upper].sum())
+            if ub_div_total > ub_effective_cap and ub_div_total > 0:
+                store.diversion[store.is_upper] *= ub_effective_cap / ub_div_total
+            return
+
+        ub_agents = [a for a in self._agents.values()
+                     if a["basin"] == "upper_basin"]
+        ub_div_total = sum(a["diversion"] for a in ub_agents)
+
         if ub_div_total > ub_effective_cap and ub_div_total > 0:
             scale = ub_effective_cap / ub_div_total
             for a in ub_agents:
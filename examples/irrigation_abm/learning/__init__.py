@@ -1,5 +1,6 @@
 """Irrigation-specific learning algorithms (FQL for water demand adaptation)."""
 
 from .fql import FQLAgent, FQLConfig, FQLState
+from .fql_batch import BatchedFQL
 
-__all__ = ["FQLAgent", "FQLConfig", "FQLState"]
+__all__ = ["FQLAgent", "FQLConfig", "FQLState", "BatchedFQL"]
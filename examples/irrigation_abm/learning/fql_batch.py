@@ -0,0 +1,261 @@
+"""
+Population-level (batched) Farmer's Q-Learning.
+
+:class:`BatchedFQL` keeps every agent's Q-table, transition count table
+and transition posterior in stacked arrays and advances the whole
+population with one vectorised posterior update, TD(0) update and
+epsilon-greedy selection per year.
+
+Two random-number modes:
+
+- :meth:`BatchedFQL.from_agents` keeps each :class:`FQLAgent`'s own
+  generator, so results are identical to calling :meth:`FQLAgent.step`
+  agent by agent (same seeds, same draws, same float operations).  The
+  per-agent draws and the two ``np.dot`` calls for the expected future
+  Q stay per agent: BLAS summation order depends on the vector stride,
+  so a batched contraction can differ from ``np.dot`` in the last bit.
+- ``BatchedFQL(configs, states, rng=generator)`` draws for the whole
+  population from one generator and contracts with ``einsum``; use it
+  for synthetic sensitivity sweeps where per-agent streams do not matter.
+
+The per-agent :class:`FQLState` objects stay usable: their tables are
+rebound to views into the stacked arrays, and :meth:`sync_states`
+copies the previous-step scalars back.
+
+Usage::
+
+    batch = BatchedFQL.from_agents([fql_agents[aid] for aid in order])
+    actions = batch.step(current_diversion, (f_t, f_next))
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .fql import FQLAgent, FQLConfig, FQLState
+
+
+class BatchedFQL:
+    """Stacked FQL state and vectorised stepping for a population.
+
+    Args:
+        configs: One :class:`FQLConfig` per agent.  All must share
+            ``n_preceding``, ``n_states`` and ``n_actions``.
+        states: One :class:`FQLState` per agent (initialised if needed).
+        rngs: Optional per-agent generators (exact per-agent reproduction).
+        rng: Population generator, used when ``rngs`` is not given.
+
+    Raises:
+        ValueError: On empty input, length mismatch or mixed table shapes.
+    """
+
+    def __init__(
+        self,
+        configs: Sequence[FQLConfig],
+        states: Sequence[FQLState],
+        rngs: Optional[Sequence[np.random.Generator]] = None,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        if not configs:
+            raise ValueError("BatchedFQL needs at least one agent")
+        if len(configs) != len(states):
+            raise ValueError(
+                f"Got {len(configs)} configs but {len(states)} states"
+            )
+        if rngs is not None and len(rngs) != len(configs):
+            raise ValueError(
+                f"Got {len(configs)} configs but {len(rngs)} generators"
+            )
+        shapes = {(c.n_preceding, c.n_states, c.n_actions) for c in configs}
+        if len(shapes) != 1:
+            raise ValueError(
+                f"All agents must share (n_preceding, n_states, n_actions); got {sorted(shapes)}"
+            )
+        self.n_preceding, self.n_states, self.n_actions = shapes.pop()
+        self.n = len(configs)
+
+        for config, state in zip(configs, states):
+            state.initialize(config)
+
+        self.mu = np.array([c.mu for c in configs], dtype=float)
+        self.sigma = np.array([c.sigma for c in configs], dtype=float)
+        self.alpha = np.array([c.alpha for c in configs], dtype=float)
+        self.gamma = np.array([c.gamma for c in configs], dtype=float)
+        self.epsilon = np.array([c.epsilon for c in configs], dtype=float)
+        self.regret = np.array([c.regret for c in configs], dtype=float)
+        self.forget = np.array([c.forget for c in configs], dtype=bool)
+
+        self.q_table = np.stack([s.q_table for s in states]).astype(float)
+        self.count_table = np.stack([s.count_table for s in states]).astype(float)
+        # FQLAgent recomputes the whole posterior from the counts on every
+        # step; doing it once here lets step() refresh only the updated row.
+        row_sums = self.count_table.sum(axis=-1, keepdims=True)
+        self.p_transition = self.count_table / np.where(row_sums == 0, 1, row_sums)
+
+        self.bounds_min = np.array([float(s.state_bounds[0]) for s in states])
+        self.bin_size = np.array([s.bin_size for s in states], dtype=float)
+        self.prev_diversion = np.array([s.prev_diversion for s in states], dtype=float)
+        self.prev_action = np.array([s.prev_action for s in states], dtype=float)
+        self.prev_diversion_request = np.array(
+            [s.prev_diversion_request for s in states], dtype=float
+        )
+
+        self.states: List[FQLState] = list(states)
+        for i, state in enumerate(self.states):
+            state.q_table = self.q_table[i]
+            state.count_table = self.count_table[i]
+            state.p_transition = self.p_transition[i]
+
+        self.rngs = list(rngs) if rngs is not None else None
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    @classmethod
+    def from_agents(
+        cls, agents: Sequence[Tuple[FQLAgent, FQLState]]
+    ) -> "BatchedFQL":
+        """Batch existing ``(FQLAgent, FQLState)`` pairs, keeping their generators."""
+        return cls(
+            configs=[agent.config for agent, _ in agents],
+            states=[state for _, state in agents],
+            rngs=[agent.rng for agent, _ in agents],
+        )
+
+    # -----------------------------------------------------------------
+    # Stepping
+    # -----------------------------------------------------------------
+
+    def step(
+        self,
+        current_diversion: np.ndarray,
+        preceding_factor: Tuple[np.ndarray, np.ndarray],
+        agents: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Advance agents by one FQL step (see :meth:`FQLAgent.step`).
+
+        Args:
+            current_diversion: Actual diversion per stepped agent.
+            preceding_factor: ``(f_t, f_next)``, each per agent or scalar.
+            agents: Unique indices of the agents to step, in draw order
+                (default: all agents in batch order).
+
+        Returns:
+            Signed diversion change per stepped agent.
+        """
+        idx = np.arange(self.n) if agents is None else np.asarray(agents, dtype=np.int64)
+        m = len(idx)
+        div = np.broadcast_to(np.asarray(current_diversion, dtype=float), (m,))
+        f_t = np.broadcast_to(np.asarray(preceding_factor[0], dtype=np.int64), (m,))
+        f_next = np.broadcast_to(np.asarray(preceding_factor[1], dtype=np.int64), (m,))
+        rows = np.arange(m)
+
+        s_t = self._div_to_state(div, idx)
+        s_0 = self._div_to_state(self.prev_diversion[idx], idx)
+        a_prev = (self.prev_action[idx] > 0).astype(np.int64)
+
+        self._update_posterior(idx, f_t, a_prev, s_0, s_t)
+
+        # Asymmetric reward: only unmet demand is penalised.
+        deviation = div - (self.prev_diversion[idx] + self.prev_action[idx])
+        deviation = np.where(deviation >= 0, 0.0, deviation)
+        reward = div + self.regret[idx] * deviation
+
+        e_future_q = self._expected_future_q(idx, f_next, s_t)
+
+        old_q = self.q_table[idx, f_t, s_0, a_prev]
+        self.q_table[idx, f_t, s_0, a_prev] = old_q + self.alpha[idx] * (
+            reward + self.gamma[idx] * e_future_q - old_q
+        )
+
+        raw, uniform = self._draw(idx)
+        magnitudes = (self.mu[idx][:, None] + raw) * self.bin_size[idx][:, None]
+        actions = np.stack([-magnitudes[:, 0], magnitudes[:, 1]], axis=1)
+
+        # Epsilon-greedy on the Q ordering, reproducing
+        # Generator.choice(actions, p=[p0, p1]) for the same uniform draw.
+        eps = self.epsilon[idx]
+        exploit_increase = (
+            self.q_table[idx, f_next, s_t, 0] <= self.q_table[idx, f_next, s_t, 1]
+        )
+        p0 = np.where(exploit_increase, eps, 1 - eps)
+        p1 = np.where(exploit_increase, 1 - eps, eps)
+        pick_second = p0 / (p0 + p1) <= uniform
+        a_new = actions[rows, pick_second.astype(np.int64)]
+
+        a_new = np.where(div + a_new <= 0, -div, a_new)
+
+        self.prev_diversion[idx] = div
+        self.prev_action[idx] = a_new
+        self.prev_diversion_request[idx] = div + a_new
+        return a_new
+
+    def sync_states(self) -> None:
+        """Copy previous-step scalars back into the per-agent FQLState objects."""
+        for i, state in enumerate(self.states):
+            state.prev_diversion = float(self.prev_diversion[i])
+            state.prev_action = float(self.prev_action[i])
+            state.prev_diversion_request = float(self.prev_diversion_request[i])
+
+    # -----------------------------------------------------------------
+    # Internals
+    # -----------------------------------------------------------------
+
+    def _div_to_state(self, div: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """Vectorised :meth:`FQLAgent._div_to_state` (truncate, then clamp)."""
+        bs = self.bin_size[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw = np.trunc((div - self.bounds_min[idx]) / bs)
+        raw = np.where(bs == 0, 0.0, raw)
+        return np.clip(raw, 0, self.n_states - 1).astype(np.int64)
+
+    def _update_posterior(
+        self,
+        idx: np.ndarray,
+        f_t: np.ndarray,
+        a_prev: np.ndarray,
+        s_0: np.ndarray,
+        s_t: np.ndarray,
+    ) -> None:
+        """Forgetting + count increment on one row per agent, then its posterior."""
+        counts = self.count_table[idx, f_t, a_prev, s_0]
+        row_sum = counts.sum(axis=1)
+        decay_rows = self.forget[idx] & (row_sum > 1)
+        counts[decay_rows] *= (
+            (row_sum[decay_rows] - 1) / row_sum[decay_rows]
+        )[:, None]
+        counts[np.arange(len(idx)), s_t] += 1
+        self.count_table[idx, f_t, a_prev, s_0] = counts
+
+        new_sum = counts.sum(axis=1)
+        self.p_transition[idx, f_t, a_prev, s_0] = (
+            counts / np.where(new_sum == 0, 1, new_sum)[:, None]
+        )
+
+    def _expected_future_q(
+        self, idx: np.ndarray, f_next: np.ndarray, s_t: np.ndarray
+    ) -> np.ndarray:
+        """max_k sum_s' P(s'|s_t, k, f_next) * Q(f_next, s', k) per agent."""
+        if self.rngs is None:
+            q = self.q_table[idx, f_next]                 # (m, ns, na)
+            p = self.p_transition[idx, f_next, :, s_t, :]  # (m, na, ns)
+            return np.einsum("msk,mks->mk", q, p).max(axis=1)
+
+        e_q = np.zeros((len(idx), self.n_actions))
+        q_table, p_transition = self.q_table, self.p_transition
+        for j, (i, f, s) in enumerate(zip(idx.tolist(), f_next.tolist(), s_t.tolist())):
+            for k in range(self.n_actions):
+                e_q[j, k] = np.dot(q_table[i, f, :, k], p_transition[i, f, k, s, :])
+        return e_q.max(axis=1)
+
+    def _draw(self, idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """|N(0, sigma)| magnitudes (m, 2) and the selection uniform (m,)."""
+        if self.rngs is None:
+            raw = np.abs(self.rng.normal(0, self.sigma[idx][:, None], size=(len(idx), 2)))
+            return raw, self.rng.random(len(idx))
+
+        raw = np.empty((len(idx), 2))
+        uniform = np.empty(len(idx))
+        for j, i in enumerate(idx.tolist()):
+            rng = self.rngs[i]
+            raw[j] = np.abs(rng.normal(0, self.sigma[i], size=2))
+            uniform[j] = rng.random()
+        return raw, uniform
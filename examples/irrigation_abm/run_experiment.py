@@ -574,7 +574,7 @@ def main():
 
     # --- Create environment and initialize ---
     config = WaterSystemConfig(seed=seed)
-    env = IrrigationEnvironment(config)
+    env = IrrigationEnvironment(config, array_state=args.array_state)
     env.initialize_from_profiles(profiles)
 
     # Load real CRSS precipitation projections when available
@@ -668,6 +668,8 @@ def main():
         .with_exact_output(str(output_dir))
         .with_workers(args.workers)
         .with_seed(seed)
+        .with_batched_execution(args.array_state)
+        .with_preflight_pruning(args.preflight_pruning)
     )
     runner = builder.build()
 
@@ -750,6 +752,12 @@ def parse_args():
     p.add_argument("--ablation-mode", type=str, default=None,
                    choices=["no_demand_ceiling"],
                    help="Policy counterfactual: disable specific validator (e.g., no_demand_ceiling)")
+    p.add_argument("--array-state", action="store_true",
+                   help="Array-backed agent state with per-agent RNG streams, each "
+                        "phase's skills executed in one batched update "
+                        "(large synthetic populations; not byte-identical to default runs)")
+    p.add_argument("--preflight-pruning", action="store_true",
+                   help="Leave skills that governance blocks on state alone out of the options")
     return p.parse_args()
 
 
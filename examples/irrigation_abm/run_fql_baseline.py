@@ -45,6 +45,7 @@ from examples.irrigation_abm.learning.fql import (
     CLUSTER_FORWARD_LOOKING,
     CLUSTER_MYOPIC,
 )
+from examples.irrigation_abm.learning.fql_batch import BatchedFQL
 from examples.irrigation_abm.learning.fql_skill_mapper import (
     fql_action_to_skill,
     compute_wsa_label,
@@ -188,6 +189,7 @@ def run_simulation(
     output_dir: Path,
     seed: int = 42,
     no_governance: bool = False,
+    batched: bool = False,
 ) -> List[Dict[str, Any]]:
     """Run FQL baseline simulation.
 
@@ -204,6 +206,8 @@ def run_simulation(
         output_dir: Directory for output files.
         seed: Random seed.
         no_governance: If True, skip all validators (raw FQL behavior).
+        batched: If True, step all agents' FQL at once per year with
+            BatchedFQL (identical results; each agent keeps its own RNG).
 
     Returns:
         List of log dicts (one per agent per year).
@@ -213,6 +217,12 @@ def run_simulation(
 
     reset_consecutive_tracker()
 
+    batch = None
+    if batched:
+        batch_ids = [aid for aid in agent_ids if aid in fql_agents and aid in profiles]
+        if batch_ids:
+            batch = BatchedFQL.from_agents([fql_agents[aid] for aid in batch_ids])
+
     for year_idx in range(1, n_years + 1):
         # Advance environment (generates precipitation, Mead level, curtailment)
         env.advance_year()
@@ -221,6 +231,17 @@ def run_simulation(
         year_skills = {}
         year_blocked = 0
 
+        # execute_skill() never touches diversion or preceding factor, so
+        # the whole population's FQL inputs can be read up front.
+        batch_actions = {}
+        if batch is not None:
+            batch_ctx = [env.get_agent_context(aid) for aid in batch_ids]
+            pf = np.array([c["preceding_factor"] for c in batch_ctx])
+            actions = batch.step(
+                np.array([c["current_diversion"] for c in batch_ctx]), (pf, pf)
+            )
+            batch_actions = dict(zip(batch_ids, actions.tolist()))
+
         for aid in agent_ids:
             if aid not in fql_agents:
                 continue
@@ -240,7 +261,10 @@ def run_simulation(
             pf = ctx["preceding_factor"]
             preceding = (pf, pf)
 
-            action = fql_agent.step(fql_state, current_diversion, preceding)
+            if batch is not None:
+                action = batch_actions[aid]
+            else:
+                action = fql_agent.step(fql_state, current_diversion, preceding)
 
             # ── Map to 2-action model (faithful to FQL) ──
             raw_skill = fql_action_to_skill(action)
@@ -329,6 +353,9 @@ def run_simulation(
             f"blocked={year_blocked}/{n_agents} | {skill_summary}"
         )
 
+    if batch is not None:
+        batch.sync_states()
+
     return logs
 
 
@@ -540,6 +567,7 @@ def main():
         output_dir=output_dir,
         seed=seed,
         no_governance=args.no_governance,
+        batched=args.batched,
     )
 
     # Save simulation log
@@ -589,6 +617,8 @@ def parse_args():
     p.add_argument("--from-logs", type=str, default=None,
                    help="Reconstruct profiles from existing simulation_log.csv directory "
                         "(e.g., results/production_v20_42yr_seed42). Use when ref/ data is unavailable.")
+    p.add_argument("--batched", action="store_true",
+                   help="Step all agents' FQL as one population per year (same results, faster)")
     return p.parse_args()
 
 
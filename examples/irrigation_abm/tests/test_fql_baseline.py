@@ -229,6 +229,30 @@ class TestSmokeRun:
         for log in logs:
             assert log["water_right"] > 0
 
+    def test_batched_run_matches_per_agent_run(self):
+        """BatchedFQL stepping yields the same simulation log."""
+        import tempfile
+        from pathlib import Path
+
+        def run(batched):
+            seed = 43
+            np.random.seed(seed)
+            profiles = _create_synthetic_profiles(6, seed=seed)
+            env = IrrigationEnvironment(WaterSystemConfig(seed=seed))
+            env.initialize_from_profiles(profiles)
+            with tempfile.TemporaryDirectory() as tmpdir:
+                return run_simulation(
+                    env=env,
+                    fql_agents=create_fql_agents(profiles, seed=seed),
+                    profiles={p.agent_id: p for p in profiles},
+                    n_years=8,
+                    output_dir=Path(tmpdir),
+                    seed=seed,
+                    batched=batched,
+                )
+
+        assert run(batched=True) == run(batched=False)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
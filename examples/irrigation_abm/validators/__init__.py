@@ -9,6 +9,7 @@ from .irrigation_validators import (
     magnitude_cap_check,
     demand_ceiling_stabilizer,
     irrigation_governance_validator,
+    irrigation_preflight_validator,
     IRRIGATION_PHYSICAL_CHECKS,
     IRRIGATION_SOCIAL_CHECKS,
     ALL_IRRIGATION_CHECKS,
@@ -23,6 +24,7 @@ __all__ = [
     "magnitude_cap_check",
     "demand_ceiling_stabilizer",
     "irrigation_governance_validator",
+    "irrigation_preflight_validator",
     "IRRIGATION_PHYSICAL_CHECKS",
     "IRRIGATION_SOCIAL_CHECKS",
     "ALL_IRRIGATION_CHECKS",
@@ -28,6 +28,7 @@ from typing import Any, Dict, List
 
 from broker.interfaces.skill_types import ValidationResult
 from broker.governance.rule_types import GovernanceRule
+from broker.validators.governance.base_validator import is_state_only, state_only
 
 
 # =============================================================================
@@ -41,6 +42,7 @@ DECREASE_SKILLS = frozenset({"decrease_large", "decrease_small", "decrease_deman
 # Individual BuiltinCheck functions
 # =============================================================================
 
+@state_only
 def water_right_cap_check(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -80,6 +82,7 @@ def water_right_cap_check(
     ]
 
 
+@state_only
 def non_negative_diversion_check(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -142,6 +145,7 @@ def non_negative_diversion_check(
     ]
 
 
+@state_only
 def curtailment_awareness_check(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -280,6 +284,7 @@ def curtailment_awareness_check(
     ]
 
 
+@state_only
 def compact_allocation_check(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -325,6 +330,7 @@ def compact_allocation_check(
     ]
 
 
+@state_only
 def drought_severity_check(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -414,6 +420,7 @@ def drought_severity_check(
     ]
 
 
+@state_only
 def minimum_utilisation_check(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -507,6 +514,7 @@ def magnitude_cap_check(
     return []
 
 
+@state_only
 def supply_gap_block_increase(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -623,6 +631,7 @@ def update_consecutive_tracker(agent_id: str, skill_name: str) -> None:
         _consecutive_increase_tracker[agent_id] = 0
 
 
+@state_only
 def consecutive_increase_cap_check(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -682,6 +691,7 @@ DEMAND_FLOOR_RATIO = 0.50  # 50% of water_right
 DEMAND_CEILING_AF = 6_000_000  # 6.0 MAF ~ 1.024x CRSS target (5.86 MAF)
 
 
+@state_only
 def demand_floor_stabilizer(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -733,6 +743,7 @@ def demand_floor_stabilizer(
     ]
 
 
+@state_only
 def demand_ceiling_stabilizer(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -788,6 +799,7 @@ def demand_ceiling_stabilizer(
     ]
 
 
+@state_only
 def zero_escape_check(
     skill_name: str,
     rules: List[GovernanceRule],
@@ -905,3 +917,22 @@ def irrigation_governance_validator(proposal, context, skill_registry=None):
     for check in ALL_IRRIGATION_CHECKS:
         results.extend(check(skill_name, [], context))
     return results
+
+
+def irrigation_preflight_validator(proposal, context, skill_registry=None):
+    """State-only subset of `irrigation_governance_validator`.
+
+    Runs the checks marked ``@state_only`` (every check except the
+    magnitude cap, which needs the proposed magnitude) so that
+    ``SkillBrokerEngine`` pre-flight pruning can drop blocked skills
+    from the options before prompting.
+    """
+    skill_name = getattr(proposal, "skill_name", str(proposal))
+    results = []
+    for check in ALL_IRRIGATION_CHECKS:
+        if is_state_only(check):
+            results.extend(check(skill_name, [], context))
+    return results
+
+
+irrigation_governance_validator.preflight = irrigation_preflight_validator
@@ -57,6 +57,7 @@ from broker.domains.water.calibration.psychometric_battery import (
     ProbeResponse,
     Scenario,
 )
+from broker.domains.water.calibration.probe_runner import ProbeRunner, ProbeTask
 # Backward compatibility
 Vignette = Scenario
 
@@ -325,6 +326,7 @@ def run_icc_probing(
     replicates: int = DEFAULT_REPLICATES,
     output_dir: str | Path = "paper3/results/cv",
     governed: bool = True,
+    workers: int = 4,
 ) -> None:
     """Run ICC psychometric probing.
 
@@ -340,6 +342,9 @@ def run_icc_probing(
         Where to save results.
     governed : bool
         Whether to apply WAGF governance to responses.
+    workers : int
+        Concurrent LLM calls.  Responses are cached under
+        ``output_dir/probe_cache``; re-running resumes missing probes.
     """
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -363,64 +368,53 @@ def run_icc_probing(
     # Create LLM invoke function
     invoke = create_probe_invoke(model, temperature=temperature)
 
-    # Run probing
-    total = len(archetypes) * len(scenarios) * replicates
-    completed = 0
-    failed = 0
-
-    for arch_name, arch_data in archetypes.items():
-        for scenario in scenarios:
-            prompt = build_probe_prompt(arch_data, scenario)
-
-            for rep in range(1, replicates + 1):
-                raw, success = invoke(prompt)
-                completed += 1
-
-                if not success or not raw:
-                    failed += 1
-                    print(f"  [{completed}/{total}] FAILED: {arch_name} x {scenario.id} rep {rep}")
-                    continue
-
-                parsed = parse_probe_response(raw)
-
-                # Extract construct labels (clean multi-value like "H | VH")
-                tp_raw = parsed.get("TP_LABEL", parsed.get("tp_label", "M"))
-                cp_raw = parsed.get("CP_LABEL", parsed.get("cp_label", "M"))
-                tp = tp_raw.split("|")[0].split("/")[0].strip().upper()
-                cp = cp_raw.split("|")[0].split("/")[0].strip().upper()
-                # Map decision: numeric → action name based on agent type
-                atype = arch_data.get("agent_type", "household_owner")
-                decision = map_decision_to_action(
-                    parsed.get("decision", "do_nothing"), agent_type=atype,
-                )
-                reasoning = parsed.get("reasoning", "")
-
-                response = ProbeResponse(
-                    scenario_id=scenario.id,
-                    archetype=arch_name,
-                    replicate=rep,
-                    tp_label=tp,
-                    cp_label=cp,
-                    decision=decision,
-                    reasoning=reasoning,
-                    governed=governed,
-                    raw_response=raw,
-                )
-                battery.add_response(response)
-
-                if completed % 50 == 0 or completed == total:
-                    print(f"  [{completed}/{total}] {arch_name} x {scenario.id} "
-                          f"rep {rep}: TP={tp}, CP={cp}, action={decision}")
-
-                # Incremental save every 500 calls (prevent data loss on crash)
-                if completed % 500 == 0:
-                    try:
-                        inc_df = battery.responses_to_dataframe()
-                        if not inc_df.empty:
-                            inc_path = output_dir / "icc_responses_partial.csv"
-                            inc_df.to_csv(inc_path, index=False)
-                    except Exception:
-                        pass  # Non-critical
+    def parse(raw: str, task: ProbeTask) -> ProbeResponse:
+        parsed = parse_probe_response(raw)
+
+        # Extract construct labels (clean multi-value like "H | VH")
+        tp_raw = parsed.get("TP_LABEL", parsed.get("tp_label", "M"))
+        cp_raw = parsed.get("CP_LABEL", parsed.get("cp_label", "M"))
+        tp = tp_raw.split("|")[0].split("/")[0].strip().upper()
+        cp = cp_raw.split("|")[0].split("/")[0].strip().upper()
+        # Map decision: numeric → action name based on agent type
+        atype = task.archetype_data.get("agent_type", "household_owner")
+        decision = map_decision_to_action(
+            parsed.get("decision", "do_nothing"), agent_type=atype,
+        )
+        return ProbeResponse(
+            scenario_id=task.scenario.id,
+            archetype=task.archetype,
+            replicate=task.replicate,
+            tp_label=tp,
+            cp_label=cp,
+            decision=decision,
+            reasoning=parsed.get("reasoning", ""),
+            governed=governed,
+            raw_response=raw,
+        )
+
+    # Run probing (cached per probe, so an interrupted run resumes)
+    runner = ProbeRunner(
+        invoke,
+        cache_dir=output_dir / "probe_cache",
+        max_concurrency=workers,
+        model=model,
+    )
+    summary = runner.run(
+        battery,
+        archetypes,
+        build_prompt=build_probe_prompt,
+        parse_response=parse,
+        replicates=replicates,
+        governed=governed,
+        scenarios=scenarios,
+    )
+    completed = summary.n_total
+    failed = summary.n_failed
+    for arch_name, scenario_id, rep in summary.failed:
+        print(f"  FAILED: {arch_name} x {scenario_id} rep {rep}")
+    if summary.n_cached:
+        print(f"  Reused {summary.n_cached} cached responses")
 
     # Compute results
     print(f"\nProbing complete. {completed - failed}/{completed} successful.")
@@ -833,6 +827,12 @@ def main():
         default=2,
         help="First year to include in post-hoc analysis (default: 2)",
     )
+    parser.add_argument(
+        "--probe-workers",
+        type=int,
+        default=4,
+        help="Concurrent LLM calls for ICC probing (default: 4)",
+    )
 
     args = parser.parse_args()
 
@@ -842,6 +842,7 @@ def main():
             model=args.model,
             replicates=args.replicates,
             output_dir=args.output_dir or "paper3/results/cv",
+            workers=args.probe_workers,
         )
 
     elif args.mode == "posthoc":
@@ -35,7 +35,7 @@ if str(_REPO_ROOT) not in sys.path:
 
 from broker.components.governance.temporal_rules import (
     DEFAULT_RULES,
-    TemporalRuleEvaluator,
+    evaluate_runs,
 )
 from examples.single_agent.adapters.flood_temporal_adapter import FloodTemporalAdapter
 
@@ -56,13 +56,6 @@ CONDITIONS_V2: Dict[str, Tuple[str, str]] = {
 }
 
 
-def _load_audit(csv_path: Path) -> List[Dict]:
-    if not csv_path.exists():
-        return []
-    df = pd.read_csv(csv_path, encoding="utf-8-sig")
-    return df.to_dict(orient="records")
-
-
 def discover_runs(
     results_root: Path,
     models: List[str],
@@ -97,10 +90,12 @@ def main() -> int:
         default="v2",
         help="Which Gemma-4 dataset to scan: v1 (JOH_FINAL) or v2 (JOH_FINAL_v2).",
     )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes for the run sweep (default: CPU count; 1 = in-process).",
+    )
     args = parser.parse_args()
 
-    evaluator = TemporalRuleEvaluator(DEFAULT_RULES, FloodTemporalAdapter())
-
     gemma4_models = {"gemma4_e2b", "gemma4_e4b", "gemma4_26b"}
     v1_models = [m for m in args.models if m not in gemma4_models]
     v2_candidate_models = [m for m in args.models if m in gemma4_models]
@@ -112,19 +107,23 @@ def main() -> int:
         conds = CONDITIONS if args.gemma4_pipeline == "v1" else CONDITIONS_V2
         discovered.extend(discover_runs(args.results_root, v2_candidate_models, conds))
 
+    def _report(result) -> None:
+        print(f"  [scan] {result.model:16} {result.condition:10} {result.run}: "
+              f"n={result.n_decisions}")
+
+    results = evaluate_runs(
+        discovered, DEFAULT_RULES, FloodTemporalAdapter(),
+        max_workers=args.workers, on_result=_report,
+    )
+
     rows: List[Dict] = []
-    for model, cond, run, csv in discovered:
-        audit_rows = _load_audit(csv)
-        if not audit_rows:
+    for result in results:
+        if not result.n_decisions:
             continue
-        print(f"  [scan] {model:16} {cond:10} {run}: n={len(audit_rows)}")
-        result = evaluator.evaluate_experiment(
-            audit_rows, model=model, condition=cond, run=run,
-        )
         rows.append({
-            "model": model,
-            "condition": cond,
-            "run": run,
+            "model": result.model,
+            "condition": result.condition,
+            "run": result.run,
             "total_decisions": result.n_decisions,
             "m1_triggers": result.by_rule.get("M1", 0),
             "m1_rate": round(result.rate_by_rule.get("M1", 0.0), 3),
@@ -845,7 +845,7 @@ def plot_adaptation_cumulative_state(csv_path: Path, output_dir: Path, agents_co
 
 
 # --- 6. Main Runner ---
-def run_parity_benchmark(model: str = "llama3.2:3b", years: int = 10, agents_count: int = 100, custom_output: str = None, verbose: bool = False, memory_engine_type: str = "window", workers: int = 1, window_size: int = 5, seed: Optional[int] = None, memory_seed: int = 42, flood_mode: str = "fixed", survey_mode: bool = False, governance_mode: str = "strict", use_priority_schema: bool = False, stress_test: str = None, memory_ranking_mode: str = "legacy", initial_agents_path: str = None, shuffle_skills: bool = False, default_skill: str = None):
+def run_parity_benchmark(model: str = "llama3.2:3b", years: int = 10, agents_count: int = 100, custom_output: str = None, verbose: bool = False, memory_engine_type: str = "window", workers: int = 1, window_size: int = 5, seed: Optional[int] = None, memory_seed: int = 42, flood_mode: str = "fixed", survey_mode: bool = False, governance_mode: str = "strict", use_priority_schema: bool = False, stress_test: str = None, memory_ranking_mode: str = "legacy", initial_agents_path: str = None, shuffle_skills: bool = False, default_skill: str = None, preflight_pruning: bool = False):
     print(f"--- Llama {agents_count}-Agent {years}-Year Benchmark (Final Parity Edition) ---")
     
     # 1. Load Registry & Prompt Template
@@ -1203,6 +1203,7 @@ def run_parity_benchmark(model: str = "llama3.2:3b", years: int = 10, agents_cou
         .with_exact_output(str(output_dir))
         .with_workers(workers)
         .with_seed(seed)
+        .with_preflight_pruning(preflight_pruning)
     )
     
     runner = builder.build()
@@ -1342,6 +1343,8 @@ if __name__ == "__main__":
     parser.add_argument("--default-skill", type=str, default=None,
                         help="Override default fallback skill (e.g., buy_insurance). "
                              "Default: from skill_registry.yaml (do_nothing)")
+    parser.add_argument("--preflight-pruning", action="store_true",
+                        help="Leave skills that governance blocks on state alone out of the options")
     args = parser.parse_args()
 
     # Apply LLM config from command line
@@ -1384,5 +1387,6 @@ if __name__ == "__main__":
         memory_ranking_mode=args.memory_ranking_mode,
         initial_agents_path=args.initial_agents,
         shuffle_skills=args.shuffle_skills,
-        default_skill=args.default_skill
+        default_skill=args.default_skill,
+        preflight_pruning=args.preflight_pruning
     )
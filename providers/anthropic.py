@@ -10,7 +10,7 @@ Usage:
     --model anthropic:claude-sonnet-4-5-20250929
     --model claude:claude-opus-4-6
 """
-from typing import Any, Dict
+from typing import Any, Dict, List
 import os
 
 from providers.llm_provider import LLMProvider, LLMConfig, LLMResponse
@@ -59,11 +59,15 @@ class AnthropicProvider(LLMProvider):
 
     def invoke(self, prompt: str, **kwargs) -> LLMResponse:
         """Synchronously invoke Claude model."""
+        return self.invoke_messages([{"role": "user", "content": prompt}], **kwargs)
+
+    def invoke_messages(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """Synchronously invoke Claude model with a chat history."""
         response = self._client.messages.create(
             model=self.config.model,
             max_tokens=kwargs.get("max_tokens", self.config.max_tokens),
             temperature=kwargs.get("temperature", self.config.temperature),
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,
         )
 
         content = ""
@@ -46,6 +46,10 @@ class LLMProvider(ABC):
         """Asynchronously invoke the LLM."""
         ...
         
+    def supports_messages(self) -> bool:
+        """True when the provider takes a chat history via ``invoke_messages``."""
+        return callable(getattr(self, "invoke_messages", None))
+
     def validate_connection(self) -> bool:
         """Check if provider is available and properly configured."""
         return True
@@ -166,11 +170,20 @@ class RateLimitedProvider(LLMProvider):
                 await asyncio.sleep(wait)
 
     def invoke(self, prompt: str, **kwargs) -> LLMResponse:
+        return self._with_retries(self.base_provider.invoke, prompt, **kwargs)
+
+    def supports_messages(self) -> bool:
+        return self.base_provider.supports_messages()
+
+    def invoke_messages(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        return self._with_retries(self.base_provider.invoke_messages, messages, **kwargs)
+
+    def _with_retries(self, call: Callable, payload: Any, **kwargs) -> LLMResponse:
         last_exception = None
         for attempt in range(self.max_retries + 1):
             try:
                 self._wait_for_rpm()
-                return self.base_provider.invoke(prompt, **kwargs)
+                return call(payload, **kwargs)
             except Exception as e:
                 last_exception = e
                 if attempt < self.max_retries:
@@ -8,7 +8,7 @@ Supports all models available in Ollama:
 - mistral, etc.
 """
 import asyncio
-from typing import Any, Dict
+from typing import Any, Dict, List
 import httpx
 
 from providers.llm_provider import LLMProvider, LLMConfig, LLMResponse
@@ -70,6 +70,44 @@ class OllamaProvider(LLMProvider):
             raw_response=data
         )
     
+    def invoke_messages(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """Synchronously invoke Ollama model with a chat history (/api/chat).
+
+        Ollama keeps the KV cache of the previous request, so a history
+        that extends it only prefills the new turns.
+        """
+        url = f"{self.base_url}/api/chat"
+
+        payload = {
+            "model": self.config.model,
+            "messages": messages,
+            "stream": False,
+            "options": {
+                "temperature": kwargs.get("temperature", self.config.temperature),
+                "num_predict": kwargs.get("max_tokens", self.config.max_tokens),
+            }
+        }
+        payload["options"].update(self.config.extra_params)
+
+        response = self._client.post(url, json=payload)
+        response.raise_for_status()
+
+        data = response.json()
+
+        return LLMResponse(
+            content=(data.get("message") or {}).get("content", ""),
+            model=self.config.model,
+            usage={
+                "prompt_tokens": data.get("prompt_eval_count", 0),
+                "completion_tokens": data.get("eval_count", 0),
+            },
+            metadata={
+                "total_duration": data.get("total_duration", 0),
+                "load_duration": data.get("load_duration", 0),
+            },
+            raw_response=data
+        )
+
     async def ainvoke(self, prompt: str, **kwargs) -> LLMResponse:
         """Asynchronously invoke Ollama model."""
         if self._async_client is None:
@@ -6,7 +6,7 @@ Supports:
 - gpt-3.5-turbo
 - And OpenAI-compatible APIs (Azure, local deployments)
 """
-from typing import Any, Dict
+from typing import Any, Dict, List
 import os
 
 from providers.llm_provider import LLMProvider, LLMConfig, LLMResponse
@@ -18,6 +18,22 @@ except ImportError:
     OPENAI_AVAILABLE = False
 
 
+def _usage(usage: Any) -> Dict[str, int]:
+    """Token counts of a completion; ``cached_prompt_tokens`` only when reported."""
+    if not usage:
+        return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    counts = {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+    }
+    # Prompt caching (OpenAI, vLLM, llama.cpp server): part of prompt_tokens
+    cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+    if cached is not None:
+        counts["cached_prompt_tokens"] = cached
+    return counts
+
+
 class OpenAIProvider(LLMProvider):
     """
     LLM Provider for OpenAI API.
@@ -55,8 +71,14 @@ class OpenAIProvider(LLMProvider):
     
     def invoke(self, prompt: str, **kwargs) -> LLMResponse:
         """Synchronously invoke OpenAI model."""
-        messages = [{"role": "user", "content": prompt}]
-        
+        return self.invoke_messages([{"role": "user", "content": prompt}], **kwargs)
+
+    def invoke_messages(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """Synchronously invoke OpenAI model with a chat history.
+
+        Used for continuation retries: an unchanged message prefix lets
+        the API's prompt caching skip re-processing it.
+        """
         response = self._client.chat.completions.create(
             model=self.config.model,
             messages=messages,
@@ -69,11 +91,7 @@ class OpenAIProvider(LLMProvider):
         return LLMResponse(
             content=choice.message.content or "",
             model=response.model,
-            usage={
-                "prompt_tokens": response.usage.prompt_tokens if response.usage else 0,
-                "completion_tokens": response.usage.completion_tokens if response.usage else 0,
-                "total_tokens": response.usage.total_tokens if response.usage else 0,
-            },
+            usage=_usage(response.usage),
             metadata={
                 "finish_reason": choice.finish_reason,
                 "id": response.id,
@@ -97,11 +115,7 @@ class OpenAIProvider(LLMProvider):
         return LLMResponse(
             content=choice.message.content or "",
             model=response.model,
-            usage={
-                "prompt_tokens": response.usage.prompt_tokens if response.usage else 0,
-                "completion_tokens": response.usage.completion_tokens if response.usage else 0,
-                "total_tokens": response.usage.total_tokens if response.usage else 0,
-            },
+            usage=_usage(response.usage),
             metadata={
                 "finish_reason": choice.finish_reason,
                 "id": response.id,
@@ -0,0 +1,87 @@
+"""Batched execution: one sim_engine.execute_skills() call per phase."""
+import pytest
+
+from broker.components.memory.engine import WindowMemoryEngine
+from broker.core.experiment import ExperimentBuilder
+
+from tests.fixtures.fake_traffic import (
+    AGENT_TYPES, SKILL_REGISTRY, TrafficSimulation, commuters, decisions, read_traces, route_closed,
+)
+
+N_AGENTS = 5
+
+
+class RecordingTraffic(TrafficSimulation):
+    """Records every skill it executes, and each execute_skills batch."""
+
+    def __init__(self):
+        super().__init__()
+        self.executed = []
+        self.batches = []
+
+    def execute_skill(self, approved_skill):
+        self.executed.append((approved_skill.agent_id, approved_skill.skill_name))
+        return super().execute_skill(approved_skill)
+
+    def execute_skills(self, approved_skills):
+        self.batches.append([s.agent_id for s in approved_skills])
+        return [self.execute_skill(s) for s in approved_skills]
+
+
+def _builder(output_dir, sim, batched, validators=()):
+    return (
+        ExperimentBuilder()
+        .with_model("mock")
+        .with_years(2)
+        .with_agents(commuters(N_AGENTS))
+        .with_simulation(sim)
+        .with_skill_registry(str(SKILL_REGISTRY))
+        .with_memory_engine(WindowMemoryEngine(window_size=3))
+        .with_governance("strict", str(AGENT_TYPES))
+        .with_custom_validators(list(validators))
+        .with_exact_output(str(output_dir))
+        .with_seed(42)
+        .with_batched_execution(batched)
+    )
+
+
+def _run(output_dir, batched, validators):
+    sim = RecordingTraffic()
+    runner = _builder(output_dir, sim, batched, validators).build()
+    runner.run()
+    return runner, sim
+
+
+# Without a validator the mock's choice is approved; route_closed rejects
+# it, so the registry's default skill is executed as the fallback.
+@pytest.mark.parametrize("validators", [(), (route_closed,)], ids=["approved", "rejected"])
+def test_matches_per_skill_execution(tmp_path, validators):
+    runner, sim = _run(tmp_path / "batched", True, validators)
+    base_runner, base_sim = _run(tmp_path / "single", False, validators)
+
+    ids = [f"commuter_{i}" for i in range(1, N_AGENTS + 1)]
+    assert sim.batches == [ids, ids]
+    assert base_sim.batches == []
+    assert sim.executed == base_sim.executed
+    assert decisions(tmp_path / "batched") == decisions(tmp_path / "single")
+    outcomes = lambda d: [(t["agent_id"], t["outcome"], t["execution_result"]) for t in read_traces(d)]
+    assert outcomes(tmp_path / "batched") == outcomes(tmp_path / "single")
+    for aid in ids:
+        assert runner.agents[aid].get_all_state() == base_runner.agents[aid].get_all_state()
+
+
+def test_failed_batch_aborts_the_phase(tmp_path):
+    class BrokenTraffic(RecordingTraffic):
+        def execute_skills(self, approved_skills):
+            raise RuntimeError("basin model diverged")
+
+    runner = _builder(tmp_path, BrokenTraffic(), batched=True).build()
+    runner.run()
+    traces = read_traces(tmp_path)
+    assert len(traces) == 2 * N_AGENTS
+    assert {t["outcome"] for t in traces} == {"ABORTED"}
+
+
+def test_build_requires_execute_skills(tmp_path):
+    with pytest.raises(ValueError, match="execute_skills"):
+        _builder(tmp_path, TrafficSimulation(), batched=True).build()
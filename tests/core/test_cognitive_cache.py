@@ -5,10 +5,13 @@ Covers: hash stability, cache hit/miss, eviction, invalidation,
 persistence round-trip, and stats tracking.
 """
 import json
+import os
+import subprocess
+import sys
 import pytest
 from pathlib import Path
 
-from broker.core.efficiency import CognitiveCache
+from broker.core.efficiency import CognitiveCache, ContextDigester
 
 
 # ---------------------------------------------------------------------------
@@ -155,3 +158,80 @@ class TestCachePersistence:
         assert save_path.exists()
         data = json.loads(save_path.read_text(encoding="utf-8"))
         assert "h1" in data["cache"]
+
+
+# ---------------------------------------------------------------------------
+# Section digests
+# ---------------------------------------------------------------------------
+
+def _context(year=1):
+    return {
+        "agent_id": "a1",
+        "agent_type": "household",
+        "personal": {"id": "a1", "income": 50000, "memory": ["flood in year 0", "bought insurance"]},
+        "state": {"flooded": False, "savings": 50000},
+        "local": {"social": ["neighbour elevated"], "spatial": {}},
+        "environment_context": {"current_year": year, "flood": year % 2 == 0},
+        "available_skills": ["do_nothing", "elevate_house"],
+    }
+
+
+_STABLE_SCRIPT = (
+    "from broker.core.efficiency import CognitiveCache, ContextDigester\n"
+    "from tests.core.test_cognitive_cache import _context\n"
+    "print(ContextDigester().context_hash(_context()), CognitiveCache().compute_hash(_context()))"
+)
+
+
+class TestContextDigester:
+    """Tests for memoised per-section context hashing."""
+
+    def test_hashes_stable_across_processes(self):
+        root = Path(__file__).resolve().parents[2]
+        outputs = set()
+        for seed in ("0", "1"):
+            env = {**os.environ, "PYTHONHASHSEED": seed}
+            out = subprocess.run(
+                [sys.executable, "-c", _STABLE_SCRIPT], cwd=root, env=env,
+                capture_output=True, text=True, check=True,
+            ).stdout.split()
+            outputs.add(tuple(out))
+        assert outputs == {(ContextDigester().context_hash(_context()),
+                            CognitiveCache().compute_hash(_context()))}
+
+    def test_unchanged_sections_reuse_digests(self):
+        digester = ContextDigester()
+        first = digester.context_hash(_context())
+        misses = digester.misses
+        assert digester.context_hash(_context()) == first
+        assert digester.misses == misses
+
+        changed = _context(year=2)
+        assert digester.context_hash(changed) != first
+        assert digester.misses == misses + 1  # only environment_context
+
+    def test_in_place_mutation_and_history_independence(self):
+        digester = ContextDigester()
+        ctx = _context()
+        before = digester.context_hash(ctx)
+        ctx["personal"]["memory"].append("neighbour flooded")
+        after = digester.context_hash(ctx)
+        assert after != before
+        assert after == ContextDigester().context_hash(ctx)
+
+    def test_equal_values_of_other_types_do_not_reuse_digests(self):
+        digester = ContextDigester()
+        digester.section_digest("a1", "state", {"x": 1})
+        after_int = digester.section_digest("a1", "state", {"x": 1.0})
+        assert after_int == ContextDigester().section_digest("a1", "state", {"x": 1.0})
+        assert after_int != ContextDigester().section_digest("a1", "state", {"x": 1})
+        assert digester.misses == 2
+
+    def test_cache_key_shares_digester_sections(self):
+        cache = CognitiveCache()
+        key = cache.compute_hash(_context())
+        misses = cache.digester.misses
+        cache.digester.context_hash(_context())
+        # state, environment_context and personal.memory were already digested
+        assert cache.digester.misses == misses + len(_context()) - 2
+        assert cache.compute_hash(_context()) == key
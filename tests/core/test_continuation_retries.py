@@ -0,0 +1,82 @@
+"""Governance retries sent as a continuation of the original conversation."""
+import json
+import os
+
+import pytest
+
+from broker.components.memory.engine import WindowMemoryEngine
+from broker.core.experiment import ExperimentBuilder
+from broker.utils.llm_utils import LLMStats, _render_messages, create_llm_invoke
+
+from tests.fixtures.fake_traffic import (
+    AGENT_TYPES, SKILL_REGISTRY, TrafficSimulation, commuters, read_traces, route_closed,
+)
+
+
+class _CachingModel:
+    """Mock model that, like a KV cache, only counts tokens past the last request's prefix."""
+
+    def __init__(self, continuation):
+        self.mock = create_llm_invoke("mock")
+        self.last = ""
+        if continuation:
+            self.chat = lambda messages: self._call(_render_messages(messages))
+
+    def _call(self, text):
+        cached = len(os.path.commonprefix([text, self.last]))
+        self.last = text
+        content, _ = self.mock(text)
+        return content, LLMStats(prompt_tokens=max(1, (len(text) - cached) // 4), num_ctx=4096)
+
+    def __call__(self, prompt):
+        return self._call(prompt)
+
+
+def _run(output_dir, continuation):
+    runner = (
+        ExperimentBuilder()
+        .with_model("mock")
+        .with_years(1)
+        .with_agents(commuters(1))
+        .with_simulation(TrafficSimulation())
+        .with_skill_registry(str(SKILL_REGISTRY))
+        .with_memory_engine(WindowMemoryEngine(window_size=3))
+        .with_governance("strict", str(AGENT_TYPES))
+        .with_custom_validators([route_closed])
+        .with_exact_output(str(output_dir))
+        .with_seed(42)
+    ).build()
+    runner._llm_cache["commuter"] = _CachingModel(continuation)
+    runner.run()
+    return read_traces(output_dir)[0]
+
+
+def test_continuation_retries_only_send_the_new_turns(tmp_path):
+    fresh = _run(tmp_path / "fresh", continuation=False)
+    cont = _run(tmp_path / "cont", continuation=True)
+
+    # Same decision path; the mock keeps picking the blocked first option
+    assert cont["retry_count"] == fresh["retry_count"] == 2
+    assert cont["approved_skill"] == fresh["approved_skill"]
+
+    fresh_tokens = fresh["llm_stats"]["retry_prompt_tokens"]
+    cont_tokens = cont["llm_stats"]["retry_prompt_tokens"]
+    assert len(fresh_tokens) == len(cont_tokens) == 2
+    # A fresh retry puts the feedback first, so nothing of the original prompt is reused
+    assert fresh_tokens[0] >= len(fresh["input"]) // 4
+    assert cont_tokens[0] * 2 < fresh_tokens[0]
+    assert cont["llm_stats"]["retry_mode"] == "continuation"
+    assert "retry_mode" not in fresh["llm_stats"]
+
+
+def test_retry_mode_configures_chat_support():
+    assert not hasattr(create_llm_invoke("mock"), "chat")
+    invoke = create_llm_invoke("mock", overrides={"retry_mode": "continuation"})
+    content, _ = invoke.chat([
+        {"role": "user", "content": "Options:\n1. carpool\n2. do_nothing"},
+        {"role": "assistant", "content": '{"decision": 1}'},
+        {"role": "user", "content": "Your previous response was flagged."},
+    ])
+    assert json.loads(content) == {"decision": 1}
+    with pytest.raises(ValueError):
+        create_llm_invoke("mock", overrides={"retry_mode": "resume"})
@@ -0,0 +1,69 @@
+"""Live readiness tracking and early stopping in ExperimentRunner."""
+import json
+import random
+from pathlib import Path
+
+import yaml
+
+from broker.components.memory.engine import WindowMemoryEngine
+from broker.core.experiment import ExperimentBuilder
+from broker.components.validation.readiness_profile import load_readiness_profile
+from broker.tools.readiness_report import compute_readiness_report
+
+from .test_experiment_checkpoint import (
+    _FIXTURE_DIR, YEARS, _StochasticTraffic, _agents, _mock_llm, _traces,
+)
+
+
+def _build(output_dir, **readiness):
+    random.seed(42)
+    return (
+        ExperimentBuilder()
+        .with_model("mock")
+        .with_years(YEARS)
+        .with_agents(_agents())
+        .with_simulation(_StochasticTraffic())
+        .with_skill_registry(str(_FIXTURE_DIR / "traffic_skill_registry.yaml"))
+        .with_memory_engine(WindowMemoryEngine(window_size=3))
+        .with_governance("strict", str(_FIXTURE_DIR / "traffic_agent_types.yaml"))
+        .with_exact_output(str(output_dir))
+        .with_workers(1)
+        .with_seed(42)
+        .with_readiness_monitor(**readiness)
+    ).build()
+
+
+def test_live_snapshot_matches_post_hoc_report(tmp_path):
+    runner = _build(tmp_path, profile="functional", snapshot_every=5)
+    runner.run(llm_invoke=_mock_llm)
+
+    snapshot = json.loads((tmp_path / "readiness_live.json").read_text(encoding="utf-8"))
+    assert snapshot["n_decisions"] == YEARS * 3
+    assert snapshot["stop_reason"] is None
+    report = compute_readiness_report(tmp_path, load_readiness_profile("functional"))
+    live = runner.readiness_tracker.metrics()
+    assert live.approval_rate == report.metrics.approval_rate
+    assert live.terminal_taxonomy == report.metrics.terminal_taxonomy
+    assert live.distinct_actions == report.metrics.distinct_actions
+    assert live.retry_distribution == report.metrics.retry_distribution
+
+
+def test_early_stop_at_year_boundary(tmp_path):
+    profile_yaml = tmp_path / "profiles.yaml"
+    profile_yaml.write_text(yaml.safe_dump({"profiles": {"functional": {
+        "description": "unreachable approval bar",
+        "thresholds": {"min_approval_rate": 1.5},
+    }}}), encoding="utf-8")
+    out = tmp_path / "run"
+    runner = _build(
+        out, profile="functional", profile_yaml=str(profile_yaml),
+        snapshot_every=3, early_stop=True, min_decisions=3,
+    )
+    runner.run(llm_invoke=_mock_llm)
+
+    assert runner.readiness_tracker.should_stop
+    assert len(_traces(out)) == 3  # year 1 only
+    summary = json.loads((out / "audit_summary.json").read_text(encoding="utf-8"))
+    assert "approval_rate" in summary["readiness_early_stop"]
+    snapshot = json.loads((out / "readiness_live.json").read_text(encoding="utf-8"))
+    assert snapshot["stop_reason"] == summary["readiness_early_stop"]
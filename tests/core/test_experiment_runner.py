@@ -340,6 +340,113 @@ class TestPhaseExecution:
         assert execution_order == ["gov1", "hh1"]
 
 
+class TestPhaseOrchestratorWaves:
+    """DAG phase scheduling via ExperimentRunner(phase_orchestrator=...)."""
+
+    @staticmethod
+    def _orchestrator(household_ordering="parallel"):
+        from broker.components.orchestration.phases import PhaseOrchestrator
+        from broker.interfaces.coordination import ExecutionPhase, PhaseConfig
+        return PhaseOrchestrator(phases=[
+            PhaseConfig(phase=ExecutionPhase.INSTITUTIONAL, agent_types=["government"]),
+            PhaseConfig(phase=ExecutionPhase.HOUSEHOLD, agent_types=["household"],
+                        ordering=household_ordering, max_workers=3),
+            PhaseConfig(phase=ExecutionPhase.OBSERVATION, agent_types=["observer"],
+                        depends_on=[ExecutionPhase.INSTITUTIONAL, ExecutionPhase.HOUSEHOLD]),
+        ])
+
+    @staticmethod
+    def _agents():
+        agents = {"gov1": _make_agent("gov1", "government")}
+        agents.update({f"hh{i}": _make_agent(f"hh{i}", "household") for i in range(4)})
+        agents["obs1"] = _make_agent("obs1", "observer")
+        return agents
+
+    def _run(self, tmp_path, broker, config=None, **kwargs):
+        post_steps = []
+        runner = ExperimentRunner(
+            broker=broker,
+            sim_engine=MagicMock(advance_year=lambda: {}),
+            agents=self._agents(),
+            config=ExperimentConfig(num_years=1, output_dir=tmp_path, **(config or {})),
+            hooks={"post_step": lambda agent, result: post_steps.append(agent.id)},
+            phase_orchestrator=self._orchestrator(**kwargs),
+        )
+        runner.run(llm_invoke=MagicMock())
+        return runner, post_steps
+
+    def test_independent_phases_overlap(self, tmp_path):
+        import threading
+        # The government call only returns once a household call has started.
+        household_started = threading.Event()
+
+        def process_step(agent_id, **kwargs):
+            if agent_id == "gov1":
+                assert household_started.wait(timeout=5), "phases did not overlap"
+            elif agent_id.startswith("hh"):
+                household_started.set()
+            return _make_approved_result(agent_id)
+
+        broker = _make_mock_broker()
+        broker.process_step.side_effect = process_step
+        _, post_steps = self._run(tmp_path, broker)
+        assert post_steps == ["gov1", "hh0", "hh1", "hh2", "hh3", "obs1"]
+
+    def test_merge_and_audit_order_are_deterministic(self, tmp_path):
+        import random as _random
+        import time
+
+        def process_step(agent_id, step_id, **kwargs):
+            time.sleep(_random.random() * 0.01)
+            broker.audit_writer.write_trace("t", {"agent_id": agent_id, "step_id": step_id})
+            return _make_approved_result(agent_id)
+
+        broker = _make_mock_broker()
+        broker.process_step.side_effect = process_step
+        real_writer = broker.audit_writer
+        runner, post_steps = self._run(tmp_path, broker)
+
+        written = [c.args[1] for c in real_writer.write_trace.call_args_list]
+        assert [t["agent_id"] for t in written] == post_steps
+        assert [t["step_id"] for t in written] == list(range(1, 7))
+        assert runner.step_counter == 6
+        assert broker.audit_writer is real_writer
+
+    def test_observer_wave_sees_merged_state(self, tmp_path):
+        seen = {}
+
+        def process_step(agent_id, **kwargs):
+            if agent_id == "obs1":
+                seen["calls_before"] = broker.process_step.call_count
+            return _make_approved_result(agent_id)
+
+        broker = _make_mock_broker()
+        broker.process_step.side_effect = process_step
+        self._run(tmp_path, broker, household_ordering="sequential")
+        assert seen["calls_before"] == 6  # gov + 4 households already done
+
+    @pytest.mark.parametrize("config, method", [
+        ({"pack_decisions": 2}, "_run_agents_packed"),
+        ({"process_workers": 2}, "_run_agents_processes"),
+    ])
+    def test_phases_use_configured_dispatch_mode(self, tmp_path, config, method):
+        phases = []
+
+        def run(runner, agents, run_id, env, step_ids=None):
+            phases.append(([a.id for a in agents], step_ids))
+            return [(a, _make_approved_result(a.id)) for a in agents]
+
+        with patch.object(ExperimentRunner, method, autospec=True, side_effect=run):
+            _, post_steps = self._run(tmp_path, _make_mock_broker(), config=config)
+        # One call per phase, phases of a wave one after another
+        assert phases == [
+            (["gov1"], [1]),
+            (["hh0", "hh1", "hh2", "hh3"], [2, 3, 4, 5]),
+            (["obs1"], [6]),
+        ]
+        assert post_steps == ["gov1", "hh0", "hh1", "hh2", "hh3", "obs1"]
+
+
 # ---------------------------------------------------------------------------
 # State changes
 # ---------------------------------------------------------------------------
@@ -0,0 +1,149 @@
+"""Packed decisions: several same-type agents per LLM call."""
+import json
+import threading
+import time
+
+from broker.components.memory.engine import WindowMemoryEngine
+from broker.core.experiment import ExperimentBuilder
+from broker.core.packed_decisions import (
+    PackedDecisionBatch, build_packed_prompt, split_packed_response,
+)
+from broker.utils.llm_utils import LLMStats, create_llm_invoke
+
+from tests.fixtures.fake_traffic import (
+    AGENT_TYPES, SKILL_REGISTRY, TrafficSimulation, commuters, decisions,
+)
+
+
+def _build(output_dir, n_agents, pack=0):
+    return (
+        ExperimentBuilder()
+        .with_model("mock")
+        .with_years(1)
+        .with_agents(commuters(n_agents))
+        .with_simulation(TrafficSimulation())
+        .with_skill_registry(str(SKILL_REGISTRY))
+        .with_memory_engine(WindowMemoryEngine(window_size=3))
+        .with_governance("strict", str(AGENT_TYPES))
+        .with_exact_output(str(output_dir))
+        .with_seed(42)
+        .with_packed_decisions(pack)
+    ).build()
+
+
+def _slow(invoke, delay, calls):
+    def slow_invoke(prompt):
+        calls.append(prompt)
+        time.sleep(delay)
+        return invoke(prompt)
+    return slow_invoke
+
+
+def test_packed_prompt_round_trip():
+    shared = "You are a commuter.\n\nOptions:\n1. carpool\n2. do_nothing"
+    prompt = build_packed_prompt({
+        "a1": f"{shared}\n\nYour delay is 10 minutes.",
+        "a2": f"{shared}\n\nYour delay is 50 minutes.",
+    })
+    assert prompt.count("You are a commuter.") == 1
+    assert "### Agent a1\nYour delay is 10 minutes." in prompt
+    assert prompt.index("### Agent a1") < prompt.index("### Agent a2")
+
+    raw = 'Sure:\n[{"agent_id": "A2", "decision": 2}, {"agent_id": "a1", "decision": 1},]'
+    parts = split_packed_response(raw, ["a1", "a2"])
+    assert {k: json.loads(v) for k, v in parts.items()} == {"a1": {"decision": 1}, "a2": {"decision": 2}}
+
+    # Positional when no ids; a truncated array keeps the objects that completed
+    assert json.loads(split_packed_response('[{"decision": 3}, {"decision": 4}]', ["x", "y"])["y"]) == {"decision": 4}
+    truncated = split_packed_response('[{"agent_id": "x", "decision": 3}, {"agent_id": "y", "dec', ["x", "y"])
+    assert json.loads(truncated["x"]) == {"decision": 3} and truncated["y"] is None
+
+
+def test_batch_makes_one_call_and_reasks_only_missing_agents():
+    calls = []
+
+    def invoke(prompt):
+        calls.append(prompt)
+        if "### Agent" in prompt:  # leaves out agent "c"
+            body = [{"agent_id": aid, "decision": 1} for aid in ("a", "b", "d")]
+            return json.dumps(body), LLMStats(prompt_tokens=400, response_tokens=40)
+        return '{"decision": 2}', LLMStats(prompt_tokens=100)
+
+    batch = PackedDecisionBatch(["a", "b", "c", "d", "e"], invoke)
+    answers = {}
+
+    def agent(aid):
+        try:
+            if aid == "e":
+                return  # e.g. a cache hit: never calls the LLM
+            invoke_a = batch.invoke_for(aid)
+            answers[aid] = invoke_a(f"shared\n\nI am {aid}")
+            if aid == "a":  # a governance retry goes straight to the model
+                answers["a_retry"] = invoke_a("retry")
+        finally:
+            batch.withdraw(aid)
+
+    threads = [threading.Thread(target=agent, args=(aid,)) for aid in "abcde"]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert batch.to_dict() == {"packed_calls": 1, "individual_calls": 2}
+    assert sum("### Agent" in p for p in calls) == 1
+    assert json.loads(answers["b"][0]) == {"decision": 1}
+    assert answers["b"][1].prompt_tokens == 100
+    assert answers["c"][0] == '{"decision": 2}'
+    assert answers["a_retry"][0] == '{"decision": 2}'
+
+
+def test_packed_run_matches_per_agent_run_with_fewer_calls(tmp_path):
+    n_agents, delay = 6, 0.05
+
+    def timed_run(output_dir, pack):
+        runner = _build(output_dir, n_agents, pack=pack)
+        calls = []
+        runner._llm_cache["commuter"] = _slow(create_llm_invoke("mock"), delay, calls)
+        start = time.perf_counter()
+        runner.run()
+        return runner, calls, time.perf_counter() - start
+
+    _, single_calls, single_s = timed_run(tmp_path / "single", 0)
+    runner, packed_calls, packed_s = timed_run(tmp_path / "packed", 3)
+
+    assert decisions(tmp_path / "packed") == decisions(tmp_path / "single")
+    assert len(decisions(tmp_path / "packed")) == n_agents
+    assert (len(single_calls), len(packed_calls)) == (n_agents, 2)
+    assert runner.packed_stats == {"packed_calls": 2, "individual_calls": 0}
+    assert packed_s < single_s
+    manifest = json.loads((tmp_path / "packed" / "reproducibility_manifest.json").read_text())
+    assert manifest["packed_decisions"]["group_size"] == 3
+
+
+def test_packed_run_executes_on_runner_thread_behind_concurrency_gate(tmp_path):
+    from broker.utils.performance_tuner import AdaptiveConcurrencyConfig, AdaptiveConcurrencyController
+
+    runner = _build(tmp_path, 4, pack=2)
+    threads, execute = set(), runner.sim_engine.execute_skill
+
+    def execute_skill(approved_skill):
+        threads.add(threading.current_thread().name)
+        return execute(approved_skill)
+
+    runner.sim_engine.execute_skill = execute_skill
+    runner.concurrency = AdaptiveConcurrencyController(AdaptiveConcurrencyConfig(min_limit=1, max_limit=2))
+    runner._llm_cache["commuter"] = create_llm_invoke("mock")
+    runner.run()
+
+    assert threads == {threading.current_thread().name}
+    assert runner.packed_stats == {"packed_calls": 2, "individual_calls": 0}
+    assert runner.concurrency.calls == 2
+    assert [aid for aid, _, _ in decisions(tmp_path)] == [f"commuter_{i}" for i in range(1, 5)]
+
+
+def test_speculative_drafting_is_off_when_packing(tmp_path):
+    runner = _build(tmp_path, 2, pack=2)
+    runner.broker.config.get_llm_params = lambda agent_type: {"speculative": {"enabled": True}}
+    runner.get_llm_invoke("commuter")
+    assert runner.drafters == {}
+    assert runner.drafting_disabled == {"commuter": "pack_decisions"}
@@ -0,0 +1,136 @@
+"""Prefix-cache-aware scheduling: dispatch order, result order, reuse stats."""
+import json
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+from broker.components.context.tiered import create_context_builder
+from broker.components.memory.engine import WindowMemoryEngine
+from broker.core.experiment import ExperimentBuilder
+from broker.core.prefix_scheduling import PrefixReuseStats, PrefixScheduler
+from broker.utils.llm_utils import LLMStats, create_llm_invoke
+
+from tests.fixtures.fake_traffic import (
+    AGENT_TYPES, SKILL_REGISTRY, TrafficSimulation, commuters, read_traces,
+)
+
+
+def _agent(agent_type, persona=""):
+    return SimpleNamespace(agent_type=agent_type, config=SimpleNamespace(persona=persona))
+
+
+class _OneSlotCache:
+    """Mock model with a single-slot prompt cache, reporting cached tokens like OpenAI."""
+
+    def __init__(self):
+        self.mock = create_llm_invoke("mock")
+        self.last = ""
+        self.prompts = []
+
+    def __call__(self, prompt):
+        cached = len(os.path.commonprefix([prompt, self.last])) // 4
+        self.last = prompt
+        self.prompts.append(prompt)
+        content, _ = self.mock(prompt)
+        return content, LLMStats(prompt_tokens=max(1, len(prompt) // 4), cached_prompt_tokens=cached)
+
+
+def _interleaved():
+    from broker.agents import AgentConfig, BaseAgent
+    from broker.agents.base import Skill, StateParam
+
+    state = [StateParam("advisories_issued", (0, 365), 0.0, "Advisories issued")]
+    advisory = Skill("announce_advisory", "Issue an advisory", "advisories_issued", "increase")
+    agents = {}
+    for i, commuter in enumerate(commuters(3).values(), start=1):
+        agents[commuter.name] = commuter
+        agents[f"dispatcher_{i}"] = BaseAgent(AgentConfig(
+            name=f"dispatcher_{i}", agent_type="dispatcher", state_params=state,
+            objectives=[], constraints=[], skills=[advisory],
+        ))
+    return agents
+
+
+def _run(output_dir, scheduled):
+    agents = _interleaved()
+    memory = WindowMemoryEngine(window_size=3)
+    builder = (
+        ExperimentBuilder()
+        .with_model("mock")
+        .with_years(1)
+        .with_agents(agents)
+        .with_simulation(TrafficSimulation())
+        .with_context_builder(create_context_builder(agents, yaml_path=str(AGENT_TYPES), memory_engine=memory))
+        .with_skill_registry(str(SKILL_REGISTRY))
+        .with_memory_engine(memory)
+        .with_governance("strict", str(AGENT_TYPES))
+        .with_exact_output(str(output_dir))
+        .with_seed(42)
+    )
+    if scheduled:
+        builder = builder.with_prefix_scheduling()
+    runner = builder.build()
+    model = _OneSlotCache()
+    runner._llm_cache["commuter"] = runner._llm_cache["dispatcher"] = model
+    applied = []
+    runner.hooks["post_step"] = lambda agent, result: applied.append(agent.name)
+    runner.run()
+
+    decisions = {
+        t["agent_id"]: (t["step_id"], t["approved_skill"]["skill_name"])
+        for agent_type in ("commuter", "dispatcher")
+        for t in read_traces(output_dir, agent_type)
+    }
+    manifest = json.loads((Path(output_dir) / "reproducibility_manifest.json").read_text(encoding="utf-8"))
+    return list(agents), model, applied, decisions, manifest
+
+
+def test_order_groups_by_template_type_and_persona():
+    agents = [_agent("a", "p"), _agent("b"), _agent("a", "q"), _agent("c"), _agent("a", "p"), _agent("b")]
+    scheduler = PrefixScheduler(templates={"a": "shared", "b": "other", "c": "shared"})
+
+    # a and c share a template, so c follows a's personas before b
+    assert scheduler.order(agents) == [0, 4, 2, 3, 1, 5]
+    assert scheduler.to_dict()["groups_dispatched"] == 4
+    assert PrefixScheduler().order(agents) == [0, 4, 2, 1, 5, 3]
+
+    custom = [SimpleNamespace(agent_type="a", fixed_attributes={"tier": t}) for t in "xyx"]
+    assert PrefixScheduler(persona_attribute="tier").order(custom) == [0, 2, 1]
+
+
+def test_reuse_stats_per_agent_type():
+    stats = PrefixReuseStats()
+    stats.record("a", LLMStats(prompt_tokens=100, cached_prompt_tokens=80))
+    stats.record("a", LLMStats(prompt_tokens=100, cached_prompt_tokens=0))
+    stats.record("b", LLMStats(prompt_tokens=50, prefill_ms=12.5))
+    summary = stats.to_dict()
+
+    assert stats.reported
+    assert summary["calls"] == 3 and summary["prompt_tokens"] == 250
+    assert summary["by_agent_type"]["a"]["prefix_reuse_rate"] == 0.4
+    assert summary["by_agent_type"]["b"] == {
+        "calls": 1, "prompt_tokens": 50, "prefill_ms_total": 12.5, "prefill_ms_mean": 12.5,
+    }
+    assert not PrefixReuseStats().reported
+
+
+def test_scheduled_run_reuses_prefixes_without_changing_decisions(tmp_path):
+    names, _, plain_applied, plain, plain_manifest = _run(tmp_path / "plain", scheduled=False)
+    _, model, applied, scheduled, manifest = _run(tmp_path / "scheduled", scheduled=True)
+
+    # Requests go out grouped by type, results are applied in population order
+    first_lines = [p.splitlines()[0] for p in model.prompts]
+    assert len(set(first_lines[:3])) == len(set(first_lines[3:])) == 1
+    assert len({first_lines[0], first_lines[3]}) == 2
+    assert applied == plain_applied == names
+    # Step ids (so seeds) and decisions follow the agent, not the dispatch slot
+    assert scheduled == plain and len(scheduled) == 6
+
+    reuse, plain_reuse = manifest["prefix_reuse"], plain_manifest["prefix_reuse"]
+    assert reuse["calls"] == plain_reuse["calls"] == 6
+    assert reuse["prefix_reuse_rate"] > plain_reuse["prefix_reuse_rate"]
+    assert set(reuse["by_agent_type"]) == {"commuter", "dispatcher"}
+    assert manifest["prefix_scheduling"] == {
+        "persona_attribute": None, "groups_dispatched": 2, "agents_dispatched": 6,
+    }
+    assert "prefix_scheduling" not in plain_manifest
@@ -0,0 +1,140 @@
+"""Pre-flight pruning: skills blocked on state alone are not offered."""
+from pathlib import Path
+
+from broker.components.memory.engine import WindowMemoryEngine
+from broker.core.experiment import ExperimentBuilder
+from broker.interfaces.skill_types import ValidationResult
+from broker.validators.governance import state_only
+from broker.utils.llm_utils import create_llm_invoke
+
+from tests.fixtures.fake_traffic import (
+    AGENT_TYPES, SKILL_REGISTRY, TrafficSimulation, commuters, read_traces, route_closed,
+)
+
+N_AGENTS = 4
+
+
+def _run(output_dir, pruning):
+    runner = (
+        ExperimentBuilder()
+        .with_model("mock")
+        .with_years(2)
+        .with_agents(commuters(N_AGENTS))
+        .with_simulation(TrafficSimulation())
+        .with_skill_registry(str(SKILL_REGISTRY))
+        .with_memory_engine(WindowMemoryEngine(window_size=3))
+        .with_governance("strict", str(AGENT_TYPES))
+        .with_custom_validators([route_closed])
+        .with_exact_output(str(output_dir))
+        .with_seed(42)
+        .with_preflight_pruning(pruning)
+    ).build()
+    prompts = []
+    mock = create_llm_invoke("mock")
+
+    def invoke(prompt):
+        prompts.append(prompt)
+        return mock(prompt)
+
+    runner._llm_cache["commuter"] = invoke
+    runner.run()
+    return read_traces(output_dir), prompts
+
+
+def test_pruning_removes_blocked_option_and_governance_retries(tmp_path):
+    plain, plain_prompts = _run(tmp_path / "plain", False)
+    pruned, pruned_prompts = _run(tmp_path / "pruned", True)
+
+    # The mock picks the first option: without pruning that is the closed route
+    assert all(t["retry_count"] > 0 for t in plain)
+    assert "preflight_pruned" not in plain[0]
+    assert sum(t["retry_count"] for t in pruned) == 0
+    assert len(pruned_prompts) == 2 * N_AGENTS < len(plain_prompts)
+
+    assert {t["approved_skill"]["skill_name"] for t in pruned} == {"delay_departure"}
+    assert pruned[0]["preflight_pruned"] == {"take_alternate_route": ["route_closed"]}
+    assert all("take_alternate_route" not in p for p in pruned_prompts)
+
+
+def test_pruning_keeps_options_when_everything_is_blocked(tmp_path):
+    from broker.core.skill_broker_engine import SkillBrokerEngine
+
+    @state_only
+    def all_closed(proposal, context, skill_registry=None):
+        return [ValidationResult(valid=False, validator_name="AllClosed", errors=["closed"])]
+
+    engine = SkillBrokerEngine.__new__(SkillBrokerEngine)
+    engine.validators = []
+    engine.custom_validators = [all_closed]
+    engine.skill_registry = None
+    engine.config = None
+    context = {"agent_id": "a", "state": {}}
+    assert engine._preflight_prune(context, "commuter", ["x", "y"], {}) == ["x", "y"]
+    assert "preflight_pruned" not in context
+
+
+def test_agent_validator_preflight_uses_state_thinking_rules(monkeypatch):
+    from broker.interfaces.skill_types import SkillProposal
+    from broker.validators import AgentValidator
+
+    monkeypatch.setenv("GOVERNANCE_PROFILE", "strict")
+    config = Path(__file__).resolve().parents[2] / "examples" / "quickstart" / "agent_types.yaml"
+    validator = AgentValidator(str(config))
+    proposal = SkillProposal("take_action", "a1", {}, "simple_agent")
+
+    def rules_hit(state):
+        results = validator.preflight(proposal, {"agent_type": "simple_agent", "state": state})
+        return [r.metadata["rules_hit"] for r in results if not r.valid]
+
+    assert rules_hit({"protected": 1}) == [["already_protected"]]
+    assert rules_hit({"protected": 0}) == []
+    assert rules_hit({}) == []  # construct not in state: left to post-hoc validation
+
+
+def test_agent_validator_preflight_runs_domain_state_only_checks(monkeypatch):
+    import examples.governed_flood  # noqa: F401 - registers the flood checks
+    from broker.interfaces.skill_types import SkillProposal
+    from broker.validators import AgentValidator
+
+    config = Path(__file__).resolve().parents[2] / "examples" / "quickstart" / "agent_types.yaml"
+    validator = AgentValidator(str(config))
+
+    def rules_hit(skill, state):
+        proposal = SkillProposal(skill, "a1", {}, "simple_agent")
+        results = validator.preflight(proposal, {"agent_type": "simple_agent", "state": state})
+        return sorted(r.metadata["rule_id"] for r in results if not r.valid)
+
+    renter = {"tenure": "Renter", "savings": 0}
+    assert rules_hit("elevate_house", renter) == []  # no domain configured
+
+    governance = {**validator.config._config["global_config"], "governance": {"domain": "flood"}}
+    monkeypatch.setitem(validator.config._config, "global_config", governance)
+    assert rules_hit("elevate_house", renter) == [
+        "builtin_elevation_affordability", "builtin_renter_restriction",
+    ]
+    assert rules_hit("elevate_house", {"elevated": True, "savings": 10**6}) == ["builtin_already_elevated"]
+    assert rules_hit("buy_insurance", renter) == []
+
+
+def test_validate_all_state_only_skips_reasoning_rules():
+    from broker.governance import GovernanceRule
+    from broker.validators.governance import validate_all
+
+    rules = [
+        GovernanceRule.from_dict({
+            "id": "owner_only", "category": "personal", "precondition": "renter",
+            "blocked_skills": ["elevate_house"], "level": "ERROR",
+        }),
+        GovernanceRule.from_dict({
+            "id": "low_threat", "category": "personal", "construct": "TP_LABEL",
+            "when_above": ["L"], "blocked_skills": ["elevate_house"], "level": "ERROR",
+        }),
+    ]
+    context = {"state": {"renter": True}, "reasoning": {"TP_LABEL": "L"}}
+
+    def rule_ids(**kwargs):
+        return sorted(r.metadata["rule_id"] for r in validate_all("elevate_house", rules, context, **kwargs))
+
+    assert [r.is_state_only for r in rules] == [True, False]
+    assert rule_ids() == ["low_threat", "owner_only"]
+    assert rule_ids(state_only=True) == ["owner_only"]
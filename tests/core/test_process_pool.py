@@ -0,0 +1,180 @@
+"""Process-pool execution: agent shards decided in forked workers."""
+import json
+
+import pytest
+
+from broker.components.context.builder import create_context_builder
+from broker.components.memory.engine import WindowMemoryEngine
+from broker.core.experiment import ExperimentBuilder
+from broker.core.process_pool import fork_available
+from broker.utils.llm_utils import LLMStats
+
+from tests.fixtures.fake_traffic import (
+    AGENT_TYPES, SKILL_REGISTRY, TrafficSimulation, commuters, read_traces,
+)
+
+pytestmark = pytest.mark.skipif(not fork_available(), reason="needs the fork start method")
+
+N_AGENTS = 5
+
+
+def _remembering(prompt):
+    """Second option once the agent remembers a decision, else the first."""
+    return json.dumps({"decision": 2 if "Decided to" in prompt else 1}), LLMStats()
+
+
+def _run(output_dir, processes=0, setup=None):
+    agents = commuters(N_AGENTS)
+    memory = WindowMemoryEngine(window_size=3)
+    runner = (
+        ExperimentBuilder()
+        .with_model("mock")
+        .with_years(3)
+        .with_agents(agents)
+        .with_simulation(TrafficSimulation())
+        .with_skill_registry(str(SKILL_REGISTRY))
+        .with_memory_engine(memory)
+        .with_context_builder(create_context_builder(agents, yaml_path=str(AGENT_TYPES), memory_engine=memory))
+        .with_governance("strict", str(AGENT_TYPES))
+        .with_exact_output(str(output_dir))
+        .with_seed(42)
+        .with_workers(2 if processes else 1)
+        .with_processes(processes)
+    ).build()
+    runner._llm_cache["commuter"] = _remembering
+    if setup is not None:
+        setup(runner)
+    runner.run()
+    return runner, read_traces(output_dir)
+
+
+def _key(trace):
+    skill = (trace.get("approved_skill") or {}).get("skill_name")
+    return trace["agent_id"], trace["year"], trace["step_id"], skill, trace["input"]
+
+
+def test_process_run_matches_in_process_run(tmp_path):
+    plain, plain_traces = _run(tmp_path / "plain")
+    pooled, pooled_traces = _run(tmp_path / "pooled", processes=2)
+
+    # Same decisions, in agent order, with memories written by the coordinator
+    assert [_key(t) for t in pooled_traces] == [_key(t) for t in plain_traces]
+    assert len(pooled_traces) == 3 * N_AGENTS
+    skills = {t["year"]: t["approved_skill"]["skill_name"] for t in pooled_traces}
+    assert skills[1] != skills[2] == skills[3]
+    assert pooled.memory_engine.storage == plain.memory_engine.storage
+    assert {aid: a.dynamic_state for aid, a in pooled.agents.items()} == {
+        aid: a.dynamic_state for aid, a in plain.agents.items()
+    }
+
+    # Worker counters and stage timings are merged into the coordinator
+    assert pooled.broker.stats == plain.broker.stats
+    timings = pooled.broker.profiler.summary()
+    assert timings["n_steps"] == timings["stages"]["context_build"]["count"] == 3 * N_AGENTS
+    manifest = json.loads((tmp_path / "pooled" / "reproducibility_manifest.json").read_text())
+    assert manifest["process_workers"] == 2
+    assert pooled._process_pool is None
+
+
+def test_worker_failure_becomes_aborted_trace(tmp_path):
+    def break_commuter_2(runner):
+        build = runner.broker.context_builder.build
+
+        def flaky_build(agent_id, *args, **kwargs):
+            if agent_id == "commuter_2":
+                raise ConnectionError("profile store went away")
+            return build(agent_id, *args, **kwargs)
+
+        runner.broker.context_builder.build = flaky_build
+
+    _, traces = _run(tmp_path / "flaky", processes=2, setup=break_commuter_2)
+    assert [t["agent_id"] for t in traces[:N_AGENTS]] == [f"commuter_{i}" for i in range(1, N_AGENTS + 1)]
+    failed = [t for t in traces if t["agent_id"] == "commuter_2"]
+    assert len(failed) == 3 and all(t["outcome"] == "ABORTED" for t in failed)
+    assert "ConnectionError" in failed[0]["validation_errors"][0]
+    assert all(t["outcome"] != "ABORTED" for t in traces if t["agent_id"] != "commuter_2")
+
+
+def test_unparsable_output_returns_aborted_result(tmp_path):
+    def prose_model(runner):
+        runner._llm_cache["commuter"] = lambda prompt: ("I would rather not say.", LLMStats())
+        runner.outcomes = []
+        runner.hooks["post_step"] = lambda agent, result: runner.outcomes.append(
+            (agent.id, result.outcome.value, result.validation_errors)
+        )
+
+    plain, plain_traces = _run(tmp_path / "plain", setup=prose_model)
+    pooled, pooled_traces = _run(tmp_path / "pooled", processes=2, setup=prose_model)
+
+    assert pooled.outcomes == plain.outcomes
+    assert len(pooled.outcomes) == 3 * N_AGENTS
+    assert {outcome for _, outcome, _ in pooled.outcomes} == {"ABORTED"}
+    assert pooled.outcomes[0][2] == ["Parse error after retries"]
+    assert pooled_traces == plain_traces == []
+
+
+def test_worker_invalidations_and_drafter_counts_come_back(tmp_path):
+    from broker.core.efficiency import SpeculativeDrafter
+
+    def setup(runner):
+        drafter = runner.drafters["commuter"] = SpeculativeDrafter(["decision"])
+        runner._llm_cache["commuter"] = drafter.wrap(_remembering)
+        for i in range(1, N_AGENTS + 1):
+            runner.efficiency.put(f"stale-commuter_{i}", {"outcome": "APPROVED"})
+        lookup = runner._cache_lookup
+
+        def rejecting_lookup(agent, env, **kwargs):
+            # Stands in for a hit governance now rejects
+            runner.efficiency.invalidate(f"stale-{agent.id}")
+            return lookup(agent, env, **kwargs)
+
+        runner._cache_lookup = rejecting_lookup
+
+    plain, _ = _run(tmp_path / "plain", setup=setup)
+    pooled, _ = _run(tmp_path / "pooled", processes=2, setup=setup)
+
+    assert not any(key.startswith("stale-") for key in pooled.efficiency._cache)
+    assert pooled.drafters["commuter"].get_stats() == plain.drafters["commuter"].get_stats()
+    assert pooled.drafters["commuter"].get_stats()["total"] == 3 * N_AGENTS
+
+
+def test_agent_state_goes_only_to_its_owner(tmp_path, monkeypatch):
+    from broker.core.process_pool import AgentProcessPool
+
+    synced = []
+    requests = AgentProcessPool._requests
+
+    def recording_requests(pool, tasks, run_id, env):
+        built = requests(pool, tasks, run_id, env)
+        synced.append([sorted(k for k in r["sync"] if k.startswith("agent:")) for r in built])
+        return built
+
+    monkeypatch.setattr(AgentProcessPool, "_requests", recording_requests)
+    _run(tmp_path, processes=2)
+
+    # Agents are sharded by position; every year's state changes are resent
+    owned = [["agent:commuter_1", "agent:commuter_3", "agent:commuter_5"],
+             ["agent:commuter_2", "agent:commuter_4"]]
+    assert synced[1:] == [owned, owned]
+
+
+def test_decisions_come_back_without_the_full_context(tmp_path, monkeypatch):
+    from broker.core._audit_helpers import AUDIT_CONTEXT_KEYS
+    from broker.core.process_pool import AgentProcessPool
+
+    decided = []
+    decide = AgentProcessPool.decide
+
+    def recording_decide(pool, tasks, run_id, env):
+        outcomes = decide(pool, tasks, run_id, env)
+        decided.extend((payload, env) for _, payload, _, _ in outcomes.values())
+        return outcomes
+
+    monkeypatch.setattr(AgentProcessPool, "decide", recording_decide)
+    _, traces = _run(tmp_path, processes=2)
+
+    assert len(decided) == 3 * N_AGENTS
+    for decision, env in decided:
+        assert set(decision.context) <= set(AUDIT_CONTEXT_KEYS) | {"personal"}
+        assert decision.env_context is env
+    assert all(t["memory_audit"]["retrieved_count"] == min(t["year"] - 1, 3) for t in traces)
@@ -0,0 +1,111 @@
+"""Per-stage latency instrumentation of SkillBrokerEngine.process_step."""
+import json
+import random
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from broker.components.analytics.latency import LatencyHistogram, StageProfiler
+from broker.components.memory.engine import WindowMemoryEngine
+from broker.core.experiment import ExperimentBuilder
+
+from .test_experiment_checkpoint import (
+    _FIXTURE_DIR, YEARS, _StochasticTraffic, _agents, _mock_llm, _traces,
+)
+
+
+def test_histogram_percentiles_within_bucket_error():
+    rng = np.random.default_rng(0)
+    samples = rng.lognormal(mean=-4.0, sigma=1.0, size=5000)
+    hist = LatencyHistogram()
+    for s in samples:
+        hist.record(float(s))
+    for q in (50, 95, 99):
+        exact = np.percentile(samples, q, method="inverted_cdf")
+        assert hist.percentile(q) == pytest.approx(exact, rel=0.025)
+    assert hist.count == 5000
+    assert hist.max == samples.max()
+
+    other = LatencyHistogram()
+    other.record(10.0)
+    hist.merge(other)
+    assert hist.percentile(100) == 10.0
+
+
+def test_stages_accumulate_per_step_and_thread():
+    profiler = StageProfiler()
+    with profiler.stage("llm"):  # outside a step: ignored
+        pass
+
+    def step(agent_type, llm_s):
+        profiler.begin_step(agent_type)
+        with profiler.stage("llm"):
+            time.sleep(llm_s)
+        with profiler.stage("llm"):
+            time.sleep(llm_s)
+        with profiler.stage("parse"):
+            pass
+        return profiler.end_step()
+
+    threads = [threading.Thread(target=step, args=("a", 0.01)) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    timing = step("b", 0.005)
+    assert set(timing.stages) == {"llm", "parse"}
+    assert timing.stages["llm"] >= 0.01
+
+    summary = profiler.summary()
+    assert summary["n_steps"] == 4
+    assert summary["by_agent_type"]["a"]["llm"]["count"] == 3
+    assert summary["by_agent_type"]["a"]["llm"]["p50_ms"] >= 20.0
+    assert 0.0 < summary["llm_share"] <= 1.0
+    assert summary["llm_time_s"] + summary["framework_time_s"] == pytest.approx(
+        summary["stages"]["total"]["total_s"], abs=1e-5
+    )
+
+
+def _build(output_dir, in_trace):
+    random.seed(42)
+    return (
+        ExperimentBuilder()
+        .with_model("mock")
+        .with_years(YEARS)
+        .with_agents(_agents())
+        .with_simulation(_StochasticTraffic())
+        .with_skill_registry(str(_FIXTURE_DIR / "traffic_skill_registry.yaml"))
+        .with_memory_engine(WindowMemoryEngine(window_size=3))
+        .with_governance("strict", str(_FIXTURE_DIR / "traffic_agent_types.yaml"))
+        .with_exact_output(str(output_dir))
+        .with_workers(1)
+        .with_seed(42)
+        .with_stage_timings_in_trace(in_trace)
+    ).build()
+
+
+def test_run_writes_performance_summary(tmp_path):
+    runner = _build(tmp_path, in_trace=True)
+    runner.run(llm_invoke=_mock_llm)
+
+    summary = json.loads((tmp_path / "performance_summary.json").read_text(encoding="utf-8"))
+    assert summary["n_steps"] == YEARS * 3
+    stages = summary["stages"]
+    for name in ("context_build", "format_prompt", "llm", "parse", "validation",
+                 "governance_retry", "execution", "audit_write", "total", "framework"):
+        assert name in stages, name
+    assert any(name.startswith("validator:") for name in stages)
+    assert stages["total"]["p50_ms"] <= stages["total"]["p99_ms"]
+
+    traces = _traces(tmp_path)
+    assert all("llm" in t["stage_timings_ms"] for t in traces)
+    assert "audit_write" not in traces[0]["stage_timings_ms"]
+
+
+def test_stage_timings_not_in_trace_by_default(tmp_path):
+    runner = _build(tmp_path, in_trace=False)
+    runner.run(llm_invoke=_mock_llm)
+    assert all("stage_timings_ms" not in t for t in _traces(tmp_path))
+    assert (tmp_path / "performance_summary.json").exists()
@@ -0,0 +1,145 @@
+"""Parallel multi-seed sweep orchestrator."""
+import csv
+import json
+import sys
+import time
+
+import pytest
+
+from broker.core.sweep import (
+    INDEX_FILE, MANIFEST_FILE, SweepRunner, build_matrix, llm_slot, shared_inputs, throttle,
+)
+from broker.tools.run_sweep import main as run_sweep_main
+
+
+def _load_shared():
+    return {"profiles": ["a", "b", "c"]}
+
+
+def _cell_ok(cell, output_dir, shared):
+    (output_dir / "done.txt").write_text(str(cell.seed))
+    return {"n_profiles": len(shared["profiles"]), "same": shared is shared_inputs()}
+
+
+def _cell_flaky(cell, output_dir, shared):
+    marker = output_dir / "attempted"
+    if not marker.exists():
+        marker.write_text("1")
+        raise RuntimeError("transient")
+    return {"seed": cell.seed}
+
+
+def _cell_fails_odd(cell, output_dir, shared):
+    if cell.seed % 2:
+        raise ValueError(f"seed {cell.seed} diverged")
+    return {}
+
+
+def _cell_llm(cell, output_dir, shared):
+    def invoke(prompt):
+        start = time.time()
+        time.sleep(0.15)
+        return start, time.time()
+
+    start, end = throttle(invoke)("p")
+    (output_dir / "span.json").write_text(json.dumps([start, end]))
+
+
+def test_build_matrix_order_and_ids():
+    cells = build_matrix(["gemma3:4b", "qwen3:8b"], [42, 43], {"gov": {"x": 1}, "nogov": {}})
+    assert [(c.model, c.ablation, c.seed) for c in cells[:4]] == [
+        ("gemma3:4b", "gov", 42), ("gemma3:4b", "gov", 43),
+        ("gemma3:4b", "nogov", 42), ("gemma3:4b", "nogov", 43),
+    ]
+    assert cells[0].cell_id == "gemma3_4b__seed42__gov"
+    assert cells[0].params == {"x": 1}
+    assert len({c.cell_id for c in cells}) == 8
+    with pytest.raises(ValueError):
+        SweepRunner(_cell_ok, "unused", max_workers=1).run(cells + cells[:1])
+
+
+def test_inline_run_retries_and_resumes(tmp_path):
+    cells = build_matrix(["m"], [1, 2])
+    summary = SweepRunner(_cell_flaky, tmp_path, max_workers=1, max_retries=1).run(cells)
+    assert (summary.n_done, summary.n_failed, summary.n_retried) == (2, 0, 2)
+    assert [r.attempts for r in summary.records] == [2, 2]
+
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    assert {c["status"] for c in manifest["cells"]} == {"done"}
+    with open(tmp_path / INDEX_FILE, newline="") as f:
+        index = list(csv.DictReader(f))
+    assert [row["output_dir"] for row in index] == [
+        str(tmp_path / c.cell_id) for c in cells
+    ]
+
+    again = SweepRunner(_cell_flaky, tmp_path, max_workers=1).run(cells)
+    assert (again.n_skipped, again.n_done) == (2, 0)
+
+
+def test_pool_run_shares_inputs_and_records_failures(tmp_path):
+    cells = build_matrix(["m"], [1, 2, 3, 4], ["a"])
+    runner = SweepRunner(
+        _cell_fails_odd, tmp_path, max_workers=2, max_retries=1, shared_loader=_load_shared,
+    )
+    summary = runner.run(cells)
+    assert (summary.n_done, summary.n_failed) == (2, 2)
+    failed = [r for r in summary.records if r.status == "failed"]
+    assert [r.seed for r in failed] == [1, 3]
+    assert all(r.attempts == 2 and "diverged" in r.error for r in failed)
+
+    # A re-run only retries the failed cells.
+    summary = SweepRunner(_cell_ok, tmp_path, max_workers=2, shared_loader=_load_shared).run(cells)
+    assert (summary.n_skipped, summary.n_done, summary.n_failed) == (2, 2, 0)
+    assert summary.records[0].result == {"n_profiles": 3, "same": True}
+    assert not (tmp_path / cells[1].cell_id / "done.txt").exists()
+
+
+def test_llm_concurrency_budget_is_global(tmp_path):
+    cells = build_matrix(["m"], [1, 2, 3])
+    SweepRunner(_cell_llm, tmp_path, max_workers=3, llm_concurrency=1).run(cells)
+    spans = sorted(
+        json.loads((tmp_path / c.cell_id / "span.json").read_text()) for c in cells
+    )
+    for (_, end), (start, _) in zip(spans, spans[1:]):
+        assert start >= end
+
+
+def test_llm_slot_is_noop_outside_sweep():
+    with llm_slot():
+        pass
+    assert throttle(lambda x: x + 1)(1) == 2
+
+
+def test_throttle_holds_a_slot_for_chat(monkeypatch):
+    import broker.core.sweep as sweep
+
+    class Slots:
+        held = 0
+
+        def acquire(self):
+            self.held += 1
+
+        def release(self):
+            pass
+
+    def invoke(prompt):
+        return prompt
+
+    invoke.chat = lambda messages: messages[-1]
+    slots = Slots()
+    monkeypatch.setattr(sweep, "_LLM_SLOTS", slots)
+    throttled = throttle(invoke)
+    assert throttled("p") == "p" and throttled.chat(["a", "b"]) == "b"
+    assert slots.held == 2
+
+
+def test_command_sweep_cli(tmp_path):
+    cmd = f'"{sys.executable}" -c "import sys; sys.exit({{seed}} % 2)"'
+    code = run_sweep_main([
+        "--cmd", cmd, "--seeds", "2", "3", "--output-root", str(tmp_path),
+        "--workers", "1", "--retries", "0",
+    ])
+    assert code == 1
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    assert [c["status"] for c in manifest["cells"]] == ["done", "failed"]
+    assert (tmp_path / "none__seed2__default" / "sweep_cell.log").exists()
@@ -0,0 +1,74 @@
+"""
+Fake traffic domain for end-to-end runner tests.
+
+Agents, simulation and trace readers for the config in
+``examples/_test_fixtures/fake_traffic``: commuters choosing among five
+routing skills, with the mock model and no water-domain code involved.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from broker.interfaces.skill_types import ExecutionResult, ValidationResult
+from broker.validators.governance import state_only
+
+FIXTURE_DIR = Path(__file__).resolve().parents[2] / "examples" / "_test_fixtures" / "fake_traffic"
+AGENT_TYPES = FIXTURE_DIR / "traffic_agent_types.yaml"
+SKILL_REGISTRY = FIXTURE_DIR / "traffic_skill_registry.yaml"
+SKILLS = ["take_alternate_route", "delay_departure", "switch_to_transit", "carpool", "do_nothing"]
+
+
+class TrafficSimulation:
+    """Every executed skill adds 30 minutes of delay."""
+
+    def __init__(self):
+        self.year = 0
+
+    def advance_year(self) -> Dict[str, Any]:
+        self.year += 1
+        return {"current_year": self.year, "situation": f"Year {self.year}: heavy congestion."}
+
+    def execute_skill(self, approved_skill) -> ExecutionResult:
+        return ExecutionResult(success=True, state_changes={"delay_minutes": 30.0})
+
+
+def commuters(n: int) -> Dict[str, Any]:
+    """Agents ``commuter_1`` .. ``commuter_n`` with the fixture's skills."""
+    from broker.agents import AgentConfig, BaseAgent
+    from broker.agents.base import Skill, StateParam
+
+    skills = [Skill(name, name, "delay_minutes", "decrease") for name in SKILLS]
+    state = [StateParam("delay_minutes", (0, 120), 0.0, "Total commute delay")]
+    return {
+        f"commuter_{i}": BaseAgent(AgentConfig(
+            name=f"commuter_{i}", agent_type="commuter", state_params=state,
+            objectives=[], constraints=[], skills=skills,
+        ))
+        for i in range(1, n + 1)
+    }
+
+
+def read_traces(output_dir, agent_type: str = "commuter") -> List[Dict[str, Any]]:
+    """Decision traces of a run (metadata records dropped; ``[]`` if none)."""
+    path = Path(output_dir) / "raw" / f"{agent_type}_traces.jsonl"
+    lines = path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+    return [t for t in map(json.loads, lines) if "_metadata" not in t]
+
+
+def decisions(output_dir) -> List[tuple]:
+    """``(agent_id, year, skill)`` per commuter trace, in trace order."""
+    return [
+        (t["agent_id"], t["year"], t["approved_skill"]["skill_name"])
+        for t in read_traces(output_dir)
+    ]
+
+
+@state_only
+def route_closed(proposal, context, skill_registry=None) -> List[ValidationResult]:
+    """Custom validator: the alternate route is closed for everyone."""
+    if proposal.skill_name != "take_alternate_route":
+        return []
+    return [ValidationResult(
+        valid=False, validator_name="RouteClosed", errors=["Alternate route is closed"],
+        metadata={"rule_id": "route_closed"},
+    )]
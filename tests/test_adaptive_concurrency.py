@@ -0,0 +1,117 @@
+"""Adaptive concurrency: the in-flight LLM limit follows observed latency."""
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import urlopen
+
+import pytest
+
+from broker.utils.llm_utils import LLMStats
+from broker.utils.performance_tuner import (
+    AdaptiveConcurrencyConfig, AdaptiveConcurrencyController,
+)
+
+CAPACITY = 4
+SERVICE_S = 0.02
+
+
+@pytest.fixture
+def stand_in_server():
+    """Local model stand-in serving CAPACITY requests at a time; the rest queue."""
+    slots = threading.Semaphore(CAPACITY)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with slots:
+                time.sleep(SERVICE_S)
+            body = json.dumps({"response": '{"decision": 1}'}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_limit_settles_near_server_capacity(stand_in_server):
+    def invoke(prompt):
+        with urlopen(stand_in_server, data=prompt.encode(), timeout=10) as resp:
+            return json.loads(resp.read())["response"], LLMStats()
+
+    controller = AdaptiveConcurrencyController(
+        AdaptiveConcurrencyConfig(min_limit=1, max_limit=16, window=8, latency_tolerance=1.5)
+    )
+    gated = controller.wrap(invoke)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(gated, [f"prompt {i}" for i in range(240)]))
+
+    assert all(content == '{"decision": 1}' for content, _ in results)
+    summary = controller.to_dict()
+    assert summary["calls"] == 240 and summary["failed_calls"] == 0
+    reasons = [d["reason"] for d in summary["decisions"]]
+    assert reasons[0] == "headroom" and "latency" in reasons
+    # Queueing past capacity is what triggers the cuts, so the limit never runs away
+    cut_from = [d["from"] for d in summary["decisions"] if d["reason"] == "latency"]
+    assert statistics.median(cut_from) > CAPACITY
+    assert max(d["to"] for d in summary["decisions"]) <= 2 * CAPACITY
+    assert summary["final_limit"] <= 2 * CAPACITY
+
+
+def test_failures_cut_the_limit():
+    controller = AdaptiveConcurrencyController(
+        AdaptiveConcurrencyConfig(min_limit=1, max_limit=8, initial_limit=8, window=2)
+    )
+    gated = controller.wrap(lambda prompt: ("", LLMStats(success=False)))
+    for _ in range(4):
+        gated("p")
+    assert controller.limit == 2
+    assert [d["reason"] for d in controller.decisions] == ["errors", "errors"]
+
+
+def test_runner_records_limit_changes_in_manifest(tmp_path):
+    from broker.components.memory.engine import WindowMemoryEngine
+    from broker.core.experiment import ExperimentBuilder
+    from tests.fixtures.fake_traffic import (
+        AGENT_TYPES, SKILL_REGISTRY, TrafficSimulation, commuters, decisions,
+    )
+
+    def builder(output_dir):
+        return (
+            ExperimentBuilder()
+            .with_model("mock")
+            .with_years(1)
+            .with_agents(commuters(6))
+            .with_simulation(TrafficSimulation())
+            .with_skill_registry(str(SKILL_REGISTRY))
+            .with_memory_engine(WindowMemoryEngine(window_size=3))
+            .with_governance("strict", str(AGENT_TYPES))
+            .with_exact_output(str(output_dir))
+            .with_seed(42)
+        )
+
+    builder(tmp_path / "plain").build().run()
+    builder(tmp_path / "adaptive").with_adaptive_concurrency(min_workers=1, max_workers=4, window=2).build().run()
+
+    assert sorted(decisions(tmp_path / "adaptive")) == sorted(decisions(tmp_path / "plain"))
+    manifest = json.loads((tmp_path / "adaptive" / "reproducibility_manifest.json").read_text())
+    assert manifest["adaptive_concurrency"]["calls"] == 6
+    assert manifest["adaptive_concurrency"]["config"]["max_limit"] == 4
+
+
+def test_builder_rejects_bad_bounds():
+    from broker.core.experiment import ExperimentBuilder
+
+    errors = ExperimentBuilder().with_adaptive_concurrency(min_workers=4, max_workers=2).validate()
+    assert any("adaptive concurrency" in e for e in errors)
@@ -0,0 +1,135 @@
+"""Tests for the concurrent, resumable psychometric ProbeRunner."""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from broker.domains.water.calibration.probe_runner import CACHE_FILE, ProbeRunner
+from broker.domains.water.calibration.psychometric_battery import (
+    PsychometricBattery,
+    ProbeResponse,
+)
+from broker.utils.llm_utils import LLMProvider, LLMStats
+
+SCENARIO_DIR = (
+    Path(__file__).resolve().parents[1]
+    / "examples" / "multi_agent" / "flood" / "paper3" / "configs" / "scenarios"
+)
+ARCHETYPES = {"cautious": {"tp": "H"}, "bold": {"tp": "L"}}
+REPLICATES = 3
+
+
+def _prompt(arch, scenario):
+    return f"{scenario.id}|{arch['tp']}"
+
+
+def _parse(raw, task):
+    data = json.loads(raw)
+    return ProbeResponse(
+        scenario_id=task.scenario.id,
+        archetype=task.archetype,
+        replicate=task.replicate,
+        tp_label=data["tp"],
+        decision=data["decision"],
+        governed=task.governed,
+    )
+
+
+class CountingInvoke:
+    """Thread-safe invoke stub that tracks calls and peak concurrency."""
+
+    def __init__(self, fail_on=(), delay=0.0):
+        self.fail_on = set(fail_on)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if prompt in self.fail_on:
+                raise ConnectionError("model unavailable")
+            return json.dumps({"tp": prompt.split("|")[1], "decision": "buy_insurance"}), True
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _run(invoke, cache_dir=None, **kwargs):
+    battery = PsychometricBattery(scenario_dir=SCENARIO_DIR)
+    runner = ProbeRunner(invoke, cache_dir=cache_dir, model="stub", **kwargs)
+    summary = runner.run(battery, ARCHETYPES, _prompt, _parse, replicates=REPLICATES)
+    return battery, summary
+
+
+class TestProbeRunner:
+    def test_runs_full_grid_in_grid_order(self):
+        invoke = CountingInvoke(delay=0.01)
+        battery, summary = _run(invoke, max_concurrency=3)
+        n_scen = len(battery.scenarios)
+        assert summary.n_total == invoke.calls == len(ARCHETYPES) * n_scen * REPLICATES
+        assert 1 < invoke.peak <= 3
+        keys = [(r.archetype, r.scenario_id, r.replicate) for r in battery.responses]
+        expected = [
+            (a, s, rep) for a in ARCHETYPES for s in battery.scenarios
+            for rep in range(1, REPLICATES + 1)
+        ]
+        assert keys == expected
+
+    def test_failed_probes_resume_from_cache(self, tmp_path):
+        battery = PsychometricBattery(scenario_dir=SCENARIO_DIR)
+        flaky = "|".join([next(iter(battery.scenarios)), "H"])
+        first = CountingInvoke(fail_on={flaky})
+        _, summary = _run(first, cache_dir=tmp_path, max_retries=1)
+        assert summary.n_failed == REPLICATES
+        assert first.calls == summary.n_total + REPLICATES  # one retry each
+
+        second = CountingInvoke()
+        resumed, summary = _run(second, cache_dir=tmp_path)
+        assert second.calls == REPLICATES
+        assert summary.n_cached == summary.n_total - REPLICATES
+        assert summary.n_failed == 0
+
+        fresh, _ = _run(CountingInvoke())
+        assert resumed.responses_to_dataframe().equals(fresh.responses_to_dataframe())
+
+    def test_torn_cache_line_is_ignored(self, tmp_path):
+        _run(CountingInvoke(), cache_dir=tmp_path)
+        cache = tmp_path / CACHE_FILE
+        lines = cache.read_text(encoding="utf-8").splitlines()
+        cache.write_text("\n".join(lines[:-1]) + "\n" + lines[-1][:20], encoding="utf-8")
+
+        invoke = CountingInvoke()
+        _, summary = _run(invoke, cache_dir=tmp_path)
+        assert invoke.calls == 1 and summary.n_failed == 0
+        _, summary = _run(CountingInvoke(), cache_dir=tmp_path)
+        assert summary.n_cached == summary.n_total
+
+    def test_llm_provider_and_unsuccessful_stats(self):
+        class Provider(LLMProvider):
+            model_name = "stub-provider"
+
+            def invoke(self, prompt):
+                ok = not prompt.endswith("L")
+                body = json.dumps({"tp": "M", "decision": "do_nothing"})
+                return body, LLMStats(success=ok)
+
+        battery = PsychometricBattery(scenario_dir=SCENARIO_DIR)
+        runner = ProbeRunner(Provider(), max_retries=0)
+        summary = runner.run(battery, ARCHETYPES, _prompt, _parse, replicates=2)
+        assert runner.model == "stub-provider"
+        assert summary.n_failed == summary.n_total // 2
+        assert {r.archetype for r in battery.responses} == {"cautious"}
+
+    def test_invalid_concurrency_rejected(self):
+        with pytest.raises(ValueError):
+            ProbeRunner(CountingInvoke(), max_concurrency=0)
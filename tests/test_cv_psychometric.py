@@ -29,6 +29,9 @@ from broker.domains.water.calibration.psychometric_battery import (
     compute_icc_2_1,
     compute_cronbach_alpha,
     compute_fleiss_kappa,
+    compute_fleiss_kappa_counts,
+    build_replicate_matrix,
+    pairwise_jaccard,
     LABEL_TO_ORDINAL,
 )
 
@@ -548,3 +551,67 @@ class TestDiscriminant:
         """Empty responses -> r = 0."""
         r = battery.compute_discriminant()
         assert r == 0.0
+
+
+# ---------------------------------------------------------------------------
+# Vectorized builders
+# ---------------------------------------------------------------------------
+
+class TestVectorizedStats:
+    """Array-based builders agree with the straightforward definitions."""
+
+    def test_replicate_matrix_pivot(self):
+        matrix = build_replicate_matrix(
+            ["b", "a", "a", "b", "a"], [2, 1, 2, 1, 1], [4.0, 1.0, 2.0, 3.0, 5.0],
+        )
+        # Rows sorted by subject; the later (a, 1) rating wins.
+        np.testing.assert_array_equal(matrix, [[5.0, 2.0], [3.0, 4.0]])
+
+    def test_replicate_matrix_gaps_are_nan(self):
+        matrix = build_replicate_matrix(["a", "b"], [1, 3], [1.0, 2.0])
+        assert matrix.shape == (2, 3)
+        assert np.isnan(matrix[0, 1:]).all() and matrix[1, 2] == 2.0
+
+    def test_fleiss_counts_matches_lists(self):
+        rng = np.random.default_rng(3)
+        cats = np.array(["a", "b", "c"])
+        decisions = [list(rng.choice(cats, size=6)) for _ in range(8)]
+        counts = np.array([[row.count(c) for c in cats] for row in decisions], dtype=float)
+        assert compute_fleiss_kappa_counts(counts, 6) == pytest.approx(
+            compute_fleiss_kappa(decisions)
+        )
+
+    def test_pairwise_jaccard_matches_loop(self):
+        texts = ["Flood risk is high", "high flood risk", "", "insurance is cheap", "risk"]
+        sets = [set(t.lower().split()) for t in texts]
+        expected = [
+            len(sets[i] & sets[j]) / len(sets[i] | sets[j]) if sets[i] | sets[j] else 0.0
+            for i in range(len(sets)) for j in range(i + 1, len(sets))
+        ]
+        np.testing.assert_allclose(pairwise_jaccard(texts), expected)
+
+    def test_reasoning_consistency(self, battery):
+        texts = ["water rising fast", "water rising", "water rising fast"]
+        battery.add_responses([
+            ProbeResponse(scenario_id="s", archetype="a", replicate=i + 1, reasoning=t)
+            for i, t in enumerate(texts)
+        ])
+        result = battery.compute_reasoning_consistency()
+        assert result["n_pairs"] == 3
+        assert result["mean_consistency"] == pytest.approx(round((2 / 3 + 1 + 2 / 3) / 3, 4))
+
+    def test_decision_agreement_pads_short_archetypes(self, battery):
+        plan = {"a": ["x", "x", "y"], "b": ["y", "y"], "c": ["x", "y", "x"]}
+        for arch, decisions in plan.items():
+            battery.add_responses([
+                ProbeResponse(scenario_id="s", archetype=arch, replicate=i + 1, decision=d)
+                for i, d in enumerate(decisions)
+            ])
+        expected = compute_fleiss_kappa([["x", "x", "y"], ["y", "y", "y"], ["x", "y", "x"]])
+        assert battery.compute_decision_agreement() == pytest.approx(expected)
+
+    def test_dataframe_cache_refreshes_on_add(self, battery, sample_responses):
+        battery.add_responses(sample_responses[:5])
+        assert len(battery.responses_to_dataframe()) == 5
+        battery.add_response(sample_responses[5])
+        assert len(battery.responses_to_dataframe()) == 6
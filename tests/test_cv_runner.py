@@ -176,3 +176,50 @@ class TestGroupComparison:
         assert "CACR" in comparison.columns
         assert "R_H" in comparison.columns
         assert "group_label" in comparison.columns
+
+
+# ---------------------------------------------------------------------------
+# Trace loading and batch runs
+# ---------------------------------------------------------------------------
+
+class TestBatchRuns:
+    """Tests for column-pruned loading and multi-trace batches."""
+
+    def test_load_trace_columns(self, simulation_df, tmp_path):
+        """Only requested columns are loaded; unknown names are ignored."""
+        path = tmp_path / "simulation_log.csv"
+        simulation_df.to_csv(path, index=False)
+        runner = CVRunner(trace_path=path)
+        df = runner.load_trace(columns=["agent_id", "year", "not_a_column"])
+        assert list(df.columns) == ["agent_id", "year"]
+        assert len(df) == len(simulation_df)
+
+    def test_load_trace_chunked_matches_full(self, simulation_df, tmp_path):
+        """Chunked CSV parsing yields the same frame as a single read."""
+        path = tmp_path / "simulation_log.csv"
+        simulation_df.to_csv(path, index=False)
+        full = CVRunner(trace_path=path).load_trace()
+        chunked = CVRunner(trace_path=path).load_trace(chunksize=7)
+        pd.testing.assert_frame_equal(full, chunked)
+
+    def test_run_batch_matches_sequential(self, simulation_df, tmp_path):
+        """Process-pool batch gives the same summaries as single runs."""
+        traces = {}
+        for seed in (42, 43):
+            path = tmp_path / f"seed{seed}.csv"
+            simulation_df.to_csv(path, index=False)
+            traces[f"seed{seed}"] = path
+
+        reports = CVRunner.run_batch(
+            traces, max_workers=2, group="B", start_year=2,
+        )
+        assert list(reports) == ["seed42", "seed43"]
+
+        single = CVRunner(trace_path=traces["seed42"], start_year=2)
+        expected = single.run_posthoc()
+        assert reports["seed42"].summary["TCS"] == expected.summary["TCS"]
+        assert reports["seed42"].summary["CACR"] == expected.summary["CACR"]
+        assert reports["seed43"].metadata["trace_path"] == str(traces["seed43"])
+
+        comparison = CVRunner.compare_groups(reports)
+        assert list(comparison["group_label"]) == ["seed42", "seed43"]
@@ -30,7 +30,7 @@ class TestRecording:
     def test_record_single_decision(self, detector):
         detector.record_decision("A1", "buy_insurance")
         assert "A1" in detector._agent_history
-        assert detector._agent_history["A1"] == ["buy_insurance"]
+        assert list(detector._agent_history["A1"]) == ["buy_insurance"]
 
     def test_record_decisions_batch(self, detector):
         detector.record_decisions({"A1": "buy", "A2": "sell", "A3": "hold"})
@@ -40,6 +40,14 @@ class TestRecording:
         for i in range(25):
             detector.record_decision("A1", f"action_{i}")
         assert len(detector._agent_history["A1"]) <= detector.history_window * 2
+        assert list(detector._agent_history["A1"])[-1] == "action_24"
+
+    def test_running_counts_follow_latest_decision(self, detector):
+        detector.record_decisions({"A1": "buy", "A2": "buy", "A3": "sell"})
+        detector.record_decision("A1", "sell")
+        assert detector._decision_counts == {"buy": 1, "sell": 2}
+        detector.record_decision("A2", "sell")
+        assert detector._decision_counts == {"sell": 3}
 
 
 # ---------------------------------------------------------------------------
@@ -116,6 +124,39 @@ class TestStagnation:
         assert report.stagnation_rate < 0.5
 
 
+class TestIncremental:
+    def test_only_changed_agents_recomputed(self, detector, monkeypatch):
+        for step in range(3):
+            for i in range(20):
+                detector.record_decision(f"A{i}", "buy")
+        detector.compute_snapshot(step=3)
+        detector.compute_snapshot(step=4)  # settle prior windows
+
+        calls = []
+        original = detector._update_agent_jaccard
+        monkeypatch.setattr(
+            detector, "_update_agent_jaccard",
+            lambda agent_id: calls.append(agent_id) or original(agent_id),
+        )
+        detector.record_decision("A3", "sell")
+        detector.compute_snapshot(step=5)
+        assert calls == ["A3"]
+
+    def test_repeat_snapshot_compares_against_prior_window(self, detector):
+        for step, action in enumerate(["buy", "buy", "sell", "hold"]):
+            detector.record_decision("A1", action)
+        first = detector.compute_snapshot(step=4, include_agents=True)
+        second = detector.compute_snapshot(step=5, include_agents=True)
+        assert first.agent_reports[0].jaccard_similarity < 1.0
+        # No new decisions: recent window now equals the stored prior set
+        assert second.agent_reports[0].jaccard_similarity == 1.0
+
+    def test_dominant_tie_goes_to_first_recorded_agent(self, detector):
+        detector.record_decisions({"A1": "sell", "A2": "buy"})
+        report = detector.compute_snapshot(step=1)
+        assert report.dominant_action == "sell"
+
+
 # ---------------------------------------------------------------------------
 # Alerts
 # ---------------------------------------------------------------------------
@@ -0,0 +1,175 @@
+"""Load-test mode: stand-in LLM server, synthetic populations, per-worker report."""
+import csv
+import json
+import threading
+import time
+from http.client import RemoteDisconnected
+from pathlib import Path
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from broker.core.load_test import format_report, run_load_test, synthesize_population_csv
+from broker.utils.llm_utils import _invoke_ollama_direct, ollama_base_url
+from broker.utils.stand_in_llm import StandInConfig, StandInLLMServer
+
+_PROFILES = Path(__file__).resolve().parents[1] / "examples" / "single_agent" / "agent_initial_profiles.csv"
+PROMPT = "Options:\n1. carpool\n2. do_nothing"
+
+
+def _post(url, payload, timeout=5):
+    request = Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    with urlopen(request, timeout=timeout) as resp:
+        return json.loads(resp.read())
+
+
+def test_stand_in_speaks_ollama_and_openai_formats():
+    with StandInLLMServer(StandInConfig(latency="fixed", latency_s=0.0)) as server:
+        generate = _post(f"{server.url}/api/generate", {"model": "m", "prompt": PROMPT})
+        chat = _post(f"{server.url}/api/chat", {"model": "m", "messages": [{"role": "user", "content": PROMPT}]})
+        completion = _post(f"{server.url}/v1/chat/completions",
+                           {"model": "m", "messages": [{"role": "user", "content": PROMPT}]})
+        legacy = _post(f"{server.url}/v1/completions", {"model": "m", "prompt": PROMPT})
+        stats = server.stats()
+
+    assert json.loads(generate["response"]) == {"decision": 1}
+    assert generate["prompt_eval_count"] == len(PROMPT) // 4 and generate["eval_count"] > 0
+    assert json.loads(chat["message"]["content"]) == {"decision": 1}
+    assert json.loads(completion["choices"][0]["message"]["content"]) == {"decision": 1}
+    assert completion["usage"]["prompt_tokens"] == len(PROMPT) // 4
+    assert json.loads(legacy["choices"][0]["text"]) == {"decision": 1}
+    assert stats["requests"] == 4 and len(stats["by_endpoint"]) == 4
+
+
+def test_injected_failures_and_timeouts(monkeypatch):
+    with StandInLLMServer(StandInConfig(latency_s=0.0, malformed_rate=1.0, seed=1)) as server:
+        answers = [_post(f"{server.url}/api/generate", {"prompt": PROMPT})["response"] for _ in range(6)]
+        assert server.stats()["malformed"] == 6
+    for answer in answers:
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(answer)
+
+    with StandInLLMServer(StandInConfig(latency_s=0.0, timeout_rate=1.0, stall_s=0.3)) as server:
+        with pytest.raises((URLError, RemoteDisconnected, TimeoutError)):
+            _post(f"{server.url}/api/generate", {"prompt": PROMPT}, timeout=0.1)
+        # The real Ollama client sees a dropped connection as a failed call
+        monkeypatch.setenv("OLLAMA_HOST", server.url.replace("http://", ""))
+        assert ollama_base_url() == server.url
+        content, stats = _invoke_ollama_direct("stand-in", PROMPT, {}, False)
+        assert content == "" and not stats.success
+        assert server.stats()["timed_out"] == 2
+
+
+def test_capacity_queues_concurrent_requests():
+    config = StandInConfig(latency="fixed", latency_s=0.05, capacity=1)
+    with StandInLLMServer(config) as server:
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(target=_post, args=(f"{server.url}/api/generate", {"prompt": PROMPT}))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        assert server.stats()["max_in_flight"] == 1
+    assert elapsed >= 4 * 0.05
+
+    with pytest.raises(ValueError):
+        StandInConfig(latency="pareto")
+    with pytest.raises(ValueError):
+        StandInConfig(malformed_rate=1.5)
+    with pytest.raises(ValueError):
+        StandInConfig(answers="best")
+
+
+def test_random_answers_fill_the_response_template():
+    prompt = (
+        "It is now the year 2020.\nMemory:\n1. Flooded last year\n"
+        "Options:\n1. carpool\n2. do_nothing\n3. switch_to_transit\n"
+        '{"threat_appraisal": {"label": "VL/L/M/H/VH", "reason": "..."}, "decision": "<1-3>"}'
+    )
+    with StandInLLMServer(StandInConfig(latency_s=0.0, answers="random", seed=3)) as server:
+        answers = [json.loads(_post(f"{server.url}/api/generate", {"prompt": prompt})["response"])
+                   for _ in range(30)]
+
+    assert {a["decision"] for a in answers} == {1, 2, 3}
+    assert {a["threat_appraisal"]["label"] for a in answers} <= {"VL", "L", "M", "H", "VH"}
+    assert len({a["threat_appraisal"]["label"] for a in answers}) > 1
+
+
+def test_prompt_cache_skips_prefill_of_shared_prefix():
+    config = StandInConfig(latency="fixed", latency_s=0.0, prefill_tokens_per_s=1e6, prefix_cache_slots=1)
+    other = "Options:\n1. do_nothing\n2. carpool"
+    with StandInLLMServer(config) as server:
+        first = _post(f"{server.url}/v1/completions", {"prompt": PROMPT})
+        again = _post(f"{server.url}/v1/completions", {"prompt": PROMPT})
+        _post(f"{server.url}/api/generate", {"prompt": other})
+        evicted = _post(f"{server.url}/api/generate", {"prompt": PROMPT})
+        stats = server.stats()
+
+    assert first["usage"]["prompt_tokens_details"]["cached_tokens"] == 0
+    assert again["usage"]["prompt_tokens_details"]["cached_tokens"] == len(PROMPT) // 4
+    # One slot: the other prompt replaced it, leaving only the shared "Options:\n1. " prefix
+    assert evicted["prompt_eval_count"] == len(PROMPT) // 4 - len("Options:\n1. ") // 4
+    assert stats["cached_prompt_tokens"] == len(PROMPT) // 4 + len("Options:\n1. ") // 4 * 2
+
+
+def test_synthetic_population_grows_example_profiles(tmp_path):
+    with open(_PROFILES, newline="", encoding="utf-8-sig") as f:
+        source = list(csv.DictReader(f))
+    path = synthesize_population_csv(_PROFILES, tmp_path / "population.csv", 1000, seed=7)
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert len(rows) == 1000
+    assert [r["id"] for r in rows[:2]] == ["Agent_1", "Agent_2"] and rows[-1]["id"] == "Agent_1000"
+    trust = [float(r["trust_in_insurance"]) for r in source]
+    assert all(min(trust) <= float(r["trust_in_insurance"]) <= max(trust) for r in rows)
+    assert len({r["trust_in_insurance"] for r in rows}) > len(set(trust))
+    assert {r["elevated"] for r in rows} <= {r["elevated"] for r in source}
+    assert {r["memory"] for r in rows} <= {r["memory"] for r in source}
+    again = synthesize_population_csv(_PROFILES, tmp_path / "again.csv", 1000, seed=7)
+    assert again.read_text() == path.read_text()
+
+
+def test_load_test_reports_stages_per_worker_count(tmp_path, monkeypatch):
+    from broker.components.memory.engine import WindowMemoryEngine
+    from broker.core.experiment import ExperimentBuilder
+    from tests.fixtures.fake_traffic import AGENT_TYPES, SKILL_REGISTRY, TrafficSimulation, commuters
+
+    def cell(workers, output_dir, llm_url):
+        monkeypatch.setenv("OLLAMA_HOST", llm_url)
+        runner = (
+            ExperimentBuilder()
+            .with_model("mock")
+            .with_years(1)
+            .with_agents(commuters(6))
+            .with_simulation(TrafficSimulation())
+            .with_skill_registry(str(SKILL_REGISTRY))
+            .with_memory_engine(WindowMemoryEngine(window_size=3))
+            .with_governance("strict", str(AGENT_TYPES))
+            .with_exact_output(str(output_dir))
+            .with_seed(42)
+        ).build()
+        runner.config.workers = workers
+        runner._llm_cache["commuter"] = lambda prompt: _invoke_ollama_direct("stand-in", prompt, {}, False)
+        runner.run()
+
+    stand_in = StandInConfig(latency="fixed", latency_s=0.02, tokens_per_s=500, response_tokens=5)
+    report = run_load_test(cell, [1, 3], tmp_path, stand_in)
+
+    assert [run["workers"] for run in report["runs"]] == [1, 3]
+    for run in report["runs"]:
+        assert run["error"] == ""
+        assert run["steps"] == run["server"]["requests"] == 6
+        assert run["server"]["response_tokens"] == 30
+        assert run["stages"]["llm"]["mean_ms"] >= 30
+        assert {"context_build", "parse", "total"} <= set(run["stages"])
+    assert report["runs"][0]["server"]["max_in_flight"] == 1
+    assert report["runs"][1]["server"]["max_in_flight"] > 1
+    assert json.loads((tmp_path / "load_test_report.json").read_text()) == report
+    text = format_report(report)
+    assert "w=3" in text and "context_build" in text
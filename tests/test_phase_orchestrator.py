@@ -215,6 +215,53 @@ class TestDependencyOrdering:
                phase_order.index(ExecutionPhase.OBSERVATION)
 
 
+class TestExecutionWaves:
+    def _water_like(self, **kwargs):
+        return PhaseOrchestrator(phases=[
+            PhaseConfig(phase=ExecutionPhase.INSTITUTIONAL, agent_types=["government", "insurance"]),
+            PhaseConfig(phase=ExecutionPhase.HOUSEHOLD,
+                        agent_types=["household_owner", "household_renter", "household_mg_owner"],
+                        ordering="parallel", max_workers=2),
+            PhaseConfig(phase=ExecutionPhase.RESOLUTION, agent_types=[],
+                        depends_on=[ExecutionPhase.INSTITUTIONAL, ExecutionPhase.HOUSEHOLD]),
+            PhaseConfig(phase=ExecutionPhase.OBSERVATION, agent_types=[],
+                        depends_on=[ExecutionPhase.RESOLUTION]),
+        ], **kwargs)
+
+    def test_independent_phases_share_a_wave(self, agents):
+        waves = self._water_like().get_execution_waves(agents)
+        assert [[pc.phase for pc, _ in wave] for wave in waves] == [
+            [ExecutionPhase.INSTITUTIONAL, ExecutionPhase.HOUSEHOLD],
+            [ExecutionPhase.RESOLUTION],
+            [ExecutionPhase.OBSERVATION],
+        ]
+        assert waves[0][0][1] == ["gov_1", "ins_1"]
+        assert waves[0][1][1] == ["hh_1", "hh_2", "hh_3"]
+
+    def test_waves_flatten_to_execution_plan(self, agents):
+        orch = self._water_like()
+        flat = [(pc.phase, ids) for wave in orch.get_execution_waves(agents) for pc, ids in wave]
+        assert flat == orch.get_execution_plan(agents)
+
+    def test_generic_layout_is_one_phase_per_wave(self, orchestrator, agents):
+        waves = orchestrator.get_execution_waves(agents)
+        assert [len(w) for w in waves] == [1, 1, 1]
+
+    def test_cycle_raises(self):
+        from broker.components.events.exceptions import PhaseDependencyCycleError
+        orch = PhaseOrchestrator(phases=[
+            PhaseConfig(phase=ExecutionPhase.INSTITUTIONAL, depends_on=[ExecutionPhase.HOUSEHOLD]),
+            PhaseConfig(phase=ExecutionPhase.HOUSEHOLD, depends_on=[ExecutionPhase.INSTITUTIONAL]),
+        ])
+        with pytest.raises(PhaseDependencyCycleError):
+            orch.get_execution_waves({})
+
+    def test_max_concurrent_phases_validated(self):
+        from broker.components.events.exceptions import InvalidPhaseConfigError
+        with pytest.raises(InvalidPhaseConfigError):
+            self._water_like(max_concurrent_phases=0)
+
+
 # ---------------------------------------------------------------------------
 # YAML Loading
 # ---------------------------------------------------------------------------
@@ -0,0 +1,91 @@
+"""Inverted-index SkillRetriever matches the linear keyword scorer."""
+import random
+
+import pytest
+
+from broker.components.governance.retriever import SkillRetriever, _SkillIndex
+from broker.interfaces.skill_types import SkillDefinition
+
+WORDS = [
+    "flood", "insurance", "elevate", "house", "relocate", "savings", "risk",
+    "water", "demand", "crop", "neighbor", "buy", "sell", "wait", "action",
+    "threat", "level", "high", "low", "cost",
+]
+
+
+def _skill(skill_id, description):
+    return SkillDefinition(skill_id, description, ["*"], [], {}, [], "")
+
+
+def _linear_retrieve(retriever, context, skills):
+    """Pre-index retrieve(): score every skill, stable sort, truncate, inject."""
+    keywords = retriever._extract_keywords(context)
+    scored = [(retriever._calculate_score(s, keywords), s) for s in skills]
+    scored.sort(key=lambda x: x[0], reverse=True)
+    top = [s for score, s in scored[:retriever.top_n] if score >= retriever.min_score]
+    for gid in retriever.global_skills:
+        g = next((s for s in skills if s.skill_id == gid), None)
+        if g and g not in top:
+            top.append(g)
+    return top
+
+
+def _random_skills(rng, n):
+    skills = []
+    for i in range(n):
+        sid = "_".join(rng.sample(WORDS, 2)) + f"_{i}"
+        desc = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8)))
+        skills.append(_skill(sid, desc.capitalize() + "."))
+    skills.append(_skill("do_nothing", "Take no action."))
+    return skills
+
+
+def _random_context(rng):
+    return {
+        "state": {
+            "risk_level": rng.uniform(-1, 1),
+            "savings": rng.uniform(0, 2),
+            "status": rng.choice(["high risk", "Flood", "", "low"]),
+        },
+        "perception": {f"{rng.choice(WORDS)}_{rng.choice(WORDS)}": rng.random() for _ in range(3)},
+        "memory": [
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10)))
+            for _ in range(rng.randint(0, 4))
+        ] + [{"content": "My neighbor bought insurance."}],
+    }
+
+
+@pytest.mark.parametrize("min_score", [0.05, 0.0, -1.0])
+def test_index_matches_linear_scorer(min_score):
+    rng = random.Random(7)
+    retriever = SkillRetriever(top_n=4, min_score=min_score, global_skills=["do_nothing"])
+    skills = _random_skills(rng, 40)
+    for _ in range(200):
+        context = _random_context(rng)
+        assert retriever.retrieve(context, skills) == _linear_retrieve(retriever, context, skills)
+
+
+def test_scores_bit_identical_including_substrings_and_phrases():
+    skills = [
+        _skill("buy_insurance", "Focus on insurance and savings."),
+        _skill("elevate_house", "Raise house to avoid flood damage."),
+        _skill("do_nothing", "Take no action."),
+    ]
+    keywords = {"insur": 0.3, "high risk": 1.0, "raise house": 0.7, "": 0.1,
+                "do_nothing": 0.2, "flood": 1.2, "flooding": 5.0}
+    index = _SkillIndex(skills)
+    scores = index.score(keywords)
+    retriever = SkillRetriever(global_skills=[])
+    for i, skill in enumerate(skills):
+        assert scores.get(i, 0.0) == retriever._calculate_score(skill, keywords)
+
+
+def test_index_built_once_per_skill_list():
+    retriever = SkillRetriever(top_n=2, global_skills=["do_nothing"])
+    skills = _random_skills(random.Random(1), 10)
+    context = {"state": {}, "memory": ["flood insurance"]}
+    retriever.retrieve(context, skills)
+    retriever.retrieve(context, list(skills))
+    assert len(retriever._indexes) == 1
+    retriever.retrieve(context, skills[:5])
+    assert len(retriever._indexes) == 2
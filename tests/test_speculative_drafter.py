@@ -0,0 +1,168 @@
+"""Tests for SpeculativeDrafter (broker/core/efficiency.py)."""
+import json
+
+import pytest
+
+from broker.core._retry_loop import RetryMixin
+from broker.core.efficiency import SpeculativeDrafter
+from broker.components.analytics.audit import trace_to_csv_row
+from broker.components.response_format import ResponseFormatBuilder
+from broker.utils.llm_utils import LLMStats
+
+FIELDS = ["threat_appraisal", "decision"]
+
+
+def _response(decision=1):
+    body = json.dumps({"threat_appraisal": {"label": "H", "reason": "flooded"}, "decision": decision})
+    return f"<<<DECISION_START>>>\n{body}\n<<<DECISION_END>>>"
+
+
+class FakeProvider:
+    """Main provider stand-in that records prompts and replays replies."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def __call__(self, prompt):
+        self.prompts.append(prompt)
+        return self.replies.pop(0), LLMStats(prompt_tokens=100, response_tokens=10, num_ctx=4096)
+
+
+class TestDraftModel:
+    def test_accepted_draft_is_returned(self):
+        main = FakeProvider("ACCEPT")
+        drafter = SpeculativeDrafter(FIELDS, draft_invoke=lambda p: _response(2))
+        content, stats = drafter.invoke("PROMPT", main)
+        assert content == _response(2)
+        assert stats.speculative["status"] == "accepted"
+        assert len(main.prompts) == 1 and "### [DRAFT RESPONSE]" in main.prompts[0]
+
+    def test_main_correction_replaces_draft_without_extra_call(self):
+        main = FakeProvider(_response(3))
+        drafter = SpeculativeDrafter(FIELDS, draft_invoke=lambda p: _response(2))
+        content, stats = drafter.invoke("PROMPT", main)
+        assert content == _response(3)
+        assert stats.speculative["status"] == "rejected"
+        assert len(main.prompts) == 1
+
+    def test_malformed_draft_falls_back_to_normal_call(self):
+        main = FakeProvider(_response(1))
+        drafter = SpeculativeDrafter(FIELDS, draft_invoke=lambda p: '{"decision": 1}')
+        content, stats = drafter.invoke("PROMPT", main)
+        assert content == _response(1)
+        assert stats.speculative["status"] == "fallback"
+        assert main.prompts == ["PROMPT"]
+
+    def test_unusable_verdict_falls_back(self):
+        main = FakeProvider("maybe?", _response(1))
+        drafter = SpeculativeDrafter(FIELDS, draft_invoke=lambda p: _response(2))
+        content, stats = drafter.invoke("PROMPT", main)
+        assert content == _response(1)
+        assert stats.speculative["status"] == "fallback"
+        assert main.prompts[1] == "PROMPT"
+        assert stats.prompt_tokens == 200 and stats.response_tokens == 20
+
+
+class TestTemplate:
+    def test_template_prefix_is_completed(self):
+        completion = ' {"label": "H", "reason": "flooded"}, "decision": 1}\n<<<DECISION_END>>>'
+        main = FakeProvider(completion)
+        drafter = SpeculativeDrafter(FIELDS)
+        content, stats = drafter.invoke("PROMPT", main)
+        assert content == drafter.template_prefix() + completion
+        assert drafter.extract_fields(content)["decision"] == 1
+        assert stats.speculative["status"] == "completed"
+        assert main.prompts[0].endswith(drafter.template_prefix())
+
+    def test_template_prefix_is_an_assistant_turn_for_chat_providers(self):
+        completion = ' {"label": "H"}, "decision": 1}'
+        main = FakeProvider()
+        sent = []
+        main.chat = lambda messages: (sent.append(messages) or completion, LLMStats())
+        drafter = SpeculativeDrafter(FIELDS)
+        content, stats = drafter.invoke("PROMPT", main)
+        assert sent == [[
+            {"role": "user", "content": "PROMPT"},
+            {"role": "assistant", "content": drafter.template_prefix()},
+        ]]
+        assert main.prompts == []
+        assert content == drafter.template_prefix() + completion
+        assert stats.speculative["status"] == "completed"
+
+    def test_full_response_despite_prefix_is_used_as_is(self):
+        main = FakeProvider(_response(2))
+        content, stats = SpeculativeDrafter(FIELDS).invoke("PROMPT", main)
+        assert content == _response(2)
+        assert stats.speculative["status"] == "ignored"
+        assert len(main.prompts) == 1
+
+    def test_ignored_template_does_not_count_as_accepted(self):
+        drafter = SpeculativeDrafter(FIELDS)
+        drafter.invoke("P", FakeProvider(_response(2)))
+        drafter.invoke("P", FakeProvider(' {"label": "H"}, "decision": 1}'))
+        stats = drafter.get_stats()
+        assert stats["ignored"] == 1 and stats["completed"] == 1
+        assert stats["acceptance_rate"] == 0.5
+
+    def test_wrap_forwards_chat_to_main_model(self):
+        main = FakeProvider(_response(1))
+        main.chat = lambda messages: (messages[-1]["content"], LLMStats())
+        invoke = SpeculativeDrafter(FIELDS).wrap(main)
+        assert invoke.chat([{"role": "user", "content": "retry"}])[0] == "retry"
+        assert main.prompts == []
+        assert not hasattr(SpeculativeDrafter(FIELDS).wrap(FakeProvider()), "chat")
+
+    def test_from_response_format(self):
+        builder = ResponseFormatBuilder({"response_format": {
+            "delimiter_start": "<<A>>", "delimiter_end": "<<B>>",
+            "fields": [{"key": "decision", "type": "choice"}, {"key": "reason", "type": "text"}],
+        }})
+        drafter = SpeculativeDrafter.from_response_format(builder)
+        assert drafter.fields == ["decision", "reason"]
+        assert drafter.template_prefix().startswith("<<A>>")
+
+    def test_requires_fields(self):
+        with pytest.raises(ValueError):
+            SpeculativeDrafter([])
+
+
+class TestAccounting:
+    def test_get_stats(self):
+        drafter = SpeculativeDrafter(FIELDS, draft_invoke=lambda p: _response(2))
+        drafter.invoke("P", FakeProvider("ACCEPT"))
+        drafter.invoke("P", FakeProvider(_response(3)))
+        stats = drafter.get_stats()
+        assert stats["accepted"] == 1 and stats["rejected"] == 1
+        assert stats["acceptance_rate"] == 0.5
+
+    def test_audit_llm_stats_accumulate(self):
+        draft = lambda p: (_response(2), LLMStats(prompt_tokens=50, response_tokens=5))
+        drafter = SpeculativeDrafter(FIELDS, draft_invoke=draft)
+        total = {"llm_retries": 0, "llm_success": False}
+        for reply in ("ACCEPT", _response(3), "ACCEPT", "maybe?"):
+            _, stats = drafter.invoke("P", FakeProvider(reply, _response(1)))
+            RetryMixin._accumulate_draft_stats(total, stats)
+        spec = total["speculative"]
+        assert (spec["accepted"], spec["rejected"], spec["fallback"], spec["ignored"]) == (2, 1, 1, 0)
+        assert spec["draft_prompt_tokens"] == 200 and spec["draft_response_tokens"] == 20
+
+        row = trace_to_csv_row({"llm_stats": total})
+        assert row["draft_accepted"] == 2 and row["draft_rejected"] == 1
+        assert row["draft_fallback"] == 1 and row["draft_ignored"] == 0
+        assert row["draft_tokens"] == 220
+
+    def test_template_outcomes_are_counted_separately(self):
+        total = {}
+        for reply in (' {"label": "H"}, "decision": 1}', _response(2)):
+            _, stats = SpeculativeDrafter(FIELDS).invoke("P", FakeProvider(reply))
+            RetryMixin._accumulate_draft_stats(total, stats)
+        assert total["speculative"]["completed"] == 1 and total["speculative"]["ignored"] == 1
+        row = trace_to_csv_row({"llm_stats": total})
+        assert row["draft_accepted"] == 1 and row["draft_ignored"] == 1 and row["draft_rejected"] == 0
+
+    def test_plain_stats_leave_audit_untouched(self):
+        total = {}
+        RetryMixin._accumulate_draft_stats(total, LLMStats())
+        assert total == {}
+        assert "speculative" not in LLMStats().to_dict()
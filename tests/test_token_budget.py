@@ -0,0 +1,193 @@
+"""Tests for token-accurate prompt budgeting (broker.components.context.token_budget)."""
+
+import pytest
+
+from broker.components.context.tiered import TieredContextBuilder
+from broker.components.context.token_budget import (
+    HeuristicTokenCounter,
+    TokenBudget,
+    model_family,
+    resolve_token_counter,
+)
+
+
+class WordCounter:
+    """Deterministic stand-in tokenizer: one token per whitespace word."""
+
+    name = "words"
+
+    def count(self, text):
+        return len(text.split())
+
+
+TEMPLATE = (
+    "{system_prompt}\n\nMEMORY:\n{memory}\n\nGOSSIP:\n{social_gossip}\n\n"
+    "NEWS:\n{global_news}\n\nFORMAT:\n{response_format}"
+)
+
+
+def _context(n_memory=6, n_social=4, n_news=4):
+    return {
+        "agent_id": "a1",
+        "agent_type": "household",
+        "system_prompt": "You are a household deciding about flood risk.",
+        "personal": {
+            "id": "a1",
+            "memory": [
+                {"content": f"memory item {i} with detail", "importance": i / 10, "timestamp": i}
+                for i in range(n_memory)
+            ],
+            "options_text": "1. wait\n2. elevate",
+        },
+        "local": {"social": [f"neighbor {i} said something" for i in range(n_social)]},
+        "global": [f"news headline {i} today" for i in range(n_news)],
+    }
+
+
+def _builder(token_budget=None, max_prompt_tokens=16384):
+    return TieredContextBuilder(
+        agents={},
+        hub=None,
+        prompt_templates={"household": TEMPLATE},
+        max_prompt_tokens=max_prompt_tokens,
+        token_budget=token_budget,
+    )
+
+
+class TestCounters:
+    def test_model_family(self):
+        assert model_family("gemma3:4b") == "gemma"
+        assert model_family("Qwen3:8B") == "qwen"
+        assert model_family("ministral-3:8b") == "mistral"
+        assert model_family("unknown-model") == "default"
+        assert model_family(None) == "default"
+
+    def test_missing_tokenizer_dir_falls_back_to_heuristic(self, tmp_path):
+        counter = resolve_token_counter("gemma3:4b", tokenizer_dir=str(tmp_path))
+        assert isinstance(counter, HeuristicTokenCounter)
+        assert counter.count("abcdefgh") == 2
+
+    def test_explicit_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            resolve_token_counter("gemma3:4b", tokenizer_path=str(tmp_path / "nope.json"))
+
+    def test_local_tokenizer_file(self, tmp_path):
+        tokenizers = pytest.importorskip("tokenizers")
+        from tokenizers.models import WordLevel
+        from tokenizers.pre_tokenizers import Whitespace
+
+        tok = tokenizers.Tokenizer(WordLevel({"[UNK]": 0, "flood": 1}, unk_token="[UNK]"))
+        tok.pre_tokenizer = Whitespace()
+        family_dir = tmp_path / "gemma"
+        family_dir.mkdir()
+        tok.save(str(family_dir / "tokenizer.json"))
+
+        counter = resolve_token_counter("gemma3:4b", tokenizer_dir=str(tmp_path))
+        assert counter.count("flood risk is rising") == 4
+        assert counter.count("") == 0
+
+    def test_unknown_tier_rejected(self):
+        with pytest.raises(ValueError, match="Unknown prompt tier"):
+            TokenBudget(num_ctx=100, tier_budgets={"gossip": 10})
+
+    def test_reserve_must_leave_room(self):
+        with pytest.raises(ValueError):
+            TokenBudget(num_ctx=100, reserve_output=100)
+
+
+class TestTieredBudgeting:
+    def test_untrimmed_prompt_is_byte_identical(self):
+        ctx_plain, ctx_budget = _context(), _context()
+        plain = _builder().format_prompt(ctx_plain)
+        budgeted = _builder(TokenBudget(num_ctx=10_000, counter=WordCounter())).format_prompt(ctx_budget)
+        assert budgeted == plain
+        assert ctx_budget["_prompt_budget"]["trimmed"] == {}
+        assert ctx_budget["_prompt_budget"]["counter"] == "words"
+
+    def test_count_recorded_without_budget(self):
+        ctx = _context()
+        prompt = _builder().format_prompt(ctx)
+        assert ctx["_prompt_budget"]["prompt_tokens"] == len(prompt) // 4
+        assert ctx["_prompt_budget"]["counter"] == "heuristic"
+
+    def test_tier_budget_trims_lowest_salience_memory(self):
+        budget = TokenBudget(num_ctx=10_000, tier_budgets={"memory": 12}, counter=WordCounter())
+        ctx = _context()
+        prompt = _builder(budget).format_prompt(ctx)
+        # Six words per memory line: two survive, the most salient ones.
+        assert "memory item 5" in prompt and "memory item 4" in prompt
+        assert "memory item 3" not in prompt
+        assert ctx["_prompt_budget"]["trimmed"] == {"memory": 4}
+        assert ctx["_prompt_budget"]["tier_tokens"]["memory"] <= 12
+
+    def test_num_ctx_trims_events_before_social_before_memory(self):
+        full = WordCounter().count(_builder().format_prompt(_context()))
+        # Room for everything except the news and half the gossip.
+        budget = TokenBudget(num_ctx=full - 16 - 10, counter=WordCounter())
+        ctx = _context()
+        prompt = _builder(budget).format_prompt(ctx)
+        report = ctx["_prompt_budget"]
+        assert report["trimmed"] == {"events": 4, "social": 2}
+        assert "news headline" not in prompt
+        assert "neighbor 0" in prompt and "neighbor 3" not in prompt
+        assert report["prompt_tokens"] == WordCounter().count(prompt) <= report["limit"]
+
+    def test_reserve_output_counts_against_num_ctx(self):
+        full = WordCounter().count(_builder().format_prompt(_context()))
+        budget = TokenBudget(num_ctx=full + 100, reserve_output=116, counter=WordCounter())
+        ctx = _context()
+        _builder(budget).format_prompt(ctx)
+        assert ctx["_prompt_budget"]["limit"] == full - 16
+        assert ctx["_prompt_budget"]["trimmed"] == {"events": 4}
+
+    def test_trimming_is_deterministic(self):
+        budget = TokenBudget(num_ctx=60, counter=WordCounter())
+        prompts = {_builder(budget).format_prompt(_context()) for _ in range(3)}
+        assert len(prompts) == 1
+
+    def test_hierarchical_memory_keeps_recent_episodic(self):
+        ctx = _context()
+        ctx["personal"]["memory"] = {
+            "core": {"savings": 100},
+            "semantic": ["old lesson one", "old lesson two"],
+            "episodic": ["flooded in year one", "flooded in year two"],
+        }
+        budget = TokenBudget(num_ctx=10_000, tier_budgets={"memory": 12}, counter=WordCounter())
+        prompt = _builder(budget).format_prompt(ctx)
+        assert "flooded in year two" in prompt
+        assert "old lesson" not in prompt
+
+    def test_untrimmable_overflow_raises(self):
+        budget = TokenBudget(num_ctx=5, counter=WordCounter())
+        with pytest.raises(RuntimeError, match="exceeds limit"):
+            _builder(budget).format_prompt(_context())
+
+
+class TestBuilderWiring:
+    @staticmethod
+    def _build(tmp_path, **options):
+        from broker.core.experiment import ExperimentBuilder
+        from tests.fixtures.fake_traffic import AGENT_TYPES, SKILL_REGISTRY, TrafficSimulation, commuters
+
+        return (
+            ExperimentBuilder()
+            .with_model("mock")
+            .with_agents(commuters(2))
+            .with_simulation(TrafficSimulation())
+            .with_skill_registry(str(SKILL_REGISTRY))
+            .with_governance("strict", str(AGENT_TYPES))
+            .with_exact_output(str(tmp_path))
+            .with_token_budget(**options)
+        ).build()
+
+    def test_defaults_to_configured_window_minus_response(self, tmp_path):
+        budget = self._build(tmp_path, tier_budgets={"memory": 300}).broker.context_builder.token_budget
+        # commuter llm_params: num_ctx 2048, num_predict 512
+        assert (budget.num_ctx, budget.reserve_output) == (2048, 512)
+        assert budget.prompt_limit == 1536
+        assert budget.tier_budgets == {"memory": 300}
+
+    def test_budget_above_context_window_warns(self, tmp_path, caplog):
+        budget = self._build(tmp_path, num_ctx=8192, reserve_output=256).broker.context_builder.token_budget
+        assert budget.prompt_limit == 8192 - 256
+        assert "exceeds the configured context window (2048 tokens)" in caplog.text
@@ -0,0 +1,119 @@
+"""Compact (content-addressed, delta-encoded) raw audit trace storage."""
+import csv
+import json
+
+import pytest
+
+from broker.components.analytics.audit import AuditConfig, GenericAuditWriter
+from broker.components.analytics.trace_store import (
+    TraceDecoder, TraceEncoder, iter_jsonl_traces,
+)
+from broker.tools.recover_csv_from_jsonl import recover_csv
+
+SYSTEM = "\n\n".join([
+    "You are a household deciding on flood adaptation in a coastal town. " * 8,
+    "Rules:\n" + "\n".join(f"- rule {i}: keep the decision consistent with your appraisal" for i in range(12)),
+    "Respond with JSON containing skill_name, reasoning and appraisal labels.",
+])
+
+
+def _traces(n_agents=4, years=12):
+    traces = []
+    memories = {a: [] for a in range(n_agents)}
+    for year in range(1, years + 1):
+        for a in range(n_agents):
+            agent_id = f"H{a}"
+            mem = memories[a]
+            mem.append({
+                "content": f"Year {year}: flood depth {year % 3} ft; neighbours discussed insurance "
+                           f"premiums and elevation grants at length.",
+                "importance": 0.5, "source": "personal", "emotion": "neutral",
+            })
+            if len(mem) > 20:
+                mem.pop(0)
+            state = {"elevated": year > 5, "savings": 1000 + a, "year": year}
+            after = {**state, "elevated": True, "insured": True}
+            after.pop("year")
+            traces.append({
+                "agent_id": agent_id,
+                "step_id": len(traces),
+                "year": year,
+                "timestamp": f"2026-01-{year:02d}T00:00:00",
+                "input": f"{SYSTEM}\n\nYou are agent {agent_id}.\n\nYear {year} memories:\n- "
+                         + "\n- ".join(m["content"] for m in mem[-3:]),
+                "memory_pre": [m["content"] for m in mem[-3:]],
+                "memory_post": [dict(m) for m in mem],
+                "memory_audit": {"retrieved_count": 3, "memories": [dict(m) for m in mem[-3:]]},
+                "state_before": state,
+                "state_after": after,
+                "environment_context": {"current_year": year, "flood": year % 3 == 0},
+                "approved_skill": {"skill_name": "buy_insurance", "status": "APPROVED"},
+            })
+    return traces
+
+
+def _write(tmp_path, mode, traces):
+    writer = GenericAuditWriter(AuditConfig(output_dir=str(tmp_path / mode), trace_storage=mode))
+    for trace in traces:
+        writer.write_trace("household", json.loads(json.dumps(trace)))
+    writer.finalize()
+    return tmp_path / mode / "raw" / "household_traces.jsonl"
+
+
+def _rows(path):
+    return [t for t in iter_jsonl_traces(path) if "_metadata" not in t]
+
+
+def test_compact_round_trip_matches_full_and_is_smaller(tmp_path):
+    traces = _traces()
+    full = _write(tmp_path, "full", traces)
+    compact = _write(tmp_path, "compact", traces)
+
+    assert _rows(compact) == _rows(full)
+    assert [t["memory_post"] for t in _rows(compact)] == [t["memory_post"] for t in traces]
+    assert compact.stat().st_size * 3 < full.stat().st_size
+
+    header = json.loads(compact.read_text(encoding="utf-8").splitlines()[0])
+    assert header["trace_storage"] == "compact"
+
+
+def test_recover_csv_reads_compact_files(tmp_path):
+    traces = _traces(n_agents=2, years=3)
+    _write(tmp_path, "full", traces)
+    _write(tmp_path, "compact", traces)
+    (tmp_path / "full" / "household_governance_audit.csv").unlink()
+    (tmp_path / "compact" / "household_governance_audit.csv").unlink()
+
+    assert recover_csv(tmp_path / "full")["household"]["rows_recovered"] == 6
+    assert recover_csv(tmp_path / "compact")["household"]["rows_recovered"] == 6
+
+    def read(mode):
+        with open(tmp_path / mode / "household_governance_audit.csv", encoding="utf-8-sig") as f:
+            return list(csv.DictReader(f))
+
+    assert read("compact") == read("full")
+
+
+def test_memory_delta_keyframes_and_base_check():
+    encoder = TraceEncoder(keyframe_interval=3)
+    records = []
+    for trace in _traces(n_agents=1, years=5):
+        encoded, blobs = encoder.encode(trace)
+        records.append((encoded, blobs))
+    kinds = [next(iter(e["memory_post"])) for e, _ in records]
+    assert kinds == ["$list", "$delta", "$delta", "$list", "$delta"]
+
+    # A lost trace breaks the next delta, not the keyframe after it
+    decoder = TraceDecoder()
+    for _, blobs in records:
+        for blob in blobs:
+            decoder.add_blob(blob)
+    decoder.decode(records[0][0])
+    with pytest.raises(ValueError):
+        decoder.decode(records[2][0])
+    assert decoder.decode(records[3][0])["memory_post"] == _traces(n_agents=1, years=5)[3]["memory_post"]
+
+
+def test_invalid_trace_storage_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        GenericAuditWriter(AuditConfig(output_dir=str(tmp_path), trace_storage="zip"))
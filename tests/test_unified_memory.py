@@ -425,6 +425,79 @@ class TestUnifiedMemoryStore(unittest.TestCase):
         self.assertEqual(len(store.get_working("a1")), 0)
         self.assertEqual(len(store.get_longterm("a1")), 0)
 
+    def test_lazy_decay_matches_eager_formula(self):
+        """apply_decay should yield base / (1 + rate * age_days) on read."""
+        store = UnifiedMemoryStore(working_capacity=10)
+        now = time.time()
+        items = []
+        for i, imp in enumerate([0.2, 0.6, 0.9]):
+            item = UnifiedMemoryItem(
+                content=f"M{i}", agent_id="a1", base_importance=imp,
+                timestamp=now - (i + 1) * 86400,
+            )
+            store.add(item)
+            items.append(item)
+
+        store.apply_decay("a1", 0.5, now)
+        for i, item in enumerate(items):
+            expected = item.base_importance / (1.0 + 0.5 * (i + 1))
+            self.assertAlmostEqual(item.importance, expected)
+
+        # Items added after the decay keep their importance until the next one
+        late = UnifiedMemoryItem(
+            content="late", agent_id="a1", base_importance=0.8,
+            timestamp=now - 10 * 86400,
+        )
+        store.add(late)
+        self.assertAlmostEqual(late.importance, 0.8)
+
+        # An explicit assignment survives until the next decay
+        items[0].importance = 0.95
+        self.assertAlmostEqual(items[0].importance, 0.95)
+        store.apply_decay("a1", 0.5, now)
+        self.assertAlmostEqual(items[0].importance, 0.2 / 1.5)
+        self.assertAlmostEqual(late.importance, 0.8 / 6.0)
+
+    def test_ranked_longterm_tracks_inserts_and_decay(self):
+        """top_longterm should match a stable sort after every change."""
+        store = UnifiedMemoryStore(working_capacity=2, consolidation_threshold=0.0)
+        now = time.time()
+
+        def reference():
+            return sorted(store.get_longterm("a1"), key=lambda m: m.importance, reverse=True)
+
+        for i in range(12):
+            item = UnifiedMemoryItem(
+                content=f"M{i}", agent_id="a1",
+                base_importance=[0.3, 0.9, 0.5, 0.5][i % 4],
+                timestamp=now - (12 - i) * 3 * 86400,
+            )
+            store.add(item)
+            self.assertEqual(store.ranked_longterm("a1"), reference())
+
+        store.apply_decay("a1", 1.0, now)
+        self.assertEqual(store.top_longterm("a1", 4), reference()[:4])
+
+        store.get_longterm("a1")[3].importance = 1.0
+        self.assertIs(store.top_longterm("a1", 1)[0], store.get_longterm("a1")[3])
+        self.assertEqual(store.ranked_longterm("a1"), reference())
+
+    def test_forget_by_importance_in_longterm(self):
+        """Forget should drop only long-term items below the threshold, in order."""
+        store = UnifiedMemoryStore(working_capacity=10)
+        imps = [0.7, 0.1, 0.5, 0.3, 0.9, 0.5]
+        store._longterm["a1"] = [
+            UnifiedMemoryItem(content=f"M{i}", agent_id="a1", base_importance=imp)
+            for i, imp in enumerate(imps)
+        ]
+
+        forgotten = store.forget("a1", strategy="importance", threshold=0.5)
+
+        self.assertEqual(forgotten, 2)
+        self.assertEqual([m.content for m in store.get_longterm("a1")], ["M0", "M2", "M4", "M5"])
+        self.assertEqual(store.forget("a1", strategy="importance", threshold=0.5), 0)
+        self.assertEqual(store.forget("a2", strategy="importance", threshold=0.5), 0)
+
 
 class TestAdaptiveRetrievalEngine(unittest.TestCase):
     """Test adaptive retrieval with dynamic weight adjustment."""